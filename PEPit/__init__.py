@@ -5,7 +5,11 @@ from .function import Function
 from .psd_matrix import PSDMatrix
 from .wrapper import Wrapper
 from .pep import PEP
+from .pep_template import PEPTemplate
+from .pep_cache import PEPCache
+from .pep_profile import PEPProfile
 from .point import Point, null_point
+from .registry import Registry
 
 __all__ = ['block_partition', 'BlockPartition',
            'examples',
@@ -19,6 +23,10 @@ __all__ = ['block_partition', 'BlockPartition',
            'function', 'Function',
            'psd_matrix', 'PSDMatrix',
            'pep', 'PEP',
+           'pep_template', 'PEPTemplate',
+           'pep_cache', 'PEPCache',
+           'pep_profile', 'PEPProfile',
            'point', 'Point', 'null_point',
+           'registry', 'Registry',
            'wrapper', 'Wrapper',
            ]
@@ -1,8 +1,9 @@
-from PEPit.point import Point, null_point
+from PEPit.point import Point
 from PEPit.constraint import Constraint
+from PEPit.registry import RegisteredClass
 
 
-class BlockPartition(object):
+class BlockPartition(object, metaclass=RegisteredClass):
     """
     A :class:`BlockPartition` encodes an abstract block partitioning
     (of :math:`d` blocks of variables) of the ambient space.
@@ -23,10 +24,11 @@ class BlockPartition(object):
         >>> block_partition = pep.declare_block_partition(d=5)
 
     """
-    # Class counter.
-    # It counts the number of partitions defined from scratch.
-    counter = 0
-    list_of_partitions = list()
+    # Class attributes stored in the active Registry, with their initial values.
+    # The counter counts the number of partitions defined from scratch.
+    _registered_attributes = {"counter": int,
+                              "list_of_partitions": list,
+                              }
 
     def __init__(self, d):
         """
@@ -88,15 +90,10 @@ class BlockPartition(object):
         # Case 1: point is already in the list: do nothing (just return)
         # Case 2: point is not partitioned yet: partition (and return)
         if point not in self.blocks_dict.keys():
-            point_partition = list()
-            accumulation = null_point
             # Fill the partition with d-1 new :class:`Point`.
-            for i in range(self.d-1):
-                new_point = Point()
-                accumulation += new_point
-                point_partition.append(new_point)
+            point_partition = [Point() for _ in range(self.d-1)]
             # The last element is set so that the sum is equal to point.
-            point_partition.append(point - accumulation)
+            point_partition.append(point - Point.sum(point_partition))
             self.blocks_dict[point] = point_partition
         # Return the desired block projection of point
         return self.blocks_dict[point][block_number]
@@ -1,4 +1,7 @@
-class Constraint(object):
+from PEPit.registry import RegisteredClass
+
+
+class Constraint(object, metaclass=RegisteredClass):
     """
     A :class:`Constraint` encodes either an equality or an inequality between two :class:`Expression` objects.
 
@@ -8,6 +11,11 @@ class Constraint(object):
 
     Attributes:
         name (str): A name set through the set_name method. None is no name is given.
+                    The name of a class interpolation constraint is derived on demand from the table of
+                    class constraints it belongs to (see `Function.add_constraints_from_two_lists_of_points`).
+        _class_constraint_key (tuple): None, or a tuple (function, constraint_name, index) locating this
+                                       class interpolation constraint in the tables of class constraints of a
+                                       :class:`Function`, from which its default name is derived.
         expression (Expression): The :class:`Expression` that is compared to 0.
         equality_or_inequality (str): "equality" or "inequality". Encodes the type of constraint.
         _value (float): numerical value of `self.expression` obtained after solving the PEP via SDP solver.
@@ -27,9 +35,9 @@ class Constraint(object):
         >>> equality = expr1 == expr2
 
     """
-    # Class counter.
+    # Class counter, stored in the active Registry.
     # It counts the number of generated constraints
-    counter = 0
+    _registered_attributes = {"counter": int}
 
     def __init__(self,
                  expression,
@@ -57,7 +65,8 @@ class Constraint(object):
 
         """
         # Initialize name of the constraint
-        self.name = None
+        self._name = None
+        self._class_constraint_key = None
 
         # Update the counter
         self.counter = Constraint.counter
@@ -76,6 +85,21 @@ class Constraint(object):
         # Moreover, the associated dual variable value must be stored in self._dual_variable_value.
         self._dual_variable_value = None
 
+    @property
+    def name(self):
+        """
+        Returns (str): the name set through the method `set_name`, or, for a class interpolation constraint,
+                       the name derived from the table of class constraints it belongs to. None otherwise.
+        """
+        if self._name is None and self._class_constraint_key is not None:
+            function, constraint_name, index = self._class_constraint_key
+            return function.get_class_constraint_name(constraint_name, index)
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+
     def set_name(self, name):
         """
         Assign a name to self for easier identification purpose.
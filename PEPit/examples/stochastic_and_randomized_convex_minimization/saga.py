@@ -1,6 +1,6 @@
 import numpy as np
 
-from PEPit import PEP
+from PEPit import PEP, Point, Expression
 from PEPit.functions import ConvexFunction
 from PEPit.functions import SmoothStronglyConvexFunction
 from PEPit.primitive_steps import proximal_step
@@ -135,34 +135,27 @@ def wc_saga(L, mu, n, wrapper="cvxpy", solver=None, verbose=1):
     g, f = [x0 for _ in range(n)], [x0 for _ in range(n)]
     g0, f0 = [x0 for _ in range(n)], [x0 for _ in range(n)]
     gs, fs = [x0 for _ in range(n)], [x0 for _ in range(n)]
-    init_lyapunov = c * (xs - x0) ** 2
-
     for i in range(n):
         g[i], f[i] = fn[i].oracle(phi[i])
         gs[i], fs[i] = fn[i].oracle(xs)
-        init_lyapunov = init_lyapunov + 1 / n * (f[i] - fs[i] - gs[i] * (phi[i] - xs))
+    init_lyapunov = c * (xs - x0) ** 2 + Expression.sum(1 / n * (f[i] - fs[i] - gs[i] * (phi[i] - xs))
+                                                        for i in range(n))
 
     # Set the initial constraint as the Lyapunov bounded by 1
     problem.set_initial_condition(init_lyapunov <= 1)
 
     # Compute the expected value of the Lyapunov function after one iteration
     # (so: expectation over n possible scenarios: one for each element fi in the function).
-    final_lyapunov_avg = (xs - xs) ** 2
+    list_of_final_lyapunov = list()
     for i in range(n):
         g0[i], f0[i] = fn[i].oracle(x0)
-        w = x0 - gamma * (g0[i] - g[i])
-        for j in range(n):
-            w = w - gamma / n * g[j]
+        w = x0 - gamma * (g0[i] - g[i]) - gamma / n * Point.sum(g)
         x1, _, _ = proximal_step(w, h, gamma)
-        final_lyapunov = c * (x1 - xs) ** 2
-        for j in range(n):
-            if i != j:
-                gi, fi = g[j], f[j]
-                final_lyapunov = final_lyapunov + 1 / n * (fi - fs[j] - gs[j] * (phi[j] - xs))
-            else:
-                gi, fi = g0[i], f0[i]
-                final_lyapunov = final_lyapunov + 1 / n * (fi - fs[j] - gs[j] * (x0 - xs))
-        final_lyapunov_avg = final_lyapunov_avg + final_lyapunov / n
+        final_lyapunov = c * (x1 - xs) ** 2 + Expression.sum(1 / n * (f[j] - fs[j] - gs[j] * (phi[j] - xs)) if j != i
+                                                             else 1 / n * (f0[j] - fs[j] - gs[j] * (x0 - xs))
+                                                             for j in range(n))
+        list_of_final_lyapunov.append(final_lyapunov)
+    final_lyapunov_avg = Expression.sum(final_lyapunov / n for final_lyapunov in list_of_final_lyapunov)
 
     # Set the performance metric to the distance average to optimal point
     problem.set_performance_metric(final_lyapunov_avg)
@@ -2,11 +2,13 @@ import warnings
 import numpy as np
 
 from PEPit.constraint import Constraint
+from PEPit.registry import RegisteredClass
 
-from PEPit.tools.dict_operations import merge_dict, prune_dict
+from PEPit.tools.dict_operations import merge_dict, add_dict_in_place, prune_dict
+from PEPit.tools.coefficient_operations import add_coefficients, coalesce_symmetric_coefficients
 
 
-class Expression(object):
+class Expression(object, metaclass=RegisteredClass):
     """
     An :class:`Expression` is a linear combination of
     functions values,
@@ -25,6 +27,12 @@ class Expression(object):
                                    Keys are :class:`Expression` objects or tuple of 2 :class:`Point` objects.
                                    And values are their associated coefficients.
         counter (int): counts the number of **leaf** :class:`Expression` objects.
+        _sparse_matrices (tuple): sparse representation of self in terms of the Gram matrix and function values,
+                                  computed and cached by
+                                  :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`.
+                                  Set to None until it is required.
+                                  In compact mode, it stores the decomposition of the non-leaf
+                                  :class:`Expression` objects, and `decomposition_dict` is only computed if required.
 
     :class:`Expression` objects can be added or subtracted together.
     They can also be added, subtracted, multiplied and divided by a scalar value.
@@ -34,6 +42,13 @@ class Expression(object):
         >>> expr2 = Expression()
         >>> new_expr = (- expr1 + expr2 - 1) / 5
 
+    Long sums can be computed in one pass with :meth:`Expression.sum`,
+    without copying the decomposition dict at each step as a chain of `+` (or `+=`) does.
+
+    Example:
+        >>> expressions = [Expression() for _ in range(10)]
+        >>> sum_of_expressions = Expression.sum(expressions)
+
     :class:`Expression` objects can also be compared together
 
     Example:
@@ -45,11 +60,29 @@ class Expression(object):
 
     The three outputs `inequality1`, `inequality2` and `equality` are then :class:`Constraint` objects.
 
+    In hash-consing mode (see the class attribute `hash_consing`),
+    :class:`Expression` objects resulting from the same linear combination are one and the same object.
+
+    In compact mode (see the class attribute `compact`), linear combinations are stored as numpy arrays
+    of weights of the function values and of the Gram matrix (see `_sparse_matrices`).
+
     """
-    # Class counter.
-    # It counts the number of function values needed to linearly generate the expressions.
-    counter = 0
-    list_of_leaf_expressions = list()
+
+    # Instances store the following attributes in slots.
+    # Other attributes (e.g. set by the user) are stored in a dict, only created if required.
+    __slots__ = ("name", "_is_leaf", "_value", "_sparse_matrices", "counter", "_decomposition_dict", "__dict__")
+    # Class attributes stored in the active Registry, with their initial values.
+    # The counter counts the number of function values needed to linearly generate the expressions.
+    # In hash-consing mode, a non-leaf Expression is identified by its pruned decomposition dict
+    # (rounded to hash_consing_decimals decimals, and with symmetrized inner products),
+    # and linear combinations that already exist are not instantiated twice.
+    _registered_attributes = {"counter": int,
+                              "list_of_leaf_expressions": list,
+                              "hash_consing": bool,
+                              "_dict_of_hash_consed_expressions": dict,
+                              "compact": bool,
+                              }
+    hash_consing_decimals = 12
 
     def __init__(self,
                  is_leaf=True,
@@ -90,6 +123,9 @@ class Expression(object):
         # Initialize the value attribute to None until the PEP is solved
         self._value = None
 
+        # Initialize the cached sparse representation to None until it is required
+        self._sparse_matrices = None
+
         # If leaf function value, the decomposition is updated,
         # the object counter is set
         # and the class counter updated.
@@ -105,6 +141,287 @@ class Expression(object):
             self.decomposition_dict = decomposition_dict
             self.counter = None
 
+    @staticmethod
+    def _from_decomposition_dict(decomposition_dict):
+        """
+        Create a non-leaf :class:`Expression` from its decomposition dict.
+
+        In hash-consing mode, the decomposition dict is pruned,
+        and the :class:`Expression` that already encodes the same linear combination (up to rounding), if any,
+        is returned instead of a new one.
+
+        Args:
+            decomposition_dict (dict): decomposition of the :class:`Expression` as a linear combination of
+                                       **leaf** :class:`Expression` objects, inner products of leaf
+                                       :class:`Point` objects and constants.
+
+        Returns:
+            (Expression): an :class:`Expression` encoding the linear combination `decomposition_dict`.
+
+        Raises:
+            TypeError: if `decomposition_dict` contains other keys than function values, inner products and
+                       constants.
+
+        """
+
+        # Without hash-consing, simply create a new Expression
+        if not Expression.hash_consing:
+            return Expression(is_leaf=False, decomposition_dict=decomposition_dict)
+
+        # Compute the key of the linear combination, using leaf counters and symmetrized inner products
+        decomposition_dict = prune_dict(decomposition_dict)
+        key = dict()
+        for element, weight in decomposition_dict.items():
+            if type(element) == Expression:
+                element_key = ("F", element.counter)
+            elif type(element) == tuple:
+                element_key = ("G",) + tuple(sorted((element[0].counter, element[1].counter)))
+            elif element == 1:
+                element_key = 1
+            else:
+                raise TypeError("Expressions are made of function values, inner products and constants only!"
+                                "Got {}".format(type(element)))
+            key[element_key] = key.get(element_key, 0) + weight
+        key = prune_dict({element_key: round(weight, Expression.hash_consing_decimals)
+                          for element_key, weight in key.items()})
+
+        # A linear combination reduced to one leaf Expression with weight 1 is this leaf Expression
+        if len(key) == 1 and list(key.values())[0] == 1 and list(key.keys())[0] != 1 \
+                and list(key.keys())[0][0] == "F":
+            counter = list(key.keys())[0][1]
+            return [expression for expression in decomposition_dict.keys()
+                    if type(expression) == Expression and expression.counter == counter][0]
+
+        # Otherwise, look for an existing Expression before creating a new one
+        key = frozenset(key.items())
+        if key not in Expression._dict_of_hash_consed_expressions:
+            Expression._dict_of_hash_consed_expressions[key] = Expression(is_leaf=False,
+                                                                          decomposition_dict=decomposition_dict)
+
+        return Expression._dict_of_hash_consed_expressions[key]
+
+    @staticmethod
+    def sum(expressions):
+        """
+        Sum :class:`Expression` objects and / or scalar values in one pass, leading to a new :class:`Expression`.
+
+        The decomposition dicts of all the :class:`Expression` objects are accumulated in a single dict,
+        instead of being copied at each addition.
+
+        Args:
+            expressions (iterable): any iterable of :class:`Expression` objects and / or scalar constants.
+
+        Returns:
+            (Expression): the sum of the elements of `expressions`, null if `expressions` is empty.
+
+        Raises:
+            TypeError: if some element of `expressions` is neither an :class:`Expression` nor a scalar value.
+
+        """
+
+        # In compact mode, add the sparse representations of all the expressions at once
+        if Expression.compact:
+            list_of_sparse_matrices = [Expression._get_sparse_matrices_of_summand(expression)
+                                       for expression in expressions]
+            if not list_of_sparse_matrices:
+                list_of_sparse_matrices = [Expression._get_sparse_matrices_of_summand(0)]
+            return Expression._from_sparse_matrices(Expression._add_sparse_matrices(list_of_sparse_matrices))
+
+        # Accumulate the decomposition dicts of all the expressions in place
+        decomposition_dict = dict()
+        for expression in expressions:
+            add_dict_in_place(decomposition_dict, Expression._get_decomposition_dict_of_summand(expression))
+
+        # Create and return the sum
+        return Expression._from_decomposition_dict(decomposition_dict)
+
+    @staticmethod
+    def _get_decomposition_dict_of_summand(other):
+        """
+        Return the decomposition dict of an :class:`Expression` or a scalar value to be added to an :class:`Expression`.
+
+        Args:
+            other (Expression or int or float): any :class:`Expression` object or scalar constant.
+
+        Returns:
+            (dict): the decomposition dict of `other`.
+
+        Raises:
+            TypeError: if provided `other` is neither an :class:`Expression` nor a scalar value.
+
+        """
+
+        # If other is an Expression, return its decomposition_dict
+        if isinstance(other, Expression):
+            return other.decomposition_dict
+        # If other is a scalar constant, it is a constant term
+        elif isinstance(other, int) or isinstance(other, float):
+            return {1: other}
+        # Raise an Exception in any other scenario
+        else:
+            raise TypeError("Expression can be added only to other expression or scalar values!"
+                            "Got {}".format(type(other)))
+
+    @property
+    def decomposition_dict(self):
+        """
+        Returns:
+            self._decomposition_dict (dict): decomposition of self as a linear combination of leaf
+                                             :class:`Expression` objects, inner products of leaf :class:`Point`
+                                             objects and constants, computed from its sparse representation if needed.
+        """
+        if self._decomposition_dict is None:
+            # Imported here to avoid a circular import
+            from PEPit.point import Point
+
+            Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = self._sparse_matrices
+            decomposition_dict = {Expression.list_of_leaf_expressions[index]: value
+                                  for index, value in zip(Fweights_ind.tolist(), Fweights_val.tolist())}
+            # Off-diagonal weights are shared by both symmetric inner products
+            for i, j, value in zip(Gweights_indi.tolist(), Gweights_indj.tolist(), Gweights_val.tolist()):
+                point1, point2 = Point.list_of_leaf_points[i], Point.list_of_leaf_points[j]
+                decomposition_dict[(point1, point2)] = value
+                if i != j:
+                    decomposition_dict[(point2, point1)] = value
+            if cons_val != 0:
+                decomposition_dict[1] = cons_val
+            self._decomposition_dict = decomposition_dict
+        return self._decomposition_dict
+
+    @decomposition_dict.setter
+    def decomposition_dict(self, decomposition_dict):
+        self._decomposition_dict = decomposition_dict
+        self._sparse_matrices = None
+
+    @staticmethod
+    def _get_sparse_matrices_of_summand(other):
+        """
+        Return the sparse representation of an :class:`Expression` or a scalar value to be added to an
+        :class:`Expression`, in compact mode.
+
+        Args:
+            other (Expression or int or float): any :class:`Expression` object or scalar constant.
+
+        Returns:
+            (tuple): the sparse representation of `other`
+                     (see :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`).
+
+        Raises:
+            TypeError: if provided `other` is neither an :class:`Expression` nor a scalar value.
+
+        """
+
+        # If other is an Expression, return its sparse representation, computed if needed
+        if isinstance(other, Expression):
+            if other._sparse_matrices is None:
+                # Imported here to avoid a circular import
+                from PEPit.tools.expressions_to_matrices import expression_to_sparse_matrices
+                expression_to_sparse_matrices(other)
+            return other._sparse_matrices
+        # If other is a scalar constant, it is a constant term
+        elif isinstance(other, int) or isinstance(other, float):
+            return (np.zeros((0,), dtype=int), np.zeros((0,), dtype=int), np.zeros((0,)),
+                    np.zeros((0,), dtype=int), np.zeros((0,)), other)
+        # Raise an Exception in any other scenario
+        else:
+            raise TypeError("Expression can be added only to other expression or scalar values!"
+                            "Got {}".format(type(other)))
+
+    @staticmethod
+    def _add_sparse_matrices(list_of_sparse_matrices):
+        """
+        Sum sparse representations of :class:`Expression` objects.
+
+        Args:
+            list_of_sparse_matrices (list): a list of sparse representations of :class:`Expression` objects
+                                            (see :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`).
+
+        Returns:
+            (tuple): the sparse representation of the sum of the :class:`Expression` objects.
+
+        """
+
+        # Stack the weights of all the expressions
+        Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = zip(*list_of_sparse_matrices)
+        cons_val = sum(cons_val)
+
+        # Sum the weights of the Gram matrix, unless there is only one non-empty set of weights to sum
+        non_empty = [k for k, val in enumerate(Gweights_val) if val.size > 0]
+        if len(non_empty) <= 1:
+            k = non_empty[0] if non_empty else 0
+            Gweights = (Gweights_indi[k], Gweights_indj[k], Gweights_val[k])
+        else:
+            Gweights = coalesce_symmetric_coefficients(np.concatenate(Gweights_indi), np.concatenate(Gweights_indj),
+                                                       np.concatenate(Gweights_val))
+
+        # Same for the weights of the function values
+        non_empty = [k for k, val in enumerate(Fweights_val) if val.size > 0]
+        if len(non_empty) <= 1:
+            k = non_empty[0] if non_empty else 0
+            Fweights = (Fweights_ind[k], Fweights_val[k])
+        else:
+            Fweights_ind = np.concatenate(Fweights_ind)
+            Fweights = add_coefficients(Fweights_ind, np.concatenate(Fweights_val), Fweights_ind[:0],
+                                        np.zeros((0,)))
+
+        return Gweights + Fweights + (cons_val,)
+
+    @staticmethod
+    def _from_sparse_matrices(sparse_matrices):
+        """
+        Create a non-leaf :class:`Expression` from its sparse representation, in compact mode.
+
+        In hash-consing mode, the :class:`Expression` that already encodes the same linear combination
+        (up to rounding), if any, is returned instead of a new one.
+
+        Args:
+            sparse_matrices (tuple): the sparse representation of the :class:`Expression`
+                                     (see :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`).
+
+        Returns:
+            (Expression): an :class:`Expression` encoding the linear combination `sparse_matrices`.
+
+        """
+
+        # Hash-consing works as in Expression._from_decomposition_dict,
+        # where the weight of an inner product sums the weights of both symmetric entries
+        if Expression.hash_consing:
+            Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = sparse_matrices
+            key = {("F", index): value for index, value in zip(Fweights_ind.tolist(), Fweights_val.tolist())}
+            for i, j, value in zip(Gweights_indi.tolist(), Gweights_indj.tolist(), Gweights_val.tolist()):
+                key[("G", j, i)] = value if i == j else 2 * value
+            key[1] = cons_val
+            key = prune_dict({element_key: round(weight, Expression.hash_consing_decimals)
+                              for element_key, weight in key.items()})
+            if len(key) == 1 and list(key.values())[0] == 1 and list(key.keys())[0] != 1 \
+                    and list(key.keys())[0][0] == "F":
+                return Expression.list_of_leaf_expressions[list(key.keys())[0][1]]
+            key = frozenset(key.items())
+            if key not in Expression._dict_of_hash_consed_expressions:
+                Expression._dict_of_hash_consed_expressions[key] = \
+                    Expression._from_sparse_matrices_without_hash_consing(sparse_matrices)
+            return Expression._dict_of_hash_consed_expressions[key]
+
+        return Expression._from_sparse_matrices_without_hash_consing(sparse_matrices)
+
+    @staticmethod
+    def _from_sparse_matrices_without_hash_consing(sparse_matrices):
+        """
+        Create a new non-leaf :class:`Expression` from its sparse representation.
+
+        Args:
+            sparse_matrices (tuple): the sparse representation of the :class:`Expression`
+                                     (see :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`).
+
+        Returns:
+            (Expression): a new :class:`Expression` encoding the linear combination `sparse_matrices`.
+
+        """
+        expression = Expression(is_leaf=False, decomposition_dict=dict())
+        expression._decomposition_dict = None
+        expression._sparse_matrices = sparse_matrices
+        return expression
+
     def set_name(self, name):
         """
         Assign a name to self for easier identification purpose.
@@ -147,22 +464,20 @@ class Expression(object):
 
         """
 
-        # If other is an Expression, merge the decomposition_dicts
-        if isinstance(other, Expression):
-            merged_decomposition_dict = merge_dict(self.decomposition_dict, other.decomposition_dict)
-        # If other is a scalar constant, add it to the decomposition_dict of self
-        elif isinstance(other, int) or isinstance(other, float):
-            merged_decomposition_dict = merge_dict(self.decomposition_dict, {1: other})
-        # Raise an Exception in any other scenario
-        else:
-            raise TypeError("Expression can be added only to other expression or scalar values!"
-                            "Got {}".format(type(other)))
+        # In compact mode, add the sparse representations
+        if Expression.compact:
+            return Expression._from_sparse_matrices(Expression._add_sparse_matrices(
+                [Expression._get_sparse_matrices_of_summand(self), Expression._get_sparse_matrices_of_summand(other)]))
+
+        # Merge the decomposition_dict of self with the one of other
+        merged_decomposition_dict = merge_dict(self.decomposition_dict,
+                                               Expression._get_decomposition_dict_of_summand(other))
 
         # Remove leaf with null coefficients
         merged_decomposition_dict = prune_dict(merged_decomposition_dict)
 
         # Create and return the newly created Expression
-        return Expression(is_leaf=False, decomposition_dict=merged_decomposition_dict)
+        return Expression._from_decomposition_dict(merged_decomposition_dict)
 
     def __radd__(self, other):
         """
@@ -251,13 +566,22 @@ class Expression(object):
         # Verify other is a scalar constant
         assert isinstance(other, int) or isinstance(other, float)
 
+        # In compact mode, multiply uniformly the weights of the sparse representation by other
+        if Expression.compact:
+            Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = \
+                Expression._get_sparse_matrices_of_summand(self)
+            if other == 0:
+                return Expression._from_sparse_matrices(Expression._get_sparse_matrices_of_summand(0))
+            return Expression._from_sparse_matrices((Gweights_indi, Gweights_indj, Gweights_val * other,
+                                                     Fweights_ind, Fweights_val * other, cons_val * other))
+
         # Multiply uniformly self's decomposition_dict by other
         new_decomposition_dict = dict()
         for key, value in self.decomposition_dict.items():
             new_decomposition_dict[key] = value * other
 
         # Create and return the newly created Expression
-        return Expression(is_leaf=False, decomposition_dict=new_decomposition_dict)
+        return Expression._from_decomposition_dict(new_decomposition_dict)
 
     def __mul__(self, other):
         """
@@ -405,6 +729,25 @@ class Expression(object):
             # If leaf function value, the PEP would have filled the attribute after solving the problem.
             if self._is_leaf:
                 raise ValueError("The PEP must be solved to evaluate Expressions!")
+            # In compact mode, combine the values of the leaf expressions and of the inner products of the leaf
+            # points from the sparse representation.
+            elif Expression.compact:
+                # Imported here to avoid a circular import
+                from PEPit.point import Point
+
+                Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = \
+                    Expression._get_sparse_matrices_of_summand(self)
+                value = cons_val
+                if Fweights_ind.size > 0:
+                    value += Fweights_val @ np.array([Expression.list_of_leaf_expressions[index].eval()
+                                                      for index in Fweights_ind.tolist()])
+                if Gweights_indi.size > 0:
+                    inner_products = np.array([np.dot(Point.list_of_leaf_points[i].eval(),
+                                                      Point.list_of_leaf_points[j].eval())
+                                               for i, j in zip(Gweights_indi.tolist(), Gweights_indj.tolist())])
+                    # Off-diagonal weights are shared by both symmetric inner products
+                    value += np.where(Gweights_indi == Gweights_indj, Gweights_val, 2 * Gweights_val) @ inner_products
+                self._value = value
             # If linear combination,
             # combine the values of the leaf expressions,
             # and store the result before returning it.
@@ -5,11 +5,13 @@ from PEPit.point import Point
 from PEPit.expression import Expression
 from PEPit.constraint import Constraint
 from PEPit.psd_matrix import PSDMatrix
+from PEPit.registry import RegisteredClass
 
 from PEPit.tools.dict_operations import merge_dict, prune_dict
+from PEPit.tools.interpolation_kernels import get_batched_class_constraints
 
 
-class Function(object):
+class Function(object, metaclass=RegisteredClass):
     """
     A :class:`Function` object encodes a function or an operator.
 
@@ -34,13 +36,37 @@ class Function(object):
                                as well as the associated subgradients and function values.
         list_of_stationary_points (list): The sublist of `self.list_of_points` of
                                           stationary points (characterized by some subgradient=0).
+        _dict_of_points (dict): An index of `self.list_of_points` by identity.
+                                Keys are the evaluated :class:`Point` objects
+                                and values are the associated gradients and function values.
+        _dict_of_points_by_key (dict): An index of `self.list_of_points` by decomposition.
+                                       Keys are computed by the method `_get_point_key` from the decomposition dicts
+                                       of the evaluated :class:`Point` objects
+                                       and values are the first associated triplets.
+        _nb_indexed_points (int): The number of elements of `self.list_of_points` stored in the indexes.
         list_of_constraints (list): The list of :class:`Constraint` objects associated with this :class:`Function`.
         list_of_psd (list): The list of :class:`PSDMatrix` objects associated with this :class:`Function`.
         list_of_class_constraints (list): The list of class interpolation :class:`Constraint` objects.
         list_of_class_psd (list): The list of :class:`PSDMatrix` objects associated with a class
                                   interpolation constraints.
-        tables_of_constraints (dict): A dictionary containing all the constraints, sorted by table.
+        tables_of_constraints (dict): A dictionary containing all the class constraints, sorted by table.
+                                      It is built on demand from `_tables_of_class_constraints`.
+        _tables_of_class_constraints (dict): The compact description of the tables of class constraints.
+                                             Keys are the generic constraint names and values are tuples
+                                             (list_of_points_1, list_of_points_2, rows, columns, positions),
+                                             where the k-th constraint of the table lies at row `rows[k]`
+                                             and column `columns[k]`, and is the element `positions[k]`
+                                             of `list_of_class_constraints`.
+                                             `list_of_points_1` is None for the tables of one-point constraints.
+        _set_of_deferrable_class_constraints (set): The class interpolation inequalities that may be left out of
+                                                    the first working set of a constraint generation
+                                                    (see `PEP.solve`), namely the ones between two points
+                                                    that are neither consecutive nor stationary.
         counter (int): counts the number of **leaf** :class:`Function` objects.
+        batched_class_constraints (bool): class attribute, set by the :class:`PEP`.
+                                          If True, the class constraints given by an interpolation kernel
+                                          are created all at once by vectorized operations
+                                          (see `add_constraints_from_two_lists_of_points`).
 
     Note:
         PEPit was initially tough for evaluating performances of optimization algorithms.
@@ -56,11 +82,13 @@ class Function(object):
         >>> new_func = (- func1 + func2) / 5
 
     """
-    # Class counter.
-    # It counts the number of functions defined from scratch.
+    # Class attributes stored in the active Registry, with their initial values.
+    # The counter counts the number of functions defined from scratch.
     # The others are linear combination of those functions.
-    counter = 0
-    list_of_functions = list()
+    _registered_attributes = {"counter": int,
+                              "list_of_functions": list,
+                              "batched_class_constraints": bool,
+                              }
 
     def __init__(self,
                  is_leaf=True,
@@ -125,12 +153,19 @@ class Function(object):
         self.list_of_stationary_points = list()
         self.list_of_points = list()
         self.list_of_constraints = list()
+
+        # Initialize the index of the list of points,
+        # that allows checking in constant time whether this function is already evaluated on a point.
+        self._dict_of_points = dict()
+        self._dict_of_points_by_key = dict()
+        self._nb_indexed_points = 0
         self.list_of_psd = list()
         self.list_of_class_constraints = list()
         self.list_of_class_psd = list()
+        self._set_of_deferrable_class_constraints = set()
 
-        # Initialize dictionary that will contain the tables of constraints
-        self.tables_of_constraints = dict()
+        # Initialize dictionary that will contain the tables of constraints, as index arrays
+        self._tables_of_class_constraints = dict()
 
     def set_name(self, name):
         """
@@ -321,7 +356,8 @@ class Function(object):
         self.list_of_psd.append(matrix)
 
     def add_constraints_from_one_list_of_points(self, list_of_points,
-                                                constraint_name, set_class_constraint_i):
+                                                constraint_name, set_class_constraint_i,
+                                                kernel=None):
         """
         Add a class constraint of one input on all the points of `list_of_points`.
         Creates a table corresponding to this set of constraints.
@@ -330,51 +366,29 @@ class Function(object):
             list_of_points (list): the list of points the constraint apply on.
             constraint_name (str): generic name for this constraint.
             set_class_constraint_i (Callable): a function that takes a point in input and returns a :class:`Constraint`.
+            kernel (InterpolationKernel, optional): the same constraint, described by its weights on (xi, gi)
+                                                    and fi (see `add_constraints_from_two_lists_of_points`).
 
         """
 
-        # Set function ID
-        function_id = self.get_name()
-        if function_id is None:
-            function_id = "Function_{}".format(self.counter)
-
-        # Initialize table of constraints
-        table_of_constraints = list()
-
         # Browse list of points and create interpolation constraints
-        for i, point_i in enumerate(list_of_points):
-
-            xi, gi, fi = point_i
-            xi_id = xi.get_name()
-            if xi_id is None:
-                xi_id = "Point_{}".format(i)
-
-            # Create interpolation constraint
-            constraint = set_class_constraint_i(xi, gi, fi)
-
-            # Set name to newly created constraint
-            constraint.set_name("IC_{}_{}({})".format(function_id, constraint_name, xi_id))
-
-            # Add constraint to the table of constraints
-            table_of_constraints.append(constraint)
-
-            # Add constraint to the list of class constraints
-            self.list_of_class_constraints.append(constraint)
-
-        # Complete table of constraints
-        table_of_constraints = np.array(table_of_constraints).reshape(1, -1)
-        point_names = [point[0].name or "Point_{}".format(point_index) for point_index, point in
-                       enumerate(list_of_points)]
-        if table_of_constraints.shape != (0,):
-            df = pd.DataFrame(table_of_constraints, columns=point_names)
-            df.columns.name = "IC_{}".format(function_id)
+        first_position = len(self.list_of_class_constraints)
+        nb_points = len(list_of_points)
+        if kernel is not None and Function.batched_class_constraints:
+            self.list_of_class_constraints += get_batched_class_constraints(kernel, list_of_points, list_of_points,
+                                                                            np.arange(nb_points), np.arange(nb_points))
+        else:
+            for xi, gi, fi in list_of_points:
+                self.list_of_class_constraints.append(set_class_constraint_i(xi, gi, fi))
 
-            # Add the table of constraints to the attribute tables_of_constraints
-            self.tables_of_constraints[constraint_name] = df
+        # Describe the table of constraints, made of a single row
+        self.add_table_of_class_constraints(constraint_name, None, list_of_points,
+                                            np.zeros(nb_points, dtype=int), np.arange(nb_points),
+                                            np.arange(first_position, first_position + nb_points))
 
     def add_constraints_from_two_lists_of_points(self, list_of_points_1, list_of_points_2,
                                                  constraint_name, set_class_constraint_i_j,
-                                                 symmetry=False):
+                                                 symmetry=False, kernel=None):
         """
         Add a class constraint of two inputs on all the couple of points of
         `list_of_points_1` :math:`\\times` `list_of_points_2`.
@@ -389,68 +403,173 @@ class Function(object):
             symmetry (bool, optional): A boolean specifying if the constraint function is symmetric or not.
                                        If so, the number of constraints is divided by 2.
                                        Set to False by default.
+            kernel (InterpolationKernel, optional): the same constraint, described by its weights on the inner products
+                                                    of (xi, gi, xj, gj) and on (fi, fj)
+                                                    (see :mod:`PEPit.tools.interpolation_kernels`).
+                                                    If provided and `Function.batched_class_constraints` is True,
+                                                    all the constraints are computed at once from the stacked
+                                                    coefficients of the points, instead of one by one
+                                                    by `set_class_constraint_i_j`.
+
+        """
+
+        # List the couples of points to be constrained, row by row
+        rows, columns = np.divmod(np.arange(len(list_of_points_1) * len(list_of_points_2)), len(list_of_points_2)) \
+            if list_of_points_2 else (np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+        mask = rows < columns if symmetry else rows != columns
+        rows, columns = rows[mask], columns[mask]
+
+        # Identify the stationary points, whose interpolation constraints are never deferred
+        stationary_points = {id(point[0]) for point in self.list_of_stationary_points}
+
+        # Create the interpolation constraints all at once if possible
+        list_of_constraints = None
+        if kernel is not None and Function.batched_class_constraints:
+            list_of_constraints = get_batched_class_constraints(kernel, list_of_points_1, list_of_points_2,
+                                                                rows, columns)
+
+        # Browse the couples of points and create interpolation constraints
+        first_position = len(self.list_of_class_constraints)
+        for position, (i, j) in enumerate(zip(rows.tolist(), columns.tolist())):
+
+            xi, gi, fi = list_of_points_1[i]
+            xj, gj, fj = list_of_points_2[j]
+
+            # Create interpolation constraint
+            if list_of_constraints is None:
+                constraint = set_class_constraint_i_j(xi, gi, fi,
+                                                      xj, gj, fj,
+                                                      )
+            else:
+                constraint = list_of_constraints[position]
+
+            # Add constraint to the list of class constraints
+            self.list_of_class_constraints.append(constraint)
+
+            # Only the constraints between consecutive or stationary points are needed from the start
+            if abs(i - j) > 1 and id(xi) not in stationary_points and id(xj) not in stationary_points \
+                    and constraint.equality_or_inequality == "inequality":
+                self._set_of_deferrable_class_constraints.add(constraint)
 
+        # Describe the table of constraints
+        if list_of_points_1:
+            self.add_table_of_class_constraints(constraint_name, list_of_points_1, list_of_points_2, rows, columns,
+                                                np.arange(first_position, first_position + len(rows)))
+
+    def add_table_of_class_constraints(self, constraint_name, list_of_points_1, list_of_points_2,
+                                       rows, columns, positions):
+        """
+        Describe a table of class constraints by index arrays.
+        The names of the constraints, as well as the tables of constraints and of dual values,
+        are only derived from this description when they are requested.
+
+        Args:
+            constraint_name (str): generic name for the constraints of the table.
+            list_of_points_1 (list): the points indexing the rows of the table.
+                                     None for a table of one-point constraints, made of a single row.
+            list_of_points_2 (list): the points indexing the columns of the table.
+            rows (ndarray): the row of each constraint of the table.
+            columns (ndarray): the column of each constraint of the table.
+            positions (ndarray): the position of each constraint of the table in `list_of_class_constraints`.
+
+        """
+        self._tables_of_class_constraints[constraint_name] = (None if list_of_points_1 is None
+                                                              else list(list_of_points_1),
+                                                              list(list_of_points_2),
+                                                              np.asarray(rows, dtype=int),
+                                                              np.asarray(columns, dtype=int),
+                                                              np.asarray(positions, dtype=int))
+        for index, position in enumerate(positions):
+            self.list_of_class_constraints[position]._class_constraint_key = (self, constraint_name, index)
+
+    def _get_function_id(self):
         """
+        Returns:
+            (str): the name of self, or a default name derived from its counter.
 
-        # Set function ID
+        """
         function_id = self.get_name()
         if function_id is None:
             function_id = "Function_{}".format(self.counter)
+        return function_id
 
-        # Initialize table of constraints
-        table_of_constraints = list()
+    @staticmethod
+    def _get_point_ids(list_of_points):
+        """
+        Args:
+            list_of_points (list): a list of triplets (point, gradient, function value).
 
-        # Browse list of points and create interpolation constraints
-        for i, point_i in enumerate(list_of_points_1):
+        Returns:
+            (list): the names of the points, or default names derived from their positions in the list.
 
-            xi, gi, fi = point_i
-            xi_id = xi.get_name()
-            if xi_id is None:
-                xi_id = "Point_{}".format(i)
+        """
+        return [point[0].get_name() or "Point_{}".format(point_index)
+                for point_index, point in enumerate(list_of_points)]
 
-            # Initialize row of constraints
-            row_of_constraints = list()
+    def get_class_constraint_name(self, constraint_name, index):
+        """
+        Derive the name of a class constraint from the table it belongs to.
 
-            for j, point_j in enumerate(list_of_points_2):
+        Args:
+            constraint_name (str): generic name for the constraints of the table.
+            index (int): the index of the constraint in the table (see `add_table_of_class_constraints`).
 
-                xj, gj, fj = point_j
-                xj_id = xj.get_name()
-                if xj_id is None:
-                    xj_id = "Point_{}".format(j)
+        Returns:
+            (str): the name of the constraint.
 
-                if i == j or (i > j and symmetry):
-                    row_of_constraints.append(0)
+        """
+        list_of_points_1, list_of_points_2, rows, columns, _ = self._tables_of_class_constraints[constraint_name]
+        j = columns[index]
+        xj_id = list_of_points_2[j][0].get_name() or "Point_{}".format(j)
+        if list_of_points_1 is None:
+            return "IC_{}_{}({})".format(self._get_function_id(), constraint_name, xj_id)
 
-                else:
-                    # Create interpolation constraint
-                    constraint = set_class_constraint_i_j(xi, gi, fi,
-                                                          xj, gj, fj,
-                                                          )
+        i = rows[index]
+        xi_id = list_of_points_1[i][0].get_name() or "Point_{}".format(i)
+        return "IC_{}_{}({}, {})".format(self._get_function_id(), constraint_name, xi_id, xj_id)
 
-                    # Set name to newly created constraint
-                    constraint.set_name("IC_{}_{}({}, {})".format(function_id, constraint_name, xi_id, xj_id))
+    def _get_table(self, constraint_name, values):
+        """
+        Build a table of class constraints, filled with given values.
+
+        Args:
+            constraint_name (str): generic name for the constraints of the table.
+            values (ndarray): one value per constraint of the table. The other entries are set to 0.
+
+        Returns:
+            pandas.DataFrame: the table, whose rows and columns are named after the points.
+
+        """
+        list_of_points_1, list_of_points_2, rows, columns, _ = self._tables_of_class_constraints[constraint_name]
+        nb_rows = 1 if list_of_points_1 is None else len(list_of_points_1)
+        table = np.zeros((nb_rows, len(list_of_points_2)), dtype=values.dtype)
+        table[rows, columns] = values
+
+        df = pd.DataFrame(table, columns=self._get_point_ids(list_of_points_2),
+                          index=None if list_of_points_1 is None else self._get_point_ids(list_of_points_1))
+        df.columns.name = "IC_{}".format(self._get_function_id())
+
+        return df
 
-                    # Add constraint to the row of constraints
-                    row_of_constraints.append(constraint)
+    @property
+    def tables_of_constraints(self):
+        """
+        Build the tables of class constraints.
 
-                    # Add constraint to the list of class constraints
-                    self.list_of_class_constraints.append(constraint)
+        Returns:
+             dict: a dictionary which keys are the names of the generic constraints provided to the methods
+                   `add_constraints_from_one_list_of_points` and `add_constraints_from_two_lists_of_points`,
+                   and the values are pandas.DataFrames containing the associated :class:`Constraint` objects.
 
-            # Add row of constraints to the table of constraints
-            table_of_constraints.append(row_of_constraints)
+        """
 
-        # Complete table of constraints
-        table_of_constraints = np.array(table_of_constraints)
-        point_names_1 = [point[0].name or "Point_{}".format(point_index) for point_index, point in
-                         enumerate(list_of_points_1)]
-        point_names_2 = [point[0].name or "Point_{}".format(point_index) for point_index, point in
-                         enumerate(list_of_points_2)]
-        if table_of_constraints.shape != (0,):
-            df = pd.DataFrame(table_of_constraints, columns=point_names_2, index=point_names_1)
-            df.columns.name = "IC_{}".format(function_id)
+        tables_of_constraints = dict()
+        for constraint_name, (_, _, _, _, positions) in self._tables_of_class_constraints.items():
+            constraints = np.empty(len(positions), dtype=object)
+            constraints[:] = [self.list_of_class_constraints[position] for position in positions]
+            tables_of_constraints[constraint_name] = self._get_table(constraint_name, constraints)
 
-            # Add the table of constraints to the attribute tables_of_constraints
-            self.tables_of_constraints[constraint_name] = df
+        return tables_of_constraints
 
     def get_class_constraints_duals(self):
         """
@@ -464,41 +583,12 @@ class Function(object):
 
         """
 
-        # Initialize the dictionary.
         tables_of_duals = dict()
+        for constraint_name, (_, _, _, _, positions) in self._tables_of_class_constraints.items():
+            dual_values = np.array([self.list_of_class_constraints[position].eval_dual() for position in positions],
+                                   dtype=float)
+            tables_of_duals[constraint_name] = self._get_table(constraint_name, dual_values)
 
-        # Browse the tables.
-        for key, table in self.tables_of_constraints.items():
-
-            # Create a table of dual values from the current table of constraints.
-            new_table = []
-
-            # Browse the table of constraints.
-            for index, row in table.iterrows():
-                new_row = []
-                for element in row:
-                    # If there is an actual constraint, return its dual value.
-                    if isinstance(element, Constraint):
-                        new_row.append(element.eval_dual())
-                    # If there is a scalar number, simply return it.
-                    elif isinstance(element, float) or isinstance(element, int):
-                        new_row.append(element)
-                    else:
-                        raise TypeError("The elements of table of constraints must either be Constraints objects"
-                                        " or scalar values. Got {}.".format(type(element)))
-                new_table.append(new_row)
-
-            # Transform the table into a pandas.DataFrame.
-            new_table = np.array(new_table)
-            df = pd.DataFrame(new_table, columns=table.columns, index=table.index)
-
-            # Add a name to the pandas.DataFrame.
-            df.columns.name = table.columns.name
-
-            # Store into the dict to be returned.
-            tables_of_duals[key] = df
-
-        # Return the dictionary of tables of dual values.
         return tables_of_duals
 
     def set_class_constraints(self):
@@ -508,6 +598,8 @@ class Function(object):
 
         """
         self.list_of_class_constraints = list()
+        self._set_of_deferrable_class_constraints = set()
+        self._tables_of_class_constraints = dict()
         self.add_class_constraints()
 
     def add_class_constraints(self):
@@ -526,6 +618,71 @@ class Function(object):
 
         raise NotImplementedError("This method must be overwritten in children classes")
 
+    @staticmethod
+    def _get_point_key(point):
+        """
+        Compute a hashable key from the decomposition of a :class:`Point`.
+        Two :class:`Point` objects share the same key if and only if they have the same decomposition.
+
+        Args:
+            point (Point): any point.
+
+        Returns:
+            frozenset or tuple: the key of `point`.
+
+        """
+
+        # In compact mode, use the bytes of the sorted sparse vector of coefficients (without null coefficients)
+        if Point.compact:
+            indices, values = point._get_coefficients()
+            return indices.tobytes(), values.tobytes()
+
+        return frozenset(point.decomposition_dict.items())
+
+    def _find_point(self, point):
+        """
+        Look for the triplet whose point has the same decomposition as `point` in the index by decomposition.
+
+        Args:
+            point (Point): any point.
+
+        Returns:
+            tuple or None: the tuple "gradient, function value" associated to this triplet, if any.
+                           None otherwise.
+
+        """
+
+        triplet = self._dict_of_points_by_key.get(self._get_point_key(point))
+        if triplet is None:
+            return None
+
+        return triplet[1:]
+
+    def _update_index_of_points(self):
+        """
+        Store the triplets of `self.list_of_points` that are not indexed yet in the indexes.
+        If `self.list_of_points` has been shortened or replaced, the indexes are recomputed from scratch.
+
+        """
+
+        # Recompute the indexes from scratch if they are not consistent with the list of points anymore
+        if self._nb_indexed_points > len(self.list_of_points):
+            self._dict_of_points = dict()
+            self._dict_of_points_by_key = dict()
+            self._nb_indexed_points = 0
+
+        # Index the new triplets.
+        # A point is always associated to the first triplet of the list that has the same decomposition,
+        # as it is the one to be reused.
+        for triplet in self.list_of_points[self._nb_indexed_points:]:
+            point = triplet[0]
+            associated_grad_and_function_val = self._find_point(point)
+            if associated_grad_and_function_val is None:
+                associated_grad_and_function_val = triplet[1:]
+                self._dict_of_points_by_key[self._get_point_key(point)] = triplet
+            self._dict_of_points.setdefault(point, associated_grad_and_function_val)
+        self._nb_indexed_points = len(self.list_of_points)
+
     def _is_already_evaluated_on_point(self, point):
         """
         Check whether this :class:`Function` is already evaluated on the :class:`Point` "point" or not.
@@ -540,14 +697,18 @@ class Function(object):
 
         """
 
-        # Browse the list of point "self" has been evaluated on
-        for triplet in self.list_of_points:
-            if triplet[0].decomposition_dict == point.decomposition_dict:
-                # If "self" has been evaluated on "point", then break the loop and return its corresponding data
-                return triplet[1:]
+        # Make sure all the points "self" has been evaluated on are indexed
+        if self._nb_indexed_points != len(self.list_of_points):
+            self._update_index_of_points()
+
+        # If "self" has been evaluated on this very "point", then return its corresponding data
+        associated_grad_and_function_val = self._dict_of_points.get(point)
+        if associated_grad_and_function_val is not None:
+            return associated_grad_and_function_val
 
+        # Otherwise, look for a point with the same decomposition.
         # If "self" has not been evaluated on "point" yet, then return None.
-        return None
+        return self._find_point(point)
 
     def _separate_leaf_functions_regarding_their_need_on_point(self, point):
         """
@@ -613,14 +774,21 @@ class Function(object):
         assert isinstance(f, Expression)
 
         # Prune the decomposition dict of each element to verify if the point is optimal or not by testing gradient=0.
+        # The decomposition dict is only replaced when some entry is actually removed.
+        # In compact mode, the decompositions stored in arrays are always pruned.
         for element in triplet:
-            element.decomposition_dict = prune_dict(element.decomposition_dict)
+            if element._decomposition_dict is None:
+                continue
+            pruned_decomposition_dict = prune_dict(element.decomposition_dict)
+            if len(pruned_decomposition_dict) != len(element.decomposition_dict):
+                element.decomposition_dict = pruned_decomposition_dict
 
-        # Store the point in list_of_points
+        # Store the point in list_of_points and index it
         self.list_of_points.append(triplet)
+        self._update_index_of_points()
 
         # If gradient==0, then store the point in list_of_optimal_points too
-        if g.decomposition_dict == dict():
+        if (g._get_coefficients()[0].size == 0 if Point.compact else g.decomposition_dict == dict()):
             self.list_of_stationary_points.append(triplet)
 
         # If self is not a leaf function, create gradient and function value for each of the latest
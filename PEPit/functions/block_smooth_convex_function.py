@@ -82,45 +82,36 @@ class BlockSmoothConvexFunction(Function):
         see [1, Lemma 1.1].
 
         """
-        # Set function ID
-        function_id = self.get_name()
-        if function_id is None:
-            function_id = "Function_{}".format(self.counter)
-
-        # Set tables_of_constraints attributes
-        for k in range(self.partition.get_nb_blocks()):
-            self.tables_of_constraints["smoothness_convexity_block_{}".format(k)] = [[]]*len(self.list_of_points)
+        # Initialize the index arrays of the tables of constraints, one per block
+        nb_blocks = self.partition.get_nb_blocks()
+        rows, columns, positions = list(), list(), [list() for _ in range(nb_blocks)]
 
         # Browse list of points and create interpolation constraints
         for i, point_i in enumerate(self.list_of_points):
 
             xi, gi, fi = point_i
-            xi_id = xi.get_name()
-            if xi_id is None:
-                xi_id = "Point_{}".format(i)
 
             for j, point_j in enumerate(self.list_of_points):
 
                 xj, gj, fj = point_j
-                xj_id = xj.get_name()
-                if xj_id is None:
-                    xj_id = "Point_{}".format(j)
 
-                if point_i == point_j:
-                    for k in range(self.partition.get_nb_blocks()):
-                        self.tables_of_constraints["smoothness_convexity_block_{}".format(k)][i].append(0)
+                if i != j:
 
-                else:
+                    rows.append(i)
+                    columns.append(j)
 
-                    for k in range(self.partition.get_nb_blocks()):
+                    for k in range(nb_blocks):
 
                         # partial gradients for block k
                         gik = self.partition.get_block(gi, k)
                         gjk = self.partition.get_block(gj, k)
-                        
+
                         # Necessary conditions for interpolation
                         constraint = (fi - fj >= gj * (xi - xj) + 1 / (2 * self.L[k]) * (gik - gjk) ** 2)
-                        constraint.set_name("IC_{}_smoothness_convexity_block_{}({}, {})".format(function_id, k,
-                                                                                                 xi_id, xj_id))
-                        self.tables_of_constraints["smoothness_convexity_block_{}".format(k)][i].append(constraint)
+                        positions[k].append(len(self.list_of_class_constraints))
                         self.list_of_class_constraints.append(constraint)
+
+        # Describe the tables of constraints
+        for k in range(nb_blocks):
+            self.add_table_of_class_constraints("smoothness_convexity_block_{}".format(k),
+                                                self.list_of_points, self.list_of_points, rows, columns, positions[k])
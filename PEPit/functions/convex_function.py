@@ -1,4 +1,5 @@
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class ConvexFunction(Function):
@@ -53,6 +54,20 @@ class ConvexFunction(Function):
 
         return constraint
 
+    @staticmethod
+    def get_convexity_kernel():
+        """
+        Formulates the interpolation constraints for self (CCP function) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # fi - fj >= gj * (xi - xj)
+        return InterpolationKernel(quadratic_terms=[(1, gj, xi - xj)],
+                                   linear_weights=fj - fi,
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Add the convexity constraints.
@@ -62,4 +77,5 @@ class ConvexFunction(Function):
                                                       list_of_points_2=self.list_of_points,
                                                       constraint_name="convexity",
                                                       set_class_constraint_i_j=self.set_convexity_constraint_i_j,
+                                                      kernel=self.get_convexity_kernel(),
                                                       )
@@ -1,4 +1,6 @@
+import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class ConvexLipschitzFunction(Function):
@@ -80,6 +82,33 @@ class ConvexLipschitzFunction(Function):
 
         return constraint
 
+    def get_lipschitz_continuity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (CCP Lipschitz continuous function)
+        as an interpolation kernel, in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # gi ** 2 <= M ** 2
+        return InterpolationKernel(quadratic_terms=[(1, gi, gi)],
+                                   linear_weights=np.zeros(2),
+                                   constant=- self.M ** 2,
+                                   equality_or_inequality="inequality")
+
+    @staticmethod
+    def get_convexity_kernel():
+        """
+        Formulates the interpolation constraints for self (CCP function)
+        as an interpolation kernel, in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # fi - fj >= gj * (xi - xj)
+        return InterpolationKernel(quadratic_terms=[(1, gj, xi - xj)],
+                                   linear_weights=fj - fi,
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of interpolation constraints for self (CCP Lipschitz continuous function),
@@ -89,10 +118,12 @@ class ConvexLipschitzFunction(Function):
         self.add_constraints_from_one_list_of_points(list_of_points=self.list_of_points,
                                                      constraint_name="lipschitz_continuity",
                                                      set_class_constraint_i=self.set_lipschitz_continuity_constraint_i,
+                                                     kernel=self.get_lipschitz_continuity_kernel(),
                                                      )
 
         self.add_constraints_from_two_lists_of_points(list_of_points_1=self.list_of_points,
                                                       list_of_points_2=self.list_of_points,
                                                       constraint_name="convexity",
                                                       set_class_constraint_i_j=self.set_convexity_constraint_i_j,
+                                                      kernel=self.get_convexity_kernel(),
                                                       )
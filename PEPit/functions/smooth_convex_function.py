@@ -1,5 +1,6 @@
 import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class SmoothConvexFunction(Function):
@@ -77,6 +78,20 @@ class SmoothConvexFunction(Function):
 
         return constraint
 
+    def get_smoothness_convexity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (smooth convex function) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # fi - fj >= gj * (xi - xj) + 1 / (2 * L) * (gi - gj) ** 2
+        return InterpolationKernel(quadratic_terms=[(1, gj, xi - xj),
+                                                    (1 / (2 * self.L), gi - gj, gi - gj)],
+                                   linear_weights=fj - fi,
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Add class constraints.
@@ -87,4 +102,5 @@ class SmoothConvexFunction(Function):
                                                       constraint_name="smoothness_convexity",
                                                       set_class_constraint_i_j=
                                                       self.set_smoothness_convexity_constraint_i_j,
+                                                      kernel=self.get_smoothness_convexity_kernel(),
                                                       )
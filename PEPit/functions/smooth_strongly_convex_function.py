@@ -1,5 +1,6 @@
 import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class SmoothStronglyConvexFunction(Function):
@@ -86,6 +87,23 @@ class SmoothStronglyConvexFunction(Function):
 
         return constraint
 
+    def get_smoothness_strong_convexity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (smooth strongly convex function)
+        as an interpolation kernel, in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # fi - fj >= gj * (xi - xj) + 1 / (2 * L) * (gi - gj) ** 2
+        #            + mu / (2 * (1 - mu / L)) * (xi - xj - 1 / L * (gi - gj)) ** 2
+        u = xi - xj - 1 / self.L * (gi - gj)
+        return InterpolationKernel(quadratic_terms=[(1, gj, xi - xj),
+                                                    (1 / (2 * self.L), gi - gj, gi - gj),
+                                                    (self.mu / (2 * (1 - self.mu / self.L)), u, u)],
+                                   linear_weights=fj - fi,
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Add class constraints.
@@ -95,4 +113,5 @@ class SmoothStronglyConvexFunction(Function):
                                                       constraint_name="smoothness_strong_convexity",
                                                       set_class_constraint_i_j=
                                                       self.set_smoothness_strong_convexity_constraint_i_j,
+                                                      kernel=self.get_smoothness_strong_convexity_kernel(),
                                                       )
@@ -1,4 +1,5 @@
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class StronglyConvexFunction(Function):
@@ -72,6 +73,20 @@ class StronglyConvexFunction(Function):
 
         return constraint
 
+    def get_strong_convexity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (strongly convex closed proper function)
+        as an interpolation kernel, in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # fi - fj >= gj * (xi - xj) + mu / 2 * (xi - xj) ** 2
+        return InterpolationKernel(quadratic_terms=[(1, gj, xi - xj),
+                                                    (self.mu / 2, xi - xj, xi - xj)],
+                                   linear_weights=fj - fi,
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of interpolation constraints for self (strongly convex closed proper function),
@@ -82,4 +97,5 @@ class StronglyConvexFunction(Function):
                                                       list_of_points_2=self.list_of_points,
                                                       constraint_name="strong_convexity",
                                                       set_class_constraint_i_j=self.set_strong_convexity_constraint_i_j,
+                                                      kernel=self.get_strong_convexity_kernel(),
                                                       )
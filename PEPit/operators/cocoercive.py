@@ -1,4 +1,6 @@
+import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class CocoerciveOperator(Function):
@@ -80,6 +82,20 @@ class CocoerciveOperator(Function):
 
         return constraint
 
+    def get_cocoercivity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (cocoercive operator) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # (gi - gj) * (xi - xj) - beta * (gi - gj) ** 2 >= 0
+        return InterpolationKernel(quadratic_terms=[(-1, gi - gj, xi - xj),
+                                                    (self.beta, gi - gj, gi - gj)],
+                                   linear_weights=np.zeros(2),
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of interpolation constraints for self (cocoercive maximally monotone operator),
@@ -90,5 +106,6 @@ class CocoerciveOperator(Function):
                                                       list_of_points_2=self.list_of_points,
                                                       constraint_name="cocoercivity",
                                                       set_class_constraint_i_j=self.set_cocoercivity_constraint_i_j,
+                                                      kernel=self.get_cocoercivity_kernel(),
                                                       symmetry=True,
                                                       )
@@ -1,5 +1,6 @@
 import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class LipschitzOperator(Function):
@@ -96,6 +97,20 @@ class LipschitzOperator(Function):
 
         return constraint
 
+    def get_lipschitz_continuity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (Lipschitz operator) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # (gi - gj) ** 2 - L ** 2 * (xi - xj) ** 2 <= 0
+        return InterpolationKernel(quadratic_terms=[(1, gi - gj, gi - gj),
+                                                    (- self.L ** 2, xi - xj, xi - xj)],
+                                   linear_weights=np.zeros(2),
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of interpolation constraints for self (Lipschitz operator),
@@ -107,5 +122,6 @@ class LipschitzOperator(Function):
                                                       constraint_name="lipschitz_continuity",
                                                       set_class_constraint_i_j=
                                                       self.set_lipschitz_continuity_constraint_i_j,
+                                                      kernel=self.get_lipschitz_continuity_kernel(),
                                                       symmetry=True,
                                                       )
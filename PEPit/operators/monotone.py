@@ -1,4 +1,6 @@
+import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class MonotoneOperator(Function):
@@ -60,6 +62,20 @@ class MonotoneOperator(Function):
 
         return constraint
 
+    @staticmethod
+    def get_monotonicity_kernel():
+        """
+        Formulates the interpolation constraints for self (maximally monotone operator) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # (gi - gj) * (xi - xj) >= 0
+        return InterpolationKernel(quadratic_terms=[(-1, gi - gj, xi - xj)],
+                                   linear_weights=np.zeros(2),
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of interpolation constraints for self (maximally monotone operator),
@@ -70,5 +86,6 @@ class MonotoneOperator(Function):
                                                       list_of_points_2=self.list_of_points,
                                                       constraint_name="monotonicity",
                                                       set_class_constraint_i_j=self.set_monotonicity_constraint_i_j,
+                                                      kernel=self.get_monotonicity_kernel(),
                                                       symmetry=True,
                                                       )
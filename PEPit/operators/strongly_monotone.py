@@ -1,4 +1,6 @@
+import numpy as np
 from PEPit.function import Function
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS
 
 
 class StronglyMonotoneOperator(Function):
@@ -73,6 +75,20 @@ class StronglyMonotoneOperator(Function):
 
         return constraint
 
+    def get_strong_monotonicity_kernel(self):
+        """
+        Formulates the interpolation constraints for self (strongly monotone operator) as an interpolation kernel,
+        in order to create them all at once.
+        """
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        # (gi - gj) * (xi - xj) - mu * (xi - xj) ** 2 >= 0
+        return InterpolationKernel(quadratic_terms=[(-1, gi - gj, xi - xj),
+                                                    (self.mu, xi - xj, xi - xj)],
+                                   linear_weights=np.zeros(2),
+                                   constant=0,
+                                   equality_or_inequality="inequality")
+
     def add_class_constraints(self):
         """
         Formulates the list of necessary conditions for interpolation of self (Lipschitz strongly monotone and
@@ -84,5 +100,6 @@ class StronglyMonotoneOperator(Function):
                                                       constraint_name="strong_monotonicity",
                                                       set_class_constraint_i_j=
                                                       self.set_strong_monotonicity_constraint_i_j,
+                                                      kernel=self.get_strong_monotonicity_kernel(),
                                                       symmetry=True,
                                                       )
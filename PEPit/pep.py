@@ -1,8 +1,16 @@
+import functools
 import importlib.util
+import time
 
 import numpy as np
 
-from PEPit.tools.dict_operations import prune_dict, symmetrize_dict
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+from PEPit.tools.chordal_decomposition import get_aggregate_sparsity_pattern, get_chordal_extension, \
+    complete_psd_matrix
+from PEPit.tools.presolve import get_redundant_rows
+from PEPit.tools.homogeneity import get_homogeneity_scalings, get_normalized_constraints_and_psd, rescale_solution
+from PEPit.tools.sdp_formats import get_sdpa_block_structure, get_symmetric_vectorization_matrix, \
+    read_sdpa_solution, write_cbf, write_npz, write_sdpa
 
 from PEPit.wrappers import WRAPPERS
 from PEPit.point import Point
@@ -11,17 +19,44 @@ from PEPit.constraint import Constraint
 from PEPit.function import Function
 from PEPit.psd_matrix import PSDMatrix
 from PEPit.block_partition import BlockPartition
+from PEPit.pep_template import PEPTemplate
+from PEPit.pep_cache import PEPCache
+from PEPit.pep_profile import PEPProfile
+from PEPit.registry import Registry, RegisteredClass
 
 
-class PEP(object):
+def _with_registry(method):
+    """
+    Decorate a method of :class:`PEP` so that the :class:`Registry` of the :class:`PEP` is active
+    during the call (and the previously active one is restored afterwards).
+
+    """
+    @functools.wraps(method)
+    def method_with_registry(self, *args, **kwargs):
+        with self:
+            return method(self, *args, **kwargs)
+
+    return method_with_registry
+
+
+class PEP(object, metaclass=RegisteredClass):
     """
     The class :class:`PEP` is the main class of this framework.
     A :class:`PEP` object encodes a complete performance estimation problem.
     It stores the following information.
 
+    Each :class:`PEP` owns a :class:`Registry` storing the counters and lists of leaf objects
+    (:class:`Point`, :class:`Expression`, :class:`Function`, ...) that define it.
+    The :class:`Registry` of a new :class:`PEP` becomes the active one in the current thread,
+    so that the objects created afterwards belong to this :class:`PEP`.
+    The methods of a :class:`PEP` always use its own :class:`Registry`,
+    and a :class:`PEP` can be used as a context manager to make its :class:`Registry` active within a block.
+    Several PEPs can therefore coexist, and be built or solved concurrently in different threads.
+
     Attributes:
-        counter (int): counts the number of :class:`PEP` objects.
-                       Ideally, only one is defined at a time.
+        counter (int): counts the number of :class:`PEP` objects sharing the same :class:`Registry`.
+                       Ideally, only one is defined per :class:`Registry`.
+        registry (Registry): the :class:`Registry` of this :class:`PEP`.
 
         list_of_functions (list): list of leaf :class:`Function` objects that are defined through the pipeline.
         list_of_points (list): list of :class:`Point` objects that are defined out of the scope of a :class:`Function`.
@@ -38,7 +73,20 @@ class PEP(object):
         wrapper (Wrapper): :class:`Wrapper` object that interfaces between the :class:`PEP` and the solver.
 
         _list_of_constraints_sent_to_wrapper (list): list of :class:`Constraint` objects sent to the wrapper.
+        _set_of_constraints_removed_by_presolve (set): set of the :class:`Constraint` objects of
+                                                       `_list_of_constraints_sent_to_wrapper`
+                                                       that are not sent to the solver after the presolve.
+        _set_of_inactive_class_constraints (set): set of the class interpolation :class:`Constraint` objects of
+                                                  `_list_of_constraints_sent_to_wrapper` that are not sent to the
+                                                  solver, because they are not in the working set of the
+                                                  constraint generation.
         _list_of_psd_sent_to_wrapper (list): list of :class:`PSDMatrix` objects sent to the wrapper.
+        _list_of_performance_metric_constraints (list): list of the :class:`Constraint` objects
+                                                        objective <= performance metric.
+        _homogeneity_scalings (HomogeneityScalings): the scalings normalizing the PEP sent to the wrapper,
+                                                     None if it is not normalized.
+        _dict_of_normalized_constraints_and_psd (dict): mapping the :class:`Constraint` and :class:`PSDMatrix`
+                                                        objects to the normalized ones sent to the wrapper.
 
         objective (Expression): the expression to be maximized by the solver.
                                 It is set by the method `solve`. And should not be updated otherwise.
@@ -48,22 +96,67 @@ class PEP(object):
 
         residual (ndarray): the dual value found by the solver to the lmi constraints G >> 0.
 
+        solver_status (str): the status returned by the solver on the PEP (before any dimension reduction)
+                             during the last call to the method `solve`.
+        solver_name (str): the name of the solver used during the last call to the method `solve`.
+        solve_time (float): the wall-clock time (in seconds) spent in the solver calls of the method `solve`.
+        compile_time (float): the wall-clock time (in seconds) spent by the method `solve` before the solution
+                              is known, outside of the solver calls (class constraints, and compilation of the SDP).
+        postprocessing_time (float): the wall-clock time (in seconds) spent by the method `solve` after the
+                                     solution is known, outside of the solver calls (dimension reduction,
+                                     evaluation of the points and function values, and feasibility check).
+        profile (PEPProfile): the time and memory spent in each phase of the last call to the method `solve`.
+
+        list_of_solve_hooks (list): class attribute. List of callables, each one being called with the :class:`PEP`
+                                    as argument at the end of each call to the method `solve`.
+
     """
-    # Class counter.
+    # Class counter, stored in the active Registry.
     # It counts the number of PEP defined instantiated.
-    counter = 0
+    _registered_attributes = {"counter": int}
 
-    def __init__(self):
+    # Callables called with the PEP at the end of each call to the method solve.
+    # This list is not reset when instantiating a new PEP.
+    list_of_solve_hooks = list()
+
+    def __init__(self, hash_consing=False, compact=False, batched_class_constraints=False):
         """
         A :class:`PEP` object can be instantiated without any argument
 
+        Args:
+            hash_consing (bool): if True, :class:`Point` and :class:`Expression` objects encoding the same
+                                 linear combination of leaves (up to rounding) are one and the same object.
+                                 This avoids storing and evaluating redundant intermediate iterates.
+                                 Defaults to False.
+            compact (bool): if True, :class:`Point` and :class:`Expression` objects store their decompositions
+                            as numpy arrays of coefficients, and inner products are computed by outer products.
+                            This saves memory and time for PEPs with many iterations.
+                            Defaults to False.
+            batched_class_constraints (bool): if True, the class constraints of the classes of functions that
+                                              provide an interpolation kernel are created all at once
+                                              by vectorized operations on the coefficients of their points
+                                              (see :mod:`PEPit.tools.interpolation_kernels`).
+                                              This saves time for PEPs with many points.
+                                              Defaults to False.
+
         Example:
             >>> pep = PEP()
 
         """
-        # Set all counters to 0 to recreate
+        # Create and activate a new registry to create
         # points, expressions, functions and block partitions from scratch at the beginning of each PEP.
-        self._reset_classes()
+        self._list_of_registries_to_restore = list()
+        self.registry = Registry()
+        self.registry.activate()
+
+        # Activate (or deactivate) hash-consing and compact mode of Points and Expressions
+        Point.hash_consing = hash_consing
+        Expression.hash_consing = hash_consing
+        Point.compact = compact
+        Expression.compact = compact
+
+        # Create the class constraints one by one, or all at once
+        Function.batched_class_constraints = batched_class_constraints
 
         # Update the class counter
         self.counter = PEP.counter
@@ -89,6 +182,13 @@ class PEP(object):
         # Those lists should not be updated by hand, only the solve method does update them.
         self._list_of_constraints_sent_to_wrapper = list()
         self._list_of_psd_sent_to_wrapper = list()
+        self._set_of_constraints_removed_by_presolve = set()
+        self._set_of_inactive_class_constraints = set()
+        self._list_of_performance_metric_constraints = list()
+
+        # The PEP sent to the wrapper may be normalized along its scaling symmetries in the method "solve".
+        self._homogeneity_scalings = None
+        self._dict_of_normalized_constraints_and_psd = dict()
 
         # The attribute objective will contain a leaf Expression when set in the method "solve".
         self.objective = None
@@ -102,25 +202,42 @@ class PEP(object):
         # Its dual value, called residual, is then stored in the following attribute.
         self.residual = None
 
-    @staticmethod
-    def _reset_classes():
+        # Information about the last call to the solver
+        self.solver_status = None
+        self.solver_name = None
+        self.solve_time = None
+        self.compile_time = None
+        self.postprocessing_time = None
+        self.profile = None
+
+    def __enter__(self):
+        """
+        Activate the :class:`Registry` of this :class:`PEP` in the current thread.
+
+        Example:
+            >>> problem1 = PEP()
+            >>> problem2 = PEP()
+            >>> with problem1:
+            ...     x = Point()  # x is a leaf Point of problem1
+
+        Returns:
+            self (PEP): this :class:`PEP`.
+
         """
-        Reset all classes attributes to initial values when instantiating a new :class:`PEP` object.
+        # Store the registry to activate back when exiting
+        self._list_of_registries_to_restore.append(Registry.get_active_registry())
 
+        self.registry.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
         """
+        Activate back the :class:`Registry` that was active before entering.
 
-        BlockPartition.counter = 0
-        BlockPartition.list_of_partitions = list()
-        Constraint.counter = 0
-        Expression.counter = 0
-        Expression.list_of_leaf_expressions = list()
-        Function.counter = 0
-        Function.list_of_functions = list()
-        PEP.counter = 0
-        Point.counter = 0
-        Point.list_of_leaf_points = list()
-        PSDMatrix.counter = 0
+        """
+        self._list_of_registries_to_restore.pop().activate()
 
+    @_with_registry
     def declare_function(self, function_class, **kwargs):
         """
         Instantiate a leaf :class:`Function` and store it in the attribute `list_of_functions`.
@@ -145,6 +262,7 @@ class PEP(object):
         # Return it
         return f
 
+    @_with_registry
     def set_initial_point(self, name=None):
         """
         Create a new leaf :class:`Point` and store it in the attribute `list_of_points`.
@@ -170,6 +288,7 @@ class PEP(object):
         # Return it
         return x
 
+    @_with_registry
     def set_initial_condition(self, condition, name=None):
         """
         Store a new :class:`Constraint` to the list of constraints of this :class:`PEP`.
@@ -190,6 +309,7 @@ class PEP(object):
         # Call add_constraint method
         self.add_constraint(constraint=condition)
 
+    @_with_registry
     def add_constraint(self, constraint, name=None):
         """
         Store a new :class:`Constraint` to the list of constraints of this :class:`PEP`.
@@ -213,6 +333,7 @@ class PEP(object):
         # Add constraint to the list of self's constraints
         self.list_of_constraints.append(constraint)
 
+    @_with_registry
     def add_psd_matrix(self, matrix_of_expressions, name=None):
         """
         Store a new matrix of :class:`Expression`\s that we enforce to be positive semi-definite.
@@ -262,6 +383,7 @@ class PEP(object):
         # Return it
         return block_partition
 
+    @_with_registry
     def set_performance_metric(self, expression, name=None):
         """
         Store a performance metric in the attribute `list_of_performance_metrics`.
@@ -281,15 +403,20 @@ class PEP(object):
         # Store performance metric in the appropriate list
         self.list_of_performance_metrics.append(expression)
 
+    @_with_registry
     def solve(self, wrapper="cvxpy", return_primal_or_dual="dual", verbose=1,
-              dimension_reduction_heuristic=None, eig_regularization=1e-3, tol_dimension_reduction=1e-4, **kwargs):
+              dimension_reduction_heuristic=None, eig_regularization=1e-3, tol_dimension_reduction=1e-4,
+              template=None, chordal_decomposition=False, presolve=False,
+              constraint_generation=False, tol_constraint_generation=1e-6, cache=None, homogeneity=False,
+              **kwargs):
         """
         Transform the :class:`PEP` under the SDP form, and solve it. Parse the options for solving the SDPs,
         instantiate the concerning wrappers and call the main internal solve option for solving the PEP.
 
         Args:
             wrapper (str, optional): Reference to a solver, interfaced by a :class:`PEPit.Wrapper`.
-                                     Default is "cvxpy", other native option include "mosek".
+                                     Default is "cvxpy", other native options include "mosek", "scs",
+                                     and "burer_monteiro" (see :class:`BurerMonteiroWrapper`).
             return_primal_or_dual (str, optional): If "dual", it returns a worst-case upper bound of the PEP
                                                    (dual value of the objective).
                                                    If "primal", it returns a worst-case lower bound of the PEP
@@ -320,6 +447,49 @@ class PEP(object):
                                                        Precisely, the second problem minimizes "optimal_value - tol"
                                                        (only used when "dimension_reduction_heuristic" is not None)
                                                        The default value is 1e-5.
+            template (PEPTemplate, optional): A :class:`PEPTemplate` storing previously compiled problems.
+                                              If this PEP shares the structure of one of them,
+                                              only its coefficients are updated before solving.
+                                              Defaults to the template activated through a `with` statement,
+                                              if any, and to None otherwise.
+            chordal_decomposition (bool, optional): If True, the constraint :math:`G \succeq 0` is replaced by
+                                                    PSD constraints on the submatrices of :math:`G` associated
+                                                    with the cliques of a chordal extension of the aggregate
+                                                    sparsity pattern of all the constraints, and :math:`G` is
+                                                    completed into a PSD matrix after solving.
+                                                    Only available with the "cvxpy" wrapper.
+                                                    Default is False.
+            presolve (bool, optional): If True, the redundant scalar constraints (duplicated ones and ones that
+                                       do not involve any variable) are not sent to the solver, and their dual
+                                       variables are set to 0. With the "cvxpy" wrapper, the leaf :class:`Point`
+                                       objects that do not appear in any constraint are also removed from the
+                                       PSD constraint on :math:`G`. Default is False.
+            constraint_generation (bool, optional): If True, the PEP is first solved with a subset of the
+                                                    interpolation inequalities, namely the ones between consecutive
+                                                    points and the ones involving a stationary point.
+                                                    The remaining ones are evaluated on the obtained solution,
+                                                    the most violated ones are added, and the PEP is solved again,
+                                                    until none of them is violated. The result is the one of the
+                                                    full PEP, and the dual variables of the interpolation
+                                                    inequalities never added are set to 0. Default is False.
+            tol_constraint_generation (float, optional): The violation above which an interpolation inequality
+                                                         is added to the working set of the constraint generation
+                                                         (only used when "constraint_generation" is True).
+                                                         The default value is 1e-6.
+            cache (PEPCache, optional): A :class:`PEPCache` storing the solutions of previously solved PEPs.
+                                        If this PEP and the solving settings are the same as the ones of one of them,
+                                        its solution is loaded instead of calling the solver.
+                                        Otherwise, the solution of this PEP is stored in it.
+                                        Defaults to the cache activated through a `with` statement,
+                                        if any, and to None otherwise.
+            homogeneity (bool or dict, optional): If True, the scaling symmetries of the PEP are detected
+                                                  (see `get_homogeneity_scalings`), and the normalized PEP is
+                                                  sent to the solver, its solution being scaled back.
+                                                  With a cache, the PEPs related by scalings then share their
+                                                  solution. A dict mapping leaf :class:`Point` and
+                                                  :class:`Expression` objects to positive numbers declares their
+                                                  scalings instead, the missing ones being set to 1.
+                                                  Default is False.
             kwargs (keywords, optional): Additional solver-specific arguments.
 
         Returns:
@@ -329,7 +499,9 @@ class PEP(object):
         wrapper_name = wrapper.lower()
 
         # Check that the solver is installed, if it is not, switch to CVXPY.
-        found_python_package = importlib.util.find_spec(wrapper_name)
+        found_python_package = None
+        if wrapper_name in WRAPPERS:
+            found_python_package = importlib.util.find_spec(WRAPPERS[wrapper_name].python_package)
         if found_python_package is None:
             if verbose:
                 print('\033[96m(PEPit) {} not found in system environment,'
@@ -346,6 +518,23 @@ class PEP(object):
             wrapper_name = "cvxpy"
             wrapper = WRAPPERS[wrapper_name](verbose=verbose)
 
+        # Check that the wrapper handles the chordal decomposition. Otherwise, switch to CVXPY.
+        if chordal_decomposition and not wrapper.supports_chordal_extension:
+            if verbose:
+                print('\033[96m(PEPit) Chordal decomposition not available with {},'
+                      ' switching to cvxpy\033[0m'.format(wrapper_name))
+            wrapper_name = "cvxpy"
+            wrapper = WRAPPERS[wrapper_name](verbose=verbose)
+
+        # Provide the wrapper with the template, if any
+        if template is None:
+            template = PEPTemplate.get_active_template()
+        wrapper.template = template
+
+        # Use the active cache, if any
+        if cache is None:
+            cache = PEPCache.get_active_cache()
+
         # Store wrapper information in self
         self.wrapper_name = wrapper_name
         self.wrapper = wrapper
@@ -353,11 +542,21 @@ class PEP(object):
         # Call the internal solve methods, which formulates and solves the PEP via the SDP solver.
         out = self._solve_with_wrapper(wrapper, verbose, return_primal_or_dual,
                                        dimension_reduction_heuristic,
-                                       eig_regularization, tol_dimension_reduction, **kwargs)
+                                       eig_regularization, tol_dimension_reduction,
+                                       chordal_decomposition, presolve,
+                                       constraint_generation, tol_constraint_generation, cache, homogeneity,
+                                       **kwargs)
+
+        # Call the hooks
+        for hook in PEP.list_of_solve_hooks:
+            hook(self)
+
         return out
 
     def _solve_with_wrapper(self, wrapper, verbose=1, return_primal_or_dual="dual",
                             dimension_reduction_heuristic=None, eig_regularization=1e-3, tol_dimension_reduction=1e-4,
+                            chordal_decomposition=False, presolve=False,
+                            constraint_generation=False, tol_constraint_generation=1e-6, cache=None, homogeneity=False,
                             **kwargs):
         """
         Internal solve method. Translate the :class:`PEP` to an SDP, and solve it via the wrapper.
@@ -393,6 +592,25 @@ class PEP(object):
                                                        Precisely, the second problem minimizes "optimal_value - tol"
                                                        (only used when "dimension_reduction_heuristic" is not None)
                                                        The default value is 1e-5.
+            chordal_decomposition (bool, optional): If True, the constraint :math:`G \succeq 0` is replaced by
+                                                    PSD constraints on clique submatrices of :math:`G`
+                                                    (see `get_chordal_extension`). Default is False.
+            presolve (bool, optional): If True, the redundant scalar constraints are not sent to the solver
+                                       (see `get_redundant_rows`), and the unused leaf :class:`Point` objects
+                                       are removed from the PSD constraint on :math:`G`. Default is False.
+            constraint_generation (bool, optional): If True, the interpolation inequalities between points that
+                                                    are neither consecutive nor stationary are only sent to the
+                                                    solver once they are violated by a previous solution.
+                                                    Default is False.
+            tol_constraint_generation (float, optional): The violation above which an interpolation inequality
+                                                         is sent to the solver (only used when
+                                                         "constraint_generation" is True). The default value is 1e-6.
+            cache (PEPCache, optional): If provided, the solution is loaded from this cache if it is there,
+                                        and stored in it otherwise. Default is None.
+            homogeneity (bool or dict, optional): If True, the PEP is normalized along its detected scaling
+                                                  symmetries before being sent to the solver. A dict declares the
+                                                  scalings of some leaves (see `get_homogeneity_scalings`).
+                                                  Default is False.
             kwargs (keywords, optional): Additional solver-specific arguments.
 
         Returns:
@@ -400,6 +618,271 @@ class PEP(object):
 
         """
 
+        # Measure the time spent outside of the solver before and after the solution is known
+        start_time = time.perf_counter()
+        self.solve_time = 0.
+        self.compile_time = 0.
+        self.postprocessing_time = 0.
+        self.profile = PEPProfile()
+
+        # Create the objective, as well as all the class and partition constraints
+        list_of_leaf_functions, list_of_functions_with_constraints = self._set_up_problem(self.profile)
+
+        # Normalize the PEP along its scaling symmetries
+        self._homogeneity_scalings = None
+        self._dict_of_normalized_constraints_and_psd = dict()
+        if cache is not None or homogeneity:
+            list_of_constraints, list_of_psd = self._get_list_of_constraints_and_psd(list_of_leaf_functions,
+                                                                                     list_of_functions_with_constraints)
+        if homogeneity:
+            with self.profile.measure("homogeneity"):
+                declared_scalings = homogeneity if isinstance(homogeneity, dict) else None
+                self._homogeneity_scalings = get_homogeneity_scalings(list_of_constraints, list_of_psd,
+                                                                      self.objective, declared_scalings)
+                self._dict_of_normalized_constraints_and_psd = get_normalized_constraints_and_psd(
+                    list_of_constraints, list_of_psd, self._homogeneity_scalings)
+            if verbose:
+                print('(PEPit) Homogeneity: PEP normalized, objective scaled by {}'.format(
+                    self._homogeneity_scalings.objective))
+
+        # Load the solution from the cache, if it is there
+        if cache is not None:
+            settings = {"wrapper": self.wrapper_name,
+                        "dimension_reduction_heuristic": dimension_reduction_heuristic,
+                        "eig_regularization": eig_regularization,
+                        "tol_dimension_reduction": tol_dimension_reduction,
+                        "chordal_decomposition": chordal_decomposition,
+                        "presolve": presolve,
+                        "constraint_generation": constraint_generation,
+                        "tol_constraint_generation": tol_constraint_generation,
+                        }
+            settings.update(kwargs)
+            if homogeneity:
+                settings["homogeneity"] = True
+            cache_key = PEPCache.get_key(list_of_constraints, list_of_psd, settings, self._homogeneity_scalings)
+            solution = cache.get_solution(cache_key, self._homogeneity_scalings)
+            if solution is not None:
+                # The solution of the normalized PEP is scaled back
+                if self._homogeneity_scalings is not None:
+                    solution = rescale_solution(solution, self._homogeneity_scalings)
+                self.compile_time = time.perf_counter() - start_time
+                postprocessing_start_time = time.perf_counter()
+                out = self._load_solution(solution, list_of_constraints, list_of_psd, return_primal_or_dual, verbose)
+                self.postprocessing_time = time.perf_counter() - postprocessing_start_time
+                return out
+
+        # Start the constraint generation from the interpolation inequalities between consecutive or stationary points
+        self._set_of_inactive_class_constraints = set()
+        if constraint_generation:
+            for function in list_of_leaf_functions:
+                self._set_of_inactive_class_constraints |= function._set_of_deferrable_class_constraints
+
+        round_counter = 0
+        while True:
+
+            # Send the PEP to the wrapper
+            with self.profile.measure("send_constraint_to_solver"):
+                self._send_problem_to_wrapper(wrapper, list_of_leaf_functions, list_of_functions_with_constraints,
+                                              chordal_decomposition, presolve,
+                                              verbose=verbose if round_counter == 0 else 0)
+
+            # Instantiate the problem
+            if verbose and round_counter == 0:
+                print('(PEPit) Compiling SDP')
+            with self.profile.measure("generate_problem"):
+                wrapper.generate_problem(self.objective)
+
+            # Solve it
+            if verbose:
+                print('(PEPit) Calling SDP solver')
+            solver_status, solver_name, wc_value = self._call_solver(wrapper, **kwargs)
+            self.solver_status = solver_status
+            self.solver_name = solver_name
+            if verbose:
+                print('(PEPit) Solver status: {} (wrapper:{}, solver: {}); optimal value: {}'.format(solver_status,
+                                                                                                     self.wrapper_name,
+                                                                                                     solver_name,
+                                                                                                     wc_value))
+
+            # A relaxation may be unbounded, in which case all the interpolation inequalities left out are added
+            if wc_value is None and self._set_of_inactive_class_constraints:
+                if verbose:
+                    print('(PEPit) Constraint generation: unbounded relaxation,'
+                          ' adding the {} interpolation constraint(s) left out'.format(
+                            len(self._set_of_inactive_class_constraints)))
+                self._set_of_inactive_class_constraints = set()
+                round_counter += 1
+                wrapper = self._get_new_wrapper(wrapper)
+                continue
+
+            # Raise explicit error when wc_value in infinite
+            if wc_value is None:
+                self.compile_time = time.perf_counter() - start_time - self.solve_time
+                if verbose:
+                    print("\033[96m(PEPit) Problem issue: PEPit didn't find any nontrivial worst-case guarantee. "
+                          "It seems that the optimal value of your problem is unbounded.\033[0m")
+
+                # Skip the following as no variable has a value
+                return wc_value
+
+            # Stop if all the interpolation inequalities left out are satisfied
+            if not self._set_of_inactive_class_constraints:
+                break
+            G_value, F_value = self._get_primal_variables(wrapper)
+            violated_constraints = self._get_violated_inactive_class_constraints(G_value, F_value,
+                                                                                 tol_constraint_generation)
+            round_counter += 1
+            if verbose:
+                print('(PEPit) Constraint generation: round {}, {} violated interpolation constraint(s) out of {}'
+                      ' left out'.format(round_counter, len(violated_constraints),
+                                         len(self._set_of_inactive_class_constraints)))
+            if not violated_constraints:
+                break
+
+            # Add the most violated ones to the working set, and start again with a new wrapper
+            self._set_of_inactive_class_constraints -= set(violated_constraints[:max(Point.counter, 1)])
+            wrapper = self._get_new_wrapper(wrapper)
+
+        self.compile_time = time.perf_counter() - start_time - self.solve_time
+        postprocessing_start_time = time.perf_counter()
+        compile_solve_time = self.solve_time
+
+        # Keep dual values before dimension reduction in memory
+        # Dimension aims at finding low dimension lower bound functions,
+        # but solves a different problem with an extra condition and different objective,
+        # leading to different dual values. The ones we store here provide the proof of the obtained guarantee.
+        self.residual = self._assign_dual_values(wrapper)
+        for constraint in self._set_of_constraints_removed_by_presolve | self._set_of_inactive_class_constraints:
+            constraint._dual_variable_value = 0.
+        G_value, F_value = self._get_primal_variables(wrapper)
+
+        # Perform a dimension reduction if required
+        if dimension_reduction_heuristic:
+
+            # Print the estimated dimension before dimension reduction
+            nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(G_value)
+            if self._homogeneity_scalings is None:
+                wrapper.prepare_heuristic(wc_value, tol_dimension_reduction)
+            else:
+                # The heuristic is applied to the normalized PEP, with the same constraint on the objective
+                wrapper.prepare_heuristic(wc_value / self._homogeneity_scalings.objective,
+                                          tol_dimension_reduction / self._homogeneity_scalings.objective)
+            if verbose:
+                print('(PEPit) Postprocessing: {} eigenvalue(s) > {} before dimension reduction'.format(nb_eigenvalues,
+                                                                                                        eig_threshold))
+                print('(PEPit) Calling SDP solver')
+
+            # Translate the heuristic into the objective and solve the associated problem
+            if dimension_reduction_heuristic == "trace":
+                self._apply_heuristic(wrapper, np.identity(Point.counter))
+                solver_status, solver_name, wc_value = self._call_solver(wrapper, **kwargs)
+
+                # Compute minimal number of dimensions
+                G_value, F_value = self._get_primal_variables(wrapper)
+                nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(G_value)
+
+            elif dimension_reduction_heuristic.startswith("logdet"):
+                niter = int(dimension_reduction_heuristic[6:])
+                for i in range(1, 1 + niter):
+                    regularized_G_value = corrected_G_value + eig_regularization * np.eye(Point.counter)
+                    if wrapper.chordal_extension is not None:
+                        # The inverse of the maximum determinant completion is supported on the chordal extension
+                        chordal_pattern, elimination_order, _ = wrapper.chordal_extension
+                        regularized_G_value = complete_psd_matrix(regularized_G_value,
+                                                                  chordal_pattern, elimination_order)
+                    W = np.linalg.inv(regularized_G_value)
+                    self._apply_heuristic(wrapper, W)
+                    solver_status, solver_name, wc_value = self._call_solver(wrapper, **kwargs)
+
+                    # Compute minimal number of dimensions
+                    G_value, F_value = self._get_primal_variables(wrapper)
+                    nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(
+                        G_value)
+
+                    # Print the estimated dimension after niter dimension reduction steps
+                    if verbose:
+                        print('(PEPit) Solver status: {} (solver: {});'
+                              ' objective value: {}'.format(solver_status,
+                                                            solver_name,
+                                                            wc_value))
+                        print(
+                            '(PEPit) Postprocessing: {} eigenvalue(s) > {} after {} dimension reduction step(s)'.format(
+                                nb_eigenvalues, eig_threshold, i))
+
+            else:
+                raise ValueError("The argument \'dimension_reduction_heuristic\' must be \'trace\'"
+                                 "or \`logdet\` followed by an integer."
+                                 "Got {}".format(dimension_reduction_heuristic))
+
+            # Print the estimated dimension after dimension reduction
+            if verbose:
+                print('(PEPit) Solver status: {} (solver: {});'
+                      ' objective value: {}'.format(solver_status,
+                                                    solver_name,
+                                                    wc_value))
+                print('(PEPit) Postprocessing: {} eigenvalue(s) > {} after dimension reduction'.format(nb_eigenvalues,
+                                                                                                       eig_threshold))
+
+            # The heuristic problem only involves the working set of the constraint generation
+            if self._set_of_inactive_class_constraints and verbose:
+                violated_constraints = self._get_violated_inactive_class_constraints(G_value, F_value,
+                                                                                     tol_constraint_generation)
+                if violated_constraints:
+                    print('\033[96m(PEPit) Postprocessing: {} interpolation constraint(s) left out by the constraint'
+                          ' generation are violated after dimension reduction\033[0m'.format(len(violated_constraints)))
+
+        # Store all the values of points and function values
+        self.G_value = G_value
+        self.F_value = F_value
+        with self.profile.measure("eval_points_and_function_values"):
+            self._eval_points_and_function_values(F_value, G_value, verbose=verbose)
+        with self.profile.measure("check_feasibility"):
+            dual_objective = self.check_feasibility(wc_value, verbose=verbose)
+
+        # Store the solution in the cache
+        if cache is not None:
+            solution = {"wc_value": wc_value,
+                        "dual_objective": dual_objective,
+                        "solver_status": self.solver_status,
+                        "solver_name": self.solver_name,
+                        "G_value": G_value,
+                        "F_value": F_value,
+                        "residual": self.residual,
+                        "constraint_duals": np.array([constraint._dual_variable_value for constraint
+                                                      in self._list_of_constraints_sent_to_wrapper], dtype=float),
+                        "psd_duals": [psd_matrix._dual_variable_value
+                                      for psd_matrix in self._list_of_psd_sent_to_wrapper],
+                        }
+            # The solution of the normalized PEP is stored, to be shared by all the PEPs related by scalings
+            if self._homogeneity_scalings is not None:
+                solution = rescale_solution(solution, self._homogeneity_scalings, inverse=True)
+            cache.set_solution(cache_key, solution, self._homogeneity_scalings)
+        self.postprocessing_time = (time.perf_counter() - postprocessing_start_time
+                                    - (self.solve_time - compile_solve_time))
+
+        # Return the value of the minimal performance metric
+        if return_primal_or_dual == "dual":
+            return dual_objective
+        elif return_primal_or_dual == "primal":
+            return wc_value
+        else:
+            raise ValueError("The argument \'return_primal_or_dual\' must be \'dual\' or \`primal\`."
+                             "Got {}".format(return_primal_or_dual))
+
+    def _set_up_problem(self, profile=None):
+        """
+        Create the objective of the :class:`PEP`, as well as all the class and partition constraints.
+
+        Args:
+            profile (PEPProfile, optional): the profile to which the time and memory spent are added,
+                                            under the phase "set_class_constraints".
+
+        Returns:
+            list_of_leaf_functions (list): the leaf :class:`Function` objects.
+            list_of_functions_with_constraints (list): the :class:`Function` objects with their own constraints.
+
+        """
+
         # Create an expression that serve for the objective (min of the performance measures)
         self.objective = Expression(is_leaf=True)
 
@@ -409,18 +892,147 @@ class PEP(object):
         list_of_functions_with_constraints = [function for function in Function.list_of_functions
                                               if len(function.list_of_constraints) > 0 or len(function.list_of_psd) > 0]
 
-        # Create all class constraints
-        for function in list_of_leaf_functions:
-            function.set_class_constraints()
+        if profile is None:
+            profile = PEPProfile()
+        with profile.measure("set_class_constraints"):
+
+            # Create all class constraints
+            for function in list_of_leaf_functions:
+                with profile.measure("set_class_constraints", function_class=type(function).__name__):
+                    function.set_class_constraints()
+
+            # Create all partition constraints
+            for partition in BlockPartition.list_of_partitions:
+                with profile.measure("set_class_constraints", function_class=type(partition).__name__):
+                    partition.add_partition_constraints()
+
+        # Create the constraints between the objective and the performance metrics
+        self._list_of_performance_metric_constraints = list()
+        for performance_metric in self.list_of_performance_metrics:
+            assert isinstance(performance_metric, Expression)
+            self._list_of_performance_metric_constraints.append(self.objective <= performance_metric)
+
+        return list_of_leaf_functions, list_of_functions_with_constraints
 
-        # Create all partition constraints
+    def _get_list_of_constraints_and_psd(self, list_of_leaf_functions, list_of_functions_with_constraints):
+        """
+        Gather all the :class:`Constraint` and :class:`PSDMatrix` objects of the :class:`PEP`,
+        in the order they are sent to the wrapper, starting with the constraints between the objective
+        and the performance metrics.
+
+        Args:
+            list_of_leaf_functions (list): the leaf :class:`Function` objects, whose class constraints are set.
+            list_of_functions_with_constraints (list): the :class:`Function` objects with their own constraints.
+
+        Returns:
+            list_of_constraints (list): the :class:`Constraint` objects.
+            list_of_psd (list): the :class:`PSDMatrix` objects.
+
+        """
+        list_of_constraints = list(self._list_of_performance_metric_constraints)
+        list_of_constraints += self.list_of_constraints
+        list_of_psd = list(self.list_of_psd)
+        for function in list_of_leaf_functions:
+            list_of_constraints += function.list_of_class_constraints
+            list_of_psd += function.list_of_class_psd
+        for function in list_of_functions_with_constraints:
+            list_of_constraints += function.list_of_constraints
+            list_of_psd += function.list_of_psd
         for partition in BlockPartition.list_of_partitions:
-            partition.add_partition_constraints()
+            list_of_constraints += partition.list_of_constraints
+
+        return list_of_constraints, list_of_psd
+
+    def _load_solution(self, solution, list_of_constraints, list_of_psd, return_primal_or_dual="dual", verbose=1):
+        """
+        Store the values of a solution loaded from a :class:`PEPCache` as if the :class:`PEP` had just been solved.
+
+        Args:
+            solution (dict): the solution (see `PEPCache.set_solution`).
+            list_of_constraints (list): the :class:`Constraint` objects, in the order they are sent to the wrapper.
+            list_of_psd (list): the :class:`PSDMatrix` objects, in the order they are sent to the wrapper.
+            return_primal_or_dual (str, optional): "dual" or "primal", the worst-case value to return.
+            verbose (int, optional): Level of information details to print.
+
+        Returns:
+            float: Worst-case guarantee of the PEP.
+
+        """
+
+        # Store the dual values
+        self._list_of_constraints_sent_to_wrapper = list_of_constraints
+        self._list_of_psd_sent_to_wrapper = list_of_psd
+        for constraint, dual_value in zip(list_of_constraints, solution["constraint_duals"]):
+            constraint._dual_variable_value = float(dual_value)
+        for psd_matrix, dual_value in zip(list_of_psd, solution["psd_duals"]):
+            psd_matrix._dual_variable_value = dual_value
+        self.residual = solution["residual"]
+
+        # Store the primal values
+        self.solve_time = 0.
+        self.solver_status = solution["solver_status"]
+        self.solver_name = solution["solver_name"]
+        self.G_value = solution["G_value"]
+        self.F_value = solution["F_value"]
+        with self.profile.measure("eval_points_and_function_values"):
+            self._eval_points_and_function_values(self.F_value, self.G_value, verbose=verbose)
+        if verbose:
+            print('(PEPit) Solution loaded from cache: status {} (wrapper:{}, solver: {}); optimal value: {}'.format(
+                self.solver_status, self.wrapper_name, self.solver_name, solution["wc_value"]))
+
+        # Return the value of the minimal performance metric
+        if return_primal_or_dual == "dual":
+            return solution["dual_objective"]
+        elif return_primal_or_dual == "primal":
+            return solution["wc_value"]
+        else:
+            raise ValueError("The argument \'return_primal_or_dual\' must be \'dual\' or \`primal\`."
+                             "Got {}".format(return_primal_or_dual))
+
+    def _get_new_wrapper(self, wrapper):
+        """
+        Instantiate a new wrapper of the same type as `wrapper`, with the same template, and store it in self.
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+
+        Returns:
+            (Wrapper): the new interface to the solver.
+
+        """
+        new_wrapper = WRAPPERS[self.wrapper_name](verbose=wrapper.verbose)
+        new_wrapper.template = wrapper.template
+        self.wrapper = new_wrapper
+
+        return new_wrapper
+
+    def _send_problem_to_wrapper(self, wrapper, list_of_leaf_functions, list_of_functions_with_constraints,
+                                 chordal_decomposition=False, presolve=False, verbose=1):
+        """
+        Send the variables, the objective and all the constraints of the :class:`PEP` to the wrapper.
+        The time and memory spent in sending the class constraints of each function are added
+        to the attribute `profile`, under the phase "send_constraint_to_solver".
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            list_of_leaf_functions (list): the leaf :class:`Function` objects, whose class constraints are set.
+            list_of_functions_with_constraints (list): the :class:`Function` objects with their own constraints.
+            chordal_decomposition (bool, optional): whether to decompose the main constraint G >> 0 along cliques.
+            presolve (bool, optional): whether to detect the redundant scalar constraints.
+            verbose (int, optional): Level of information details to print.
+
+        """
 
         # Report the creation of variables (G,F)
         if verbose:
             print('(PEPit) Setting up the problem:'
                   ' size of the Gram matrix: {}x{}'.format(Point.counter, Point.counter))
+
+        # Presolve the problem, and decompose the main constraint G >> 0 along the cliques of its sparsity pattern
+        self._set_of_constraints_removed_by_presolve = set()
+        if presolve or chordal_decomposition:
+            self._prepare_wrapper(wrapper, list_of_functions_with_constraints,
+                                  chordal_decomposition, presolve, verbose)
         wrapper.set_main_variables()
 
         # Initialize the lists of constraints sent to wrapper
@@ -431,11 +1043,8 @@ class PEP(object):
         # Note maximizing the minimum of all the performance metrics
         # is equivalent to maximize objective which is constraint to be smaller than all the performance metrics.
 
-        for performance_metric in self.list_of_performance_metrics:
-            assert isinstance(performance_metric, Expression)
-            performance_metric_constraint = (self.objective <= performance_metric)
-            wrapper.send_constraint_to_solver(performance_metric_constraint)
-            self._list_of_constraints_sent_to_wrapper.append(performance_metric_constraint)
+        for performance_metric_constraint in self._list_of_performance_metric_constraints:
+            self._send_constraint_to_wrapper(wrapper, performance_metric_constraint)
 
         if verbose:
             print('(PEPit) Setting up the problem:'
@@ -445,8 +1054,7 @@ class PEP(object):
         if verbose:
             print('(PEPit) Setting up the problem: Adding initial conditions and general constraints ...')
         for condition in self.list_of_constraints:
-            wrapper.send_constraint_to_solver(condition)
-            self._list_of_constraints_sent_to_wrapper.append(condition)
+            self._send_constraint_to_wrapper(wrapper, condition)
         if verbose:
             print('(PEPit) Setting up the problem:'
                   ' initial conditions and general constraints ({} constraint(s) added)'.format(
@@ -457,8 +1065,7 @@ class PEP(object):
             if verbose:
                 print('(PEPit) Setting up the problem: {} lmi constraint(s) added'.format(len(self.list_of_psd)))
             for psd_counter, psd_matrix in enumerate(self.list_of_psd):
-                wrapper.send_lmi_constraint_to_solver(psd_counter, psd_matrix)
-                self._list_of_psd_sent_to_wrapper.append(psd_matrix)
+                self._send_psd_matrix_to_wrapper(wrapper, psd_counter, psd_matrix)
 
         # Defining class constraints
         if verbose:
@@ -472,9 +1079,9 @@ class PEP(object):
                 print('\t\t\tFunction', function_counter, ':', 'Adding', len(function.list_of_class_constraints),
                       'scalar constraint(s) ...')
 
-            for constraint in function.list_of_class_constraints:
-                wrapper.send_constraint_to_solver(constraint)
-                self._list_of_constraints_sent_to_wrapper.append(constraint)
+            with self.profile.measure("send_constraint_to_solver", function_class=type(function).__name__):
+                for constraint in function.list_of_class_constraints:
+                    self._send_constraint_to_wrapper(wrapper, constraint)
 
             if verbose:
                 print('\t\t\tFunction', function_counter, ':', len(function.list_of_class_constraints),
@@ -486,8 +1093,7 @@ class PEP(object):
                           'lmi constraint(s) ...')
 
                 for psd_counter, psd_matrix in enumerate(function.list_of_class_psd):
-                    wrapper.send_lmi_constraint_to_solver(psd_counter, psd_matrix)
-                    self._list_of_psd_sent_to_wrapper.append(psd_matrix)
+                    self._send_psd_matrix_to_wrapper(wrapper, psd_counter, psd_matrix)
 
                 if verbose:
                     print('\t\t\tFunction', function_counter, ':', len(function.list_of_class_psd),
@@ -507,8 +1113,7 @@ class PEP(object):
                           'scalar constraint(s) ...')
 
                 for constraint in function.list_of_constraints:
-                    wrapper.send_constraint_to_solver(constraint)
-                    self._list_of_constraints_sent_to_wrapper.append(constraint)
+                    self._send_constraint_to_wrapper(wrapper, constraint)
 
                 if verbose:
                     print('\t\t\tFunction', function_counter, ':', len(function.list_of_constraints),
@@ -520,8 +1125,7 @@ class PEP(object):
                           'lmi constraint(s) ...')
 
                 for psd_counter, psd_matrix in enumerate(function.list_of_psd):
-                    wrapper.send_lmi_constraint_to_solver(psd_counter, psd_matrix)
-                    self._list_of_psd_sent_to_wrapper.append(psd_matrix)
+                    self._send_psd_matrix_to_wrapper(wrapper, psd_counter, psd_matrix)
 
                 if verbose:
                     print('\t\t\tFunction', function_counter, ':', len(function.list_of_psd),
@@ -539,113 +1143,231 @@ class PEP(object):
                 print('\t\t\tPartition', partition_counter, 'with', partition.get_nb_blocks(),
                       'blocks: Adding', len(partition.list_of_constraints), 'scalar constraint(s)...')
             for constraint in partition.list_of_constraints:
-                wrapper.send_constraint_to_solver(constraint)
-                self._list_of_constraints_sent_to_wrapper.append(constraint)
+                self._send_constraint_to_wrapper(wrapper, constraint)
             if verbose:
                 print('\t\t\tPartition', partition_counter, 'with', partition.get_nb_blocks(),
                       'blocks:', len(partition.list_of_constraints), 'scalar constraint(s) added')
 
-        # Instantiate the problem
-        if verbose:
-            print('(PEPit) Compiling SDP')
-        wrapper.generate_problem(self.objective)
+    def _send_constraint_to_wrapper(self, wrapper, constraint):
+        """
+        Send a :class:`Constraint` to the wrapper, unless it has been removed by the presolve
+        or it is not in the working set of the constraint generation,
+        and keep track of it in the attribute `_list_of_constraints_sent_to_wrapper`.
+        If the PEP is normalized, the normalized :class:`Constraint` is sent instead.
 
-        # Solve it
-        if verbose:
-            print('(PEPit) Calling SDP solver')
-        solver_status, solver_name, wc_value = wrapper.solve(**kwargs)
-        if verbose:
-            print('(PEPit) Solver status: {} (wrapper:{}, solver: {}); optimal value: {}'.format(solver_status,
-                                                                                                 self.wrapper_name,
-                                                                                                 solver_name,
-                                                                                                 wc_value))
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            constraint (Constraint): the constraint.
+
+        """
+        if constraint not in self._set_of_constraints_removed_by_presolve \
+                and constraint not in self._set_of_inactive_class_constraints:
+            wrapper.send_constraint_to_solver(self._dict_of_normalized_constraints_and_psd.get(constraint, constraint))
+        self._list_of_constraints_sent_to_wrapper.append(constraint)
+
+    def _send_psd_matrix_to_wrapper(self, wrapper, psd_counter, psd_matrix):
+        """
+        Send a :class:`PSDMatrix` to the wrapper, or its normalized version if the PEP is normalized,
+        and keep track of it in the attribute `_list_of_psd_sent_to_wrapper`.
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            psd_counter (int): the index of the :class:`PSDMatrix` in its list.
+            psd_matrix (PSDMatrix): the LMI.
+
+        """
+        wrapper.send_lmi_constraint_to_solver(psd_counter,
+                                              self._dict_of_normalized_constraints_and_psd.get(psd_matrix, psd_matrix))
+        self._list_of_psd_sent_to_wrapper.append(psd_matrix)
+
+    def _prepare_wrapper(self, wrapper, list_of_functions_with_constraints, chordal_decomposition, presolve,
+                         verbose=1):
+        """
+        Detect the redundant scalar constraints of the PEP (see `get_redundant_rows`),
+        and provide the wrapper with a chordal extension of the aggregate sparsity pattern of the Gram matrix
+        (see `get_chordal_extension`), that is the set of its entries involved in the performance metrics
+        or in any (non-redundant) constraint of the PEP.
+        Without chordal decomposition, the chordal extension is the dense pattern of the leaf :class:`Point` objects
+        that are used, so that the unused ones are removed from the PSD constraint on :math:`G`.
 
-        # Raise explicit error when wc_value in infinite
-        if wc_value is None:
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            list_of_functions_with_constraints (list): the :class:`Function` objects with their own constraints.
+            chordal_decomposition (bool): whether to decompose the main constraint G >> 0 along cliques.
+            presolve (bool): whether to detect the redundant scalar constraints.
+            verbose (int, optional): Level of information details to print.
+
+        """
+
+        # Collect all the constraints and LMIs
+        list_of_constraints = list(self.list_of_constraints)
+        list_of_psd = list(self.list_of_psd)
+        for function in Function.list_of_functions:
+            if function.get_is_leaf():
+                list_of_constraints += [constraint for constraint in function.list_of_class_constraints
+                                        if constraint not in self._set_of_inactive_class_constraints]
+                list_of_psd += function.list_of_class_psd
+        for function in list_of_functions_with_constraints:
+            list_of_constraints += function.list_of_constraints
+            list_of_psd += function.list_of_psd
+        for partition in BlockPartition.list_of_partitions:
+            list_of_constraints += partition.list_of_constraints
+
+        # Stack all the expressions
+        list_of_expressions = [constraint.expression for constraint in list_of_constraints]
+        list_of_expressions += list(self.list_of_performance_metrics)
+        list_of_expressions += [psd_matrix[i, j] for psd_matrix in list_of_psd
+                                for i in range(psd_matrix.shape[0]) for j in range(i + 1)]
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+
+        # Detect the redundant scalar constraints
+        if presolve:
+            nb_constraints = len(list_of_constraints)
+            is_equality = np.array([constraint.equality_or_inequality == "equality"
+                                    for constraint in list_of_constraints], dtype=bool)
+            redundant = get_redundant_rows(A[:nb_constraints], b[:nb_constraints], is_equality)
+            self._set_of_constraints_removed_by_presolve = {constraint for constraint, is_redundant
+                                                            in zip(list_of_constraints, redundant) if is_redundant}
+            A = A[np.flatnonzero(np.concatenate([~redundant, np.ones(A.shape[0] - nb_constraints, dtype=bool)]))]
             if verbose:
-                print("\033[96m(PEPit) Problem issue: PEPit didn't find any nontrivial worst-case guarantee. "
-                      "It seems that the optimal value of your problem is unbounded.\033[0m")
+                print('(PEPit) Presolve: {} redundant scalar constraint(s) removed'.format(np.sum(redundant)))
 
-            # Skip the following as no variable has a value
-            return wc_value
+        # Only the wrappers supporting it are provided with a chordal extension
+        if not wrapper.supports_chordal_extension:
+            return
 
-        # Keep dual values before dimension reduction in memory
-        # Dimension aims at finding low dimension lower bound functions,
-        # but solves a different problem with an extra condition and different objective,
-        # leading to different dual values. The ones we store here provide the proof of the obtained guarantee.
-        self.residual = wrapper.assign_dual_values()
+        # Compute the chordal extension of the sparsity pattern of the Gram matrix
+        pattern = get_aggregate_sparsity_pattern(A, Point.counter)
+        if chordal_decomposition:
+            chordal_extension = get_chordal_extension(pattern)
+        else:
+            used_points = np.diag(pattern)
+            chordal_extension = (np.outer(used_points, used_points), list(range(Point.counter)),
+                                 [np.flatnonzero(used_points)])
+
+        # The dense constraint G >> 0 is kept if there is nothing to decompose
+        cliques = chordal_extension[2]
+        if len(cliques) > 1 or sum(len(clique) for clique in cliques) < Point.counter:
+            wrapper.chordal_extension = chordal_extension
+        if verbose:
+            print('(PEPit) Setting up the problem:'
+                  ' PSD constraint on the Gram matrix decomposed into {} clique(s)'
+                  ' of size at most {}'.format(len(cliques), max([len(clique) for clique in cliques], default=0)))
+
+    def _call_solver(self, wrapper, **kwargs):
+        """
+        Call the solver through the wrapper, and add the time spent in the solver to the attribute `solve_time`,
+        and to the phase "solver" of the attribute `profile`.
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            kwargs (keywords, optional): Additional solver-specific arguments.
+
+        Returns:
+            status (string): status of the solution / problem.
+            name (string): name of the solver.
+            value (float): value of the performance metric after solving.
+
+        """
+        start_time = time.perf_counter()
+        with self.profile.measure("solver"):
+            solver_status, solver_name, wc_value = wrapper.solve(**kwargs)
+        self.solve_time += time.perf_counter() - start_time
+
+        # The value of the normalized PEP is scaled back
+        if self._homogeneity_scalings is not None and wc_value is not None:
+            wc_value = float(wc_value * self._homogeneity_scalings.objective)
+
+        return solver_status, solver_name, wc_value
+
+    def _apply_heuristic(self, wrapper, weight):
+        """
+        Change the objective of the wrapper to minimize :math:`\\mathrm{Tr}(G\\,W)`,
+        expressed in terms of the normalized Gram matrix if the PEP is normalized.
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+            weight (ndarray): the weights W of the heuristic.
+
+        """
+        if self._homogeneity_scalings is not None:
+            weight = weight * np.outer(self._homogeneity_scalings.points, self._homogeneity_scalings.points)
+        wrapper.heuristic(weight)
+
+    def _get_primal_variables(self, wrapper):
+        """
+        Get the values of the Gram matrix and of the vector of leaf :class:`Expression` objects found by the solver,
+        scaled back if the PEP is normalized.
+
+        Args:
+            wrapper (Wrapper): Interface to the solver.
+
+        Returns:
+            G_value (ndarray): the value of the Gram matrix G.
+            F_value (ndarray): the value of the vector of leaf :class:`Expression` objects F.
+
+        """
         G_value, F_value = wrapper.get_primal_variables()
+        if self._homogeneity_scalings is not None:
+            scalings = self._homogeneity_scalings
+            G_value = np.asarray(G_value) * np.outer(scalings.points, scalings.points)
+            F_value = np.asarray(F_value).reshape(-1) * scalings.expressions
 
-        # Perform a dimension reduction if required
-        if dimension_reduction_heuristic:
+        return G_value, F_value
 
-            # Print the estimated dimension before dimension reduction
-            nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(G_value)
-            wrapper.prepare_heuristic(wc_value, tol_dimension_reduction)
-            if verbose:
-                print('(PEPit) Postprocessing: {} eigenvalue(s) > {} before dimension reduction'.format(nb_eigenvalues,
-                                                                                                        eig_threshold))
-                print('(PEPit) Calling SDP solver')
+    def _assign_dual_values(self, wrapper):
+        """
+        Store the dual values found by the solver in the :class:`Constraint` and :class:`PSDMatrix` objects
+        sent to the wrapper, scaled back if the PEP is normalized.
 
-            # Translate the heuristic into the objective and solve the associated problem
-            if dimension_reduction_heuristic == "trace":
-                wrapper.heuristic(np.identity(Point.counter))
-                solver_status, solver_name, wc_value = wrapper.solve(**kwargs)
+        Args:
+            wrapper (Wrapper): Interface to the solver.
 
-                # Compute minimal number of dimensions
-                G_value, F_value = wrapper.get_primal_variables()
-                nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(G_value)
+        Returns:
+            residual (ndarray): the dual value of the PSD constraint on the Gram matrix.
 
-            elif dimension_reduction_heuristic.startswith("logdet"):
-                niter = int(dimension_reduction_heuristic[6:])
-                for i in range(1, 1 + niter):
-                    W = np.linalg.inv(corrected_G_value + eig_regularization * np.eye(Point.counter))
-                    wrapper.heuristic(W)
-                    solver_status, solver_name, wc_value = wrapper.solve(**kwargs)
+        """
+        residual = wrapper.assign_dual_values()
+        if self._homogeneity_scalings is not None:
+            scalings = self._homogeneity_scalings
+            residual = scalings.objective * np.asarray(residual) / np.outer(scalings.points, scalings.points)
+            for constraint, scaling in zip(self._list_of_constraints_sent_to_wrapper, scalings.constraints):
+                normalized_constraint = self._dict_of_normalized_constraints_and_psd[constraint]
+                if normalized_constraint._dual_variable_value is not None:
+                    constraint._dual_variable_value = float(scalings.objective * scaling
+                                                            * normalized_constraint._dual_variable_value)
+            for psd_matrix, psd_scalings in zip(self._list_of_psd_sent_to_wrapper, scalings.psd):
+                normalized_psd_matrix = self._dict_of_normalized_constraints_and_psd[psd_matrix]
+                psd_matrix._dual_variable_value = scalings.objective * np.outer(psd_scalings, psd_scalings) \
+                    * normalized_psd_matrix._dual_variable_value
+
+        return residual
+
+    @_with_registry
+    def _get_violated_inactive_class_constraints(self, G_value, F_value, tol):
+        """
+        Evaluate at once all the interpolation inequalities that are not in the working set of the constraint
+        generation on the values of the Gram matrix and of the leaf :class:`Expression` objects.
 
-                    # Compute minimal number of dimensions
-                    G_value, F_value = wrapper.get_primal_variables()
-                    nb_eigenvalues, eig_threshold, corrected_G_value = self.get_nb_eigenvalues_and_corrected_matrix(
-                        G_value)
+        Args:
+            G_value (ndarray): the value of the Gram matrix G.
+            F_value (ndarray): the value of the vector of leaf :class:`Expression` objects F.
+            tol (float): the violation above which an inequality is considered violated.
 
-                    # Print the estimated dimension after niter dimension reduction steps
-                    if verbose:
-                        print('(PEPit) Solver status: {} (solver: {});'
-                              ' objective value: {}'.format(solver_status,
-                                                            solver_name,
-                                                            wc_value))
-                        print(
-                            '(PEPit) Postprocessing: {} eigenvalue(s) > {} after {} dimension reduction step(s)'.format(
-                                nb_eigenvalues, eig_threshold, i))
+        Returns:
+            (list): the violated :class:`Constraint` objects, from the most violated to the least violated.
 
-            else:
-                raise ValueError("The argument \'dimension_reduction_heuristic\' must be \'trace\'"
-                                 "or \`logdet\` followed by an integer."
-                                 "Got {}".format(dimension_reduction_heuristic))
+        """
 
-            # Print the estimated dimension after dimension reduction
-            if verbose:
-                print('(PEPit) Solver status: {} (solver: {});'
-                      ' objective value: {}'.format(solver_status,
-                                                    solver_name,
-                                                    wc_value))
-                print('(PEPit) Postprocessing: {} eigenvalue(s) > {} after dimension reduction'.format(nb_eigenvalues,
-                                                                                                       eig_threshold))
+        # Stack the inactive constraints in a deterministic order
+        list_of_constraints = sorted(self._set_of_inactive_class_constraints, key=lambda constraint: constraint.counter)
+        A, b = expressions_to_stacked_sparse_matrix([constraint.expression for constraint in list_of_constraints])
 
-        # Store all the values of points and function values
-        self.G_value = G_value
-        self.F_value = F_value
-        self._eval_points_and_function_values(F_value, G_value, verbose=verbose)
-        dual_objective = self.check_feasibility(wc_value, verbose=verbose)
+        # Evaluate all of them with one matrix-vector product
+        values = A @ np.concatenate([np.asarray(G_value).flatten(order="F"), np.asarray(F_value).reshape(-1)]) + b
+        order = np.argsort(-values, kind="stable")
 
-        # Return the value of the minimal performance metric
-        if return_primal_or_dual == "dual":
-            return dual_objective
-        elif return_primal_or_dual == "primal":
-            return wc_value
-        else:
-            raise ValueError("The argument \'return_primal_or_dual\' must be \'dual\' or \`primal\`."
-                             "Got {}".format(return_primal_or_dual))
+        return [list_of_constraints[k] for k in order if values[k] > tol]
 
     def check_feasibility(self, wc_value, verbose=1):
         """
@@ -687,10 +1409,28 @@ class PEP(object):
                 message += " up to an error of {}".format(-G_min_eig_val)
             print(message)
 
+        # Stack the coefficients of all the constraints, of all the entries of the PSD matrices and of the objective
+        # in one sparse matrix, so that their values and the proof are computed with sparse linear algebra.
+        list_of_expressions = [constraint.expression for constraint in self._list_of_constraints_sent_to_wrapper]
+        for psd_matrix in self._list_of_psd_sent_to_wrapper:
+            size = psd_matrix.shape[0]
+            list_of_expressions += [psd_matrix[i, j] for j in range(size) for i in range(size)]
+        list_of_expressions.append(self.objective)
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+        nb_constraints = len(self._list_of_constraints_sent_to_wrapper)
+
+        # Values of all the stacked expressions, computed from the values of the leaf Points and Expressions
+        expressions_values = A @ self._get_stacked_values_of_leaves(*self._get_values_of_leaves()) + b
+
         # Grab the smallest eigenvalue of all the PSD matrices
         if self._list_of_psd_sent_to_wrapper:
-            psd_min_eig_val = np.min([np.min(np.linalg.eigh(psd_matrix.eval())[0])
-                                      for psd_matrix in self._list_of_psd_sent_to_wrapper])
+            psd_min_eig_val = np.inf
+            first_row = nb_constraints
+            for psd_matrix in self._list_of_psd_sent_to_wrapper:
+                size = psd_matrix.shape[0]
+                psd_matrix_value = expressions_values[first_row:first_row + size ** 2].reshape((size, size), order="F")
+                psd_min_eig_val = min(psd_min_eig_val, np.min(np.linalg.eigh(psd_matrix_value)[0]))
+                first_row += size ** 2
             if verbose:
                 message = "\t\tAll required PSD matrices are indeed positive semi-definite"
                 if psd_min_eig_val < 0:
@@ -699,14 +1439,10 @@ class PEP(object):
 
         # Get the max value of all transgression of the constraints
         if self._list_of_constraints_sent_to_wrapper:
-            max_constraint_error = np.max(
-                [constraint.eval()
-                 for constraint in self._list_of_constraints_sent_to_wrapper
-                 if constraint.equality_or_inequality == "inequality"]
-                + [np.abs(constraint.eval())
-                   for constraint in self._list_of_constraints_sent_to_wrapper
-                   if constraint.equality_or_inequality == "equality"]
-            )
+            is_equality = np.array([constraint.equality_or_inequality == "equality"
+                                    for constraint in self._list_of_constraints_sent_to_wrapper])
+            constraints_values = expressions_values[:nb_constraints]
+            max_constraint_error = np.max(np.where(is_equality, np.abs(constraints_values), constraints_values))
             if verbose:
                 message = "\t\tAll the primal scalar constraints are verified"
                 if max_constraint_error > 0:
@@ -729,8 +1465,12 @@ class PEP(object):
             if residual_min_eig_val < 0:
                 message += " up to an error of {}".format(-residual_min_eig_val)
             print(message)
-        # - <Gram, residual> <= 0
-        constraints_combination = -np.dot(Point.list_of_leaf_points, np.dot(self.residual, Point.list_of_leaf_points))
+        # The proof is the linear combination of the stacked expressions with weights
+        # - dual for each scalar constraint, + dual entry for each entry of the PSD matrices, and + 1 for the objective.
+        # Its coefficients must vanish but its constant term, which is then the dual objective tau.
+        dual_values = np.array([constraint.eval_dual() for constraint in self._list_of_constraints_sent_to_wrapper],
+                               dtype=float)
+        proof_weights = [-dual_values]
 
         # LMI constraints
         # Dual >= 0
@@ -744,43 +1484,31 @@ class PEP(object):
                 print(message)
             # - <psd_matrix, lmi_dual> <= 0
             for psd_matrix in self._list_of_psd_sent_to_wrapper:
-                constraints_combination -= np.sum(psd_matrix.eval_dual() * psd_matrix.matrix_of_expressions)
+                proof_weights.append(np.asarray(psd_matrix.eval_dual(), dtype=float).flatten(order="F"))
 
         # Scalar constraints
         # Dual of inequality constraints >= 0
-        inequality_constraint_dual_values = [constraint.eval_dual()
-                                             for constraint in self._list_of_constraints_sent_to_wrapper
-                                             if constraint.equality_or_inequality == "inequality"]
-        if inequality_constraint_dual_values:
+        inequality_constraint_dual_values = dual_values[[constraint.equality_or_inequality == "inequality"
+                                                         for constraint in self._list_of_constraints_sent_to_wrapper]]
+        if inequality_constraint_dual_values.size > 0:
             inequality_constraint_dual_min_value = np.min(inequality_constraint_dual_values)
             if verbose:
                 message = "\t\tAll the dual scalar values associated with inequality constraints are nonnegative"
                 if inequality_constraint_dual_min_value < 0:
                     message += " up to an error of {}".format(-inequality_constraint_dual_min_value)
                 print(message)
-        # + <expression, dual> <= 0
-        for constraint in self._list_of_constraints_sent_to_wrapper:
-            constraints_combination += constraint.eval_dual() * constraint.expression
 
         # Proof reconstruction
-        # At this stage, constraints_combination must be equal to "objective - tau"
-        # which constitutes the proof as it has to be non-positive.
-        # Compute an expression that should be exactly equal to the constant tau.
-        dual_objective_expression = self.objective - constraints_combination
-        # Operation over the decomposition dict of dual_objective_expression
-        dual_objective_expression_decomposition_dict = prune_dict(
-            symmetrize_dict(
-                dual_objective_expression.decomposition_dict
-            )
-        )
-        # Get the actual dual_objective from its dict
-        if 1 in dual_objective_expression_decomposition_dict.keys():
-            dual_objective = dual_objective_expression_decomposition_dict[1]
-        else:
-            dual_objective = 0.
+        # At this stage, objective - <expression, dual> - <psd_matrix, lmi_dual> - <Gram, residual>
+        # must be equal to the constant tau, which constitutes the proof.
+        proof_weights.append(np.ones((1,)))
+        proof_weights = np.concatenate(proof_weights)
+        dual_objective_coefficients = A.T @ proof_weights
+        dual_objective = float(proof_weights @ b)
+        # - <Gram, residual> <= 0, with the residual symmetrized as G is symmetric
+        dual_objective_coefficients[:Point.counter ** 2] += ((self.residual + self.residual.T) / 2).flatten(order="F")
         # Compute the remaining terms, that should be small and only due to numerical stability errors
-        remaining_terms = np.sum(np.abs([value for key, value in dual_objective_expression_decomposition_dict.items()
-                                         if key != 1]))
+        remaining_terms = np.sum(np.abs(dual_objective_coefficients))
         if verbose:
             message = "(PEPit) The worst-case guarantee proof is perfectly reconstituted"
             if remaining_terms > 0:
@@ -920,3 +1648,244 @@ class PEP(object):
                                 raise TypeError(
                                     "Expressions are made of function values, inner products and constants only!"
                                     "Got {}".format(type(sub_expression)))
+
+    @staticmethod
+    def _get_values_of_leaves():
+        """
+        Return the values of the leaf :class:`Point` and :class:`Expression` objects after the PEP has been solved.
+
+        Returns:
+            points_values (ndarray): the values of the leaf :class:`Point` objects, one per line, ordered by counter.
+            function_values (ndarray): the values of the leaf :class:`Expression` objects, ordered by counter.
+
+        Raises:
+            ValueError("The PEP must be solved to evaluate Points!") if the PEP has not been solved yet.
+
+        """
+        points_values = np.array([point.eval() for point in Point.list_of_leaf_points], dtype=float)
+        points_values = points_values.reshape((Point.counter, points_values.size // max(Point.counter, 1)))
+        function_values = np.array([expression.eval() for expression in Expression.list_of_leaf_expressions],
+                                   dtype=float)
+
+        return points_values, function_values
+
+    @staticmethod
+    def _get_stacked_values_of_leaves(points_values, function_values):
+        """
+        Stack the (column-major) vectorization of the Gram matrix of the leaf :class:`Point` objects
+        and the values of the leaf :class:`Expression` objects,
+        as in :func:`PEPit.tools.expressions_to_matrices.expressions_to_stacked_sparse_matrix`.
+
+        Args:
+            points_values (ndarray): the values of the leaf :class:`Point` objects, one per line.
+            function_values (ndarray): the values of the leaf :class:`Expression` objects.
+
+        Returns:
+            (ndarray): the vector (vec(G), F).
+
+        """
+        return np.concatenate([(points_values @ points_values.T).flatten(order="F"), function_values])
+
+    @_with_registry
+    def export(self, path, format="sdpa"):
+        """
+        Write the SDP associated with the :class:`PEP` in a file, in order to solve it outside of PEPit.
+
+        The SDP maximizes the objective, that is the minimum of the performance metrics, subject to all the
+        constraints of the :class:`PEP`, in the same order as they are sent to a wrapper by the method `solve`.
+        Its variables are the Gram matrix :math:`G \succeq 0` of the leaf :class:`Point` objects
+        and the vector :math:`F` of the leaf :class:`Expression` objects.
+        Once solved, the solution can be loaded with the method `import_solution`,
+        possibly after building and exporting the same :class:`PEP` again in another process.
+
+        Args:
+            path (str): the path of the file to write.
+            format (str, optional): "sdpa" for the SDPA sparse format (see `write_sdpa`),
+                                    "cbf" for the Conic Benchmark Format (see `write_cbf`),
+                                    or "npz" for an uncompressed NumPy bundle (see `write_npz`).
+                                    Default is "sdpa".
+
+        Raises:
+            ValueError: if `format` is not one of the supported formats.
+
+        """
+        writers = {"sdpa": write_sdpa, "cbf": write_cbf, "npz": write_npz}
+        if format not in writers:
+            raise ValueError("The argument \'format\' must be \'sdpa\', \'cbf\' or \'npz\'."
+                             "Got {}".format(format))
+
+        # Create the objective and all the constraints, as the method solve does
+        list_of_leaf_functions, list_of_functions_with_constraints = self._set_up_problem()
+        list_of_constraints, list_of_psd = self._get_list_of_constraints_and_psd(list_of_leaf_functions,
+                                                                                 list_of_functions_with_constraints)
+        self._list_of_constraints_sent_to_wrapper = list_of_constraints
+        self._list_of_psd_sent_to_wrapper = list_of_psd
+
+        # Stack the constraints, the entries of the PSD matrices and the objective
+        A, b, is_equality, psd_sizes = self._get_exported_problem()
+        writers[format](path, A, b, is_equality, psd_sizes, Point.counter)
+
+    def _get_exported_problem(self):
+        """
+        Stack the expressions of the constraints sent to the wrapper, of the entries of the PSD matrices sent to the
+        wrapper (column by column), and of the objective, in that order (see `expressions_to_stacked_sparse_matrix`).
+
+        Returns:
+            A (scipy.sparse.csr_matrix): the stacked weights of (vec(G), F).
+            b (numpy array): the stacked constant terms.
+            is_equality (numpy array): True for the equality constraints, False for the inequality ones.
+            psd_sizes (list): the sizes of the PSD matrices.
+
+        """
+        list_of_expressions = [constraint.expression for constraint in self._list_of_constraints_sent_to_wrapper]
+        for psd_matrix in self._list_of_psd_sent_to_wrapper:
+            size = psd_matrix.shape[0]
+            list_of_expressions += [psd_matrix[i, j] for j in range(size) for i in range(size)]
+        list_of_expressions.append(self.objective)
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+        is_equality = np.array([constraint.equality_or_inequality == "equality"
+                                for constraint in self._list_of_constraints_sent_to_wrapper], dtype=bool)
+        psd_sizes = [psd_matrix.shape[0] for psd_matrix in self._list_of_psd_sent_to_wrapper]
+
+        return A, b, is_equality, psd_sizes
+
+    @_with_registry
+    def import_solution(self, path, format="sdpa", verbose=1):
+        """
+        Load the solution of the SDP written by the method `export`, and store all the primal and dual values
+        as the method `solve` does.
+
+        Args:
+            path (str): the path of the solution file.
+            format (str, optional): "sdpa" for a solution of the SDPA sparse format as written by CSDP
+                                    (see `read_sdpa_solution`), or "npz" for a NumPy bundle with the arrays
+                                    "G" and "F" (primal values), "residual" (dual of :math:`G \succeq 0`),
+                                    "constraint_duals" (one per constraint) and "psd_dual_0", "psd_dual_1", ...
+                                    (one per PSD matrix). Default is "sdpa".
+            verbose (int, optional): Level of information details to print.
+
+        Returns:
+            float: Worst-case guarantee of the PEP (dual value of the objective).
+
+        Raises:
+            ValueError: if the :class:`PEP` has not been exported, or if `format` is not one of the supported formats.
+
+        """
+        if self.objective is None:
+            raise ValueError("The PEP must be exported before importing a solution!")
+
+        nb_points = Point.counter
+        nb_constraints = len(self._list_of_constraints_sent_to_wrapper)
+        if format == "sdpa":
+            _, _, is_equality, psd_sizes = self._get_exported_problem()
+            y, X = read_sdpa_solution(path, get_sdpa_block_structure(is_equality, psd_sizes, nb_points))
+            nb_gram_variables = nb_points * (nb_points + 1) // 2
+            G_value = (get_symmetric_vectorization_matrix(nb_points) @ y[:nb_gram_variables]).reshape(
+                (nb_points, nb_points), order="F")
+            F_value = y[nb_gram_variables:]
+            residual = X[0]
+
+            # The dual value of an equality constraint is the difference of the ones of its two inequalities
+            constraint_duals = np.zeros(nb_constraints)
+            if nb_constraints > 0:
+                lp_duals = X[1]
+                constraint_duals = lp_duals[:nb_constraints].copy()
+                constraint_duals[is_equality] -= lp_duals[nb_constraints:]
+            psd_duals = X[1 + (nb_constraints > 0):]
+
+        elif format == "npz":
+            with np.load(path, allow_pickle=False) as data:
+                G_value = data["G"]
+                F_value = data["F"]
+                residual = data["residual"]
+                constraint_duals = data["constraint_duals"]
+                psd_duals = [data["psd_dual_{}".format(k)] for k in range(len(self._list_of_psd_sent_to_wrapper))]
+
+        else:
+            raise ValueError("The argument \'format\' must be \'sdpa\' or \'npz\'."
+                             "Got {}".format(format))
+
+        # Store the dual values
+        for constraint, dual_value in zip(self._list_of_constraints_sent_to_wrapper, constraint_duals):
+            constraint._dual_variable_value = float(dual_value)
+        for psd_matrix, dual_value in zip(self._list_of_psd_sent_to_wrapper, psd_duals):
+            psd_matrix._dual_variable_value = dual_value
+        self.residual = residual
+
+        # Store the primal values, and check the solution
+        self.solver_status = "imported"
+        self.solver_name = format
+        self.G_value = G_value
+        self.F_value = F_value
+        self._eval_points_and_function_values(F_value, G_value, verbose=verbose)
+
+        return self.check_feasibility(self.objective.eval(), verbose=verbose)
+
+    @_with_registry
+    def eval_many(self, objects):
+        """
+        Compute, store and return the values of many :class:`Point`, :class:`Expression`, :class:`Constraint`
+        and / or :class:`PSDMatrix` objects at once, after the PEP has been solved.
+
+        Contrary to evaluating them one by one, the coefficients of all the objects are stacked in sparse matrices,
+        and all the values are computed by a couple of matrix products with the values of the leaf :class:`Point`
+        and :class:`Expression` objects.
+
+        Args:
+            objects (list): a list of :class:`Point`, :class:`Expression`, :class:`Constraint`
+                            and / or :class:`PSDMatrix` objects.
+
+        Returns:
+            (list): the values of the elements of `objects`, as returned by their method `eval`.
+
+        Raises:
+            ValueError("The PEP must be solved to evaluate Points!") if the PEP has not been solved yet.
+            TypeError: if some element of `objects` is not one of the supported types.
+
+        """
+        # Imported here as scipy is only needed for batched evaluations
+        from scipy.sparse import csr_matrix
+
+        points_values, function_values = self._get_values_of_leaves()
+
+        # Sort the objects that are not evaluated yet
+        points_to_eval = list()
+        expressions_to_eval = list()
+        for element in objects:
+            if isinstance(element, Point):
+                if element._value is None:
+                    points_to_eval.append(element)
+            elif isinstance(element, Expression):
+                if element._value is None:
+                    expressions_to_eval.append(element)
+            elif isinstance(element, Constraint):
+                if element.expression._value is None:
+                    expressions_to_eval.append(element.expression)
+            elif isinstance(element, PSDMatrix):
+                expressions_to_eval += [expression for expression in element.matrix_of_expressions.flatten()
+                                        if expression._value is None]
+            else:
+                raise TypeError("Only Points, Expressions, Constraints and PSDMatrix objects can be evaluated!"
+                                " Got {}".format(type(element)))
+
+        # Evaluate all the points at once, from their stacked coefficients
+        if points_to_eval:
+            list_of_coefficients = [point._get_coefficients() for point in points_to_eval]
+            rows = np.concatenate([np.full(indices.shape, row, dtype=int)
+                                   for row, (indices, _) in enumerate(list_of_coefficients)])
+            columns = np.concatenate([indices for indices, _ in list_of_coefficients])
+            values = np.concatenate([values for _, values in list_of_coefficients])
+            coefficients = csr_matrix((values, (rows, columns)), shape=(len(points_to_eval), Point.counter))
+            for point, value in zip(points_to_eval, coefficients @ points_values):
+                point._value = value
+
+        # Evaluate all the expressions at once, from their stacked sparse representations
+        if expressions_to_eval:
+            A, b = expressions_to_stacked_sparse_matrix(expressions_to_eval)
+            expressions_values = A @ self._get_stacked_values_of_leaves(points_values, function_values) + b
+            for expression, value in zip(expressions_to_eval, expressions_values.tolist()):
+                expression._value = value
+
+        # The values of the constraints and PSD matrices are those of their expressions
+        return [element.eval() for element in objects]
+
@@ -0,0 +1,292 @@
+import os
+import hashlib
+import tempfile
+import threading
+
+import numpy as np
+
+from PEPit.point import Point
+from PEPit.expression import Expression
+
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+
+
+def _round_logarithms(values):
+    """
+    Args:
+        values (ndarray): nonzero values.
+
+    Returns:
+        (ndarray): the logarithms of the magnitudes of `values`, rounded to `PEPCache.homogeneity_decimals` decimals.
+
+    """
+    # Adding 0 turns the negative zeros into positive ones, so that they are hashed the same way
+    return np.round(np.log(np.abs(values)), PEPCache.homogeneity_decimals) + 0.
+
+
+def _get_normalized_problem(scalings):
+    """
+    Args:
+        scalings (HomogeneityScalings): the scalings of a PEP (see `get_homogeneity_scalings`).
+
+    Returns:
+        (scipy.sparse.csr_matrix): the coefficients of the normalized PEP, without zeros and with sorted indices.
+        (ndarray): the constant terms of the normalized PEP.
+
+    """
+    A = scalings.normalized_A
+    A.eliminate_zeros()
+    A.sum_duplicates()
+    A.sort_indices()
+    return A, scalings.normalized_b
+
+
+class PEPCache(object):
+    """
+    A :class:`PEPCache` object stores the solutions of solved PEPs on disk, in order to reuse them.
+
+    Regression tests and parameter sweeps often solve the very same PEPs again and again.
+    A :class:`PEPCache` identifies a PEP by a key, that is a hash of its compiled SDP
+    (sizes, type of each constraint, shape of each LMI, and all the coefficients),
+    and of the settings of the wrapper and of the solver.
+    After a PEP is solved, its worst-case values, the values of the Gram matrix and of the function values,
+    and all the dual variables are stored in a file of the cache directory named after this key.
+    When a PEP with the same key is solved later, possibly in another process,
+    this solution is loaded instead of calling the solver.
+
+    With the option `homogeneity` of the method `PEP.solve`, the solution of the normalized PEP is stored instead
+    (see `get_homogeneity_scalings`), and it is shared by all the PEPs related by scalings,
+    e.g. the same method with different smoothness constants and initial distances.
+    As the normalized coefficients of such PEPs only agree up to rounding errors, they are compared with
+    a tolerance: a stored solution is reused only if all the normalized coefficients of the PEP it was computed for
+    match the ones of the current PEP up to a relative error `homogeneity_rtol`.
+
+    Attributes:
+        directory (str): the directory in which the solutions are stored.
+        nb_hits (int): number of PEPs whose solution was found in the cache.
+        nb_misses (int): number of PEPs whose solution was not found in the cache.
+
+    Example:
+        >>> from PEPit import PEPCache
+        >>> from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+        >>> cache = PEPCache("pep_cache")
+        >>> with cache:
+        ...     for _ in range(3):
+        ...         pepit_tau, theoretical_tau = wc_gradient_descent(L=1, gamma=1, n=5, verbose=-1)
+        >>> cache.nb_misses, cache.nb_hits
+        (1, 2)
+
+    """
+    # Caches activated through the context manager, per thread.
+    _active_caches = threading.local()
+
+    # Number of decimals of the logarithms of the normalized coefficients that are hashed
+    # in the keys of normalized PEPs (see `get_key`).
+    homogeneity_decimals = 6
+
+    # Relative tolerance on the normalized coefficients of two PEPs sharing the same key,
+    # under which the solution of one of them is reused for the other (see `get_solution`).
+    homogeneity_rtol = 1e-9
+
+    def __init__(self, directory):
+        """
+        A :class:`PEPCache` object is instantiated from the directory in which the solutions are stored.
+
+        It can then be given to the method `PEP.solve`, or activated through a `with` statement
+        to be used by every PEP solved within the block.
+
+        Args:
+            directory (str): the directory in which the solutions are stored. It is created if it does not exist.
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.nb_hits = 0
+        self.nb_misses = 0
+
+    def __enter__(self):
+        """
+        Activate the cache in the current thread.
+
+        Returns:
+            cache (PEPCache): self.
+
+        """
+        if not hasattr(PEPCache._active_caches, "stack"):
+            PEPCache._active_caches.stack = list()
+        PEPCache._active_caches.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Deactivate the cache in the current thread.
+
+        """
+        PEPCache._active_caches.stack.pop()
+
+    @staticmethod
+    def get_active_cache():
+        """
+        Return the cache activated in the current thread, if any.
+
+        Returns:
+            cache (PEPCache or None): the innermost activated cache, None if there is none.
+
+        """
+        stack = getattr(PEPCache._active_caches, "stack", list())
+        if stack:
+            return stack[-1]
+        else:
+            return None
+
+    @staticmethod
+    def get_key(list_of_constraints, list_of_psd, settings, scalings=None):
+        """
+        Compute the key of a PEP.
+
+        All the :class:`Constraint` expressions and all the entries of the :class:`PSDMatrix` objects
+        (in column-major order) are stacked in that order into the rows of one sparse matrix
+        (see `expressions_to_stacked_sparse_matrix`).
+        The key is the SHA-256 hash of the sizes of the problem, of the type of each constraint,
+        of the shape of each LMI, of this matrix and its constant terms, and of the settings.
+
+        If the scalings of the PEP are provided, the key is the one of its normalized PEP instead,
+        so that all the PEPs related by scalings share the same key.
+        The coefficients of the normalized PEP are then hashed through their signs and the logarithms
+        of their magnitudes, rounded to `homogeneity_decimals` decimals.
+        Close but different normalized PEPs may then share the same key:
+        `get_solution` tells them apart by comparing their coefficients.
+
+        Args:
+            list_of_constraints (list): list of :class:`Constraint` objects, in the order they are sent to the wrapper.
+            list_of_psd (list): list of :class:`PSDMatrix` objects, in the order they are sent to the wrapper.
+            settings (dict): the settings of the wrapper and of the solver, whose values are hashed through `repr`.
+            scalings (HomogeneityScalings, optional): the scalings of the PEP (see `get_homogeneity_scalings`).
+
+        Returns:
+            key (str): the hexadecimal key of the PEP.
+
+        """
+
+        # Describe the problem and collect all the expressions
+        description = [Point.counter, Expression.counter]
+        description += [constraint.equality_or_inequality for constraint in list_of_constraints]
+        description += [psd_matrix.shape for psd_matrix in list_of_psd]
+        description += sorted((name, repr(value)) for name, value in settings.items())
+        if scalings is None:
+            list_of_expressions = [constraint.expression for constraint in list_of_constraints]
+            list_of_expressions += [psd_matrix[i, j] for psd_matrix in list_of_psd
+                                    for j in range(psd_matrix.shape[1]) for i in range(psd_matrix.shape[0])]
+            A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+            A.sum_duplicates()
+            A.sort_indices()
+        else:
+            A, b = _get_normalized_problem(scalings)
+
+        # Hash the description and the coefficients
+        if scalings is None:
+            list_of_arrays = [A.indptr, A.indices, A.data, b]
+        else:
+            nonzero_b = np.flatnonzero(b)
+            list_of_arrays = [A.indptr, A.indices, np.sign(A.data), _round_logarithms(A.data),
+                              nonzero_b, np.sign(b[nonzero_b]), _round_logarithms(b[nonzero_b])]
+        hash_function = hashlib.sha256(repr(description).encode())
+        for array in list_of_arrays:
+            hash_function.update(np.ascontiguousarray(array).tobytes())
+
+        return hash_function.hexdigest()
+
+    def _get_path(self, key):
+        """
+        Args:
+            key (str): the key of a PEP.
+
+        Returns:
+            (str): the path of the file storing the solution of this PEP.
+
+        """
+        return os.path.join(self.directory, "{}.npz".format(key))
+
+    def get_solution(self, key, scalings=None):
+        """
+        Return the solution of a PEP stored in the cache, if any.
+
+        If the scalings of the PEP are provided, the solution of its normalized PEP is returned only if
+        the normalized coefficients stored with it match the ones of the PEP
+        up to the relative tolerance `homogeneity_rtol`.
+
+        Args:
+            key (str): the key of a PEP.
+            scalings (HomogeneityScalings, optional): the scalings of the PEP (see `get_homogeneity_scalings`).
+
+        Returns:
+            solution (dict or None): the solution (see `set_solution`), None if there is none.
+
+        """
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            self.nb_misses += 1
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            solution = {name: data[name] for name in data.files}
+
+        # Check that the stored solution is the one of the same normalized PEP, up to the tolerance
+        stored_A_data = solution.pop("normalized_A_data", None)
+        stored_b = solution.pop("normalized_b", None)
+        if scalings is not None:
+            A, b = _get_normalized_problem(scalings)
+            if (stored_A_data is None or stored_A_data.shape != A.data.shape or stored_b.shape != b.shape
+                    or not np.allclose(stored_A_data, A.data, rtol=self.homogeneity_rtol, atol=0)
+                    or not np.allclose(stored_b, b, rtol=self.homogeneity_rtol, atol=0)):
+                self.nb_misses += 1
+                return None
+
+        solution["psd_duals"] = [solution.pop("psd_dual_{}".format(k)) for k in range(int(solution["nb_psd"]))]
+        for name in ["wc_value", "dual_objective"]:
+            solution[name] = float(solution[name])
+        for name in ["solver_status", "solver_name"]:
+            solution[name] = str(solution[name])
+        self.nb_hits += 1
+
+        return solution
+
+    def set_solution(self, key, solution, scalings=None):
+        """
+        Store the solution of a PEP.
+
+        The file is first written under a temporary name, then renamed,
+        so that several processes can share the same cache directory.
+        If the scalings of the PEP are provided, the normalized coefficients are stored with the solution
+        (of the normalized PEP), to be compared with the ones of the PEPs sharing the same key.
+
+        Args:
+            key (str): the key of a PEP.
+            solution (dict): the solution, with entries "wc_value" and "dual_objective" (float),
+                             "solver_status" and "solver_name" (str), "G_value", "F_value" and "residual" (ndarray),
+                             "constraint_duals" (ndarray, one value per :class:`Constraint`)
+                             and "psd_duals" (list of ndarray, one per :class:`PSDMatrix`).
+            scalings (HomogeneityScalings, optional): the scalings of the PEP (see `get_homogeneity_scalings`).
+
+        """
+        arrays = {name: np.asarray(value) for name, value in solution.items() if name != "psd_duals"}
+        arrays["nb_psd"] = np.asarray(len(solution["psd_duals"]))
+        for k, psd_dual in enumerate(solution["psd_duals"]):
+            arrays["psd_dual_{}".format(k)] = np.asarray(psd_dual, dtype=float)
+        if scalings is not None:
+            A, b = _get_normalized_problem(scalings)
+            arrays["normalized_A_data"], arrays["normalized_b"] = A.data, b
+
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".npz")
+        with os.fdopen(file_descriptor, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary_path, self._get_path(key))
+
+    def clear(self):
+        """
+        Remove all the solutions stored in the cache directory.
+
+        """
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith(".npz"):
+                os.remove(os.path.join(self.directory, file_name))
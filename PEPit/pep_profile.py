@@ -0,0 +1,168 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+class PEPProfile(object):
+    """
+    A :class:`PEPProfile` object stores the time and memory spent in each phase of the method `PEP.solve`.
+
+    The phases are "set_class_constraints" (creation of the interpolation and partition constraints),
+    "homogeneity" (normalization of the PEP, only with the option `homogeneity`),
+    "send_constraint_to_solver" (presolve and transmission of the variables and constraints to the wrapper),
+    "generate_problem" (compilation of the problem by the wrapper), "solver" (all the solver calls,
+    including the dimension reduction steps), "eval_points_and_function_values"
+    (evaluation of the leaf :class:`Point` and :class:`Expression` objects) and "check_feasibility".
+    The phases "set_class_constraints" and "send_constraint_to_solver" are also broken down per class
+    of :class:`Function` (and of :class:`BlockPartition` for the partition constraints).
+
+    For each phase, the wall-clock time, the CPU time and the number of calls are stored.
+    The peak allocations (in MB, above the memory allocated when the phase starts) are stored as well
+    when the module `tracemalloc` is tracing (e.g. after `tracemalloc.start()`), and are NaN otherwise.
+    A phase entered several times (e.g. the solver calls of the dimension reduction,
+    or the rounds of the constraint generation) accumulates its times and keeps its largest peak.
+
+    After each call to the method `PEP.solve`, the profile is stored in the attribute `profile` of the :class:`PEP`.
+
+    Attributes:
+        phases (dict): mapping each phase name to a dictionary with entries "wall_time", "cpu_time" (in seconds),
+                       "peak_memory" (in MB) and "nb_calls".
+        function_classes (dict): mapping each pair (phase name, name of a class of :class:`Function`)
+                                 to a dictionary with the same entries.
+        list_of_hooks (list): class attribute. List of callables, each one being called with the :class:`PEPProfile`
+                              and a dictionary describing one measurement (entries "phase", "function_class"
+                              (None for a whole phase), "wall_time", "cpu_time" and "peak_memory")
+                              as soon as the measurement ends.
+
+    Example:
+        >>> from PEPit import PEPProfile
+        >>> from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+        >>> def export_measurement(profile, record):
+        ...     print(record["phase"], record["function_class"], record["wall_time"])
+        >>> PEPProfile.list_of_hooks.append(export_measurement)
+        >>> pepit_tau, theoretical_tau = wc_gradient_descent(L=1, gamma=1, n=5, verbose=-1)
+        >>> PEPProfile.list_of_hooks.remove(export_measurement)
+
+    """
+    # Callables called with the profile and each measurement as soon as it ends.
+    # This list is not reset when instantiating a new PEPProfile.
+    list_of_hooks = list()
+
+    def __init__(self):
+        """
+        A :class:`PEPProfile` object can be instantiated without any argument.
+
+        """
+        self.phases = dict()
+        self.function_classes = dict()
+
+        # Measurements in progress, from the outermost to the innermost
+        self._stack = list()
+
+    @contextmanager
+    def measure(self, phase, function_class=None):
+        """
+        Measure the time and memory spent in a `with` block, and add them to a phase of the profile.
+
+        Args:
+            phase (str): the name of the phase.
+            function_class (str, optional): the name of a class of :class:`Function`.
+                                            If provided, the measurement is added to the breakdown
+                                            of the phase per function class, and not to the phase itself.
+
+        """
+        frame = {"peak": 0}
+        tracing = tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak")
+        if tracing:
+            # The peak of the measurements in progress is saved before being reset
+            current_memory, peak_memory = tracemalloc.get_traced_memory()
+            for outer_frame in self._stack:
+                outer_frame["peak"] = max(outer_frame["peak"], peak_memory)
+            tracemalloc.reset_peak()
+            frame["start"] = frame["peak"] = current_memory
+        self._stack.append(frame)
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.process_time()
+
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start_wall_time
+            cpu_time = time.process_time() - start_cpu_time
+            self._stack.pop()
+            peak_memory = np.nan
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                for outer_frame in self._stack:
+                    outer_frame["peak"] = max(outer_frame["peak"], peak)
+                peak_memory = (max(frame["peak"], peak) - frame["start"]) / 2 ** 20
+            self._add_measurement(phase, function_class, wall_time, cpu_time, peak_memory)
+
+    def _add_measurement(self, phase, function_class, wall_time, cpu_time, peak_memory):
+        """
+        Add a measurement to the profile, and call the hooks.
+
+        Args:
+            phase (str): the name of the phase.
+            function_class (str or None): the name of a class of :class:`Function`, or None for the whole phase.
+            wall_time (float): the wall-clock time (in seconds).
+            cpu_time (float): the CPU time (in seconds).
+            peak_memory (float): the peak allocations (in MB), NaN if not measured.
+
+        """
+        if function_class is None:
+            entries = self.phases
+            key = phase
+        else:
+            entries = self.function_classes
+            key = (phase, function_class)
+
+        if key not in entries:
+            entries[key] = {"wall_time": 0., "cpu_time": 0., "peak_memory": np.nan, "nb_calls": 0}
+        entry = entries[key]
+        entry["wall_time"] += wall_time
+        entry["cpu_time"] += cpu_time
+        entry["peak_memory"] = np.fmax(entry["peak_memory"], peak_memory)
+        entry["nb_calls"] += 1
+
+        record = {"phase": phase, "function_class": function_class,
+                  "wall_time": wall_time, "cpu_time": cpu_time, "peak_memory": peak_memory}
+        for hook in PEPProfile.list_of_hooks:
+            hook(self, record)
+
+    def get_phases_table(self):
+        """
+        Gather the measurements of the phases in a table.
+
+        Returns:
+            table (pandas.DataFrame): one row per phase, in order of first call, with the columns "wall_time",
+                                      "cpu_time", "peak_memory" and "nb_calls".
+
+        """
+        return pd.DataFrame.from_dict(self.phases, orient="index",
+                                      columns=["wall_time", "cpu_time", "peak_memory", "nb_calls"])
+
+    def get_function_classes_table(self):
+        """
+        Gather the measurements of the phases per class of :class:`Function` in a table.
+
+        Returns:
+            table (pandas.DataFrame): one row per phase and function class, indexed by both,
+                                      with the columns "wall_time", "cpu_time", "peak_memory" and "nb_calls".
+
+        """
+        index = pd.MultiIndex.from_tuples(list(self.function_classes.keys()), names=["phase", "function_class"]) \
+            if self.function_classes else pd.MultiIndex.from_arrays([[], []], names=["phase", "function_class"])
+        return pd.DataFrame(list(self.function_classes.values()), index=index,
+                            columns=["wall_time", "cpu_time", "peak_memory", "nb_calls"])
+
+    def get_total_time(self):
+        """
+        Returns:
+            (float): the wall-clock time (in seconds) spent in all the phases.
+
+        """
+        return sum([entry["wall_time"] for entry in self.phases.values()])
@@ -0,0 +1,171 @@
+import threading
+
+from PEPit.point import Point
+from PEPit.expression import Expression
+from PEPit.constraint import Constraint
+from PEPit.psd_matrix import PSDMatrix
+
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+
+
+class PEPTemplate(object):
+    """
+    A :class:`PEPTemplate` object stores compiled PEPs in order to reuse their structure.
+
+    When sweeping over algorithm or class parameters (step sizes, smoothness or strong convexity parameters, ...),
+    all the generated PEPs share the same structure: same Gram matrix and function values sizes,
+    same constraints, and same sparsity patterns. Only the numerical coefficients of the constraints vary.
+    A :class:`PEPTemplate` detects this common structure, compiles the problem once with symbolic coefficients
+    (e.g. `cvxpy.Parameter` objects in :class:`CvxpyWrapper`), and, for each subsequent PEP sharing the same structure,
+    only updates those coefficients before calling the solver.
+
+    The structure of a PEP is described by its signature (see the method `get_signature`).
+    Two PEPs sharing the same signature share the same compiled problem.
+    Note that specific parameter values may cancel some coefficients, leading to a different structure,
+    hence to a new compilation.
+
+    Attributes:
+        _compiled_problems (dict): the compiled problems, indexed by their signature.
+        nb_compilations (int): number of problems compiled from scratch.
+        nb_updates (int): number of problems solved after a simple update of coefficients.
+
+    Example:
+        >>> from PEPit import PEPTemplate
+        >>> from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+        >>> template = PEPTemplate()
+        >>> with template:
+        ...     for gamma in [.6, 1.2, 1.8]:
+        ...         pepit_tau, theoretical_tau = wc_gradient_descent(L=1, gamma=gamma, n=5, verbose=-1)
+        >>> template.nb_compilations, template.nb_updates
+        (1, 2)
+
+    """
+    # Templates activated through the context manager, per thread.
+    _active_templates = threading.local()
+
+    def __init__(self):
+        """
+        A :class:`PEPTemplate` object can be instantiated without any argument.
+
+        It can then be given to the method `PEP.solve`, or activated through a `with` statement
+        to be used by every PEP solved within the block.
+
+        """
+        self._compiled_problems = dict()
+        self.nb_compilations = 0
+        self.nb_updates = 0
+
+    def __enter__(self):
+        """
+        Activate the template in the current thread.
+
+        Returns:
+            template (PEPTemplate): self.
+
+        """
+        if not hasattr(PEPTemplate._active_templates, "stack"):
+            PEPTemplate._active_templates.stack = list()
+        PEPTemplate._active_templates.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Deactivate the template in the current thread.
+
+        """
+        PEPTemplate._active_templates.stack.pop()
+
+    @staticmethod
+    def get_active_template():
+        """
+        Return the template activated in the current thread, if any.
+
+        Returns:
+            template (PEPTemplate or None): the innermost activated template, None if there is none.
+
+        """
+        stack = getattr(PEPTemplate._active_templates, "stack", list())
+        if stack:
+            return stack[-1]
+        else:
+            return None
+
+    @staticmethod
+    def get_signature(wrapper_name, list_of_constraints_sent_to_solver, objective):
+        """
+        Compute the signature of a PEP, together with its coefficients.
+
+        All the :class:`Constraint` expressions, all the entries of the :class:`PSDMatrix` objects
+        (in column-major order) and the objective are stacked in that order into the rows of one sparse matrix
+        (see `expressions_to_stacked_sparse_matrix`).
+        The signature gathers the sizes of the problem, the type of each constraint,
+        and the sparsity pattern of this matrix.
+
+        Args:
+            wrapper_name (str): the name of the wrapper that compiles the problem.
+            list_of_constraints_sent_to_solver (list): list of :class:`Constraint` and :class:`PSDMatrix` objects.
+            objective (Expression): the objective function of the PEP (to be maximized).
+
+        Returns:
+            signature (tuple): the hashable signature of the PEP.
+            A (scipy.sparse.csr_matrix): the stacked weights of (vec(G), F).
+            b (numpy array): the stacked constant terms.
+
+        Raises:
+            TypeError if `list_of_constraints_sent_to_solver` contains other objects than
+            :class:`Constraint` and :class:`PSDMatrix` ones.
+
+        """
+
+        # Describe the constraints and collect all the expressions
+        description = [wrapper_name, Point.counter, Expression.counter]
+        list_of_expressions = list()
+        for constraint_or_psd in list_of_constraints_sent_to_solver:
+            if isinstance(constraint_or_psd, Constraint):
+                description.append(constraint_or_psd.equality_or_inequality)
+                list_of_expressions.append(constraint_or_psd.expression)
+            elif isinstance(constraint_or_psd, PSDMatrix):
+                description.append(constraint_or_psd.shape)
+                list_of_expressions += [constraint_or_psd[i, j]
+                                        for j in range(constraint_or_psd.shape[1])
+                                        for i in range(constraint_or_psd.shape[0])]
+            else:
+                raise TypeError("The list of constraints that are sent to the solver should contain only"
+                                "\'Constraint\' objects of \'PSDMatrix\' objects."
+                                "Got {}".format(type(constraint_or_psd)))
+        list_of_expressions.append(objective)
+
+        # Compute the coefficients and their sparsity pattern
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+        A.sort_indices()
+        signature = (tuple(description), A.indptr.tobytes(), A.indices.tobytes())
+
+        return signature, A, b
+
+    def get_compiled_problem(self, signature):
+        """
+        Return the compiled problem associated with a signature, if any.
+
+        Args:
+            signature (tuple): the signature of a PEP.
+
+        Returns:
+            compiled_problem (dict or None): the wrapper-specific compiled problem, None if there is none.
+
+        """
+        compiled_problem = self._compiled_problems.get(signature)
+        if compiled_problem is not None:
+            self.nb_updates += 1
+        return compiled_problem
+
+    def set_compiled_problem(self, signature, compiled_problem):
+        """
+        Store a compiled problem.
+
+        Args:
+            signature (tuple): the signature of a PEP.
+            compiled_problem (dict): the wrapper-specific compiled problem.
+
+        """
+        self._compiled_problems[signature] = compiled_problem
+        self.nb_compilations += 1
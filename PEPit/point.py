@@ -1,11 +1,13 @@
 import numpy as np
 
 from PEPit.expression import Expression
+from PEPit.registry import RegisteredClass
 
-from PEPit.tools.dict_operations import merge_dict, prune_dict, multiply_dicts
+from PEPit.tools.dict_operations import merge_dict, add_dict_in_place, prune_dict, multiply_dicts
+from PEPit.tools.coefficient_operations import add_coefficients, multiply_coefficients
 
 
-class Point(object):
+class Point(object, metaclass=RegisteredClass):
     """
     A :class:`Point` encodes an element of a pre-Hilbert space, either a point or a gradient.
 
@@ -20,6 +22,11 @@ class Point(object):
                                    Keys are :class:`Point` objects.
                                    And values are their associated coefficients.
         counter (int): counts the number of leaf :class:`Point` objects.
+        _coefficients (tuple): sparse vector of coefficients of self over the counters of the leaf
+                               :class:`Point` objects, as a tuple (sorted indices, values) of numpy arrays.
+                               In compact mode, it stores the decomposition of the non-leaf :class:`Point` objects,
+                               and `decomposition_dict` is only computed if required.
+                               Set to None until it is required.
 
     :class:`Point` objects can be added or subtracted together.
     They can also be multiplied and divided by a scalar value.
@@ -29,6 +36,13 @@ class Point(object):
         >>> point2 = Point()
         >>> new_point = (- point1 + point2) / 5
 
+    Long sums can be computed in one pass with :meth:`Point.sum`,
+    without copying the decomposition dict at each step as a chain of `+` (or `+=`) does.
+
+    Example:
+        >>> points = [Point() for _ in range(10)]
+        >>> sum_of_points = Point.sum(points)
+
     As in any pre-Hilbert space, there exists a scalar product.
     Therefore, :class:`Point` objects can be multiplied together.
 
@@ -45,13 +59,40 @@ class Point(object):
         >>> point = Point()
         >>> new_expr = point ** 2
 
+    In hash-consing mode (see the class attribute `hash_consing`),
+    :class:`Point` objects resulting from the same linear combination are one and the same object.
+
+    Example:
+        >>> Point.hash_consing = True
+        >>> point1 = Point()
+        >>> point2 = Point()
+        >>> (point1 - 0.1 * point2 - 0.2 * point2) is (point1 - 0.3 * point2)
+        True
+
+    In compact mode (see the class attribute `compact`), linear combinations are stored as numpy arrays of
+    coefficients, and inner products are computed from their outer products.
+    This saves memory and time when the :class:`Point` objects are combinations of many leaf :class:`Point` objects,
+    e.g. iterates of an algorithm combining all the previous gradients.
+
     """
 
-    # Class counter.
-    # It counts the dimension of the system of points,
+    # Instances store the following attributes in slots.
+    # Other attributes (e.g. set by the user) are stored in a dict, only created if required.
+    __slots__ = ("name", "_is_leaf", "_value", "counter", "_decomposition_dict", "_coefficients", "__dict__")
+
+    # Class attributes stored in the active Registry, with their initial values.
+    # The counter counts the dimension of the system of points,
     # namely the number of points needed to linearly generate the others.
-    counter = 0
-    list_of_leaf_points = list()
+    # In hash-consing mode, a non-leaf Point is identified by its pruned decomposition dict
+    # (rounded to hash_consing_decimals decimals),
+    # and linear combinations that already exist are not instantiated twice.
+    _registered_attributes = {"counter": int,
+                              "list_of_leaf_points": list,
+                              "hash_consing": bool,
+                              "_dict_of_hash_consed_points": dict,
+                              "compact": bool,
+                              }
+    hash_consing_decimals = 12
 
     def __init__(self,
                  is_leaf=True,
@@ -91,6 +132,9 @@ class Point(object):
         # Initialize the value attribute to None until the PEP is solved
         self._value = None
 
+        # The sparse vector of coefficients is only computed if required
+        self._coefficients = None
+
         # If leaf, the decomposition is updated w.r.t the new direction,
         # the object counter is set
         # and the class counter updated.
@@ -106,6 +150,165 @@ class Point(object):
             self.decomposition_dict = decomposition_dict
             self.counter = None
 
+    @staticmethod
+    def _from_decomposition_dict(decomposition_dict):
+        """
+        Create a non-leaf :class:`Point` from its decomposition dict.
+
+        In hash-consing mode, the decomposition dict is pruned,
+        and the :class:`Point` that already encodes the same linear combination (up to rounding), if any,
+        is returned instead of a new one.
+
+        Args:
+            decomposition_dict (dict): decomposition of the :class:`Point` as a linear combination of
+                                       **leaf** :class:`Point` objects.
+
+        Returns:
+            (Point): a :class:`Point` encoding the linear combination `decomposition_dict`.
+
+        """
+
+        # Without hash-consing, simply create a new Point
+        if not Point.hash_consing:
+            return Point(is_leaf=False, decomposition_dict=decomposition_dict)
+
+        # Compute the key of the linear combination
+        decomposition_dict = prune_dict(decomposition_dict)
+        key = prune_dict({point.counter: round(weight, Point.hash_consing_decimals)
+                          for point, weight in decomposition_dict.items()})
+
+        # A linear combination reduced to one leaf Point with weight 1 is this leaf Point
+        if len(key) == 1 and list(key.values())[0] == 1:
+            counter = list(key.keys())[0]
+            return [point for point in decomposition_dict.keys() if point.counter == counter][0]
+
+        # Otherwise, look for an existing Point before creating a new one
+        key = frozenset(key.items())
+        if key not in Point._dict_of_hash_consed_points:
+            Point._dict_of_hash_consed_points[key] = Point(is_leaf=False, decomposition_dict=decomposition_dict)
+
+        return Point._dict_of_hash_consed_points[key]
+
+    @staticmethod
+    def sum(points):
+        """
+        Sum :class:`Point` objects in one pass, leading to a new :class:`Point`.
+
+        The decomposition dicts of all the :class:`Point` objects are accumulated in a single dict,
+        instead of being copied at each addition.
+
+        Args:
+            points (iterable): any iterable of :class:`Point` objects.
+
+        Returns:
+            (Point): the sum of the :class:`Point` objects, null if `points` is empty.
+
+        Raises:
+            AssertionError: if some element of `points` is not a :class:`Point`.
+
+        """
+
+        # In compact mode, add the sparse vectors of coefficients of all the points at once
+        if Point.compact:
+            coefficients = list()
+            for point in points:
+                assert isinstance(point, Point)
+                coefficients.append(point._get_coefficients())
+            indices = np.concatenate([np.zeros((0,), dtype=int)] + [indices for indices, _ in coefficients])
+            values = np.concatenate([np.zeros((0,))] + [values for _, values in coefficients])
+            return Point._from_coefficients(*add_coefficients(indices, values, indices[:0], values[:0]))
+
+        # Accumulate the decomposition dicts of all the points in place
+        decomposition_dict = dict()
+        for point in points:
+            assert isinstance(point, Point)
+            add_dict_in_place(decomposition_dict, point.decomposition_dict)
+
+        # Create and return the sum that cannot be a leaf, by definition
+        return Point._from_decomposition_dict(decomposition_dict)
+
+    @property
+    def decomposition_dict(self):
+        """
+        Returns:
+            self._decomposition_dict (dict): decomposition of self as a linear combination of leaf :class:`Point`
+                                             objects, computed from its sparse vector of coefficients if needed.
+        """
+        if self._decomposition_dict is None:
+            indices, values = self._coefficients
+            self._decomposition_dict = {Point.list_of_leaf_points[index]: value
+                                        for index, value in zip(indices.tolist(), values.tolist())}
+        return self._decomposition_dict
+
+    @decomposition_dict.setter
+    def decomposition_dict(self, decomposition_dict):
+        self._decomposition_dict = decomposition_dict
+        self._coefficients = None
+
+    def _get_coefficients(self):
+        """
+        Compute, store and return the sparse vector of coefficients of self over the counters of the leaf
+        :class:`Point` objects.
+
+        Returns:
+            self._coefficients (tuple): sorted indices (numpy array) and values (numpy array) of the coefficients.
+
+        """
+        if self._coefficients is None:
+            indices = np.array([point.counter for point in self._decomposition_dict.keys()], dtype=int)
+            values = np.array(list(self._decomposition_dict.values()), dtype=float)
+            self._coefficients = add_coefficients(indices, values, indices[:0], values[:0])
+        return self._coefficients
+
+    @staticmethod
+    def _from_coefficients(indices, values):
+        """
+        Create a non-leaf :class:`Point` from its sparse vector of coefficients, in compact mode.
+
+        In hash-consing mode, the :class:`Point` that already encodes the same linear combination
+        (up to rounding), if any, is returned instead of a new one.
+
+        Args:
+            indices (numpy array): sorted counters of the leaf :class:`Point` objects.
+            values (numpy array): their non-null coefficients.
+
+        Returns:
+            (Point): a :class:`Point` encoding the linear combination given by `indices` and `values`.
+
+        """
+
+        # Hash-consing works as in Point._from_decomposition_dict
+        if Point.hash_consing:
+            key = prune_dict({index: round(value, Point.hash_consing_decimals)
+                              for index, value in zip(indices.tolist(), values.tolist())})
+            if len(key) == 1 and list(key.values())[0] == 1:
+                return Point.list_of_leaf_points[list(key.keys())[0]]
+            key = frozenset(key.items())
+            if key not in Point._dict_of_hash_consed_points:
+                Point._dict_of_hash_consed_points[key] = Point._from_coefficients_without_hash_consing(indices,
+                                                                                                      values)
+            return Point._dict_of_hash_consed_points[key]
+
+        return Point._from_coefficients_without_hash_consing(indices, values)
+
+    @staticmethod
+    def _from_coefficients_without_hash_consing(indices, values):
+        """
+        Create a new non-leaf :class:`Point` from its sparse vector of coefficients.
+
+        Args:
+            indices (numpy array): sorted counters of the leaf :class:`Point` objects.
+            values (numpy array): their non-null coefficients.
+
+        Returns:
+            (Point): a new :class:`Point` encoding the linear combination given by `indices` and `values`.
+
+        """
+        point = Point(is_leaf=False, decomposition_dict=dict())
+        point._decomposition_dict = None
+        point._coefficients = (indices, values)
+        return point
+
     def set_name(self, name):
         """
         Assign a name to self for easier identification purpose.
@@ -147,12 +350,16 @@ class Point(object):
         # Verify that other is a Point
         assert isinstance(other, Point)
 
+        # In compact mode, add the sparse vectors of coefficients
+        if Point.compact:
+            return Point._from_coefficients(*add_coefficients(*self._get_coefficients(), *other._get_coefficients()))
+
         # Update the linear decomposition of the sum of 2 points from their respective leaf decomposition
         merged_decomposition_dict = merge_dict(self.decomposition_dict, other.decomposition_dict)
         merged_decomposition_dict = prune_dict(merged_decomposition_dict)
 
         # Create and return the newly created Point that cannot be a leaf, by definition
-        return Point(is_leaf=False, decomposition_dict=merged_decomposition_dict)
+        return Point._from_decomposition_dict(merged_decomposition_dict)
 
     def __sub__(self, other):
         """
@@ -200,19 +407,29 @@ class Point(object):
         """
 
         # Multiplying by a scalar value is applying a homothety
-        if isinstance(other, int) or isinstance(other, float):
+        if (isinstance(other, int) or isinstance(other, float)) and Point.compact:
+            # In compact mode, scale the sparse vector of coefficients
+            indices, values = self._get_coefficients()
+            if other == 0:
+                indices, values = indices[:0], values[:0]
+            return Point._from_coefficients(indices, values * other)
+        elif isinstance(other, int) or isinstance(other, float):
             # Build the decomposition of the new point
             new_decomposition_dict = dict()
             for key, value in self.decomposition_dict.items():
                 new_decomposition_dict[key] = value * other
             # Create and return the newly created point
-            return Point(is_leaf=False, decomposition_dict=new_decomposition_dict)
+            return Point._from_decomposition_dict(new_decomposition_dict)
         # Multiplying by another point leads to an expression encoding the inner product of the 2 points.
+        elif isinstance(other, Point) and Point.compact:
+            # In compact mode, compute the weights of the Gram matrix from the outer product of the coefficients
+            Gweights = multiply_coefficients(*self._get_coefficients(), *other._get_coefficients())
+            return Expression._from_sparse_matrices(Gweights + (np.zeros((0,), dtype=int), np.zeros((0,)), 0))
         elif isinstance(other, Point):
             # Compute the decomposition dict of the new expression
             decomposition_dict = multiply_dicts(self.decomposition_dict, other.decomposition_dict)
             # Create and return the new expression
-            return Expression(is_leaf=False, decomposition_dict=decomposition_dict)
+            return Expression._from_decomposition_dict(decomposition_dict)
         else:
             # Raise an error if the user tries to multiply a point by anything else
             raise TypeError("Points can be multiplied by scalar constants and other points only!"
@@ -289,11 +506,18 @@ class Point(object):
             # If leaf, the PEP would have filled the attribute after solving the problem.
             if self._is_leaf:
                 raise ValueError("The PEP must be solved to evaluate Points!")
+            # In compact mode, combine the values of the leaf from the sparse vector of coefficients.
+            elif Point.compact and self._get_coefficients()[0].size > 0:
+                indices, values = self._get_coefficients()
+                self._value = values @ np.array([Point.list_of_leaf_points[index].eval() for index in indices.tolist()])
             # If linear combination, combine the values of the leaf, and store the result before returning it.
             else:
-                value = np.zeros(Point.counter)
+                value = 0
                 for point, weight in self.decomposition_dict.items():
-                    value += weight * point.eval()
+                    value = value + weight * point.eval()
+                # The null Point has no leaf to infer its dimension from
+                if not self.decomposition_dict:
+                    value = np.zeros(Point.counter)
                 self._value = value
 
         return self._value
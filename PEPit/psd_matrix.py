@@ -1,9 +1,10 @@
 import numpy as np
 
 from PEPit.expression import Expression
+from PEPit.registry import RegisteredClass
 
 
-class PSDMatrix(object):
+class PSDMatrix(object, metaclass=RegisteredClass):
     """
     A :class:`PSDMatrix` encodes a square matrix of :class:`Expression` objects that is constrained to be symmetric PSD.
 
@@ -32,9 +33,9 @@ class PSDMatrix(object):
         >>> # This is equivalent to det([[expr, t], [t, 1]]) >= 0, i.e. expr - t^2 >= 0.
 
     """
-    # Class counter.
+    # Class counter, stored in the active Registry.
     # It counts the number of generated constraints
-    counter = 0
+    _registered_attributes = {"counter": int}
 
     def __init__(self,
                  matrix_of_expressions,
@@ -0,0 +1,178 @@
+import threading
+
+
+class Registry(object):
+    """
+    A :class:`Registry` object stores the state shared by all the objects defining one :class:`PEP`:
+    counters, lists of leaf :class:`Point`, :class:`Expression` and :class:`Function` objects, etc.
+
+    Each :class:`PEP` owns its :class:`Registry`. The classes :class:`Point`, :class:`Expression`, :class:`Function`,
+    :class:`Constraint`, :class:`PSDMatrix`, :class:`BlockPartition` and :class:`PEP` read and write their
+    shared attributes (e.g. `Point.counter` or `Function.list_of_functions`) in the active :class:`Registry`
+    of the current thread (see :class:`RegisteredClass`).
+    Several PEPs can then coexist, and be built or solved concurrently in different threads.
+
+    Attributes:
+        _attributes (dict): the values of the shared attributes, indexed by (class name, attribute name).
+
+    Example:
+        >>> from PEPit import PEP, Point
+        >>> problem1 = PEP()
+        >>> x = problem1.set_initial_point()
+        >>> problem2 = PEP()
+        >>> y, z = problem2.set_initial_point(), problem2.set_initial_point()
+        >>> Point.counter
+        2
+        >>> with problem1:
+        ...     Point.counter
+        1
+
+    """
+    # Active registries, per thread.
+    _active_registries = threading.local()
+
+    def __init__(self):
+        """
+        A :class:`Registry` object can be instantiated without any argument.
+        All the shared attributes are initialized to their default values on first access.
+
+        """
+        self._attributes = dict()
+
+    def get(self, owner, name):
+        """
+        Return the value of a shared attribute, initializing it if necessary.
+
+        Args:
+            owner (type): the class defining the shared attribute.
+            name (str): the name of the shared attribute.
+
+        Returns:
+            value: the value of the shared attribute in this :class:`Registry`.
+
+        """
+        key = (owner.__name__, name)
+        try:
+            return self._attributes[key]
+        except KeyError:
+            value = owner.__dict__["_registered_attributes"][name]()
+            self._attributes[key] = value
+            return value
+
+    def set(self, owner, name, value):
+        """
+        Set the value of a shared attribute.
+
+        Args:
+            owner (type): the class defining the shared attribute.
+            name (str): the name of the shared attribute.
+            value: the new value of the shared attribute in this :class:`Registry`.
+
+        """
+        self._attributes[(owner.__name__, name)] = value
+
+    def activate(self):
+        """
+        Make this :class:`Registry` the active one in the current thread.
+
+        """
+        Registry._active_registries.registry = self
+
+    @staticmethod
+    def get_active_registry():
+        """
+        Return the active :class:`Registry` of the current thread.
+        A thread in which no :class:`Registry` has been activated uses a default :class:`Registry`
+        shared by all such threads.
+
+        Returns:
+            registry (Registry): the active :class:`Registry`.
+
+        """
+        registry = getattr(Registry._active_registries, "registry", None)
+        if registry is None:
+            registry = default_registry
+        return registry
+
+
+# Registry used by the threads in which no registry has been activated.
+default_registry = Registry()
+
+
+class RegisteredAttribute(object):
+    """
+    Data descriptor, set on :class:`RegisteredClass`, giving access to one shared attribute of its classes.
+
+    Reading or writing the shared attribute on a class (e.g. `Point.counter += 1`) reads or writes it
+    in the active :class:`Registry`.
+    For a class that does not declare this shared attribute, the class attribute of the same name, if any,
+    is read as usual.
+
+    Attributes:
+        name (str): the name of the shared attribute.
+
+    """
+
+    def __init__(self, name):
+        """
+        A :class:`RegisteredAttribute` is instantiated from the name of the shared attribute it gives access to.
+
+        Args:
+            name (str): the name of the shared attribute.
+
+        """
+        self.name = name
+
+    def __get__(self, cls, metaclass=None):
+        if cls is None:
+            return self
+        owner = cls._owners_of_registered_attributes.get(self.name)
+        if owner is not None:
+            return Registry.get_active_registry().get(owner, self.name)
+
+        # Usual look-up of a class attribute
+        for klass in cls.__mro__:
+            if self.name in klass.__dict__:
+                attribute = klass.__dict__[self.name]
+                if hasattr(attribute, "__get__"):
+                    return attribute.__get__(None, cls)
+                return attribute
+        raise AttributeError("type object \'{}\' has no attribute \'{}\'".format(cls.__name__, self.name))
+
+    def __set__(self, cls, value):
+        owner = cls._owners_of_registered_attributes.get(self.name)
+        if owner is None:
+            raise AttributeError("\'{}\' is a shared attribute of other classes than \'{}\',"
+                                 " and cannot be set on the latter".format(self.name, cls.__name__))
+        Registry.get_active_registry().set(owner, self.name, value)
+
+
+class RegisteredClass(type):
+    """
+    Metaclass of the classes whose shared attributes are stored in the active :class:`Registry`.
+
+    A class using this metaclass lists its shared attributes in the class attribute `_registered_attributes`,
+    a dictionary mapping each attribute name to a function returning its initial value
+    (e.g. `{"counter": int, "list_of_leaf_points": list}`).
+    Each shared attribute is given a :class:`RegisteredAttribute` data descriptor on the metaclass:
+    reading or writing it on the class (e.g. `Point.counter += 1`) then reads or writes it
+    in the active :class:`Registry`, while the other class attributes are looked up as usual, at no extra cost.
+    Shared attributes take precedence over the class attributes of the same name,
+    such as the slots of the instances (e.g. the counter of each :class:`Point`).
+
+    """
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+
+        # Map each shared attribute to the class of the MRO of cls that declares it
+        owners = dict()
+        for klass in reversed(cls.__mro__):
+            for attribute_name in klass.__dict__.get("_registered_attributes", ()):
+                owners[attribute_name] = klass
+        cls._owners_of_registered_attributes = owners
+
+        # Give access to the shared attributes through data descriptors of the metaclass
+        for attribute_name in owners:
+            if not isinstance(RegisteredClass.__dict__.get(attribute_name), RegisteredAttribute):
+                setattr(RegisteredClass, attribute_name, RegisteredAttribute(attribute_name))
@@ -0,0 +1,463 @@
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Columns identifying a benchmark run.
+BENCHMARK_KEYS = ["benchmark", "n"]
+
+# Relative tolerances above which an increase of a metric with respect to the baseline is flagged as a regression.
+DEFAULT_TOLERANCES = {"construction_time": .5,
+                      "compile_time": .5,
+                      "solve_time": .5,
+                      "postprocessing_time": .5,
+                      "total_time": .5,
+                      "peak_memory": .2,
+                      "gram_size": 0.,
+                      "nb_constraints": 0.,
+                      }
+
+
+def wc_stress_gradient_descent(n, L=1., mu=.1, wrapper="cvxpy", solver=None, verbose=-1, **kwargs):
+    """
+    Synthetic stress PEP: :math:`n` steps of gradient descent with step-size :math:`1/L`
+    on an :math:`L`-smooth :math:`\\mu`-strongly convex function, whose worst-case guarantee
+
+    .. math:: \\|x_n - x_\\star\\|^2 \\leqslant \\left(1 - \\frac{\\mu}{L}\\right)^{2n} \\|x_0 - x_\\star\\|^2
+
+    is tight. The Gram matrix has size :math:`n+2` and there are :math:`n(n+1)` interpolation constraints,
+    so that the PEP can be scaled to hundreds of iterations to stress the construction and the solver.
+
+    Args:
+        n (int): number of iterations.
+        L (float): the smoothness parameter.
+        mu (float): the strong convexity parameter.
+        wrapper (str): the name of the wrapper to be used.
+        solver (str): the name of the solver the wrapper should use.
+        verbose (int): level of information details to print.
+        kwargs (keywords, optional): additional keyword arguments of the method `PEP.solve`
+                                     (e.g. `constraint_generation=True`).
+
+    Returns:
+        pepit_tau (float): worst-case value.
+        theoretical_tau (float): theoretical value.
+
+    """
+    from PEPit import PEP
+    from PEPit.functions import SmoothStronglyConvexFunction
+
+    problem = PEP()
+    func = problem.declare_function(SmoothStronglyConvexFunction, mu=mu, L=L)
+    xs = func.stationary_point()
+    x0 = problem.set_initial_point()
+    problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+    x = x0
+    for _ in range(n):
+        x = x - 1 / L * func.gradient(x)
+    problem.set_performance_metric((x - xs) ** 2)
+
+    pepit_verbose = max(verbose, 0)
+    pepit_tau = problem.solve(wrapper=wrapper, solver=solver, verbose=pepit_verbose, **kwargs)
+    theoretical_tau = (1 - mu / L) ** (2 * n)
+
+    return pepit_tau, theoretical_tau
+
+
+def wc_stress_proximal_gradient(n, L=1., mu=.1, wrapper="cvxpy", solver=None, verbose=-1, **kwargs):
+    """
+    Synthetic stress PEP: :math:`n` steps of proximal gradient with step-size :math:`1/L` on the sum of an
+    :math:`L`-smooth :math:`\\mu`-strongly convex function and of a closed convex proper function,
+    whose worst-case guarantee
+
+    .. math:: \\|x_n - x_\\star\\|^2 \\leqslant \\left(1 - \\frac{\\mu}{L}\\right)^{2n} \\|x_0 - x_\\star\\|^2
+
+    is tight. Compared to `wc_stress_gradient_descent`, it involves two function classes,
+    a sum of functions and proximal steps, hence about twice as many points.
+
+    Args:
+        n (int): number of iterations.
+        L (float): the smoothness parameter.
+        mu (float): the strong convexity parameter.
+        wrapper (str): the name of the wrapper to be used.
+        solver (str): the name of the solver the wrapper should use.
+        verbose (int): level of information details to print.
+        kwargs (keywords, optional): additional keyword arguments of the method `PEP.solve`.
+
+    Returns:
+        pepit_tau (float): worst-case value.
+        theoretical_tau (float): theoretical value.
+
+    """
+    from PEPit import PEP
+    from PEPit.functions import ConvexFunction, SmoothStronglyConvexFunction
+    from PEPit.primitive_steps import proximal_step
+
+    problem = PEP()
+    f1 = problem.declare_function(SmoothStronglyConvexFunction, mu=mu, L=L)
+    f2 = problem.declare_function(ConvexFunction)
+    func = f1 + f2
+    xs = func.stationary_point()
+    x0 = problem.set_initial_point()
+    problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+    x = x0
+    for _ in range(n):
+        y = x - 1 / L * f1.gradient(x)
+        x, _, _ = proximal_step(y, f2, 1 / L)
+    problem.set_performance_metric((x - xs) ** 2)
+
+    pepit_verbose = max(verbose, 0)
+    pepit_tau = problem.solve(wrapper=wrapper, solver=solver, verbose=pepit_verbose, **kwargs)
+    theoretical_tau = (1 - mu / L) ** (2 * n)
+
+    return pepit_tau, theoretical_tau
+
+
+def get_default_benchmarks():
+    """
+    Return the default benchmark suite: a few examples of PEPit and the synthetic stress PEPs,
+    over increasing numbers of iterations.
+
+    Returns:
+        benchmarks (dict): mapping the name of each benchmark to a tuple (pep_builder, fixed_kwargs, list_of_n),
+                           where `pep_builder` is a function building and solving a PEP
+                           (such as the `wc_*` functions of PEPit.examples) that is called with
+                           `n` and the keyword arguments `fixed_kwargs`.
+
+    """
+    from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+    from PEPit.examples.unconstrained_convex_minimization import wc_accelerated_gradient_convex
+    from PEPit.examples.composite_convex_minimization import wc_proximal_gradient
+    from PEPit.examples.monotone_inclusions_variational_inequalities import wc_optimistic_gradient
+
+    benchmarks = {"gradient_descent": (wc_gradient_descent, {"L": 1, "gamma": 1}, [1, 2, 5, 10, 20]),
+                  "accelerated_gradient_convex": (wc_accelerated_gradient_convex, {"mu": 0, "L": 1},
+                                                  [1, 2, 5, 10, 20]),
+                  "proximal_gradient": (wc_proximal_gradient, {"L": 1, "mu": .1, "gamma": 1}, [1, 2, 5, 10, 20]),
+                  "optimistic_gradient": (wc_optimistic_gradient, {"gamma": 1 / 4, "L": 1}, [1, 2, 5, 10, 20]),
+                  "stress_gradient_descent": (wc_stress_gradient_descent, {}, [25, 50, 100, 200]),
+                  "stress_proximal_gradient": (wc_stress_proximal_gradient, {}, [25, 50, 100]),
+                  }
+
+    return benchmarks
+
+
+def _call_pep_builder(pep_builder, kwargs):
+    """
+    Call a PEP builder, and record all the PEPs it solves.
+
+    Args:
+        pep_builder (callable): a function building and solving a PEP.
+        kwargs (dict): the keyword arguments of `pep_builder`.
+
+    Returns:
+        output: the output of `pep_builder`.
+        list_of_solved_peps (list): the solved :class:`PEP` objects, in order.
+
+    """
+    from PEPit.pep import PEP
+
+    list_of_solved_peps = list()
+    PEP.list_of_solve_hooks.append(list_of_solved_peps.append)
+    try:
+        output = pep_builder(**kwargs)
+    finally:
+        PEP.list_of_solve_hooks.remove(list_of_solved_peps.append)
+
+    return output, list_of_solved_peps
+
+
+def measure_pep_builder(pep_builder, nb_repeats=1, measure_memory=True, **kwargs):
+    """
+    Measure the time and memory spent in building and solving the PEPs of a PEP builder.
+
+    The total time of the call is split into the time spent in the solver calls, the time spent by the method
+    `PEP.solve` before the solution is known (class constraints and compilation of the SDP)
+    and after it is known (post-processing), and the time spent before calling `PEP.solve`
+    (construction of the PEP). Each time is the minimum over `nb_repeats` calls.
+
+    The peak memory is measured in an additional call, through the module `tracemalloc`
+    (which slows the call down). It accounts for all the allocations made through Python
+    (including the NumPy arrays), but not for the memory allocated internally by the solvers.
+    Before Python 3.9, it is not measured if `tracemalloc` is already tracing when calling this function.
+
+    Args:
+        pep_builder (callable): a function building and solving a PEP (e.g. the `wc_*` functions of PEPit.examples).
+        nb_repeats (int, optional): the number of calls over which the times are measured. Defaults to 1.
+        measure_memory (bool, optional): if True, the peak memory is measured. Defaults to True.
+        kwargs (keywords, optional): the keyword arguments of `pep_builder`.
+
+    Returns:
+        row (dict): the worst-case value, the status of the solver, the construction, compile, solve,
+                    post-processing and total times (in seconds), the peak memory (in MB, NaN if not measured),
+                    the size of the Gram matrix, the number of scalar constraints and of LMIs sent to the solver
+                    (for the last solved PEP), and the number of solved PEPs.
+
+    Raises:
+        ValueError: if `nb_repeats` is not a positive integer.
+
+    """
+    if nb_repeats < 1:
+        raise ValueError("The number of repeats must be a positive integer. Got {}".format(nb_repeats))
+
+    times = {"construction_time": np.inf, "compile_time": np.inf, "solve_time": np.inf,
+             "postprocessing_time": np.inf, "total_time": np.inf}
+    for _ in range(nb_repeats):
+        start_time = time.perf_counter()
+        output, list_of_solved_peps = _call_pep_builder(pep_builder, kwargs)
+        total_time = time.perf_counter() - start_time
+
+        # Split the total time into phases, over all the solved PEPs
+        compile_time = sum([pep.compile_time for pep in list_of_solved_peps])
+        solve_time = sum([pep.solve_time for pep in list_of_solved_peps])
+        postprocessing_time = sum([pep.postprocessing_time for pep in list_of_solved_peps])
+        construction_time = total_time - compile_time - solve_time - postprocessing_time
+        for name, value in zip(times.keys(), [construction_time, compile_time, solve_time,
+                                              postprocessing_time, total_time]):
+            times[name] = min(times[name], value)
+
+    # Measure the peak memory in a separate call
+    # Starting tracemalloc resets the peak, which can only be reset otherwise with Python 3.9+.
+    # If tracemalloc is already tracing on older versions, the peak memory is not measured.
+    peak_memory = np.nan
+    was_tracing = tracemalloc.is_tracing()
+    if measure_memory and (not was_tracing or hasattr(tracemalloc, "reset_peak")):
+        if was_tracing:
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+        try:
+            _call_pep_builder(pep_builder, kwargs)
+            peak_memory = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+    # Gather the results
+    worst_case_value = output[0] if isinstance(output, (tuple, list)) else output
+    last_pep = list_of_solved_peps[-1] if list_of_solved_peps else None
+    row = {"worst_case_value": np.nan if worst_case_value is None else worst_case_value,
+           "solver_status": None if last_pep is None else str(last_pep.solver_status)}
+    row.update(times)
+    row["peak_memory"] = peak_memory
+    row["gram_size"] = np.nan if last_pep is None or last_pep.G_value is None else last_pep.G_value.shape[0]
+    row["nb_constraints"] = np.nan if last_pep is None else len(last_pep._list_of_constraints_sent_to_wrapper)
+    row["nb_lmis"] = np.nan if last_pep is None else len(last_pep._list_of_psd_sent_to_wrapper)
+    row["nb_solves"] = len(list_of_solved_peps)
+
+    return row
+
+
+def run_benchmarks(benchmarks=None, names=None, max_n=None, nb_repeats=1, measure_memory=True,
+                   label=None, callback=None, **kwargs):
+    """
+    Run a benchmark suite: call each PEP builder over increasing numbers of iterations,
+    and measure the time and memory spent in each phase (see `measure_pep_builder`).
+
+    Args:
+        benchmarks (dict, optional): mapping the name of each benchmark to a tuple (pep_builder, fixed_kwargs,
+                                     list_of_n). Defaults to the suite returned by `get_default_benchmarks`.
+        names (list, optional): the names of the benchmarks to run. Defaults to all of them.
+        max_n (int, optional): if provided, only the numbers of iterations up to `max_n` are run.
+        nb_repeats (int, optional): the number of calls over which the times are measured. Defaults to 1.
+        measure_memory (bool, optional): if True, the peak memory is measured. Defaults to True.
+        label (str, optional): a label identifying the run in the history (e.g. a commit hash).
+        callback (callable, optional): a function called on each row as soon as it is available.
+        kwargs (keywords, optional): additional keyword arguments given to every PEP builder
+                                     (e.g. `solver="CLARABEL"`). Defaults to `verbose=-1`.
+
+    Returns:
+        results (pandas.DataFrame): one row per benchmark and number of iterations, with the columns
+                                    "benchmark" and "n", the measurements (see `measure_pep_builder`),
+                                    and the description of the run ("label", "timestamp", "python_version",
+                                    "platform").
+
+    Raises:
+        ValueError: if one of the names is not a benchmark of the suite.
+
+    Example:
+        >>> from PEPit.tools.benchmark import run_benchmarks
+        >>> results = run_benchmarks(names=["gradient_descent"], max_n=5)
+
+    """
+    if benchmarks is None:
+        benchmarks = get_default_benchmarks()
+    if names is None:
+        names = list(benchmarks.keys())
+    for name in names:
+        if name not in benchmarks:
+            raise ValueError("Unknown benchmark {}. Expected one of {}".format(name, list(benchmarks.keys())))
+    kwargs.setdefault("verbose", -1)
+
+    # Describe the run
+    description = {"label": label,
+                   "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                   "python_version": platform.python_version(),
+                   "platform": platform.platform(),
+                   }
+
+    rows = list()
+    for name in names:
+        pep_builder, fixed_kwargs, list_of_n = benchmarks[name]
+        for n in list_of_n:
+            if max_n is not None and n > max_n:
+                continue
+            row = {"benchmark": name, "n": n}
+            row.update(measure_pep_builder(pep_builder, nb_repeats=nb_repeats, measure_memory=measure_memory,
+                                           n=n, **fixed_kwargs, **kwargs))
+            row.update(description)
+            if callback is not None:
+                callback(row)
+            rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def save_benchmark_results(results, path):
+    """
+    Append the results of a benchmark run to a history file, in the JSON Lines format (one run per line).
+
+    Args:
+        results (pandas.DataFrame): the results of `run_benchmarks`.
+        path (str): the path of the history file. It is created if it does not exist.
+
+    """
+    with open(path, "a") as file:
+        for row in results.to_dict(orient="records"):
+            row = {name: None if isinstance(value, float) and np.isnan(value) else value
+                   for name, value in row.items()}
+            file.write(json.dumps(row, default=lambda value: value.item()) + "\n")
+
+
+def load_benchmark_results(path):
+    """
+    Load a history file written by `save_benchmark_results`.
+
+    Args:
+        path (str): the path of the history file.
+
+    Returns:
+        results (pandas.DataFrame): all the rows of the history, in order.
+
+    """
+    with open(path, "r") as file:
+        rows = [json.loads(line) for line in file if line.strip()]
+
+    return pd.DataFrame(rows).fillna(value=np.nan)
+
+
+def compare_to_baseline(results, baseline, tolerances=None, time_resolution=1e-2):
+    """
+    Flag the regressions of a benchmark run with respect to a baseline.
+
+    For each benchmark, number of iterations and metric, the reference value is the median of the baseline rows.
+    A metric is flagged as a regression when its value exceeds the reference value by more than the relative
+    tolerance, plus `time_resolution` for the times (to absorb the timing noise of short runs).
+    A change of the worst-case value by more than :math:`10^{-3}` (relative) is flagged as well.
+
+    Args:
+        results (pandas.DataFrame): the results of `run_benchmarks`.
+        baseline (pandas.DataFrame or str): the results of previous runs, or the path of their history file.
+        tolerances (dict, optional): mapping each compared metric to its relative tolerance.
+                                     Defaults to `DEFAULT_TOLERANCES`.
+        time_resolution (float, optional): absolute tolerance (in seconds) on the times. Defaults to 1e-2.
+
+    Returns:
+        comparison (pandas.DataFrame): one row per benchmark, number of iterations and metric found in both,
+                                       with the columns "benchmark", "n", "metric", "baseline", "value",
+                                       "ratio" and "regression" (bool).
+
+    """
+    if isinstance(baseline, str):
+        baseline = load_benchmark_results(baseline)
+    if tolerances is None:
+        tolerances = DEFAULT_TOLERANCES
+    metrics = [metric for metric in list(tolerances.keys()) + ["worst_case_value"]
+               if metric in results.columns and metric in baseline.columns]
+
+    # Reference values of the baseline
+    reference = baseline.groupby(BENCHMARK_KEYS)[metrics].median()
+
+    rows = list()
+    for _, row in results.iterrows():
+        key = tuple(row[BENCHMARK_KEYS])
+        if key not in reference.index:
+            continue
+        for metric in metrics:
+            baseline_value, value = reference.loc[key, metric], row[metric]
+            if np.isnan(baseline_value) or np.isnan(value):
+                continue
+            if metric == "worst_case_value":
+                regression = abs(value - baseline_value) > 1e-3 * abs(baseline_value)
+            else:
+                threshold = (1 + tolerances[metric]) * baseline_value
+                if metric.endswith("_time"):
+                    threshold += time_resolution
+                regression = value > threshold
+            rows.append({"benchmark": key[0], "n": key[1], "metric": metric,
+                         "baseline": baseline_value, "value": value,
+                         "ratio": value / baseline_value if baseline_value else np.nan,
+                         "regression": bool(regression)})
+
+    return pd.DataFrame(rows, columns=BENCHMARK_KEYS + ["metric", "baseline", "value", "ratio", "regression"])
+
+
+def main(argv=None):
+    """
+    Command line interface of the benchmark suite, e.g.
+
+    .. code-block:: console
+
+        python -m PEPit.tools.benchmark --max-n 20 --history history.jsonl --baseline baseline.jsonl
+
+    Args:
+        argv (list, optional): the command line arguments. Defaults to `sys.argv[1:]`.
+
+    Returns:
+        (int): 1 if a regression with respect to the baseline is found, 0 otherwise.
+
+    """
+    parser = argparse.ArgumentParser(description="Run the PEPit benchmark and scaling suite.")
+    parser.add_argument("--names", nargs="+", default=None, help="names of the benchmarks to run")
+    parser.add_argument("--max-n", type=int, default=None, help="maximal number of iterations")
+    parser.add_argument("--nb-repeats", type=int, default=1, help="number of calls over which times are measured")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure the peak memory")
+    parser.add_argument("--solver", default=None, help="solver used by the wrapper")
+    parser.add_argument("--label", default=None, help="label of the run in the history")
+    parser.add_argument("--history", default=None, help="history file to which the results are appended")
+    parser.add_argument("--baseline", default=None, help="history file of the baseline runs")
+    arguments = parser.parse_args(argv)
+
+    results = run_benchmarks(names=arguments.names, max_n=arguments.max_n, nb_repeats=arguments.nb_repeats,
+                             measure_memory=not arguments.no_memory, label=arguments.label,
+                             callback=lambda row: print("{benchmark} n={n}: total {total_time:.3f}s"
+                                                        " (construction {construction_time:.3f}s,"
+                                                        " compile {compile_time:.3f}s, solve {solve_time:.3f}s,"
+                                                        " post-processing {postprocessing_time:.3f}s),"
+                                                        " peak memory {peak_memory:.1f}MB,"
+                                                        " Gram size {gram_size}, {nb_constraints} constraints"
+                                                        .format(**row), flush=True),
+                             solver=arguments.solver)
+
+    if arguments.history is not None:
+        save_benchmark_results(results, arguments.history)
+
+    if arguments.baseline is not None:
+        comparison = compare_to_baseline(results, arguments.baseline)
+        regressions = comparison[comparison["regression"]]
+        if not regressions.empty:
+            print("Regressions with respect to the baseline:")
+            print(regressions.to_string(index=False))
+            return 1
+        print("No regression with respect to the baseline.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
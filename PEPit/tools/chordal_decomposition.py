@@ -0,0 +1,127 @@
+import numpy as np
+
+
+def get_aggregate_sparsity_pattern(A, size):
+    """
+    Compute the aggregate sparsity pattern of the Gram matrix, that is the set of its entries
+    that appear with a non-zero weight in at least one row of a stacked sparse matrix
+    (see `expressions_to_stacked_sparse_matrix`).
+
+    Args:
+        A (scipy.sparse matrix): the stacked weights of (vec(G), F), vec(G) being taken column by column.
+        size (int): the size of the Gram matrix.
+
+    Returns:
+        pattern (numpy array): a symmetric boolean matrix of shape (size, size).
+                               Its diagonal entries are True, except for the leaf points that are not used at all.
+
+    """
+
+    # Gather the columns of vec(G) that are used
+    A = A.tocsr()
+    A.eliminate_zeros()
+    columns = np.unique(A.indices)
+    columns = columns[columns < size ** 2]
+
+    # Fill the pattern symmetrically, with the diagonal entries of all the leaf points that are used
+    pattern = np.zeros((size, size), dtype=bool)
+    pattern[columns % size, columns // size] = True
+    pattern[columns // size, columns % size] = True
+    pattern[np.diag_indices(size)] = np.any(pattern, axis=1)
+
+    return pattern
+
+
+def get_chordal_extension(pattern):
+    """
+    Compute a chordal extension of a sparsity pattern with the greedy minimum degree heuristic.
+
+    The vertices are eliminated one by one, each time choosing one of minimum degree,
+    and all the neighbors of an eliminated vertex are connected to each other.
+    The resulting order is a perfect elimination order of the extended pattern.
+    The vertices whose diagonal entry is not in the pattern do not belong to any clique.
+
+    Args:
+        pattern (numpy array): a symmetric boolean matrix.
+
+    Returns:
+        chordal_pattern (numpy array): a symmetric boolean matrix whose pattern is chordal and contains `pattern`.
+        elimination_order (list): a perfect elimination order of `chordal_pattern`.
+        cliques (list): the maximal cliques of `chordal_pattern`, as sorted numpy arrays of indices.
+
+    """
+
+    # Store the graph as a list of neighborhoods
+    size = pattern.shape[0]
+    neighbors = [set(np.flatnonzero(pattern[i])) - {i} for i in range(size)]
+    chordal_pattern = np.array(pattern, dtype=bool)
+
+    # Eliminate the vertices by increasing degree
+    remaining = set(range(size))
+    elimination_order = list()
+    candidate_cliques = list()
+    while remaining:
+        vertex = min(remaining, key=lambda i: (len(neighbors[i]), i))
+        clique = neighbors[vertex]
+
+        # Connect the neighbors of the eliminated vertex to each other
+        for i in clique:
+            neighbors[i] |= clique - {i}
+            neighbors[i].discard(vertex)
+        if pattern[vertex, vertex]:
+            clique_indices = np.array(sorted(clique | {vertex}))
+            chordal_pattern[np.ix_(clique_indices, clique_indices)] = True
+            candidate_cliques.append(clique_indices)
+
+        elimination_order.append(vertex)
+        remaining.remove(vertex)
+
+    # Keep the maximal cliques only
+    cliques = list()
+    for clique in sorted(candidate_cliques, key=len, reverse=True):
+        if not any(set(clique) <= set(other_clique) for other_clique in cliques):
+            cliques.append(clique)
+
+    return chordal_pattern, elimination_order, sorted(cliques, key=lambda clique: clique[0])
+
+
+def complete_psd_matrix(matrix, chordal_pattern, elimination_order):
+    """
+    Complete a symmetric matrix whose entries are only specified on a chordal pattern,
+    and whose submatrices associated with the cliques of this pattern are positive semidefinite,
+    into a positive semidefinite matrix.
+
+    The vertices are processed in the reverse of a perfect elimination order.
+    The entries between each new vertex :math:`v` and the already completed set :math:`S` are given by
+    :math:`M_{v,S} = M_{v,K} M_{K,K}^\\dagger M_{K,S}`, where :math:`K` is the set of the neighbors of :math:`v`
+    in :math:`S`. This is the maximum determinant completion when the clique submatrices are positive definite.
+
+    Args:
+        matrix (numpy array): a symmetric matrix, whose off-diagonal entries outside of `chordal_pattern`
+                              are ignored.
+        chordal_pattern (numpy array): a symmetric boolean matrix whose pattern is chordal.
+        elimination_order (list): a perfect elimination order of `chordal_pattern`.
+
+    Returns:
+        completed_matrix (numpy array): the completed matrix, that coincides with `matrix` on `chordal_pattern`
+                                        and on the diagonal.
+
+    """
+
+    completed_matrix = np.where(chordal_pattern | np.eye(matrix.shape[0], dtype=bool), matrix, 0.)
+    completed = list()
+    for vertex in reversed(elimination_order):
+        completed_indices = np.array(completed, dtype=int)
+        clique = completed_indices[chordal_pattern[vertex, completed_indices]]
+        others = completed_indices[~chordal_pattern[vertex, completed_indices]]
+
+        # Fill the unspecified entries between the vertex and the completed set
+        if clique.size > 0 and others.size > 0:
+            row = completed_matrix[vertex, clique] @ np.linalg.pinv(completed_matrix[np.ix_(clique, clique)])
+            values = row @ completed_matrix[np.ix_(clique, others)]
+            completed_matrix[vertex, others] = values
+            completed_matrix[others, vertex] = values
+
+        completed.append(vertex)
+
+    return completed_matrix
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def coalesce_coefficients(indices, values):
+    """
+    Sum the values associated with the same index, and remove the indices associated with a null value.
+
+    Args:
+        indices (numpy array): any array of integer indices, possibly repeated.
+        values (numpy array): the values associated with `indices`.
+
+    Returns:
+        indices (numpy array): the sorted distinct indices associated with a non-null value.
+        values (numpy array): the sum of the values associated with each of them.
+
+    """
+
+    # Nothing to sum
+    if indices.size == 0:
+        return np.zeros((0,), dtype=int), np.zeros((0,))
+
+    # Sum the values of each index
+    unique_indices, inverse = np.unique(indices, return_inverse=True)
+    summed_values = np.bincount(inverse.reshape(-1), weights=values, minlength=unique_indices.size)
+
+    # Remove null values
+    non_zero = summed_values != 0
+    return unique_indices[non_zero], summed_values[non_zero]
+
+
+def add_coefficients(indices1, values1, indices2, values2):
+    """
+    Add 2 sparse vectors of coefficients.
+
+    Args:
+        indices1 (numpy array): the indices of the first sparse vector.
+        values1 (numpy array): the values of the first sparse vector.
+        indices2 (numpy array): the indices of the second sparse vector.
+        values2 (numpy array): the values of the second sparse vector.
+
+    Returns:
+        indices (numpy array): the sorted indices of the sum.
+        values (numpy array): the values of the sum.
+
+    """
+
+    return coalesce_coefficients(np.concatenate([indices1, indices2]), np.concatenate([values1, values2]))
+
+
+def coalesce_symmetric_coefficients(indi, indj, values):
+    """
+    Sum the values associated with the same entry of a symmetric matrix stored by its lower triangular part,
+    and remove the entries associated with a null value.
+
+    Args:
+        indi (numpy array): the line indices of the entries, that must be larger or equal than `indj`.
+        indj (numpy array): the column indices of the entries.
+        values (numpy array): the values associated with the entries.
+
+    Returns:
+        indi (numpy array): the line indices of the distinct entries associated with a non-null value.
+        indj (numpy array): the column indices of the distinct entries associated with a non-null value.
+        values (numpy array): the sum of the values associated with each of them.
+
+    """
+
+    # Nothing to sum
+    if values.size == 0:
+        return np.zeros((0,), dtype=int), np.zeros((0,), dtype=int), np.zeros((0,))
+
+    # Index each entry by a single integer, and sum the values of each entry
+    nb_lines = max(np.max(indi) + 1, 1)
+    keys, values = coalesce_coefficients(indi * nb_lines + indj, values)
+
+    return keys // nb_lines, keys % nb_lines, values
+
+
+def multiply_coefficients(indices1, values1, indices2, values2):
+    """
+    Compute the symmetric matrix of weights of the inner product of 2 linear combinations of leaf points,
+    given by their sparse vectors of coefficients, from their outer product.
+
+    The output follows the format of :func:`PEPit.tools.expressions_to_matrices.expression_to_sparse_matrices`:
+    only the lower triangular part is stored, and each off-diagonal value is the weight of both symmetric entries.
+
+    Args:
+        indices1 (numpy array): the indices of the leaf points of the first linear combination.
+        values1 (numpy array): their coefficients.
+        indices2 (numpy array): the indices of the leaf points of the second linear combination.
+        values2 (numpy array): their coefficients.
+
+    Returns:
+        indi (numpy array): the line indices of the lower triangular weights.
+        indj (numpy array): the column indices of the lower triangular weights.
+        values (numpy array): the lower triangular weights.
+
+    """
+
+    # Outer product of the 2 vectors of coefficients
+    indi = np.repeat(indices1, indices2.size)
+    indj = np.tile(indices2, indices1.size)
+    values = np.outer(values1, values2).reshape(-1)
+
+    # Symmetrize the weights: off-diagonal ones are shared by both symmetric entries
+    values = np.where(indi == indj, values, values / 2)
+
+    return coalesce_symmetric_coefficients(np.maximum(indi, indj), np.minimum(indi, indj), values)
@@ -32,6 +32,39 @@ def merge_dict(dict1, dict2):
     return merged_dict
 
 
+def add_dict_in_place(dict1, dict2):
+    """
+    Add the values of dict2 to the ones of dict1, in place.
+    The keys whose value becomes null are removed from dict1.
+
+    Contrary to `merge_dict`, dict1 is not copied,
+    so that accumulating many dictionaries into dict1 is linear in their total size.
+
+    Args:
+        dict1 (dict): any dictionary, modified in place.
+        dict2 (dict): any dictionary.
+
+    Returns:
+        (dict): dict1, updated with the values of dict2.
+
+    """
+
+    # Iterate over a copy of the items of dict2, as dict2 may be dict1 itself
+    for key, value in list(dict2.items()):
+
+        # Add the value to the one of dict1, if any
+        new_value = dict1.get(key, 0) + value
+
+        # Remove the keys whose value becomes null
+        if new_value != 0:
+            dict1[key] = new_value
+        elif key in dict1:
+            del dict1[key]
+
+    # Return the updated dict
+    return dict1
+
+
 def prune_dict(my_dict):
     """
     Remove all keys associated to a null value.
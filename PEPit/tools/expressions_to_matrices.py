@@ -2,6 +2,7 @@ import numpy as np
 
 from PEPit.point import Point
 from PEPit.expression import Expression
+from PEPit.tools.coefficient_operations import coalesce_symmetric_coefficients
 
 
 def expression_to_matrices(expression):
@@ -12,6 +13,10 @@ def expression_to_matrices(expression):
 
     corresponds to the expression.
 
+    Note:
+        The dense outputs are built from the sparse representation returned by `expression_to_sparse_matrices`,
+        which is computed only once per :class:`Expression`.
+
     Args:
         expression (Expression): any expression.
 
@@ -21,34 +26,16 @@ def expression_to_matrices(expression):
         cons (float): constant term in the :class:`Expression`
 
     """
-    cons = 0
-    Fweights = np.zeros((Expression.counter,))
-    Gweights = np.zeros((Point.counter, Point.counter))
+    Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons = \
+        expression_to_sparse_matrices(expression)
 
-    # If simple function value, then simply return the right coordinate in F
-    if expression.get_is_leaf():
-        Fweights[expression.counter] += 1
-    # If composite, combine all the cvxpy expression found from leaf expressions
-    else:
-        for key, weight in expression.decomposition_dict.items():
-            # Function values are stored in F
-            if type(key) == Expression:
-                assert key.get_is_leaf()
-                Fweights[key.counter] = weight
-            # Inner products are stored in G
-            elif type(key) == tuple:
-                point1, point2 = key
-                assert point1.get_is_leaf()
-                assert point2.get_is_leaf()
-                Gweights[point1.counter, point2.counter] = weight
-            # Constants are simply constants
-            elif key == 1:
-                cons = weight
-            # Others don't exist and raise an Exception
-            else:
-                raise TypeError("Expressions are made of function values, inner products and constants only!")
+    Fweights = np.zeros((Expression.counter,))
+    Fweights[Fweights_ind] = Fweights_val
 
-    Gweights = (Gweights + Gweights.T) / 2
+    # The sparse representation only stores the lower triangular part of the symmetric weights of G
+    Gweights = np.zeros((Point.counter, Point.counter))
+    Gweights[Gweights_indi, Gweights_indj] = Gweights_val
+    Gweights[Gweights_indj, Gweights_indi] = Gweights_val
 
     return Gweights, Fweights, cons
 
@@ -61,6 +48,10 @@ def expression_to_sparse_matrices(expression):
 
     where :math:`\\text{Gweights}` and :math:`\\text{Fweights}` are expressed in sparse formats.
 
+    Note:
+        The sparse representation is computed once and cached in the attribute `_sparse_matrices`
+        of the :class:`Expression`, so that all the wrappers and post-processing steps reuse it.
+
     Args:
         expression (Expression): any expression.
 
@@ -73,6 +64,10 @@ def expression_to_sparse_matrices(expression):
         cons_val (float): Constant part of the constraint.
 
     """
+    # If already computed, simply return the cached representation
+    if expression._sparse_matrices is not None:
+        return expression._sparse_matrices
+
     cons_val = 0
     Fweights_ind = list()
     Fweights_val = list()
@@ -98,17 +93,10 @@ def expression_to_sparse_matrices(expression):
                 assert point1.get_is_leaf()
                 assert point2.get_is_leaf()
 
-                weight_sym = 0  # weight of the symmetrical entry
-                if (point2, point1) in expression.decomposition_dict:
-                    if point1.counter >= point2.counter:  # if both entry and symmetrical entry: only append in one case
-                        weight_sym = expression.decomposition_dict[(point2, point1)]
-                        Gweights_val.append((weight + weight_sym) / 2)
-                        Gweights_indi.append(point1.counter)
-                        Gweights_indj.append(point2.counter)
-                else:
-                    Gweights_val.append((weight + weight_sym) / 2)
-                    Gweights_indi.append(max(point1.counter, point2.counter))
-                    Gweights_indj.append(min(point1.counter, point2.counter))
+                # Only the lower triangular part of the symmetrized weights is stored
+                Gweights_indi.append(max(point1.counter, point2.counter))
+                Gweights_indj.append(min(point1.counter, point2.counter))
+                Gweights_val.append(weight if point1.counter == point2.counter else weight / 2)
             # Constants are simply constants
             elif key == 1:
                 cons_val = weight
@@ -116,10 +104,77 @@ def expression_to_sparse_matrices(expression):
             else:
                 raise TypeError("Expressions are made of function values, inner products and constants only!")
 
-    Fweights_ind = np.array(Fweights_ind)
-    Fweights_val = np.array(Fweights_val)
-    Gweights_indi = np.array(Gweights_indi)
-    Gweights_indj = np.array(Gweights_indj)
-    Gweights_val = np.array(Gweights_val)
+    Fweights_ind = np.array(Fweights_ind, dtype=int)
+    Fweights_val = np.array(Fweights_val, dtype=float)
+    Gweights_indi = np.array(Gweights_indi, dtype=int)
+    Gweights_indj = np.array(Gweights_indj, dtype=int)
+    Gweights_val = np.array(Gweights_val, dtype=float)
 
-    return Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val
+    # Sum the weights of symmetrical entries, (point1, point2) and (point2, point1), and remove null ones
+    Gweights_indi, Gweights_indj, Gweights_val = coalesce_symmetric_coefficients(Gweights_indi, Gweights_indj,
+                                                                                 Gweights_val)
+
+    # Cache the sparse representation in the expression
+    expression._sparse_matrices = (Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val)
+
+    return expression._sparse_matrices
+
+
+def expressions_to_stacked_sparse_matrix(list_of_expressions):
+    """
+    Translate a list of :class:`Expression` objects into one sparse matrix and one vector such that
+
+        ..math:: A \\begin{bmatrix} \\mathrm{vec}(G) \\\\ F \\end{bmatrix} + b
+
+    corresponds to the vector of the values of all those expressions.
+
+    Each row of :math:`A` is associated with one :class:`Expression`.
+    The first `Point.counter ** 2` columns of :math:`A` multiply the (column-major) vectorization of :math:`G`,
+    and the last `Expression.counter` ones multiply :math:`F`.
+    Since :math:`G` is symmetric, the weights of its entries are symmetrized.
+
+    Args:
+        list_of_expressions (list): a list of :class:`Expression` objects.
+
+    Returns:
+        A (scipy.sparse.csr_matrix): weights of the entries of (vec(G), F) in each :class:`Expression`.
+        b (numpy array): constant term in each :class:`Expression`.
+
+    """
+    from scipy.sparse import coo_matrix
+
+    nb_points = Point.counter
+    nb_columns = nb_points ** 2 + Expression.counter
+
+    # Collect the coordinates of all the non-zero weights
+    rows = list()
+    columns = list()
+    values = list()
+    b = np.zeros((len(list_of_expressions),))
+
+    for row, expression in enumerate(list_of_expressions):
+        Gweights_indi, Gweights_indj, Gweights_val, \
+            Fweights_ind, Fweights_val, cons_val = expression_to_sparse_matrices(expression)
+
+        # Lower triangular weights of G are spread over both symmetric entries
+        off_diagonal = Gweights_indi != Gweights_indj
+        expression_columns = [Gweights_indi + nb_points * Gweights_indj,
+                              Gweights_indj[off_diagonal] + nb_points * Gweights_indi[off_diagonal],
+                              nb_points ** 2 + Fweights_ind]
+        expression_values = [Gweights_val, Gweights_val[off_diagonal], Fweights_val]
+
+        for expression_column, expression_value in zip(expression_columns, expression_values):
+            rows.append(np.full(expression_column.shape, row, dtype=int))
+            columns.append(expression_column)
+            values.append(expression_value)
+
+        b[row] = cons_val
+
+    # Assemble the sparse matrix in one shot
+    if rows:
+        rows = np.concatenate(rows)
+        columns = np.concatenate(columns)
+        values = np.concatenate(values).astype(float)
+    A = coo_matrix((values, (rows, columns)), shape=(len(list_of_expressions), nb_columns)).tocsr()
+
+    return A, b
@@ -0,0 +1,267 @@
+from collections import namedtuple
+
+import numpy as np
+
+from PEPit.point import Point
+from PEPit.expression import Expression
+from PEPit.constraint import Constraint
+from PEPit.psd_matrix import PSDMatrix
+from PEPit.tools.expressions_to_matrices import expression_to_sparse_matrices
+
+# The scalings of a PEP map its Gram matrix G, its vector of leaf Expressions F, its constraints and its LMIs
+# to the ones of its normalized PEP (G', F'), as
+#
+#     G = diag(points) G' diag(points),  F = expressions * F',
+#     normalized constraint k = constraints[k] * constraint k,
+#     normalized LMI l = diag(psd[l]) LMI l diag(psd[l]).
+#
+# The worst-case value of the PEP is then objective times the one of the normalized PEP,
+# where objective is the scaling of the leaf Expression maximized by the PEP.
+# normalized_A and normalized_b stack the normalized constraints and the lower triangular entries of the
+# normalized LMIs (see `expressions_to_stacked_sparse_matrix`), and identify the normalized PEP.
+HomogeneityScalings = namedtuple("HomogeneityScalings",
+                                 ["points", "expressions", "constraints", "psd", "objective",
+                                  "normalized_A", "normalized_b"])
+
+
+def get_homogeneity_scalings(list_of_constraints, list_of_psd, objective, declared_scalings=None):
+    """
+    Detect the scaling symmetries of a PEP, and compute the scalings that normalize it.
+
+    A PEP is left unchanged, up to the value of its objective, by scaling each leaf :class:`Point`
+    (i.e. conjugating the Gram matrix by a positive diagonal matrix), each leaf :class:`Expression`,
+    each scalar constraint and each row and column of each LMI by positive factors.
+    The logarithms of the scalings are chosen to minimize the sum of the squared logarithms
+    of the magnitudes of all the coefficients of the normalized PEP, that is a least-squares problem.
+    Its residual, hence the normalized PEP, is the same for all the PEPs that are related by such scalings.
+    For instance, the PEPs of a method on :math:`L`-smooth functions with initial distance :math:`R` are all
+    normalized to the same PEP, and their worst-case values are rescalings of the one of the normalized PEP.
+
+    Besides, the coefficients of the normalized PEP are balanced, which improves the conditioning of the SDP.
+
+    Args:
+        list_of_constraints (list): the :class:`Constraint` objects, in the order they are sent to the wrapper.
+        list_of_psd (list): the :class:`PSDMatrix` objects, in the order they are sent to the wrapper.
+        objective (Expression): the leaf :class:`Expression` maximized by the PEP.
+        declared_scalings (dict, optional): the scalings of some leaf :class:`Point` and :class:`Expression`
+                                            objects (keys), as positive numbers (values).
+                                            If provided, the scalings of all the leaf :class:`Point`
+                                            and :class:`Expression` objects are declared, and set to 1 if missing,
+                                            but the one of `objective`.
+                                            Only the other scalings are then detected.
+
+    Returns:
+        scalings (HomogeneityScalings): the scalings of the PEP, and its normalized coefficients.
+
+    Raises:
+        ValueError: if a declared scaling is not positive, or is not associated with a leaf :class:`Point`
+                    or :class:`Expression`.
+
+    """
+    # Imported here as scipy is only needed for homogeneity detection
+    from scipy.sparse import coo_matrix
+
+    nb_points = Point.counter
+    nb_expressions = Expression.counter
+    nb_constraints = len(list_of_constraints)
+    psd_sizes = [psd_matrix.shape[0] for psd_matrix in list_of_psd]
+    psd_offsets = np.concatenate([[0], np.cumsum(psd_sizes, dtype=int)])
+
+    # List the expressions (the constraints and the lower triangular entries of the LMIs),
+    # as well as the scalings of the LMIs each entry depends on
+    list_of_expressions = [constraint.expression for constraint in list_of_constraints]
+    list_of_psd_entries = list()
+    for psd_counter, psd_matrix in enumerate(list_of_psd):
+        for j in range(psd_sizes[psd_counter]):
+            for i in range(j, psd_sizes[psd_counter]):
+                list_of_expressions.append(psd_matrix[i, j])
+                list_of_psd_entries.append((psd_offsets[psd_counter] + i, psd_offsets[psd_counter] + j))
+
+    # Each coefficient is an entry: its row is the index of its expression and its column,
+    # the one of the Gram matrix (column-major) or of F it multiplies, -1 for constants
+    entries_rows, entries_columns, entries_values = list(), list(), list()
+    for row, expression in enumerate(list_of_expressions):
+        Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = \
+            expression_to_sparse_matrices(expression)
+        columns = [Gweights_indi + Gweights_indj * nb_points, nb_points ** 2 + Fweights_ind]
+        values = [Gweights_val, Fweights_val]
+        if cons_val != 0:
+            columns.append(np.array([-1]))
+            values.append(np.array([cons_val], dtype=float))
+        columns = np.concatenate(columns).astype(int)
+        entries_rows.append(np.full(columns.size, row))
+        entries_columns.append(columns)
+        entries_values.append(np.concatenate(values))
+    entries_rows = np.concatenate([np.zeros((0,), dtype=int)] + entries_rows)
+    entries_columns = np.concatenate([np.zeros((0,), dtype=int)] + entries_columns)
+    entries_values = np.concatenate([np.zeros((0,))] + entries_values)
+    nb_entries = entries_values.size
+
+    # The logarithm of the magnitude of each entry is shifted by the logarithms of the scalings
+    # of the leaf Points, of the leaf Expression and of the LMI rows and columns it depends on
+    nb_scalings = nb_points + nb_expressions + psd_offsets[-1]
+    is_G_entry = (entries_columns >= 0) & (entries_columns < nb_points ** 2)
+    is_F_entry = entries_columns >= nb_points ** 2
+    entries = np.arange(nb_entries)
+    incidence_rows = [entries[is_G_entry], entries[is_G_entry], entries[is_F_entry]]
+    incidence_columns = [entries_columns[is_G_entry] % nb_points, entries_columns[is_G_entry] // nb_points,
+                         nb_points + entries_columns[is_F_entry] - nb_points ** 2]
+    if list_of_psd_entries:
+        psd_entries = np.array(list_of_psd_entries, dtype=int)
+        is_psd_entry = entries_rows >= nb_constraints
+        for k in range(2):
+            incidence_rows.append(entries[is_psd_entry])
+            incidence_columns.append(nb_points + nb_expressions
+                                     + psd_entries[entries_rows[is_psd_entry] - nb_constraints, k])
+    incidence_rows = np.concatenate(incidence_rows)
+    incidence = coo_matrix((np.ones(incidence_rows.size), (incidence_rows, np.concatenate(incidence_columns))),
+                           shape=(nb_entries, nb_scalings)).tocsr()
+
+    # Declared scalings are fixed, and the others are free
+    log_magnitudes = np.log(np.abs(entries_values))
+    is_free = np.ones(nb_scalings, dtype=bool)
+    if declared_scalings is not None:
+        fixed_log_scalings = np.zeros(nb_scalings)
+        for leaf, scaling in declared_scalings.items():
+            if not scaling > 0:
+                raise ValueError("The declared scalings must be positive. Got {}".format(scaling))
+            if isinstance(leaf, Point) and leaf.get_is_leaf():
+                fixed_log_scalings[leaf.counter] = np.log(scaling)
+            elif isinstance(leaf, Expression) and leaf.get_is_leaf():
+                fixed_log_scalings[nb_points + leaf.counter] = np.log(scaling)
+            else:
+                raise ValueError("The scalings can only be declared for leaf Point and Expression objects."
+                                 " Got {}".format(leaf))
+        log_magnitudes += incidence @ fixed_log_scalings
+        is_free[:nb_points + nb_expressions] = False
+        is_free[nb_points + objective.counter] = True
+    free_incidence = incidence[:, is_free]
+
+    # The optimal scaling of each constraint centers the logarithms of its entries,
+    # so that the least-squares problem is reduced to the scalings of the leaves and of the LMIs
+    is_constraint_entry = entries_rows < nb_constraints
+    groups = coo_matrix((np.ones(np.sum(is_constraint_entry)),
+                         (entries[is_constraint_entry], entries_rows[is_constraint_entry])),
+                        shape=(nb_entries, nb_constraints)).tocsr()
+    group_sizes = np.maximum(np.asarray(groups.sum(axis=0)).reshape(-1), 1)
+    grouped_incidence = (groups.T @ free_incidence).toarray()
+    grouped_log_magnitudes = groups.T @ log_magnitudes
+    hessian = (free_incidence.T @ free_incidence).toarray() \
+        - grouped_incidence.T @ (grouped_incidence / group_sizes[:, None])
+    gradient = free_incidence.T @ log_magnitudes - grouped_incidence.T @ (grouped_log_magnitudes / group_sizes)
+    free_log_scalings = np.linalg.lstsq(hessian, -gradient, rcond=None)[0]
+    log_constraint_scalings = - (grouped_log_magnitudes + grouped_incidence @ free_log_scalings) / group_sizes
+
+    # Gather all the scalings
+    log_scalings = np.zeros(nb_scalings) if declared_scalings is None else fixed_log_scalings
+    log_scalings[is_free] = free_log_scalings
+    scalings = np.exp(log_scalings)
+    normalized_log_magnitudes = log_magnitudes + free_incidence @ free_log_scalings \
+        + groups @ log_constraint_scalings
+    normalized_values = np.sign(entries_values) * np.exp(normalized_log_magnitudes)
+
+    # Stack the normalized coefficients
+    is_constant = entries_columns < 0
+    normalized_A = coo_matrix((normalized_values[~is_constant],
+                               (entries_rows[~is_constant], entries_columns[~is_constant])),
+                              shape=(len(list_of_expressions), nb_points ** 2 + nb_expressions)).tocsr()
+    normalized_b = np.zeros(len(list_of_expressions))
+    normalized_b[entries_rows[is_constant]] = normalized_values[is_constant]
+
+    return HomogeneityScalings(points=scalings[:nb_points],
+                               expressions=scalings[nb_points:nb_points + nb_expressions],
+                               constraints=np.exp(log_constraint_scalings),
+                               psd=[scalings[nb_points + nb_expressions + psd_offsets[k]:
+                                             nb_points + nb_expressions + psd_offsets[k + 1]]
+                                    for k in range(len(list_of_psd))],
+                               objective=scalings[nb_points + objective.counter],
+                               normalized_A=normalized_A,
+                               normalized_b=normalized_b)
+
+
+def get_normalized_expression(expression, scaling, scalings):
+    """
+    Express an :class:`Expression` in terms of the normalized Gram matrix and vector of leaf Expressions,
+    and multiply it by a scaling.
+
+    Args:
+        expression (Expression): any expression.
+        scaling (float): the scaling of the expression.
+        scalings (HomogeneityScalings): the scalings of the PEP.
+
+    Returns:
+        (Expression): the normalized expression.
+
+    """
+    Gweights_indi, Gweights_indj, Gweights_val, Fweights_ind, Fweights_val, cons_val = \
+        expression_to_sparse_matrices(expression)
+    return Expression._from_sparse_matrices(
+        (Gweights_indi, Gweights_indj, scaling * scalings.points[Gweights_indi] * scalings.points[Gweights_indj]
+         * Gweights_val,
+         Fweights_ind, scaling * scalings.expressions[Fweights_ind] * Fweights_val,
+         float(scaling * cons_val)))
+
+
+def get_normalized_constraints_and_psd(list_of_constraints, list_of_psd, scalings):
+    """
+    Create the constraints and the LMIs of the normalized PEP.
+
+    Args:
+        list_of_constraints (list): the :class:`Constraint` objects, in the order they are sent to the wrapper.
+        list_of_psd (list): the :class:`PSDMatrix` objects, in the order they are sent to the wrapper.
+        scalings (HomogeneityScalings): the scalings of the PEP (see `get_homogeneity_scalings`).
+
+    Returns:
+        (dict): mapping each :class:`Constraint` and :class:`PSDMatrix` object to its normalized version.
+
+    """
+    normalized_constraints_and_psd = dict()
+    for constraint, scaling in zip(list_of_constraints, scalings.constraints):
+        normalized_constraints_and_psd[constraint] = Constraint(get_normalized_expression(constraint.expression,
+                                                                                          scaling, scalings),
+                                                                constraint.equality_or_inequality)
+    for psd_matrix, psd_scalings in zip(list_of_psd, scalings.psd):
+        size = psd_matrix.shape[0]
+        normalized_constraints_and_psd[psd_matrix] = PSDMatrix(
+            [[get_normalized_expression(psd_matrix[i, j], psd_scalings[i] * psd_scalings[j], scalings)
+              for j in range(size)] for i in range(size)])
+
+    return normalized_constraints_and_psd
+
+
+def rescale_solution(solution, scalings, inverse=False):
+    """
+    Map the solution of the normalized PEP to the one of the PEP, or conversely.
+
+    Args:
+        solution (dict): a solution (see `PEPCache.set_solution`).
+        scalings (HomogeneityScalings): the scalings of the PEP (see `get_homogeneity_scalings`).
+        inverse (bool, optional): if False, `solution` is the one of the normalized PEP,
+                                  and the one of the PEP is returned. If True, the converse.
+
+    Returns:
+        (dict): the rescaled solution.
+
+    """
+    point_scalings = np.outer(scalings.points, scalings.points)
+    factors = {"wc_value": scalings.objective,
+               "dual_objective": scalings.objective,
+               "G_value": point_scalings,
+               "F_value": scalings.expressions,
+               "residual": scalings.objective / point_scalings,
+               "constraint_duals": scalings.objective * scalings.constraints,
+               }
+    rescaled_solution = dict(solution)
+    for name, factor in factors.items():
+        if solution.get(name) is not None:
+            rescaled_solution[name] = solution[name] / factor if inverse else solution[name] * factor
+    rescaled_solution["psd_duals"] = list()
+    for psd_dual, psd_scalings in zip(solution["psd_duals"], scalings.psd):
+        factor = scalings.objective * np.outer(psd_scalings, psd_scalings)
+        rescaled_solution["psd_duals"].append(np.asarray(psd_dual) / factor if inverse
+                                              else np.asarray(psd_dual) * factor)
+    for name in ["wc_value", "dual_objective"]:
+        if rescaled_solution.get(name) is not None:
+            rescaled_solution[name] = float(rescaled_solution[name])
+
+    return rescaled_solution
@@ -0,0 +1,235 @@
+from collections import namedtuple
+
+import numpy as np
+
+from PEPit.point import Point
+from PEPit.expression import Expression
+from PEPit.constraint import Constraint
+from PEPit.tools.expressions_to_matrices import expression_to_sparse_matrices
+
+# An interpolation kernel describes a class constraint between two triplets (xi, gi, fi) and (xj, gj, fj) as
+#
+#     sum_{(weight, u, v) in quadratic_terms} weight <u^T V, v^T V> + linear_weights^T (fi, fj) + constant
+#
+# (<= 0 or == 0), where V = (xi, gi, xj, gj) and u, v are vectors of coordinates in KERNEL_POINTS_BASIS.
+InterpolationKernel = namedtuple("InterpolationKernel",
+                                 ["quadratic_terms", "linear_weights", "constant", "equality_or_inequality"])
+
+# Coordinates of xi, gi, xj and gj in the basis of the quadratic terms of a kernel,
+# and of fi and fj in the basis of its linear weights.
+# For instance, the convexity constraint fi - fj >= gj * (xi - xj) is encoded as
+#
+#     xi, gi, xj, gj = KERNEL_POINTS_BASIS
+#     fi, fj = KERNEL_VALUES_BASIS
+#     kernel = InterpolationKernel(quadratic_terms=[(1, gj, xi - xj)], linear_weights=fj - fi,
+#                                  constant=0, equality_or_inequality="inequality")
+KERNEL_POINTS_BASIS = np.eye(4)
+KERNEL_VALUES_BASIS = np.eye(2)
+
+
+def get_stacked_coefficients(list_of_points):
+    """
+    Stack the sparse vectors of coefficients of a list of triplets (point, gradient, function value).
+
+    Args:
+        list_of_points (list): a list of triplets (point, gradient, function value).
+
+    Returns:
+        X (scipy.sparse.csr_matrix): the coefficients of the points over the leaf :class:`Point` objects, one per row.
+        G (scipy.sparse.csr_matrix): the coefficients of the gradients over the leaf :class:`Point` objects.
+        F (scipy.sparse.csr_matrix): the weights of the function values over the leaf :class:`Expression` objects.
+        FG (scipy.sparse.csr_matrix): the lower triangular weights of the function values
+                                      over the inner products of leaf :class:`Point` objects,
+                                      the entry (i, j) lying in the column i * Point.counter + j.
+        constants (numpy array): the constants of the function values.
+
+    """
+    # Imported here as scipy is only needed for batched class constraints
+    from scipy.sparse import csr_matrix
+
+    nb_points = Point.counter
+    nb_expressions = Expression.counter
+
+    def stack(list_of_indices, list_of_values, nb_columns):
+        indptr = np.concatenate([[0], np.cumsum([indices.size for indices in list_of_indices])])
+        return csr_matrix((np.concatenate([np.zeros((0,))] + list_of_values),
+                           np.concatenate([np.zeros((0,), dtype=int)] + list_of_indices),
+                           indptr), shape=(len(list_of_indices), nb_columns))
+
+    points_coefficients = [point._get_coefficients() for point, _, _ in list_of_points]
+    gradients_coefficients = [gradient._get_coefficients() for _, gradient, _ in list_of_points]
+    values_sparse_matrices = [expression_to_sparse_matrices(value) for _, _, value in list_of_points]
+
+    X = stack([indices for indices, _ in points_coefficients],
+              [values for _, values in points_coefficients], nb_points)
+    G = stack([indices for indices, _ in gradients_coefficients],
+              [values for _, values in gradients_coefficients], nb_points)
+    F = stack([sparse_matrices[3] for sparse_matrices in values_sparse_matrices],
+              [sparse_matrices[4] for sparse_matrices in values_sparse_matrices], nb_expressions)
+    FG = stack([sparse_matrices[0] * nb_points + sparse_matrices[1] for sparse_matrices in values_sparse_matrices],
+               [sparse_matrices[2] for sparse_matrices in values_sparse_matrices], nb_points ** 2)
+    constants = np.array([sparse_matrices[5] for sparse_matrices in values_sparse_matrices], dtype=float)
+
+    return X, G, F, FG, constants
+
+
+def _get_row_wise_outer_products(A, B):
+    """
+    Compute the outer products of the rows of 2 sparse matrices with the same number of rows.
+
+    Args:
+        A (scipy.sparse.csr_matrix): the first matrix.
+        B (scipy.sparse.csr_matrix): the second matrix.
+
+    Returns:
+        rows (numpy array): the row of each entry of the outer products.
+        indi (numpy array): the column of `A` of each entry.
+        indj (numpy array): the column of `B` of each entry.
+        values (numpy array): the product of the corresponding values of `A` and `B`.
+
+    """
+    nb_nonzeros_A = np.diff(A.indptr)
+    nb_nonzeros_B = np.diff(B.indptr)
+    nb_entries = nb_nonzeros_A * nb_nonzeros_B
+
+    # Position of each entry in the outer product of its row, and then in A and B
+    rows = np.repeat(np.arange(A.shape[0]), nb_entries)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(nb_entries) - nb_entries, nb_entries)
+    offsets_A, offsets_B = np.divmod(offsets, np.repeat(nb_nonzeros_B, nb_entries))
+    positions_A = np.repeat(A.indptr[:-1], nb_entries) + offsets_A
+    positions_B = np.repeat(B.indptr[:-1], nb_entries) + offsets_B
+
+    return rows, A.indices[positions_A], B.indices[positions_B], A.data[positions_A] * B.data[positions_B]
+
+
+def get_batched_constraint_rows(kernel, stacked_coefficients_1, stacked_coefficients_2, rows, columns):
+    """
+    Compute the sparse representations of the class constraints defined by an interpolation kernel
+    on a list of couples of triplets, all at once.
+
+    Args:
+        kernel (InterpolationKernel): the interpolation kernel.
+        stacked_coefficients_1 (tuple): the stacked coefficients of the first list of triplets
+                                        (see `get_stacked_coefficients`).
+        stacked_coefficients_2 (tuple): the stacked coefficients of the second list of triplets.
+        rows (numpy array): the index of the first triplet of each couple in the first list.
+        columns (numpy array): the index of the second triplet of each couple in the second list.
+
+    Returns:
+        Gweights (scipy.sparse.csr_matrix): the lower triangular weights of the inner products of leaf :class:`Point`
+                                            objects, in the format of :func:`expression_to_sparse_matrices`,
+                                            one row per couple, the entry (i, j) lying in the column
+                                            i * Point.counter + j.
+        Fweights (scipy.sparse.csr_matrix): the weights of the leaf :class:`Expression` objects, one row per couple.
+        cons_val (numpy array): the constant of each constraint.
+
+    """
+    # Imported here as scipy is only needed for batched class constraints
+    from scipy.sparse import coo_matrix
+
+    X1, G1, F1, FG1, constants1 = stacked_coefficients_1
+    X2, G2, F2, FG2, constants2 = stacked_coefficients_2
+    nb_pairs = len(rows)
+    nb_points = X1.shape[1]
+    basis = [X1[rows], G1[rows], X2[columns], G2[columns]]
+
+    # Linear combinations of xi, gi, xj and gj, computed once each
+    combinations = dict()
+
+    def combine(u):
+        key = tuple(np.asarray(u, dtype=float).tolist())
+        if key not in combinations:
+            combinations[key] = sum([coefficient * vectors for coefficient, vectors in zip(key, basis)
+                                     if coefficient != 0], basis[0] * 0).tocsr()
+            combinations[key].sum_duplicates()
+            combinations[key].eliminate_zeros()
+        return combinations[key]
+
+    # Inner products of linear combinations of xi, gi, xj and gj
+    list_of_rows, list_of_keys, list_of_values = list(), list(), list()
+    for weight, u, v in kernel.quadratic_terms:
+        if weight != 0:
+            constraint_rows, indi, indj, values = _get_row_wise_outer_products(combine(u), combine(v))
+            # Only the lower triangular part of the symmetrized weights is stored
+            list_of_rows.append(constraint_rows)
+            list_of_keys.append(np.maximum(indi, indj) * nb_points + np.minimum(indi, indj))
+            list_of_values.append(weight * np.where(indi == indj, values, values / 2))
+
+    # Function values, that may involve inner products as well
+    Fweights = F1[rows] * 0
+    cons_val = np.full(nb_pairs, float(kernel.constant))
+    for weight, (_, _, F, FG, constants), indices in zip(np.asarray(kernel.linear_weights, dtype=float),
+                                                        [stacked_coefficients_1, stacked_coefficients_2],
+                                                        [rows, columns]):
+        if weight != 0:
+            Fweights = Fweights + weight * F[indices]
+            cons_val += weight * constants[indices]
+            FGweights = FG[indices].tocoo()
+            list_of_rows.append(FGweights.row)
+            list_of_keys.append(FGweights.col)
+            list_of_values.append(weight * FGweights.data)
+
+    # Sum the weights of each entry of each constraint, and remove null ones
+    Gweights = coo_matrix((np.concatenate([np.zeros((0,))] + list_of_values),
+                           (np.concatenate([np.zeros((0,), dtype=int)] + list_of_rows),
+                            np.concatenate([np.zeros((0,), dtype=int)] + list_of_keys))),
+                          shape=(nb_pairs, nb_points ** 2)).tocsr()
+    for weights in [Gweights, Fweights]:
+        weights.sum_duplicates()
+        weights.eliminate_zeros()
+
+    return Gweights, Fweights, cons_val
+
+
+def get_batched_class_constraints(kernel, list_of_points_1, list_of_points_2, rows, columns,
+                                  max_nb_entries=10 ** 7):
+    """
+    Create the class constraints defined by an interpolation kernel on a list of couples of triplets.
+    Their sparse representations are computed by vectorized operations (see `get_batched_constraint_rows`),
+    and each :class:`Constraint` is created directly from its own.
+
+    Args:
+        kernel (InterpolationKernel): the interpolation kernel.
+        list_of_points_1 (list): the first list of triplets (point, gradient, function value).
+        list_of_points_2 (list): the second list of triplets.
+        rows (numpy array): the index of the first triplet of each couple in `list_of_points_1`.
+        columns (numpy array): the index of the second triplet of each couple in `list_of_points_2`.
+        max_nb_entries (int, optional): an approximate bound on the number of entries of the outer products
+                                        computed at once, the couples being processed by chunks accordingly.
+
+    Returns:
+        list_of_constraints (list): the :class:`Constraint` objects, in the order of the couples.
+
+    """
+    rows = np.asarray(rows, dtype=int)
+    columns = np.asarray(columns, dtype=int)
+    stacked_coefficients_1 = get_stacked_coefficients(list_of_points_1)
+    stacked_coefficients_2 = stacked_coefficients_1 if list_of_points_2 is list_of_points_1 \
+        else get_stacked_coefficients(list_of_points_2)
+
+    # Split the couples so that each chunk computes about max_nb_entries entries (unless a single couple does)
+    nb_nonzeros = np.diff(stacked_coefficients_1[0].indptr)[rows] + np.diff(stacked_coefficients_1[1].indptr)[rows] \
+        + np.diff(stacked_coefficients_2[0].indptr)[columns] + np.diff(stacked_coefficients_2[1].indptr)[columns]
+    cumulated_nb_entries = np.cumsum(len(kernel.quadratic_terms) * nb_nonzeros ** 2)
+    total_nb_entries = cumulated_nb_entries[-1] if rows.size else 0
+    boundaries = np.unique(np.searchsorted(cumulated_nb_entries,
+                                           np.arange(max_nb_entries, total_nb_entries, max_nb_entries), side="right"))
+
+    list_of_constraints = list()
+    for chunk in np.split(np.arange(rows.size), boundaries):
+        Gweights, Fweights, cons_val = get_batched_constraint_rows(kernel, stacked_coefficients_1,
+                                                                   stacked_coefficients_2, rows[chunk], columns[chunk])
+        Gweights_indi, Gweights_indj = np.divmod(Gweights.indices.astype(int), stacked_coefficients_1[0].shape[1])
+        Fweights_ind = Fweights.indices.astype(int)
+        for k in range(chunk.size):
+            G_start, G_end = Gweights.indptr[k], Gweights.indptr[k + 1]
+            F_start, F_end = Fweights.indptr[k], Fweights.indptr[k + 1]
+            expression = Expression._from_sparse_matrices((Gweights_indi[G_start:G_end],
+                                                           Gweights_indj[G_start:G_end],
+                                                           Gweights.data[G_start:G_end],
+                                                           Fweights_ind[F_start:F_end],
+                                                           Fweights.data[F_start:F_end],
+                                                           cons_val[k].item()))
+            list_of_constraints.append(Constraint(expression, kernel.equality_or_inequality))
+
+    return list_of_constraints
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+def get_redundant_rows(A, b, is_equality):
+    """
+    Detect the scalar constraints :math:`a_k^T x + b_k \\leqslant 0` (or :math:`= 0`) that can be removed
+    from a problem without changing its feasible set, namely
+
+        - the constraints that do not involve any variable and are satisfied (e.g. :math:`0 \\leqslant 0`),
+        - the constraints that are identical to a previous one of the same type,
+          up to the sign for the equality constraints.
+
+    Args:
+        A (scipy.sparse matrix): the stacked weights of the constraints (see `expressions_to_stacked_sparse_matrix`).
+        b (numpy array): the stacked constant terms of the constraints.
+        is_equality (numpy array): boolean array, True for the equality constraints, False for the inequality ones.
+
+    Returns:
+        redundant (numpy array): boolean array, True for the constraints that can be removed.
+                                 Among identical constraints, the first one is kept.
+
+    """
+
+    A = A.tocsr()
+    A.sum_duplicates()
+    A.eliminate_zeros()
+    A.sort_indices()
+    nb_rows = A.shape[0]
+    redundant = np.zeros(nb_rows, dtype=bool)
+
+    seen_rows = set()
+    for row in range(nb_rows):
+        indices = A.indices[A.indptr[row]:A.indptr[row + 1]]
+        data = A.data[A.indptr[row]:A.indptr[row + 1]]
+        constant = b[row]
+
+        # Constraints that do not involve any variable
+        if data.size == 0:
+            redundant[row] = constant == 0 if is_equality[row] else constant <= 0
+            continue
+
+        # Equality constraints are normalized so that their first coefficient is positive
+        if is_equality[row] and data[0] < 0:
+            data, constant = -data, -constant
+
+        # Constraints identical to a previous one
+        key = (bool(is_equality[row]), indices.tobytes(), data.tobytes(), float(constant) + 0.)
+        if key in seen_rows:
+            redundant[row] = True
+        else:
+            seen_rows.add(key)
+
+    return redundant
@@ -0,0 +1,328 @@
+import numpy as np
+
+
+def get_symmetric_vectorization_matrix(size):
+    """
+    Compute the sparse matrix :math:`P` such that :math:`\\mathrm{vec}(G) = P\\,u` for any symmetric matrix
+    :math:`G` of shape (size, size), where :math:`\\mathrm{vec}(G)` is the column-major vectorization of :math:`G`
+    and :math:`u` stacks its upper triangular entries :math:`G_{i,j}` (:math:`i \\leqslant j`), column by column.
+
+    Args:
+        size (int): the size of the symmetric matrix.
+
+    Returns:
+        P (scipy.sparse.csr_matrix): a matrix of shape (size ** 2, size * (size + 1) // 2).
+
+    """
+    from scipy.sparse import coo_matrix
+
+    rows_i, columns_j = get_upper_triangular_indices(size)
+    variables = np.arange(rows_i.size)
+    off_diagonal = rows_i != columns_j
+
+    rows = np.concatenate([rows_i + size * columns_j, columns_j[off_diagonal] + size * rows_i[off_diagonal]])
+    columns = np.concatenate([variables, variables[off_diagonal]])
+
+    return coo_matrix((np.ones(rows.size), (rows, columns)), shape=(size ** 2, rows_i.size)).tocsr()
+
+
+def get_upper_triangular_indices(size):
+    """
+    Args:
+        size (int): the size of the symmetric matrix.
+
+    Returns:
+        rows_i (numpy array): the row indices of the upper triangular entries, column by column.
+        columns_j (numpy array): the column indices of the upper triangular entries, column by column.
+
+    """
+    rows_i, columns_j = np.triu_indices(size)
+    order = np.lexsort((rows_i, columns_j))
+
+    return rows_i[order], columns_j[order]
+
+
+def _get_scalar_variables_form(A, size):
+    """
+    Express stacked weights of (vec(G), F) as weights of the scalar variables (u, F),
+    :math:`u` being the upper triangular entries of :math:`G` (see `get_symmetric_vectorization_matrix`).
+
+    Args:
+        A (scipy.sparse matrix): the stacked weights of (vec(G), F).
+        size (int): the size of the Gram matrix.
+
+    Returns:
+        (scipy.sparse.csr_matrix): the stacked weights of (u, F).
+
+    """
+    from scipy.sparse import hstack
+
+    A = A.tocsr()
+    return hstack([A[:, :size ** 2] @ get_symmetric_vectorization_matrix(size), A[:, size ** 2:]]).tocsr()
+
+
+def _get_lmi_rows(nb_constraints, psd_sizes):
+    """
+    Args:
+        nb_constraints (int): the number of scalar constraints, stacked first.
+        psd_sizes (list): the sizes of the LMIs, whose entries are stacked next, column by column.
+
+    Returns:
+        (list): for each LMI, its size and the rows of its lower triangular entries :math:`(p, q)`
+                (:math:`p \\geqslant q`), as three arrays p, q, rows.
+
+    """
+    lmi_rows = list()
+    first_row = nb_constraints
+    for psd_size in psd_sizes:
+        p, q = np.tril_indices(psd_size)
+        lmi_rows.append((psd_size, p, q, first_row + p + psd_size * q))
+        first_row += psd_size ** 2
+
+    return lmi_rows
+
+
+def get_sdpa_block_structure(is_equality, psd_sizes, size):
+    """
+    Compute the block structure of an SDP written by `write_sdpa`.
+
+    Args:
+        is_equality (numpy array): boolean array, True for the equality constraints, False for the inequality ones.
+        psd_sizes (list): the sizes of the LMIs.
+        size (int): the size of the Gram matrix.
+
+    Returns:
+        block_structure (list): the sizes of the blocks, negative for the diagonal block of the scalar constraints.
+
+    """
+    nb_lp_rows = len(is_equality) + int(np.sum(is_equality))
+
+    return [size] + ([-nb_lp_rows] if nb_lp_rows > 0 else []) + list(psd_sizes)
+
+
+def write_sdpa(path, A, b, is_equality, psd_sizes, size):
+    """
+    Write an SDP in the SDPA sparse format.
+
+    The SDP maximizes the last stacked expression (the objective) subject to the scalar constraints
+    :math:`a_k^T x + b_k \\leqslant 0` (or :math:`= 0`) stacked first, and to the LMIs whose entries are stacked next
+    (see `expressions_to_stacked_sparse_matrix`), with :math:`x = (\\mathrm{vec}(G), F)` and :math:`G \\succeq 0`.
+
+    In the SDPA format, it reads :math:`\\min_y c^T y` subject to :math:`\\sum_i y_i F_i - F_0 \\succeq 0`,
+    where :math:`y` gathers the upper triangular entries of :math:`G` (column by column) and :math:`F`,
+    and :math:`c` is the opposite of the weights of the objective (its constant term is dropped).
+    The block-diagonal matrix :math:`\\sum_i y_i F_i - F_0` is made of
+
+        - :math:`G` itself,
+        - a diagonal block with :math:`-(a_k^T x + b_k)` for each scalar constraint,
+          as well as :math:`a_k^T x + b_k` for each equality constraint,
+        - one block per LMI.
+
+    Args:
+        path (str): the path of the file to write.
+        A (scipy.sparse matrix): the stacked weights of (vec(G), F).
+        b (numpy array): the stacked constant terms.
+        is_equality (numpy array): boolean array, True for the equality constraints, False for the inequality ones.
+        psd_sizes (list): the sizes of the LMIs.
+        size (int): the size of the Gram matrix.
+
+    """
+    A = _get_scalar_variables_form(A, size)
+    nb_constraints = len(is_equality)
+    nb_variables = A.shape[1]
+
+    # Stack the entries (matno, blkno, i, j, value) of the matrices F_0, ..., F_m, block by block
+    entries = list()
+
+    # Gram matrix block
+    rows_i, columns_j = get_upper_triangular_indices(size)
+    variables = np.arange(rows_i.size)
+    entries.append(np.column_stack([variables + 1, np.ones_like(variables), rows_i + 1, columns_j + 1,
+                                    np.ones_like(variables)]))
+    block = 1
+
+    # Diagonal block of the scalar constraints, equality constraints being split into two inequalities
+    lp_rows = np.concatenate([np.arange(nb_constraints), np.flatnonzero(is_equality)]).astype(int)
+    lp_signs = np.concatenate([-np.ones(nb_constraints), np.ones(np.sum(is_equality))])
+    if lp_rows.size > 0:
+        block += 1
+        lp_weights = (A[lp_rows].multiply(lp_signs[:, None])).tocoo()
+        entries.append(np.column_stack([lp_weights.col + 1, np.full(lp_weights.nnz, block),
+                                        lp_weights.row + 1, lp_weights.row + 1, lp_weights.data]))
+        entries.append(np.column_stack([np.zeros(lp_rows.size), np.full(lp_rows.size, block),
+                                        np.arange(1, lp_rows.size + 1), np.arange(1, lp_rows.size + 1),
+                                        -lp_signs * b[lp_rows]]))
+
+    # LMI blocks, given by their upper triangular entries (q, p), p >= q
+    for psd_size, p, q, rows in _get_lmi_rows(nb_constraints, psd_sizes):
+        block += 1
+        lmi_weights = A[rows].tocoo()
+        entries.append(np.column_stack([lmi_weights.col + 1, np.full(lmi_weights.nnz, block),
+                                        q[lmi_weights.row] + 1, p[lmi_weights.row] + 1, lmi_weights.data]))
+        entries.append(np.column_stack([np.zeros(rows.size), np.full(rows.size, block), q + 1, p + 1, -b[rows]]))
+
+    entries = np.concatenate(entries)
+    entries = entries[entries[:, 4] != 0]
+    c = -A[-1].toarray().reshape(-1)
+    block_structure = get_sdpa_block_structure(is_equality, psd_sizes, size)
+
+    with open(path, "w") as file:
+        file.write('"PEP exported by PEPit: maximize the objective, i.e. minimize c^T y\n')
+        file.write("{}\n".format(nb_variables))
+        file.write("{}\n".format(len(block_structure)))
+        file.write("{}\n".format(" ".join(str(block_size) for block_size in block_structure)))
+        file.write("{}\n".format(" ".join(repr(float(value)) for value in c)))
+        for matno, blkno, i, j, value in entries:
+            file.write("{} {} {} {} {}\n".format(int(matno), int(blkno), int(i), int(j), repr(float(value))))
+
+
+def write_cbf(path, A, b, is_equality, psd_sizes, size):
+    """
+    Write an SDP in the Conic Benchmark Format (CBF), version 3.
+
+    The SDP is the same as in `write_sdpa`. Its free scalar variables gather the upper triangular entries of
+    :math:`G` (column by column) and :math:`F`, the scalar constraints are kept as is (cones L- and L=),
+    and :math:`G \\succeq 0` as well as the LMIs are affine PSD constraints (PSDCON) in those variables.
+
+    Args:
+        path (str): the path of the file to write.
+        A (scipy.sparse matrix): the stacked weights of (vec(G), F).
+        b (numpy array): the stacked constant terms.
+        is_equality (numpy array): boolean array, True for the equality constraints, False for the inequality ones.
+        psd_sizes (list): the sizes of the LMIs.
+        size (int): the size of the Gram matrix.
+
+    """
+    A = _get_scalar_variables_form(A, size)
+    nb_constraints = len(is_equality)
+    nb_variables = A.shape[1]
+
+    # Cones of the scalar constraints, by runs of constraints of the same type
+    cones = list()
+    for equality in is_equality:
+        cone = "L=" if equality else "L-"
+        if cones and cones[-1][0] == cone:
+            cones[-1][1] += 1
+        else:
+            cones.append([cone, 1])
+
+    # Entries (psdcon, variable, p, q, value) and (psdcon, p, q, value) of the affine PSD constraints
+    rows_i, columns_j = get_upper_triangular_indices(size)
+    variables = np.arange(rows_i.size)
+    h_entries = [np.column_stack([np.zeros_like(variables), variables, columns_j, rows_i, np.ones_like(variables)])]
+    d_entries = [np.zeros((0, 4))]
+    for psdcon, (psd_size, p, q, rows) in enumerate(_get_lmi_rows(nb_constraints, psd_sizes), start=1):
+        lmi_weights = A[rows].tocoo()
+        h_entries.append(np.column_stack([np.full(lmi_weights.nnz, psdcon), lmi_weights.col,
+                                          p[lmi_weights.row], q[lmi_weights.row], lmi_weights.data]))
+        d_entries.append(np.column_stack([np.full(rows.size, psdcon), p, q, b[rows]]))
+    h_entries = np.concatenate(h_entries)
+    h_entries = h_entries[h_entries[:, 4] != 0]
+    d_entries = np.concatenate(d_entries)
+    d_entries = d_entries[d_entries[:, 3] != 0]
+
+    constraint_weights = A[:nb_constraints].tocoo()
+    constraint_constants = np.flatnonzero(b[:nb_constraints])
+    objective_weights = A[-1].tocoo()
+
+    with open(path, "w") as file:
+        file.write("# PEP exported by PEPit\n")
+        file.write("VER\n3\n\n")
+        file.write("OBJSENSE\nMAX\n\n")
+        file.write("VAR\n{} 1\nF {}\n\n".format(nb_variables, nb_variables))
+        file.write("PSDCON\n{}\n".format(1 + len(psd_sizes)))
+        file.write("".join("{}\n".format(block_size) for block_size in [size] + list(psd_sizes)))
+        file.write("\n")
+        if nb_constraints > 0:
+            file.write("CON\n{} {}\n".format(nb_constraints, len(cones)))
+            file.write("".join("{} {}\n".format(cone, nb) for cone, nb in cones))
+            file.write("\n")
+        file.write("OBJACOORD\n{}\n".format(objective_weights.nnz))
+        file.write("".join("{} {}\n".format(j, repr(float(value)))
+                           for j, value in zip(objective_weights.col, objective_weights.data)))
+        file.write("\n")
+        if b[-1] != 0:
+            file.write("OBJBCOORD\n{}\n\n".format(repr(float(b[-1]))))
+        if constraint_weights.nnz > 0:
+            file.write("ACOORD\n{}\n".format(constraint_weights.nnz))
+            file.write("".join("{} {} {}\n".format(i, j, repr(float(value))) for i, j, value
+                               in zip(constraint_weights.row, constraint_weights.col, constraint_weights.data)))
+            file.write("\n")
+        if constraint_constants.size > 0:
+            file.write("BCOORD\n{}\n".format(constraint_constants.size))
+            file.write("".join("{} {}\n".format(i, repr(float(b[i]))) for i in constraint_constants))
+            file.write("\n")
+        file.write("HCOORD\n{}\n".format(h_entries.shape[0]))
+        file.write("".join("{} {} {} {} {}\n".format(int(psdcon), int(j), int(p), int(q), repr(float(value)))
+                           for psdcon, j, p, q, value in h_entries))
+        file.write("\n")
+        if d_entries.shape[0] > 0:
+            file.write("DCOORD\n{}\n".format(d_entries.shape[0]))
+            file.write("".join("{} {} {} {}\n".format(int(psdcon), int(p), int(q), repr(float(value)))
+                               for psdcon, p, q, value in d_entries))
+
+
+def write_npz(path, A, b, is_equality, psd_sizes, size):
+    """
+    Write an SDP as an uncompressed NumPy bundle (.npz), whose arrays can be read without any decompression.
+
+    The SDP is the same as in `write_sdpa`, and is stored as is, in the stacked form of
+    `expressions_to_stacked_sparse_matrix`, with the arrays
+
+        - "A_data", "A_indices", "A_indptr" and "A_shape": the stacked weights of (vec(G), F), in CSR format,
+        - "b": the stacked constant terms,
+        - "is_equality": True for the equality constraints, False for the inequality ones,
+        - "psd_sizes": the sizes of the LMIs,
+        - "size": the size of the Gram matrix.
+
+    Args:
+        path (str): the path of the file to write.
+        A (scipy.sparse matrix): the stacked weights of (vec(G), F).
+        b (numpy array): the stacked constant terms.
+        is_equality (numpy array): boolean array, True for the equality constraints, False for the inequality ones.
+        psd_sizes (list): the sizes of the LMIs.
+        size (int): the size of the Gram matrix.
+
+    """
+    A = A.tocsr()
+    with open(path, "wb") as file:
+        np.savez(file, A_data=A.data, A_indices=A.indices, A_indptr=A.indptr, A_shape=np.array(A.shape),
+                 b=np.asarray(b, dtype=float), is_equality=np.asarray(is_equality, dtype=bool),
+                 psd_sizes=np.array(psd_sizes, dtype=int), size=np.array(size))
+
+
+def read_sdpa_solution(path, block_structure):
+    """
+    Read the solution of an SDP in the SDPA format, as written by CSDP:
+    the first line contains the vector :math:`y`,
+    and each other line contains an entry "matno blkno i j value" of the upper triangular part of
+    the slack matrix :math:`Z = \\sum_i y_i F_i - F_0` (matno = 1) or of the dual matrix :math:`X` (matno = 2).
+
+    Args:
+        path (str): the path of the solution file.
+        block_structure (list): the sizes of the blocks, negative for diagonal blocks.
+
+    Returns:
+        y (numpy array): the vector :math:`y`.
+        X (list): the blocks of the dual matrix :math:`X`, as square matrices, or as vectors for the diagonal blocks.
+
+    """
+    with open(path, "r") as file:
+        y = np.array([float(value) for value in file.readline().split()])
+        X = [np.zeros((block_size, block_size)) if block_size > 0 else np.zeros(-block_size)
+             for block_size in block_structure]
+        for line in file:
+            if not line.strip():
+                continue
+            matno, blkno, i, j, value = line.split()
+            if int(matno) != 2:
+                continue
+            block = X[int(blkno) - 1]
+            i, j = int(i) - 1, int(j) - 1
+            if block.ndim == 1:
+                block[i] = float(value)
+            else:
+                block[i, j] = float(value)
+                block[j, i] = float(value)
+
+    return y, X
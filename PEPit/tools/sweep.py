@@ -0,0 +1,218 @@
+import os
+import time
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Environment variables limiting the number of threads of the numerical libraries and of the solvers.
+THREAD_LIMITING_ENVIRONMENT_VARIABLES = ["OMP_NUM_THREADS",
+                                         "OPENBLAS_NUM_THREADS",
+                                         "MKL_NUM_THREADS",
+                                         "VECLIB_MAXIMUM_THREADS",
+                                         "NUMEXPR_NUM_THREADS",
+                                         "RAYON_NUM_THREADS",
+                                         "MSK_IPAR_NUM_THREADS",
+                                         ]
+
+
+def parameter_grid_to_list(parameter_grid):
+    """
+    Transform a parameter grid into the list of the corresponding sets of parameters.
+
+    Args:
+        parameter_grid (dict or list): either a dictionary mapping each parameter name to a list of values,
+                                       in which case all the combinations of values are considered,
+                                       or a list of dictionaries, each of them being one set of parameters.
+
+    Returns:
+        list_of_parameters (list): list of dictionaries mapping each parameter name to a value.
+
+    Raises:
+        TypeError: if `parameter_grid` is neither a dictionary nor a list of dictionaries.
+
+    Example:
+        >>> parameter_grid_to_list({"gamma": [.5, 1], "n": [1, 2]})
+        [{'gamma': 0.5, 'n': 1}, {'gamma': 0.5, 'n': 2}, {'gamma': 1, 'n': 1}, {'gamma': 1, 'n': 2}]
+
+    """
+    if isinstance(parameter_grid, dict):
+        names = list(parameter_grid.keys())
+        return [dict(zip(names, values)) for values in itertools.product(*parameter_grid.values())]
+    elif isinstance(parameter_grid, (list, tuple)) and all(isinstance(parameters, dict)
+                                                           for parameters in parameter_grid):
+        return [dict(parameters) for parameters in parameter_grid]
+    else:
+        raise TypeError("The parameter grid must be a dictionary of lists of values, or a list of dictionaries."
+                        "Got {}".format(type(parameter_grid)))
+
+
+def _initialize_worker(nb_threads_per_worker):
+    """
+    Limit the number of threads used by a worker process, without modifying the environment of the parent process.
+
+    The environment variables are set in the worker before the solvers are loaded.
+    If the package `threadpoolctl` is installed, the thread pools of the numerical libraries already loaded
+    by the worker (e.g. numpy, imported with this module) are limited as well.
+
+    Args:
+        nb_threads_per_worker (int or None): the number of threads per worker. None to leave them as is.
+
+    """
+    if nb_threads_per_worker is None:
+        return
+
+    for name in THREAD_LIMITING_ENVIRONMENT_VARIABLES:
+        os.environ[name] = str(nb_threads_per_worker)
+
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        pass
+    else:
+        threadpool_limits(limits=nb_threads_per_worker)
+
+
+def _run_sweep_point(pep_builder, index, parameters, fixed_kwargs):
+    """
+    Call the PEP builder on one set of parameters and gather the information about the solved PEPs.
+
+    Args:
+        pep_builder (callable): a function building and solving a PEP (e.g. the `wc_*` functions of PEPit.examples).
+        index (int): the position of the set of parameters in the grid.
+        parameters (dict): the set of parameters.
+        fixed_kwargs (dict): the other keyword arguments of `pep_builder`.
+
+    Returns:
+        row (dict): the parameters, the worst-case value, and the solver information.
+
+    """
+    from PEPit.pep import PEP
+
+    # Record all the PEPs solved by the builder
+    list_of_solved_peps = list()
+    PEP.list_of_solve_hooks.append(list_of_solved_peps.append)
+
+    worst_case_value = theoretical_value = np.nan
+    error = None
+    start_time = time.perf_counter()
+    try:
+        output = pep_builder(**parameters, **fixed_kwargs)
+        # The wc_* functions return the worst-case value and the theoretical one
+        if isinstance(output, (tuple, list)):
+            worst_case_value = output[0]
+            if len(output) > 1:
+                theoretical_value = output[1]
+        else:
+            worst_case_value = output
+    except Exception as exception:
+        error = "{}: {}".format(type(exception).__name__, exception)
+    finally:
+        PEP.list_of_solve_hooks.remove(list_of_solved_peps.append)
+    total_time = time.perf_counter() - start_time
+
+    # Gather the results
+    row = {"index": index}
+    row.update(parameters)
+    row["worst_case_value"] = np.nan if worst_case_value is None else worst_case_value
+    row["theoretical_value"] = theoretical_value
+    row["solver_status"] = str(list_of_solved_peps[-1].solver_status) if list_of_solved_peps else None
+    row["solver_name"] = list_of_solved_peps[-1].solver_name if list_of_solved_peps else None
+    row["solve_time"] = sum([pep.solve_time for pep in list_of_solved_peps if pep.solve_time is not None])
+    row["total_time"] = total_time
+    row["nb_solves"] = len(list_of_solved_peps)
+    row["error"] = error
+
+    return row
+
+
+def iterate_sweep(pep_builder, parameter_grid, max_workers=None, nb_threads_per_worker=1,
+                  mp_context="spawn", **fixed_kwargs):
+    """
+    Solve the PEPs built by `pep_builder` over a parameter grid, in parallel over a pool of processes,
+    and yield the results as soon as they are available.
+
+    Each PEP is built and solved in a worker process, so that the (mostly single-threaded) construction
+    of the PEPs and the calls to the solver run in parallel.
+
+    Args:
+        pep_builder (callable): a picklable function building and solving a PEP,
+                                returning the worst-case value (possibly followed by the theoretical one),
+                                such as the `wc_*` functions of PEPit.examples.
+        parameter_grid (dict or list): the sets of parameters (see `parameter_grid_to_list`).
+        max_workers (int, optional): the number of worker processes. Defaults to the number of processors.
+        nb_threads_per_worker (int, optional): the number of threads each worker (numerical libraries and solver)
+                                               is allowed to use. Set to None to leave them unlimited.
+                                               Defaults to 1.
+        mp_context (str, optional): the start method of the worker processes ("spawn", "fork" or "forkserver").
+                                    Defaults to "spawn".
+        fixed_kwargs (keywords, optional): additional keyword arguments given to `pep_builder` for every set of
+                                           parameters (e.g. `verbose=-1`).
+
+    Yields:
+        row (dict): for each set of parameters, in order of completion, its index in the grid, the parameters,
+                    the worst-case value, the theoretical value (NaN if not returned by `pep_builder`),
+                    the status and name of the solver, the time spent in the solver, the total time,
+                    the number of solved PEPs, and the error message if the call failed (None otherwise).
+
+    """
+    list_of_parameters = parameter_grid_to_list(parameter_grid)
+
+    # The thread limits are applied by each worker when it starts
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context(mp_context),
+                             initializer=_initialize_worker,
+                             initargs=(nb_threads_per_worker,)) as executor:
+        futures = [executor.submit(_run_sweep_point, pep_builder, index, parameters, fixed_kwargs)
+                   for index, parameters in enumerate(list_of_parameters)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_sweep(pep_builder, parameter_grid, max_workers=None, nb_threads_per_worker=1,
+              mp_context="spawn", callback=None, **fixed_kwargs):
+    """
+    Solve the PEPs built by `pep_builder` over a parameter grid, in parallel over a pool of processes,
+    and gather the results in a table.
+
+    Args:
+        pep_builder (callable): a picklable function building and solving a PEP,
+                                returning the worst-case value (possibly followed by the theoretical one),
+                                such as the `wc_*` functions of PEPit.examples.
+        parameter_grid (dict or list): the sets of parameters (see `parameter_grid_to_list`).
+        max_workers (int, optional): the number of worker processes. Defaults to the number of processors.
+        nb_threads_per_worker (int, optional): the number of threads each worker (numerical libraries and solver)
+                                               is allowed to use. Set to None to leave them unlimited.
+                                               Defaults to 1.
+        mp_context (str, optional): the start method of the worker processes ("spawn", "fork" or "forkserver").
+        callback (callable, optional): a function called on each result (see `iterate_sweep`) as soon as
+                                       it is available.
+        fixed_kwargs (keywords, optional): additional keyword arguments given to `pep_builder` for every set of
+                                           parameters (e.g. `verbose=-1`).
+
+    Returns:
+        results (pandas.DataFrame): one row per set of parameters, in the order of the grid
+                                    (see `iterate_sweep` for the columns).
+
+    Example:
+        >>> from PEPit.tools.sweep import run_sweep
+        >>> from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+        >>> results = run_sweep(wc_gradient_descent, {"gamma": [.5, 1, 1.5], "n": [1, 2]}, L=1, verbose=-1)
+
+    """
+    rows = list()
+    for row in iterate_sweep(pep_builder, parameter_grid, max_workers=max_workers,
+                             nb_threads_per_worker=nb_threads_per_worker, mp_context=mp_context, **fixed_kwargs):
+        if callback is not None:
+            callback(row)
+        rows.append(row)
+
+    # Sort the results in the order of the grid
+    results = pd.DataFrame(rows)
+    if not results.empty:
+        results = results.sort_values("index").set_index("index")
+        results.index.name = None
+
+    return results
@@ -3,6 +3,8 @@ from PEPit.point import Point
 from PEPit.constraint import Constraint
 from PEPit.psd_matrix import PSDMatrix
 
+from PEPit.tools.chordal_decomposition import complete_psd_matrix
+
 
 class Wrapper(object):
     """
@@ -33,8 +35,19 @@ class Wrapper(object):
                        - 0: No verbose at all
                        - 1: PEPit information is printed but not solver's
                        - 2: Both PEPit and solver details are printed
+        template (PEPTemplate): if not None, the compiled problems stored in this :class:`PEPTemplate`
+                                are reused by the method generate_problem, updating only their coefficients.
+        chordal_extension (tuple): if not None, a chordal extension of the aggregate sparsity pattern
+                                   of the Gram matrix, as returned by `get_chordal_extension`.
+                                   The main constraint G >> 0 is then replaced by one PSD constraint
+                                   per clique submatrix, and G is completed after solving.
+        supports_chordal_extension (bool): class attribute, True if the wrapper handles
+                                           the attribute `chordal_extension`.
+        python_package (str): class attribute, the name of the Python package the wrapper relies on.
 
     """
+    supports_chordal_extension = False
+    python_package = None
 
     def __init__(self, verbose=1):
         """
@@ -62,6 +75,8 @@ class Wrapper(object):
         self.prob = None
         self.solver_name = None
         self.verbose = verbose
+        self.template = None
+        self.chordal_extension = None
 
     def check_license(self):
         """
@@ -116,12 +131,18 @@ class Wrapper(object):
     def get_primal_variables(self):
         """
         Output the optimal value of primal variables.
+        With a chordal decomposition of the main constraint G >> 0, the entries of G outside of the chordal
+        extension are not constrained by the solver, and G is completed into a PSD matrix.
         
         Returns:
             optimal_G (ndarray): numerical Gram matrix of the PEP after solving.
             optimal_F (ndarray): numerical elements of F after solving.
             
         """
+        if self.chordal_extension is not None and self.optimal_G is not None:
+            chordal_pattern, elimination_order, _ = self.chordal_extension
+            return complete_psd_matrix(self.optimal_G, chordal_pattern, elimination_order), self.optimal_F
+
         return self.optimal_G, self.optimal_F
 
     def assign_dual_values(self):
@@ -1,14 +1,20 @@
 from .cvxpy_wrapper import CvxpyWrapper
 from .mosek_wrapper import MosekWrapper
+from .scs_wrapper import ScsWrapper
+from .burer_monteiro_wrapper import BurerMonteiroWrapper
 
 # Define a dictionary of wrapper.
 # By convention, the keys must be written with lower cases.
 WRAPPERS = {
     "cvxpy": CvxpyWrapper,
     "mosek": MosekWrapper,
+    "scs": ScsWrapper,
+    "burer_monteiro": BurerMonteiroWrapper,
 }
 
 __all__ = ['cvxpy_wrapper', 'CvxpyWrapper',
            'mosek_wrapper', 'MosekWrapper',
+           'scs_wrapper', 'ScsWrapper',
+           'burer_monteiro_wrapper', 'BurerMonteiroWrapper',
            'WRAPPERS',
            ]
@@ -0,0 +1,521 @@
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from PEPit.wrapper import Wrapper
+from PEPit.point import Point
+from PEPit.expression import Expression
+from PEPit.constraint import Constraint
+from PEPit.psd_matrix import PSDMatrix
+
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+
+
+class BurerMonteiroWrapper(Wrapper):
+    """
+    A :class:`BurerMonteiroWrapper` object solves the PEP with a low-rank factorization of its Gram matrix,
+    :math:`G = V V^T` with :math:`V` of size `Point.counter` x `rank`, in the spirit of Burer and Monteiro.
+    It does not rely on any SDP solver.
+
+    This class overwrites the :class:`Wrapper`. In particular, it implements the methods:
+    send_constraint_to_solver, send_lmi_constraint_to_solver, generate_problem, solve, prepare_heuristic,
+    and heuristic.
+
+    The factorized problem is solved with an augmented Lagrangian method, each subproblem being minimized
+    over :math:`(V, F)` with L-BFGS. Each additional LMI :math:`M \\succeq 0` is factorized as well,
+    i.e. written :math:`M = U U^T` with :math:`U` a square matrix.
+    The output is a rank-`rank` Gram matrix, hence a `rank`-dimensional worst-case instance,
+    which is feasible up to the tolerance of the method. Its value is a lower bound on the worst-case guarantee.
+
+    The multipliers of the augmented Lagrangian provide the dual variables, and the residual
+    (the dual variable of :math:`G \\succeq 0`) follows from the stationarity of the Lagrangian with respect to G.
+    When the residual (and the dual variables of the LMIs) are positive semidefinite, the Lagrangian is stationary
+    with respect to the function values, and the relative duality gap is below the tolerance `tol` of the method,
+    the dual variables form a valid proof, and the value is certified to be the worst-case guarantee:
+    the status is then "optimal".
+    Otherwise, the status is "feasible", and only the primal value is meaningful
+    (use `return_primal_or_dual="primal"` in :meth:`PEP.solve`).
+    The solver-specific arguments of :meth:`PEP.solve` are the ones of the method `solve`, e.g. `rank`.
+
+    Attributes:
+        _list_of_constraints_sent_to_solver (list): list of :class:`Constraint` and :class:`PSDMatrix` objects
+                                                    associated to the PEP. This list does not contain constraints
+                                                    due to internal representation of the problem by the solver.
+        optimal_F (numpy.array): Elements of F after solving.
+        optimal_G (numpy.array): Gram matrix of the PEP after solving.
+        objective (Expression): The objective expression that must be maximized.
+                                This is an additional :class:`Expression` created by the PEP to deal with cases
+                                where the user wants to maximize a minimum of several expressions.
+        dual_values (list): Optimal dual variables after solving
+                            (same ordering as that of _list_of_constraints_sent_to_solver).
+        residual (Iterable of Iterables of floats): The residual of the problem, i.e. the dual variable of the Gram.
+        prob (dict): the stacked weights ("A") and constant terms ("b") of all the scalar constraints and of all
+                     the entries of the LMIs, with the indices of the rows of the equalities ("equality_rows")
+                     and of the inequalities ("inequality_rows"), and the first row and size of each LMI ("lmis").
+        solver_name (str): The name of the solver the wrapper interact with.
+        verbose (int): Level of information details to print
+                       (Override the solver verbose parameter).
+
+                       - 0: No verbose at all
+                       - 1: PEPit information is printed but not solver's
+                       - 2: Both PEPit and solver details are printed
+        _objective_row (scipy.sparse.csr_matrix): the weights of the objective :class:`Expression`
+                                                  w.r.t. the stacked variables (vec(G), F).
+        _objective_constant (float): the constant term of the objective :class:`Expression`.
+        _cost_row (scipy.sparse.csr_matrix): the weights of the function that is maximized, that is
+                                             the objective, or the opposite of the weight of a heuristic.
+        _constraint_rows (list of int): the row of `prob["A"]` associated with each :class:`Constraint`
+                                        and the first row associated with each :class:`PSDMatrix`
+                                        of `_list_of_constraints_sent_to_solver` (same ordering).
+        _factors (dict): the current factors "V" of G, and "U" of the LMIs, and the current value of "F".
+        _multipliers (numpy array): the current multipliers of the rows of `prob["A"]`.
+        _penalty (float): the current penalty parameter of the augmented Lagrangian.
+
+    """
+    python_package = "scipy"
+
+    def __init__(self, verbose=1):
+        """
+        This function initializes all internal variables of the class.
+
+        Args:
+            verbose (int): Level of information details to print
+                           (Override the solver verbose parameter).
+
+                           - 0: No verbose at all
+                           - 1: PEPit information is printed but not solver's
+                           - 2: Both PEPit and solver details are printed
+
+        """
+        super().__init__(verbose=verbose)
+
+        # Initialize attributes
+        self._objective_row = None
+        self._objective_constant = None
+        self._cost_row = None
+        self._constraint_rows = list()
+        self._factors = None
+        self._multipliers = None
+        self._penalty = None
+
+    def set_main_variables(self):
+        """
+        Nothing to do: the factor of G and the values of F are created by the method `solve`.
+
+        """
+        pass
+
+    def check_license(self):
+        """
+        Check that there is a valid available license.
+
+        Returns:
+            license presence (bool): no license needed: True
+
+        """
+        return True
+
+    def send_constraint_to_solver(self, constraint):
+        """
+        Add a PEPit :class:`Constraint` into the tracking lists.
+
+        Scalar constraints are stacked all together by the method `generate_problem`.
+
+        Args:
+            constraint (Constraint): a :class:`Constraint` object to be sent to the solver.
+
+        Raises:
+            ValueError if the attribute `equality_or_inequality` of the :class:`Constraint`
+            is neither `equality`, nor `inequality`.
+
+        """
+
+        # Sanity check
+        assert isinstance(constraint, Constraint)
+
+        # Distinguish equality and inequality
+        if constraint.equality_or_inequality not in {'equality', 'inequality'}:
+            # Raise an exception otherwise
+            raise ValueError('The attribute \'equality_or_inequality\' of a constraint object'
+                             ' must either be \'equality\' or \'inequality\'.'
+                             'Got {}'.format(constraint.equality_or_inequality))
+
+        # Add constraint to the attribute _list_of_constraints_sent_to_solver to keep track of
+        # all the constraints that have been sent to the solver as well as the order.
+        self._list_of_constraints_sent_to_solver.append(constraint)
+
+    def send_lmi_constraint_to_solver(self, psd_counter, psd_matrix):
+        """
+        Add a PEPit :class:`PSDMatrix` (LMI constraint) into the tracking lists.
+
+        LMI constraints are stacked all together by the method `generate_problem`.
+
+        Args:
+            psd_counter (int): a counter useful for the verbose mode.
+            psd_matrix (PSDMatrix): a matrix of expressions that is constrained to be PSD.
+
+        """
+
+        # Sanity check
+        assert isinstance(psd_matrix, PSDMatrix)
+
+        # Add psd_matrix to the attribute _list_of_constraints_sent_to_solver to keep track of
+        # all the constraints that have been sent to the solver as well as the order.
+        self._list_of_constraints_sent_to_solver.append(psd_matrix)
+
+        # Print a message if verbose mode activated
+        if self.verbose > 0:
+            print('\t\t Size of PSD matrix {}: {}x{}'.format(psd_counter + 1, *psd_matrix.shape))
+
+    def generate_problem(self, objective):
+        """
+        Stack the weights of all the constraints, of all the entries of the LMIs (in column-major order)
+        and of the objective, which is a PEPit :class:`Expression` object.
+
+        Args:
+            objective (Expression): the objective function of the PEP (to be maximized).
+
+        Returns:
+            prob (dict): the stacked PEP.
+
+        """
+        self.objective = objective
+
+        # Stack all the expressions, and register the rows of the constraints
+        list_of_expressions = list()
+        equality_rows = list()
+        inequality_rows = list()
+        lmis = list()
+        self._constraint_rows = list()
+        for constraint_or_psd in self._list_of_constraints_sent_to_solver:
+            row = len(list_of_expressions)
+            self._constraint_rows.append(row)
+            if isinstance(constraint_or_psd, Constraint):
+                if constraint_or_psd.equality_or_inequality == 'equality':
+                    equality_rows.append(row)
+                else:
+                    inequality_rows.append(row)
+                list_of_expressions.append(constraint_or_psd.expression)
+            else:
+                size = constraint_or_psd.shape[0]
+                lmis.append((row, size))
+                list_of_expressions += [constraint_or_psd[i, j] for j in range(size) for i in range(size)]
+        list_of_expressions.append(objective)
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+
+        # The objective (to be maximized) is the last row
+        self._objective_row = A[-1]
+        self._objective_constant = b[-1]
+        self._cost_row = self._objective_row
+
+        self.prob = {"A": A[:-1], "b": b[:-1],
+                     "equality_rows": np.array(equality_rows, dtype=int),
+                     "inequality_rows": np.array(inequality_rows, dtype=int),
+                     "lmis": lmis}
+        self._factors = None
+        self._multipliers = None
+        self._penalty = None
+
+        return self.prob
+
+    def _get_stacked_variables(self, V, F):
+        """
+        Compute the stacked variables (vec(G), F) of the PEP, with :math:`G = V V^T`.
+
+        Args:
+            V (numpy array): the factor of G.
+            F (numpy array): the values of the leaf :class:`Expression` objects.
+
+        Returns:
+            x (numpy array): the stacked variables.
+
+        """
+        return np.concatenate([(V @ V.T).flatten(order="F"), F])
+
+    def _split(self, z, rank):
+        """
+        Split the vector of the variables of the augmented Lagrangian into the factors V, U and the values F.
+
+        Args:
+            z (numpy array): the variables.
+            rank (int): the number of columns of V.
+
+        Returns:
+            V (numpy array): the factor of G.
+            F (numpy array): the values of the leaf :class:`Expression` objects.
+            list_of_U (list): the factors of the LMIs.
+
+        """
+        start = Point.counter * rank
+        V = z[:start].reshape((Point.counter, rank))
+        F = z[start:start + Expression.counter]
+        start += Expression.counter
+        list_of_U = list()
+        for _, size in self.prob["lmis"]:
+            list_of_U.append(z[start:start + size ** 2].reshape((size, size)))
+            start += size ** 2
+        return V, F, list_of_U
+
+    def _get_constraint_values(self, V, F, list_of_U):
+        """
+        Compute the values of all the stacked constraints: the values of the scalar constraints,
+        and, for the entries of an LMI :math:`M \\succeq 0`, the values of :math:`M - U U^T`.
+
+        Args:
+            V (numpy array): the factor of G.
+            F (numpy array): the values of the leaf :class:`Expression` objects.
+            list_of_U (list): the factors of the LMIs.
+
+        Returns:
+            values (numpy array): the values of the rows of `prob["A"]`.
+
+        """
+        values = self.prob["A"] @ self._get_stacked_variables(V, F) + self.prob["b"]
+        for (row, size), U in zip(self.prob["lmis"], list_of_U):
+            M = values[row:row + size ** 2].reshape((size, size), order="F")
+            values[row:row + size ** 2] = ((M + M.T) / 2 - U @ U.T).flatten(order="F")
+        return values
+
+    def _get_violation(self, values):
+        """
+        Compute the maximal violation of the constraints.
+
+        Args:
+            values (numpy array): the values of the rows of `prob["A"]`.
+
+        Returns:
+            violation (float): the maximal violation.
+
+        """
+        violations = np.abs(values)
+        violations[self.prob["inequality_rows"]] = np.maximum(values[self.prob["inequality_rows"]], 0)
+        return np.max(violations, initial=0.)
+
+    def _get_updated_multipliers(self, values):
+        """
+        Compute the multipliers of the rows of `prob["A"]` after a step of the augmented Lagrangian method.
+
+        Args:
+            values (numpy array): the values of the rows of `prob["A"]`.
+
+        Returns:
+            multipliers (numpy array): the updated multipliers.
+
+        """
+        multipliers = self._multipliers + self._penalty * values
+        inequality_rows = self.prob["inequality_rows"]
+        multipliers[inequality_rows] = np.maximum(multipliers[inequality_rows], 0)
+        return multipliers
+
+    def _augmented_lagrangian(self, z, rank):
+        """
+        Compute the augmented Lagrangian of the factorized problem and its gradient.
+
+        Args:
+            z (numpy array): the variables.
+            rank (int): the number of columns of V.
+
+        Returns:
+            value (float): the augmented Lagrangian.
+            gradient (numpy array): its gradient with respect to z.
+
+        """
+        V, F, list_of_U = self._split(z, rank)
+        values = self._get_constraint_values(V, F, list_of_U)
+        multipliers = self._get_updated_multipliers(values)
+        x = self._get_stacked_variables(V, F)
+
+        # Maximizing the cost is minimizing its opposite
+        value = - self._cost_row.dot(x)[0]
+        value += (np.sum(multipliers ** 2) - np.sum(self._multipliers ** 2)) / (2 * self._penalty)
+
+        # Gradient with respect to the stacked variables, then with respect to the factors
+        weights = self.prob["A"].T @ multipliers - self._cost_row.toarray().flatten()
+        W = weights[:Point.counter ** 2].reshape((Point.counter, Point.counter), order="F")
+        list_of_gradients = [((W + W.T) @ V).flatten(), weights[Point.counter ** 2:]]
+        for (row, size), U in zip(self.prob["lmis"], list_of_U):
+            Y = multipliers[row:row + size ** 2].reshape((size, size), order="F")
+            list_of_gradients.append((- (Y + Y.T) @ U).flatten())
+
+        return value, np.concatenate(list_of_gradients)
+
+    def _recover_dual_values(self):
+        """
+        Recover all dual variables from the multipliers of the augmented Lagrangian.
+
+        Returns:
+             dual_values (list): list of dual variables (floats) associated to _list_of_constraints_sent_to_solver
+                                 (same ordering).
+             residual (np.array): main dual PSD matrix (dual to the PSD constraint on the Gram matrix).
+
+        Raises:
+            TypeError if the attribute `_list_of_constraints_sent_to_solver` of this object
+            is neither a :class:`Constraint` object, nor a :class:`PSDMatrix` one.
+
+        """
+
+        # The residual follows from the stationarity of the Lagrangian with respect to G
+        weights = self.prob["A"].T @ self._multipliers - self._objective_row.toarray().flatten()
+        W = weights[:Point.counter ** 2].reshape((Point.counter, Point.counter), order="F")
+        residual = (W + W.T) / 2
+        dual_values = [residual]
+
+        for constraint_or_psd, row in zip(self._list_of_constraints_sent_to_solver, self._constraint_rows):
+            if isinstance(constraint_or_psd, Constraint):
+                dual_values.append(self._multipliers[row])
+            elif isinstance(constraint_or_psd, PSDMatrix):
+                size = constraint_or_psd.shape[0]
+                Y = self._multipliers[row:row + size ** 2].reshape((size, size), order="F")
+                dual_values.append(- (Y + Y.T) / 2)
+            else:
+                raise TypeError("The list of constraints that are sent to the solver should contain only"
+                                "\'Constraint\' objects of \'PSDMatrix\' objects."
+                                "Got {}".format(type(constraint_or_psd)))
+
+        return dual_values, residual
+
+    def _is_certified(self, value, tol):
+        """
+        Check whether the dual variables form a valid proof of the value of the factorized solution,
+        that is whether the residual and the dual variables of the LMIs are positive semidefinite,
+        whether the Lagrangian is stationary with respect to F, and whether the duality gap is small.
+
+        Args:
+            value (float): the value of the factorized solution.
+            tol (float): the tolerance on the relative duality gap. The tolerance on the smallest eigenvalues
+                         and on the stationarity with respect to F, relative to the size of the multipliers,
+                         is its square root.
+
+        Returns:
+            certified (bool): True if the dual variables form a valid proof.
+
+        """
+        dual_values, residual = self._recover_dual_values()
+        list_of_matrices = [residual] + [dual_value for dual_value, constraint_or_psd
+                                         in zip(dual_values[1:], self._list_of_constraints_sent_to_solver)
+                                         if isinstance(constraint_or_psd, PSDMatrix)]
+        scale = max(1., np.max(np.abs(self._multipliers), initial=0.))
+        if any(np.linalg.eigvalsh(matrix)[0] < - np.sqrt(tol) * scale for matrix in list_of_matrices):
+            return False
+
+        # The Lagrangian must be stationary with respect to F, otherwise the dual value is not an upper bound
+        weights = self.prob["A"].T @ self._multipliers - self._objective_row.toarray().flatten()
+        if np.max(np.abs(weights[Point.counter ** 2:]), initial=0.) > np.sqrt(tol) * scale:
+            return False
+
+        # The dual value must match the value of the factorized solution
+        dual_value = self._objective_constant - self._multipliers @ self.prob["b"]
+        return abs(dual_value - value) <= tol * max(1., abs(value))
+
+    def solve(self, rank=None, tol=1e-6, max_iter=100, max_inner_iter=1000, seed=0, **kwargs):
+        """
+        Solve the PEP with the augmented Lagrangian method.
+        The successive calls (e.g. within the dimension-reduction heuristics) are warm-started
+        from the previous factors and multipliers.
+
+        Args:
+            rank (int, optional): the number of columns of the factor V of G, i.e. the dimension of the
+                                  worst-case instance. Defaults to the smallest rank :math:`r` such that
+                                  :math:`r(r+1)/2` exceeds the number of constraints (and entries of the LMIs),
+                                  for which a solution of this rank exists (Barvinok-Pataki bound).
+            tol (float, optional): the tolerance on the violation of the constraints,
+                                   and on the relative duality gap of a certified solution.
+            max_iter (int, optional): the maximal number of iterations of the augmented Lagrangian method.
+            max_inner_iter (int, optional): the maximal number of L-BFGS iterations per subproblem.
+            seed (int, optional): the seed of the random initialization of the factors.
+            kwargs (keywords, optional): other solver specific arguments, that are ignored.
+
+        Returns:
+            status (string): status of the solution / problem.
+            name (string): name of the solver.
+            value (float): value of the performance metric after solving.
+
+        """
+        from scipy.optimize import minimize
+
+        self.solver_name = "Burer-Monteiro"
+        nb_rows = self.prob["A"].shape[0]
+        if rank is None:
+            rank = min(Point.counter, int(np.floor((np.sqrt(8 * nb_rows + 1) - 1) / 2)) + 1)
+
+        # Initialize the factors and the multipliers, or warm-start from the previous ones
+        if self._factors is None or self._factors["V"].shape[1] != rank:
+            random_state = np.random.RandomState(seed)
+            self._factors = {"V": random_state.randn(Point.counter, rank) / np.sqrt(Point.counter * rank),
+                             "F": np.zeros(Expression.counter),
+                             "U": [np.eye(size) for _, size in self.prob["lmis"]]}
+        if self._multipliers is None or self._multipliers.shape[0] != nb_rows:
+            self._multipliers = np.zeros(nb_rows)
+            self._penalty = 1.
+        z = np.concatenate([self._factors["V"].flatten(), self._factors["F"]]
+                           + [U.flatten() for U in self._factors["U"]])
+
+        # Augmented Lagrangian method
+        violation = np.inf
+        for iteration in range(max_iter):
+            result = minimize(self._augmented_lagrangian, z, args=(rank,), jac=True, method="L-BFGS-B",
+                              options={"maxiter": max_inner_iter, "gtol": tol, "ftol": tol ** 2})
+            z = result.x
+            V, F, list_of_U = self._split(z, rank)
+            values = self._get_constraint_values(V, F, list_of_U)
+            self._multipliers = self._get_updated_multipliers(values)
+            tau = self._objective_row.dot(self._get_stacked_variables(V, F))[0] + self._objective_constant
+
+            # Increase the penalty if the violation did not decrease enough
+            new_violation = self._get_violation(values)
+            if self.verbose > 1:
+                print('(Burer-Monteiro) Iteration {}: objective {}, violation {}, penalty {}'.format(
+                    iteration, tau, new_violation, self._penalty))
+            if not np.isfinite(tau) or abs(tau) > 1 / tol ** 2:
+                break
+            if new_violation <= tol:
+                break
+            if new_violation > violation / 4:
+                self._penalty *= 10
+            violation = new_violation
+
+        # Store main information.
+        self._factors = {"V": V, "F": F, "U": list_of_U}
+        self.optimal_G = V @ V.T
+        self.optimal_F = F
+
+        # The problem seems unbounded, or no feasible point was found
+        if not np.isfinite(tau) or abs(tau) > 1 / tol ** 2:
+            return "unbounded", self.solver_name, None
+        if new_violation > tol:
+            return "infeasible_inaccurate", self.solver_name, tau
+
+        status = "optimal" if self._is_certified(tau, tol) else "feasible"
+        return status, self.solver_name, tau
+
+    def prepare_heuristic(self, wc_value, tol_dimension_reduction):
+        """
+        Add the constraint that the objective stay close to its actual value before using
+        dimension-reduction heuristics. That is, we constrain
+
+        .. math:: \\tau \\geqslant \\text{wc value} - \\text{tol dimension reduction}
+
+        Args:
+            wc_value (float): the optimal value of the original PEP.
+            tol_dimension_reduction (float): tolerance on the objective for finding
+                                             low-dimensional examples.
+
+        """
+        # Append the inequality wc_value - tol_dimension_reduction - tau <= 0
+        row = self.prob["A"].shape[0]
+        self.prob["A"] = vstack([self.prob["A"], - self._objective_row], format="csr")
+        self.prob["b"] = np.append(self.prob["b"], wc_value - tol_dimension_reduction - self._objective_constant)
+        self.prob["inequality_rows"] = np.append(self.prob["inequality_rows"], row)
+        self._multipliers = np.append(self._multipliers, 0.)
+
+    def heuristic(self, weight):
+        """
+        Change the objective of the PEP, specifically for finding low-dimensional examples.
+        We specify a matrix :math:`W` (weight), which will allow minimizing :math:`\\mathrm{Tr}(G\\,W)`.
+
+        Args:
+            weight (np.array): weights that will be used in the heuristic.
+
+        """
+        vec_weight = np.concatenate([weight.flatten(order="F"), np.zeros(Expression.counter)])
+        self._cost_row = csr_matrix(- vec_weight)
+        return self.prob
@@ -1,12 +1,14 @@
 import importlib.util
 
+import numpy as np
+
 from PEPit.wrapper import Wrapper
 from PEPit.point import Point
 from PEPit.expression import Expression
 from PEPit.constraint import Constraint
 from PEPit.psd_matrix import PSDMatrix
 
-from PEPit.tools.expressions_to_matrices import expression_to_matrices
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
 
 
 class CvxpyWrapper(Wrapper):
@@ -39,9 +41,23 @@ class CvxpyWrapper(Wrapper):
                        - 2: Both PEPit and solver details are printed
         F (cvxpy.Variable): a 1D cvxpy.Variable that represents PEPit's Expressions.
         G (cvxpy.Variable): a 2D cvxpy.Variable that represents PEPit's Gram matrix.
+                            With a chordal extension, it is a linear expression of the entries in the extension.
+        _stacked_variables (cvxpy.Expression): the concatenation of the vectorized G and of F.
         _list_of_solver_constraints (list of cvxpy.Constraint): the list of constraints of the problem in CVXPY format.
+        _list_of_psd_solver_constraints (list of cvxpy.Constraint): the CVXPY PSD constraints associated to
+                                                                    the :class:`PSDMatrix` objects (same ordering).
+        _inequality_constraint (cvxpy.Constraint): all the scalar inequality constraints, gathered in a single
+                                                   vectorized CVXPY constraint.
+        _equality_constraint (cvxpy.Constraint): all the scalar equality constraints, gathered in a single
+                                                 vectorized CVXPY constraint.
+        _heuristic_weight (cvxpy.Parameter): the weight matrix :math:`W` of the dimension-reduction heuristic.
+                                             The heuristic problem is compiled once with this parameter,
+                                             and only re-solved with new weights afterwards.
+        _heuristic_problem (cvxpy.Problem): the problem minimizing :math:`\\mathrm{Tr}(G\\,W)`.
 
     """
+    supports_chordal_extension = True
+    python_package = "cvxpy"
 
     def __init__(self, verbose=1):
         """
@@ -61,7 +77,13 @@ class CvxpyWrapper(Wrapper):
         # Initialize attributes
         self.F = None
         self.G = None
+        self._stacked_variables = None
         self._list_of_solver_constraints = list()
+        self._list_of_psd_solver_constraints = list()
+        self._inequality_constraint = None
+        self._equality_constraint = None
+        self._heuristic_weight = None
+        self._heuristic_problem = None
 
     def set_main_variables(self):
         """
@@ -73,8 +95,77 @@ class CvxpyWrapper(Wrapper):
         # Express the constraints from F, G and objective
         # Start with the main LMI condition
         self.F = cp.Variable((Expression.counter,))
-        self.G = cp.Variable((Point.counter, Point.counter), symmetric=True)
-        self._list_of_solver_constraints.append(self.G >> 0)
+        self.G = self._create_gram_matrix()
+        self._list_of_solver_constraints += self._get_main_lmi_constraints(self.G)
+
+        # Stack the vectorized Gram matrix and the function values into a single vector of variables
+        self._stacked_variables = cp.hstack([cp.reshape(self.G, (Point.counter ** 2,), order="F"), self.F])
+
+    def _create_gram_matrix(self):
+        """
+        Create the Gram matrix G, as a symmetric cvxpy variable, or, with a chordal decomposition,
+        as a linear expression of one cvxpy variable per entry of its lower triangular part in the chordal extension.
+        In the latter case, the entries of G outside of the chordal extension are null,
+        and do not appear in the problem sent to the solver.
+
+        Returns:
+            G (cvxpy Expression): the Gram matrix.
+
+        """
+        import cvxpy as cp
+        from scipy.sparse import csr_matrix
+
+        if self.chordal_extension is None:
+            return cp.Variable((Point.counter, Point.counter), symmetric=True)
+
+        # Map each lower triangular entry of the chordal extension to its symmetric positions in vec(G)
+        indi, indj = np.nonzero(np.tril(self.chordal_extension[0]))
+        entries = np.arange(indi.size)
+        off_diagonal = indi != indj
+        rows = np.concatenate([indi + indj * Point.counter, (indj + indi * Point.counter)[off_diagonal]])
+        columns = np.concatenate([entries, entries[off_diagonal]])
+        mapping = csr_matrix((np.ones(rows.size), (rows, columns)), shape=(Point.counter ** 2, indi.size))
+
+        return cp.reshape(mapping @ cp.Variable((indi.size,)), (Point.counter, Point.counter), order="F")
+
+    def _get_main_lmi_constraints(self, G):
+        """
+        Create the main cvxpy constraint G >> 0, or, with a chordal decomposition,
+        one PSD constraint per clique submatrix of G.
+
+        Args:
+            G (cvxpy Variable): the Gram matrix.
+
+        Returns:
+            constraints (list): the cvxpy constraints.
+
+        """
+
+        if self.chordal_extension is None:
+            return [G >> 0]
+
+        _, _, cliques = self.chordal_extension
+        return [G[clique, :][:, clique] >> 0 for clique in cliques]
+
+    def _get_residual(self):
+        """
+        Recover the dual variable of the main constraint G >> 0.
+        With a chordal decomposition, it is the sum of the dual variables of the clique constraints.
+
+        Returns:
+            residual (np.array): main dual PSD matrix (dual to the PSD constraint on the Gram matrix).
+
+        """
+
+        if self.chordal_extension is None:
+            return self._list_of_solver_constraints[0].dual_value
+
+        _, _, cliques = self.chordal_extension
+        residual = np.zeros((Point.counter, Point.counter))
+        for clique, constraint in zip(cliques, self._list_of_solver_constraints):
+            residual[np.ix_(clique, clique)] += constraint.dual_value
+
+        return residual
 
     def check_license(self):
         """
@@ -97,18 +188,18 @@ class CvxpyWrapper(Wrapper):
             cvxpy_variable (cvxpy Variable): The expression in terms of F and G.
 
         """
-        import cvxpy as cp
-        
-        Gweights, Fweights, cons = expression_to_matrices(expression)
-        cvxpy_variable = cons + self.F @ Fweights + cp.sum(cp.multiply(self.G, Gweights))
+        A, b = expressions_to_stacked_sparse_matrix([expression])
+        cvxpy_variable = (A @ self._stacked_variables)[0] + b[0]
 
         # Return the input expression in a cvxpy variable
         return cvxpy_variable
 
     def send_constraint_to_solver(self, constraint):
         """
-        Transform a PEPit :class:`Constraint` into a CVXPY one
-        and add the 2 formats of the constraints into the tracking lists.
+        Add a PEPit :class:`Constraint` into the tracking lists.
+
+        Scalar constraints are not transformed one by one into CVXPY constraints.
+        They are all compiled together, in a sparse vectorized form, by the method `generate_problem`.
 
         Args:
             constraint (Constraint): a :class:`Constraint` object to be sent to CVXPY.
@@ -122,23 +213,45 @@ class CvxpyWrapper(Wrapper):
         # Sanity check
         assert isinstance(constraint, Constraint)
 
-        # Add constraint to the attribute _list_of_constraints_sent_to_solver to keep track of
-        # all the constraints that have been sent to CVXPY as well as the order.
-        self._list_of_constraints_sent_to_solver.append(constraint)
-
         # Distinguish equality and inequality
-        if constraint.equality_or_inequality == 'inequality':
-            cvxpy_constraint = self._expression_to_solver(constraint.expression) <= 0
-        elif constraint.equality_or_inequality == 'equality':
-            cvxpy_constraint = self._expression_to_solver(constraint.expression) == 0
-        else:
+        if constraint.equality_or_inequality not in {'equality', 'inequality'}:
             # Raise an exception otherwise
             raise ValueError('The attribute \'equality_or_inequality\' of a constraint object'
                              ' must either be \'equality\' or \'inequality\'.'
                              'Got {}'.format(constraint.equality_or_inequality))
 
-        # Add the corresponding CVXPY constraint to the list of constraints to be sent to CVXPY
-        self._list_of_solver_constraints.append(cvxpy_constraint)
+        # Add constraint to the attribute _list_of_constraints_sent_to_solver to keep track of
+        # all the constraints that have been sent to CVXPY as well as the order.
+        self._list_of_constraints_sent_to_solver.append(constraint)
+
+    def _send_scalar_constraints_to_solver(self):
+        """
+        Compile all the scalar :class:`Constraint` objects of the tracking list at once.
+        The inequality constraints are gathered into a single vectorized constraint :math:`A x + b \\leqslant 0`,
+        and the equality ones into :math:`A_{eq} x + b_{eq} = 0`, where :math:`x` stacks vec(G) and F.
+
+        """
+        x = self._stacked_variables
+
+        # Separate inequality and equality constraints
+        list_of_inequality_expressions = list()
+        list_of_equality_expressions = list()
+        for constraint in self._list_of_constraints_sent_to_solver:
+            if isinstance(constraint, Constraint):
+                if constraint.equality_or_inequality == 'inequality':
+                    list_of_inequality_expressions.append(constraint.expression)
+                else:
+                    list_of_equality_expressions.append(constraint.expression)
+
+        # Build one sparse constraint per type of constraint
+        if list_of_inequality_expressions:
+            A, b = expressions_to_stacked_sparse_matrix(list_of_inequality_expressions)
+            self._inequality_constraint = A @ x + b <= 0
+            self._list_of_solver_constraints.append(self._inequality_constraint)
+        if list_of_equality_expressions:
+            A_eq, b_eq = expressions_to_stacked_sparse_matrix(list_of_equality_expressions)
+            self._equality_constraint = A_eq @ x + b_eq == 0
+            self._list_of_solver_constraints.append(self._equality_constraint)
 
     def send_lmi_constraint_to_solver(self, psd_counter, psd_matrix):
         """
@@ -159,16 +272,23 @@ class CvxpyWrapper(Wrapper):
         # all the constraints that have been sent to CVXPY as well as the order.
         self._list_of_constraints_sent_to_solver.append(psd_matrix)
 
+        # With a template, the LMI constraints are compiled with the rest of the problem by generate_problem
+        if self.template is not None:
+            if self.verbose > 0:
+                print('\t\t Size of PSD matrix {}: {}x{}'.format(psd_counter + 1, *psd_matrix.shape))
+            return
+
         # Create a symmetric matrix in CVXPY
+        size = psd_matrix.shape[0]
         M = cp.Variable(psd_matrix.shape, symmetric=True)
 
         # Store the lmi constraint
         cvxpy_constraints_list = [M >> 0]
+        self._list_of_psd_solver_constraints.append(cvxpy_constraints_list[0])
 
-        # Store one correspondence constraint per entry of the matrix
-        for i in range(psd_matrix.shape[0]):
-            for j in range(psd_matrix.shape[1]):
-                cvxpy_constraints_list.append(M[i, j] == self._expression_to_solver(psd_matrix[i, j]))
+        # Store one vectorized correspondence constraint for all the entries of the matrix (column by column)
+        A, b = expressions_to_stacked_sparse_matrix([psd_matrix[i, j] for j in range(size) for i in range(size)])
+        cvxpy_constraints_list.append(cp.reshape(M, (size ** 2,), order="F") == A @ self._stacked_variables + b)
 
         # Print a message if verbose mode activated
         if self.verbose > 0:
@@ -193,37 +313,48 @@ class CvxpyWrapper(Wrapper):
         """
 
         assert self._list_of_solver_constraints == self.prob.constraints
-        dual_values_temp = [constraint.dual_value for constraint in self.prob.constraints]
         dual_values = list()
 
         # Store residual, dual value of the main lmi
-        residual = dual_values_temp[0]
+        residual = self._get_residual()
         dual_values.append(residual)
         assert residual.shape == (Point.counter, Point.counter)
 
-        # Set counter
-        counter = 1
-        counter2 = 1  # number of dual variables (no artificial ones due to LMI)
+        # Grab the dual values of the vectorized scalar constraints
+        inequality_dual_values = list()
+        equality_dual_values = list()
+        if self._inequality_constraint is not None:
+            inequality_dual_values = np.atleast_1d(self._inequality_constraint.dual_value)
+        if self._equality_constraint is not None:
+            equality_dual_values = np.atleast_1d(self._equality_constraint.dual_value)
+
+        # Set counters
+        counter_inequality = 0
+        counter_equality = 0
+        counter_psd = 0
 
         for constraint_or_psd in self._list_of_constraints_sent_to_solver:
             if isinstance(constraint_or_psd, Constraint):
-                dual_values.append(dual_values_temp[counter])
-                counter += 1
-                counter2 += 1
+                if constraint_or_psd.equality_or_inequality == 'inequality':
+                    dual_values.append(inequality_dual_values[counter_inequality])
+                    counter_inequality += 1
+                else:
+                    dual_values.append(equality_dual_values[counter_equality])
+                    counter_equality += 1
             elif isinstance(constraint_or_psd, PSDMatrix):
-                assert dual_values_temp[counter].shape == constraint_or_psd.shape
-                dual_values.append(dual_values_temp[counter])
-                counter += 1
-                counter2 += 1
-                size = constraint_or_psd.shape[0] * constraint_or_psd.shape[1]
-                counter += size
+                dual_value = self._list_of_psd_solver_constraints[counter_psd].dual_value
+                assert dual_value.shape == constraint_or_psd.shape
+                dual_values.append(dual_value)
+                counter_psd += 1
             else:
                 raise TypeError("The list of constraints that are sent to CVXPY should contain only"
                                 "\'Constraint\' objects of \'PSDMatrix\' objects."
                                 "Got {}".format(type(constraint_or_psd)))
 
         # Verify nothing is left
-        assert len(dual_values) == counter2
+        assert counter_inequality == len(inequality_dual_values)
+        assert counter_equality == len(equality_dual_values)
+        assert len(dual_values) == len(self._list_of_constraints_sent_to_solver) + 1
 
         # Return the position of the reached performance metric
         return dual_values, residual
@@ -241,12 +372,194 @@ class CvxpyWrapper(Wrapper):
 
         """
         import cvxpy as cp
-        
+
+        # Reuse the structure of a previously compiled problem if a template is provided
+        if self.template is not None:
+            return self._generate_problem_from_template(objective)
+
+        # Compile all the scalar constraints at once
+        self._send_scalar_constraints_to_solver()
+
         cvxpy_objective = self._expression_to_solver(objective)
         self.objective = cvxpy_objective
         self.prob = cp.Problem(objective=cp.Maximize(cvxpy_objective), constraints=self._list_of_solver_constraints)
         return self.prob
 
+    def _generate_problem_from_template(self, objective):
+        """
+        Instantiate the optimization model from the template.
+
+        If the template already contains a problem with the same signature, this problem is reused,
+        and only the values of its parameters are updated. Otherwise, a parametrized problem is compiled
+        and stored in the template.
+
+        Args:
+            objective (Expression): the objective function of the PEP (to be maximized).
+
+        Returns:
+            prob (cvxpy.Problem): the PEP in cvxpy format.
+
+        """
+
+        # Look for a compiled problem sharing the same structure
+        signature, A, b = self.template.get_signature("cvxpy", self._list_of_constraints_sent_to_solver, objective)
+        if self.chordal_extension is not None:
+            signature += (tuple(tuple(clique) for clique in self.chordal_extension[2]),)
+        compiled_problem = self.template.get_compiled_problem(signature)
+        if compiled_problem is None:
+            compiled_problem = self._compile_parametrized_problem(A)
+            self.template.set_compiled_problem(signature, compiled_problem)
+
+        # Update the coefficients of the problem
+        for rows, coefficients, constants in compiled_problem["parameters"]:
+            coefficients.value = A[rows].data
+            constants.value = b[rows]
+
+        # Load the compiled problem in the wrapper
+        self.F = compiled_problem["F"]
+        self.G = compiled_problem["G"]
+        self._stacked_variables = compiled_problem["stacked_variables"]
+        self._inequality_constraint = compiled_problem["inequality_constraint"]
+        self._equality_constraint = compiled_problem["equality_constraint"]
+        self._list_of_psd_solver_constraints = list(compiled_problem["psd_solver_constraints"])
+        self.objective = compiled_problem["objective"]
+        self.prob = compiled_problem["prob"]
+        self._list_of_solver_constraints = list(self.prob.constraints)
+
+        return self.prob
+
+    @staticmethod
+    def _parametrized_affine_expression(A, rows, x, chunk_size=32):
+        """
+        Create a parametrized CVXPY expression whose value equals :math:`A x + b` restricted to some rows,
+        when its parameters contain the non-zero coefficients of :math:`A` and the entries of :math:`b`.
+
+        The rows are processed by chunks. Each chunk writes :math:`S (a \\odot (P x)) + b`,
+        where :math:`P` selects the entries of :math:`x` involved in the non-zero coefficients :math:`a`
+        of the chunk, and :math:`S` sums the products row by row.
+        This form complies with the disciplined parametrized programming rules of CVXPY,
+        so that the canonicalization of the problem is performed once and for all.
+        The cost of this canonicalization grows with the product of the number of rows and of coefficients
+        of each chunk, hence the chunks.
+
+        Args:
+            A (scipy.sparse.csr_matrix): a sparse matrix with sorted indices.
+            rows (numpy array): the indices of the rows of :math:`A` to consider.
+            x (cvxpy.Expression): a 1D cvxpy expression.
+            chunk_size (int, optional): the maximal number of rows per chunk.
+
+        Returns:
+            expression (cvxpy.Expression): the parametrized expression.
+            parameters (list): list of triplets (rows of the chunk, parameter :math:`a`, parameter :math:`b`).
+
+        """
+        import cvxpy as cp
+        from scipy.sparse import csr_matrix
+
+        list_of_expressions = list()
+        parameters = list()
+        for start in range(0, len(rows), chunk_size):
+            chunk_rows = rows[start: start + chunk_size]
+            A_chunk = A[chunk_rows]
+            nb_coefficients = A_chunk.nnz
+            constants = cp.Parameter((len(chunk_rows),))
+            coefficients = cp.Parameter((nb_coefficients,))
+
+            # Rows without any coefficient are constant
+            if nb_coefficients == 0:
+                list_of_expressions.append(constants)
+            else:
+                rows_of_coefficients = np.repeat(np.arange(len(chunk_rows)), np.diff(A_chunk.indptr))
+                P = csr_matrix((np.ones(nb_coefficients), (np.arange(nb_coefficients), A_chunk.indices)),
+                               shape=(nb_coefficients, A.shape[1]))
+                S = csr_matrix((np.ones(nb_coefficients), (rows_of_coefficients, np.arange(nb_coefficients))),
+                               shape=(len(chunk_rows), nb_coefficients))
+                list_of_expressions.append(S @ cp.multiply(coefficients, P @ x) + constants)
+            parameters.append((chunk_rows, coefficients, constants))
+
+        if len(list_of_expressions) == 1:
+            expression = list_of_expressions[0]
+        else:
+            expression = cp.hstack(list_of_expressions)
+
+        return expression, parameters
+
+    def _compile_parametrized_problem(self, A):
+        """
+        Compile a problem whose coefficients are CVXPY parameters, following the layout of
+        `PEPTemplate.get_signature`: each row of :math:`A` corresponds to a scalar constraint,
+        to an entry of a PSD matrix, or to the objective (last row).
+        The rows are gathered by block (inequalities, equalities, each PSD matrix and the objective),
+        each block being a parametrized affine expression of the stacked vec(G) and F.
+
+        Args:
+            A (scipy.sparse.csr_matrix): the stacked weights of (vec(G), F), with sorted indices.
+
+        Returns:
+            compiled_problem (dict): the CVXPY variables, parameters, constraints and problem.
+
+        """
+        import cvxpy as cp
+
+        # Create the variables
+        F = cp.Variable((Expression.counter,))
+        G = self._create_gram_matrix()
+        x = cp.hstack([cp.reshape(G, (Point.counter ** 2,), order="F"), F])
+
+        # Dispatch the rows between the different blocks
+        inequality_rows = list()
+        equality_rows = list()
+        list_of_psd_rows = list()
+        row = 0
+        for constraint_or_psd in self._list_of_constraints_sent_to_solver:
+            if isinstance(constraint_or_psd, Constraint):
+                if constraint_or_psd.equality_or_inequality == 'inequality':
+                    inequality_rows.append(row)
+                else:
+                    equality_rows.append(row)
+                row += 1
+            else:
+                list_of_psd_rows.append(np.arange(row, row + constraint_or_psd.shape[0] ** 2))
+                row += constraint_or_psd.shape[0] ** 2
+        objective_rows = np.array([row])
+
+        # Create the constraints, the main LMI being the first one
+        parameters = list()
+        constraints = self._get_main_lmi_constraints(G)
+        inequality_constraint = None
+        equality_constraint = None
+        if inequality_rows:
+            expression, new_parameters = self._parametrized_affine_expression(A, np.array(inequality_rows), x)
+            parameters += new_parameters
+            inequality_constraint = expression <= 0
+            constraints.append(inequality_constraint)
+        if equality_rows:
+            expression, new_parameters = self._parametrized_affine_expression(A, np.array(equality_rows), x)
+            parameters += new_parameters
+            equality_constraint = expression == 0
+            constraints.append(equality_constraint)
+
+        # Each PSD matrix is a new variable whose vectorization equals the parametrized expressions of its entries
+        psd_solver_constraints = list()
+        for psd_rows in list_of_psd_rows:
+            size = int(np.sqrt(len(psd_rows)))
+            M = cp.Variable((size, size), symmetric=True)
+            expression, new_parameters = self._parametrized_affine_expression(A, psd_rows, x)
+            parameters += new_parameters
+            psd_solver_constraints.append(M >> 0)
+            constraints += [psd_solver_constraints[-1], cp.reshape(M, (size ** 2,), order="F") == expression]
+
+        # Create the objective
+        expression, new_parameters = self._parametrized_affine_expression(A, objective_rows, x)
+        parameters += new_parameters
+        objective = expression[0]
+        prob = cp.Problem(objective=cp.Maximize(objective), constraints=constraints)
+
+        return {"F": F, "G": G, "stacked_variables": x, "parameters": parameters,
+                "inequality_constraint": inequality_constraint, "equality_constraint": equality_constraint,
+                "psd_solver_constraints": psd_solver_constraints,
+                "objective": objective, "prob": prob}
+
     def solve(self, **kwargs):
         """
         Solve the PEP.
@@ -298,6 +611,11 @@ class CvxpyWrapper(Wrapper):
                 # If mosek is not installed, ask CVXPY to run SCS.
                 kwargs["solver"] = "SCS"
 
+        # Warm-start the successive solves of the dimension-reduction heuristic
+        # from the previous solution when the solver allows it.
+        if self.prob is self._heuristic_problem and self._heuristic_problem.status is not None:
+            kwargs.setdefault("warm_start", True)
+
         # Solve the problem.
         self.prob.solve(**kwargs)
 
@@ -325,17 +643,34 @@ class CvxpyWrapper(Wrapper):
         # Add the constraint that the objective stay close to its actual value
         self._list_of_solver_constraints.append(self.objective >= wc_value - tol_dimension_reduction)
 
+        # The heuristic problem is built with this new constraint at the first call to the method heuristic
+        self._heuristic_weight = None
+        self._heuristic_problem = None
+
     def heuristic(self, weight):
         """
         Change the objective of the PEP, specifically for finding low-dimensional examples.
         We specify a matrix :math:`W` (weight), which will allow minimizing :math:`\\mathrm{Tr}(G\\,W)`.
 
+        The weight matrix is a `cvxpy.Parameter`, so that the problem is only canonicalized at the first call.
+        The subsequent calls (e.g. the iterations of the `logdet` heuristic) only update its value,
+        and the solver is warm-started from the previous solution (see the method `solve`).
+
         Args:
             weight (np.array): weights that will be used in the heuristic.
         
         """
         import cvxpy as cp
 
-        obj = cp.sum(cp.multiply(self.G, weight))
-        self.prob = cp.Problem(objective=cp.Minimize(obj), constraints=self._list_of_solver_constraints)
+        # With a chordal decomposition, only the entries of G in the chordal extension are constrained
+        if self.chordal_extension is not None:
+            weight = np.where(self.chordal_extension[0], weight, 0.)
+
+        if self._heuristic_problem is None:
+            self._heuristic_weight = cp.Parameter(weight.shape)
+            obj = cp.sum(cp.multiply(self.G, self._heuristic_weight))
+            self._heuristic_problem = cp.Problem(objective=cp.Minimize(obj),
+                                                 constraints=self._list_of_solver_constraints)
+        self._heuristic_weight.value = weight
+        self.prob = self._heuristic_problem
         return self.prob
@@ -8,7 +8,7 @@ from PEPit.expression import Expression
 from PEPit.constraint import Constraint
 from PEPit.psd_matrix import PSDMatrix
 
-from PEPit.tools.expressions_to_matrices import expression_to_sparse_matrices
+from PEPit.tools.expressions_to_matrices import expression_to_sparse_matrices, expressions_to_stacked_sparse_matrix
 
 
 class MosekWrapper(Wrapper):
@@ -43,10 +43,15 @@ class MosekWrapper(Wrapper):
         _nb_pep_constraints_in_mosek (int): total number of scalar constraints sent to MOSEK.
         _list_of_psd_constraints_sent_to_solver (list): list of PSD constraints sent to MOSEK.
         _nb_pep_SDPconstraints_in_mosek (int): total number of PSD constraints sent to MOSEK.
+        _entry_matrices (dict): mapping each key i * Point.counter + j to the index, in the symmetric matrix store
+                                of the task, of the matrix whose only nonzero lower triangular entry is (i, j).
+                                The quadratic part of each constraint is a weighted sum of these matrices,
+                                so that the store does not grow when the coefficients of a task are updated.
         env: MOSEK environment
         task: Mosek task
 
     """
+    python_package = "mosek"
 
     def __init__(self, verbose=1):
         """
@@ -69,6 +74,7 @@ class MosekWrapper(Wrapper):
         self._nb_pep_constraints_in_mosek = 0
         self._list_of_psd_constraints_sent_to_solver = list()
         self._nb_pep_SDPconstraints_in_mosek = 0
+        self._entry_matrices = dict()
 
         import mosek
 
@@ -131,6 +137,16 @@ class MosekWrapper(Wrapper):
         assert isinstance(constraint, Constraint)
         inf = 1.0  # for symbolic purposes
 
+        # With a template, the tracked constraints are sent with the rest of the problem by generate_problem
+        if track and self.template is not None:
+            if constraint.equality_or_inequality not in {'equality', 'inequality'}:
+                raise ValueError('The attribute \'equality_or_inequality\' of a constraint object'
+                                 ' must either be \'equality\' or \'inequality\'.'
+                                 'Got {}'.format(constraint.equality_or_inequality))
+            self._list_of_constraints_sent_to_solver.append(constraint)
+            self._nb_pep_constraints_in_mosek += 1
+            return
+
         # Add constraint to the attribute _list_of_constraints_sent_to_mosek to keep track of
         # all the constraints that have been sent to mosek as well as the order.
         if track:
@@ -144,8 +160,8 @@ class MosekWrapper(Wrapper):
         self.task.appendcons(1)
         A_i, A_j, A_val, a_i, a_val, alpha_val = expression_to_sparse_matrices(constraint.expression)
 
-        sym_A = self.task.appendsparsesymmat(Point.counter, A_i, A_j, A_val)
-        self.task.putbaraij(nb_cons, 0, [sym_A], [1.0])
+        if A_val.size > 0:
+            self.task.putbaraij(nb_cons, 0, self._get_entry_matrices(A_i, A_j), A_val)
         self.task.putaijlist(nb_cons + np.zeros(a_i.shape, dtype=np.int8), a_i, a_val)
 
         if track:
@@ -170,8 +186,6 @@ class MosekWrapper(Wrapper):
             psd_matrix (PSDMatrix): a matrix of expressions that is constrained to be PSD.
 
         """
-        import mosek
-
         # Sanity check
         assert isinstance(psd_matrix, PSDMatrix)
 
@@ -180,29 +194,23 @@ class MosekWrapper(Wrapper):
         self._list_of_constraints_sent_to_solver.append(psd_matrix)
         self._nb_pep_SDPconstraints_in_mosek += 1
 
+        # With a template, the LMI constraints are sent with the rest of the problem by generate_problem
+        if self.template is not None:
+            if self.verbose > 0:
+                print('\t\t Size of PSD matrix {}: {}x{}'.format(psd_counter + 1, *psd_matrix.shape))
+            return
+
         # Create a symmetric matrix in MOSEK
         size = psd_matrix.shape[0]
         self.task.appendbarvars([size])
+        barvar_index = self.task.getnumbarvar() - 1
 
-        # Store one correspondence constraint per entry of the matrix
-        for i in range(psd_matrix.shape[0]):
-            for j in range(psd_matrix.shape[1]):
-                A_i, A_j, A_val, a_i, a_val, alpha_val = expression_to_sparse_matrices(psd_matrix[i, j])
-                # how many constraints in the task so far? This will be the constraint number
-                nb_cons = self.task.getnumcon()
-                # add a constraint in mosek
-                self.task.appendcons(1)
-                # in MOSEK format: matrices corresponding to the quadratic part of the expression
-                sym_A1 = self.task.appendsparsesymmat(Point.counter, A_i, A_j,
-                                                      A_val)  # 1/2 because we have to symmetrize the matrix!
-                # in MOSEK format: this is the matrix which selects one entry of the matrix to be PSD
-                sym_A2 = self.task.appendsparsesymmat(size, [max(i, j)], [min(i, j)], [
-                    -.5 * (i != j) - 1 * (i == j)])  # 1/2 because we have to symmetrize the matrix!
-                # fill the mosek (equality) constraint 
-                self.task.putbaraij(nb_cons, 0, [sym_A1], [1.0])
-                self.task.putbaraij(nb_cons, psd_matrix.counter + 1, [sym_A2], [1.0])
-                self.task.putaijlist(nb_cons + np.zeros(a_i.shape, dtype=np.int8), a_i, a_val)
-                self.task.putconbound(nb_cons, mosek.boundkey.fx, -alpha_val, -alpha_val)
+        # Store one correspondence constraint per entry of the matrix (column by column), all at once
+        nb_cons = self.task.getnumcon()
+        self.task.appendcons(size ** 2)
+        A, b = expressions_to_stacked_sparse_matrix([psd_matrix[i, j] for j in range(size) for i in range(size)])
+        self._put_rows_in_task(A, b, first_row=nb_cons)
+        self._put_selector_matrices_in_task(nb_cons, barvar_index, size)
 
         # Print a message if verbose mode activated
         if self.verbose > 0:
@@ -267,6 +275,10 @@ class MosekWrapper(Wrapper):
         """
         import mosek
 
+        # Reuse the structure of a previously compiled task if a template is provided
+        if self.template is not None:
+            self._generate_task_from_template(objective)
+
         assert self.task.getmaxnumvar() == Expression.counter + 1
         self.objective = objective
         _, _, _, Fweights_ind, Fweights_val, _ = expression_to_sparse_matrices(objective)
@@ -278,6 +290,165 @@ class MosekWrapper(Wrapper):
             self.task.solutionsummary(mosek.streamtype.msg)
         return self.task
 
+    def _generate_task_from_template(self, objective):
+        """
+        Fill the task with the constraints, reusing the structure stored in the template.
+
+        If the template already contains a task with the same signature, this task replaces the current one:
+        the constraints added by a previous dimension reduction heuristic are removed,
+        and only the coefficients of the constraints are updated.
+        Otherwise, the constraints are appended to the current task, which is then stored in the template.
+
+        Args:
+            objective (Expression): the objective function of the PEP (to be maximized).
+
+        """
+
+        # Look for a compiled task sharing the same structure
+        signature, A, b = self.template.get_signature("mosek", self._list_of_constraints_sent_to_solver, objective)
+        compiled_problem = self.template.get_compiled_problem(signature)
+        nb_rows = A.shape[0] - 1  # the last row is the objective
+
+        if compiled_problem is None:
+            # Create the constraints and the PSD variables associated to the PSD matrices
+            self.task.appendcons(nb_rows)
+            row = 0
+            for constraint_or_psd in self._list_of_constraints_sent_to_solver:
+                if isinstance(constraint_or_psd, Constraint):
+                    row += 1
+                else:
+                    size = constraint_or_psd.shape[0]
+                    self.task.appendbarvars([size])
+                    barvar_index = self.task.getnumbarvar() - 1
+                    # Select the entries of the matrix: they are the rows associated with the PSD matrix
+                    self._put_selector_matrices_in_task(row, barvar_index, size)
+                    row += size ** 2
+            compiled_problem = {"task": self.task, "entry_matrices": self._entry_matrices}
+            self.template.set_compiled_problem(signature, compiled_problem)
+        else:
+            # Reuse the task, after removing the constraints added by the dimension reduction heuristic
+            self.task = compiled_problem["task"]
+            self._entry_matrices = compiled_problem["entry_matrices"]
+            if self.task.getnumcon() > nb_rows:
+                self.task.removecons(list(range(nb_rows, self.task.getnumcon())))
+            self.task.putbarcj(0, [], [])
+
+        # Register the indices of the scalar constraints
+        self._constraint_index_in_mosek = list()
+        row = 0
+        for constraint_or_psd in self._list_of_constraints_sent_to_solver:
+            if isinstance(constraint_or_psd, Constraint):
+                self._constraint_index_in_mosek.append(row)
+                row += 1
+            else:
+                row += constraint_or_psd.shape[0] ** 2
+
+        # Update the coefficients of all the constraints
+        self._put_rows_in_task(A[:nb_rows], b[:nb_rows])
+
+    def _put_selector_matrices_in_task(self, first_row, barvar_index, size):
+        """
+        Make the constraints `first_row`, ..., `first_row + size ** 2 - 1` of the task select the entries
+        (column by column) of a PSD variable of the task, with a weight -1.
+
+        Args:
+            first_row (int): the index of the constraint associated with the first entry.
+            barvar_index (int): the index of the PSD variable in the task.
+            size (int): the size of the PSD variable.
+
+        """
+        i, j = np.arange(size ** 2) % size, np.arange(size ** 2) // size
+        nb_entries = size ** 2
+
+        # One selection matrix per entry (1/2 because we have to symmetrize the matrix!)
+        selector_indices = np.zeros(nb_entries, dtype=np.int64)
+        self.task.appendsparsesymmatlist([size] * nb_entries, [1] * nb_entries,
+                                         np.maximum(i, j), np.minimum(i, j), np.where(i == j, -1., -.5),
+                                         selector_indices)
+        self.task.putbaraijlist(first_row + np.arange(nb_entries), [barvar_index] * nb_entries,
+                                np.arange(nb_entries), np.arange(1, nb_entries + 1),
+                                selector_indices, np.ones(nb_entries))
+
+    def _get_entry_matrices(self, G_i, G_j):
+        """
+        Get the indices, in the symmetric matrix store of the task, of the matrices whose only nonzero
+        lower triangular entries are the entries (G_i[k], G_j[k]) (equal to 1), appending the missing ones.
+
+        Args:
+            G_i (numpy array): the row of each entry.
+            G_j (numpy array): the column of each entry (G_j <= G_i).
+
+        Returns:
+            (numpy array): the index of the matrix of each entry.
+
+        """
+        nb_points = Point.counter
+        keys = (np.asarray(G_i, dtype=np.int64) * nb_points + np.asarray(G_j, dtype=np.int64)).tolist()
+
+        # Append the matrices of the entries never used before, all at once
+        missing_keys = np.array(sorted(set(keys).difference(self._entry_matrices)), dtype=np.int64)
+        if missing_keys.size > 0:
+            nb_missing = missing_keys.size
+            indices = np.zeros(nb_missing, dtype=np.int64)
+            self.task.appendsparsesymmatlist([nb_points] * nb_missing, [1] * nb_missing,
+                                             missing_keys // nb_points, missing_keys % nb_points,
+                                             np.ones(nb_missing), indices)
+            self._entry_matrices.update(zip(missing_keys.tolist(), indices.tolist()))
+
+        return np.array([self._entry_matrices[key] for key in keys], dtype=np.int64)
+
+    def _put_rows_in_task(self, A, b, first_row=0):
+        """
+        Write the coefficients of the rows of the stacked matrix (see `expressions_to_stacked_sparse_matrix`)
+        into the constraints of the task, starting from the constraint `first_row`.
+        The constraints associated with inequalities (listed in `_constraint_index_in_mosek`) are bounded above,
+        the other ones are fixed.
+
+        Args:
+            A (scipy.sparse.csr_matrix): the stacked weights of (vec(G), F).
+            b (numpy array): the stacked constant terms.
+            first_row (int, optional): the index of the constraint associated with the first row of `A`.
+
+        """
+        import mosek
+
+        inf = 1.0  # for symbolic purposes
+        nb_points = Point.counter
+        nb_rows = A.shape[0]
+
+        # Split the coefficients between the lower triangular part of G and F
+        A = A.tocoo()
+        is_G = A.col < nb_points ** 2
+        G_rows, G_i, G_j, G_val = A.row[is_G], A.col[is_G] % nb_points, A.col[is_G] // nb_points, A.data[is_G]
+        is_lower = G_i >= G_j
+        G_rows, G_i, G_j, G_val = G_rows[is_lower], G_i[is_lower], G_j[is_lower], G_val[is_lower]
+        F_rows, F_ind, F_val = A.row[~is_G], A.col[~is_G] - nb_points ** 2, A.data[~is_G]
+
+        # Quadratic part, each constraint being the weighted sum of the matrices associated with its entries.
+        # The constraints without quadratic part are skipped: with a template, they had none when compiled either.
+        order = np.argsort(G_rows, kind="stable")
+        G_rows, G_i, G_j, G_val = G_rows[order], G_i[order], G_j[order], G_val[order]
+        pointers = np.searchsorted(G_rows, np.arange(nb_rows + 1))
+        rows = np.flatnonzero(np.diff(pointers))
+        if rows.size > 0:
+            self.task.putbaraijlist(first_row + rows, [0] * rows.size, pointers[rows], pointers[rows + 1],
+                                    self._get_entry_matrices(G_i, G_j), G_val)
+
+        # Linear part
+        self.task.putaijlist(first_row + F_rows, F_ind, F_val)
+
+        # Bounds
+        bound_keys = [mosek.boundkey.fx] * nb_rows
+        upper_bounds = - b
+        lower_bounds = - b.copy()
+        list_of_constraints = [constraint for constraint in self._list_of_constraints_sent_to_solver
+                               if isinstance(constraint, Constraint)]
+        for row, constraint in zip(self._constraint_index_in_mosek, list_of_constraints):
+            if constraint.equality_or_inequality == 'inequality' and first_row <= row < first_row + nb_rows:
+                bound_keys[row - first_row] = mosek.boundkey.up
+                lower_bounds[row - first_row] = -inf
+        self.task.putconboundlist(first_row + np.arange(nb_rows), bound_keys, lower_bounds, upper_bounds)
+
     def solve(self, **kwargs):
         """
         Solve the PEP.
@@ -338,8 +509,7 @@ class MosekWrapper(Wrapper):
         W_i = No_zero_ele[:, 0]
         W_j = No_zero_ele[:, 1]
         W_val = weight[W_i, W_j]
-        sym_W = self.task.appendsparsesymmat(Point.counter, W_i, W_j, W_val)
-        self.task.putbarcj(0, [sym_W], [1.0])
+        self.task.putbarcj(0, self._get_entry_matrices(W_i, W_j), W_val)
         self.task.putobjsense(mosek.objsense.minimize)
 
     @staticmethod
@@ -0,0 +1,458 @@
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, diags, vstack
+
+from PEPit.wrapper import Wrapper
+from PEPit.point import Point
+from PEPit.expression import Expression
+from PEPit.constraint import Constraint
+from PEPit.psd_matrix import PSDMatrix
+
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+
+
+class ScsWrapper(Wrapper):
+    """
+    A :class:`ScsWrapper` object interfaces PEPit with the SDP solver `SCS <https://www.cvxgrp.org/scs/>`_,
+    without any modelling language.
+
+    This class overwrites the :class:`Wrapper` for SCS. In particular, it implements the methods:
+    send_constraint_to_solver, send_lmi_constraint_to_solver, generate_problem, get_dual_variables,
+    get_primal_variables, eval_constraint_dual_values, solve, prepare_heuristic, and heuristic.
+
+    The conic data of SCS, that is the problem
+
+    .. math:: \\min_x c^T x \\quad \\text{s.t.} \\quad A x + s = b, \\quad s \\in \\mathcal{K},
+
+    is written directly from the sparse representation of the constraints
+    (see `expressions_to_stacked_sparse_matrix`).
+    The variable :math:`x` stacks :math:`G` in SCS format (see below) and :math:`F`.
+    The cone :math:`\\mathcal{K}` is made of a zero cone (equality constraints), a nonnegative cone
+    (inequality constraints), and one PSD cone per LMI, the first one being :math:`G \\succeq 0`.
+    The PSD cones are expressed in SCS format: lower triangular parts, column by column,
+    with off-diagonal entries scaled by :math:`\\sqrt{2}`.
+
+    Attributes:
+        _list_of_constraints_sent_to_solver (list): list of :class:`Constraint` and :class:`PSDMatrix` objects
+                                                    associated to the PEP. This list does not contain constraints
+                                                    due to internal representation of the problem by the solver.
+        optimal_F (numpy.array): Elements of F after solving.
+        optimal_G (numpy.array): Gram matrix of the PEP after solving.
+        objective (Expression): The objective expression that must be maximized.
+                                This is an additional :class:`Expression` created by the PEP to deal with cases
+                                where the user wants to maximize a minimum of several expressions.
+        dual_values (list): Optimal dual variables after solving
+                            (same ordering as that of _list_of_constraints_sent_to_solver).
+        residual (Iterable of Iterables of floats): The residual of the problem, i.e. the dual variable of the Gram.
+        prob (dict): the conic data ("A", "b", "c") and the cone description ("cone") sent to SCS.
+        solver_name (str): The name of the solver the wrapper interact with.
+        verbose (int): Level of information details to print
+                       (Override the solver verbose parameter).
+
+                       - 0: No verbose at all
+                       - 1: PEPit information is printed but not solver's
+                       - 2: Both PEPit and solver details are printed
+        _objective_row (scipy.sparse.csr_matrix): the weights of the objective :class:`Expression` w.r.t. :math:`x`.
+        _objective_constant (float): the constant term of the objective :class:`Expression`.
+        _constraint_rows (list of int): the row of :math:`A` associated with each :class:`Constraint`
+                                        and the first row associated with each :class:`PSDMatrix`
+                                        of `_list_of_constraints_sent_to_solver` (same ordering).
+        _solver (scs.SCS): the SCS solver, which stores the factorization of the problem between successive solves.
+        _solution (dict): the output of the last call to SCS.
+
+    """
+    python_package = "scs"
+
+    def __init__(self, verbose=1):
+        """
+        This function initializes all internal variables of the class.
+
+        Args:
+            verbose (int): Level of information details to print
+                           (Override the solver verbose parameter).
+
+                           - 0: No verbose at all
+                           - 1: PEPit information is printed but not solver's
+                           - 2: Both PEPit and solver details are printed
+
+        """
+        super().__init__(verbose=verbose)
+
+        # Initialize attributes
+        self._objective_row = None
+        self._objective_constant = None
+        self._constraint_rows = list()
+        self._solver = None
+        self._solution = None
+
+    def set_main_variables(self):
+        """
+        Nothing to do: the variables of SCS (G and F) are implicitly defined by the conic data
+        written by the method `generate_problem`.
+
+        """
+        pass
+
+    def check_license(self):
+        """
+        Check that there is a valid available license for SCS.
+
+        Returns:
+            license presence (bool): no license needed: True
+
+        """
+        return True
+
+    @staticmethod
+    def _get_lower_triangular_indices(size):
+        """
+        Compute the position of each entry of a symmetric matrix in the vector stacking
+        its lower triangular part column by column.
+
+        Args:
+            size (int): the size of the matrix.
+
+        Returns:
+            indices (numpy array): the `size` x `size` array of the positions of the entries.
+
+        """
+        i, j = np.meshgrid(np.arange(size), np.arange(size), indexing="ij")
+        low, high = np.maximum(i, j), np.minimum(i, j)
+        return high * size - high * (high - 1) // 2 + low - high
+
+    @staticmethod
+    def _get_svec_scaling(size):
+        """
+        Compute the scaling of the lower triangular part (column by column) of a symmetric matrix
+        in the SCS format: the off-diagonal entries are scaled by :math:`\\sqrt{2}`.
+
+        Args:
+            size (int): the size of the matrix.
+
+        Returns:
+            scaling (numpy array): the size * (size + 1) / 2 scaling factors.
+
+        """
+        i, j = np.tril_indices(size)
+        order = np.lexsort((i, j))
+        return np.where(i[order] == j[order], 1., np.sqrt(2))
+
+    def _get_variables_map(self):
+        """
+        Compute the sparse matrix mapping the weights of the stacked variables (vec(G), F)
+        (see `expressions_to_stacked_sparse_matrix`) onto the weights of the variable :math:`x` of SCS.
+        The weights of the symmetric entries of :math:`G` are summed, and scaled as :math:`G` is in SCS format.
+
+        Returns:
+            variables_map (scipy.sparse.csr_matrix): the (Point.counter ** 2 + Expression.counter) x (size of x) matrix.
+
+        """
+        nb_points = Point.counter
+        nb_G_variables = nb_points * (nb_points + 1) // 2
+        G_columns = self._get_lower_triangular_indices(nb_points).flatten(order="F")
+        columns = np.concatenate([G_columns, nb_G_variables + np.arange(Expression.counter)])
+        values = np.concatenate([1 / self._get_svec_scaling(nb_points)[G_columns], np.ones(Expression.counter)])
+        nb_rows = columns.shape[0]
+
+        return csr_matrix((values, (np.arange(nb_rows), columns)),
+                          shape=(nb_rows, nb_G_variables + Expression.counter))
+
+    def send_constraint_to_solver(self, constraint):
+        """
+        Add a PEPit :class:`Constraint` into the tracking lists.
+
+        Scalar constraints are written all together in the conic data by the method `generate_problem`.
+
+        Args:
+            constraint (Constraint): a :class:`Constraint` object to be sent to SCS.
+
+        Raises:
+            ValueError if the attribute `equality_or_inequality` of the :class:`Constraint`
+            is neither `equality`, nor `inequality`.
+
+        """
+
+        # Sanity check
+        assert isinstance(constraint, Constraint)
+
+        # Distinguish equality and inequality
+        if constraint.equality_or_inequality not in {'equality', 'inequality'}:
+            # Raise an exception otherwise
+            raise ValueError('The attribute \'equality_or_inequality\' of a constraint object'
+                             ' must either be \'equality\' or \'inequality\'.'
+                             'Got {}'.format(constraint.equality_or_inequality))
+
+        # Add constraint to the attribute _list_of_constraints_sent_to_solver to keep track of
+        # all the constraints that have been sent to SCS as well as the order.
+        self._list_of_constraints_sent_to_solver.append(constraint)
+
+    def send_lmi_constraint_to_solver(self, psd_counter, psd_matrix):
+        """
+        Add a PEPit :class:`PSDMatrix` (LMI constraint) into the tracking lists.
+
+        LMI constraints are written all together in the conic data by the method `generate_problem`.
+
+        Args:
+            psd_counter (int): a counter useful for the verbose mode.
+            psd_matrix (PSDMatrix): a matrix of expressions that is constrained to be PSD.
+
+        """
+
+        # Sanity check
+        assert isinstance(psd_matrix, PSDMatrix)
+
+        # Add psd_matrix to the attribute _list_of_constraints_sent_to_solver to keep track of
+        # all the constraints that have been sent to SCS as well as the order.
+        self._list_of_constraints_sent_to_solver.append(psd_matrix)
+
+        # Print a message if verbose mode activated
+        if self.verbose > 0:
+            print('\t\t Size of PSD matrix {}: {}x{}'.format(psd_counter + 1, *psd_matrix.shape))
+
+    def generate_problem(self, objective):
+        """
+        Write the conic data of SCS, whose objective corresponds to a PEPit :class:`Expression` object.
+
+        Note:
+            Only the lower triangular part of each :class:`PSDMatrix` is sent to SCS,
+            after symmetrization of its entries.
+
+        Args:
+            objective (Expression): the objective function of the PEP (to be maximized).
+
+        Returns:
+            prob (dict): the PEP in SCS format.
+
+        """
+        self.objective = objective
+        variables_map = self._get_variables_map()
+        nb_G_variables = Point.counter * (Point.counter + 1) // 2
+
+        # Separate the equality, inequality and LMI constraints
+        list_of_equalities = list()
+        list_of_inequalities = list()
+        list_of_psd = list()
+        for constraint_or_psd in self._list_of_constraints_sent_to_solver:
+            if isinstance(constraint_or_psd, Constraint):
+                if constraint_or_psd.equality_or_inequality == 'equality':
+                    list_of_equalities.append(constraint_or_psd)
+                else:
+                    list_of_inequalities.append(constraint_or_psd)
+            else:
+                list_of_psd.append(constraint_or_psd)
+
+        # Stack all the scalar expressions, the entries of the PSD matrices and the objective in one sparse matrix.
+        # In SCS format, a scalar constraint a^T x + b (== or <=) 0 is written a^T x + s = -b with s = 0 or s >= 0,
+        # and an entry a^T x + b of a PSD matrix is written -a^T x + s = b, s being the svec of the PSD matrix.
+        list_of_expressions = [constraint.expression for constraint in list_of_equalities + list_of_inequalities]
+        for psd_matrix in list_of_psd:
+            size = psd_matrix.shape[0]
+            list_of_expressions += [psd_matrix[i, j] for j in range(size) for i in range(j, size)]
+            list_of_expressions += [psd_matrix[j, i] for j in range(size) for i in range(j, size)]
+        list_of_expressions.append(objective)
+        A, b = expressions_to_stacked_sparse_matrix(list_of_expressions)
+        A = A @ variables_map
+
+        # The objective (to be maximized) is the last row
+        self._objective_row = A[-1]
+        self._objective_constant = b[-1]
+
+        # Scalar constraints
+        nb_scalar_constraints = len(list_of_equalities) + len(list_of_inequalities)
+        list_of_A_blocks = [A[:nb_scalar_constraints]]
+        list_of_b_blocks = [-b[:nb_scalar_constraints]]
+
+        # Main LMI G >> 0, i.e. -x_G + s = 0 with s in the PSD cone
+        list_of_A_blocks.append(coo_matrix((-np.ones(nb_G_variables),
+                                            (np.arange(nb_G_variables), np.arange(nb_G_variables))),
+                                           shape=(nb_G_variables, A.shape[1])))
+        list_of_b_blocks.append(np.zeros(nb_G_variables))
+
+        # Other LMIs, each of them being symmetrized (the entries of the upper triangular part are stacked
+        # right after the ones of the lower triangular part)
+        start = nb_scalar_constraints
+        for psd_matrix in list_of_psd:
+            size = psd_matrix.shape[0]
+            nb_entries = size * (size + 1) // 2
+            scaling = diags(self._get_svec_scaling(size) / 2)
+            lower, upper = slice(start, start + nb_entries), slice(start + nb_entries, start + 2 * nb_entries)
+            list_of_A_blocks.append(- scaling @ (A[lower] + A[upper]))
+            list_of_b_blocks.append(scaling @ (b[lower] + b[upper]))
+            start += 2 * nb_entries
+
+        # Register the rows associated with the constraints
+        rows = dict()
+        for row, constraint in enumerate(list_of_equalities + list_of_inequalities):
+            rows[constraint] = row
+        row = nb_scalar_constraints + nb_G_variables
+        for psd_matrix in list_of_psd:
+            rows[psd_matrix] = row
+            row += psd_matrix.shape[0] * (psd_matrix.shape[0] + 1) // 2
+        self._constraint_rows = [rows[constraint_or_psd]
+                                 for constraint_or_psd in self._list_of_constraints_sent_to_solver]
+
+        # Store the conic data: maximizing the objective is minimizing its opposite
+        self.prob = {"A": vstack(list_of_A_blocks, format="csc"),
+                     "b": np.concatenate(list_of_b_blocks),
+                     "c": - self._objective_row.toarray().flatten(),
+                     "cone": {"z": len(list_of_equalities),
+                              "l": len(list_of_inequalities),
+                              "s": [Point.counter] + [psd_matrix.shape[0] for psd_matrix in list_of_psd]}}
+        self._solver = None
+        self._solution = None
+
+        return self.prob
+
+    def _svec_to_matrix(self, vector, size):
+        """
+        Recover a symmetric matrix from its lower triangular part in SCS format.
+
+        Args:
+            vector (numpy array): the lower triangular part of the matrix, column by column,
+                                  with off-diagonal entries scaled by :math:`\\sqrt{2}`.
+            size (int): the size of the matrix.
+
+        Returns:
+            matrix (numpy array): the symmetric matrix.
+
+        """
+        return (vector / self._get_svec_scaling(size))[self._get_lower_triangular_indices(size)]
+
+    def _recover_dual_values(self):
+        """
+        Recover all dual variables from solver.
+
+        Returns:
+             dual_values (list): list of dual variables (floats) associated to _list_of_constraints_sent_to_solver
+                                 (same ordering).
+             residual (np.array): main dual PSD matrix (dual to the PSD constraint on the Gram matrix).
+
+        Raises:
+            TypeError if the attribute `_list_of_constraints_sent_to_solver` of this object
+            is neither a :class:`Constraint` object, nor a :class:`PSDMatrix` one.
+
+        """
+        y = self._solution["y"]
+        cone = self.prob["cone"]
+        nb_scalar_constraints = cone["z"] + cone["l"]
+        nb_G_variables = Point.counter * (Point.counter + 1) // 2
+
+        # Store residual, dual value of the main lmi
+        residual = self._svec_to_matrix(y[nb_scalar_constraints:nb_scalar_constraints + nb_G_variables],
+                                        Point.counter)
+        dual_values = [residual]
+
+        for constraint_or_psd, row in zip(self._list_of_constraints_sent_to_solver, self._constraint_rows):
+            if isinstance(constraint_or_psd, Constraint):
+                dual_values.append(y[row])
+            elif isinstance(constraint_or_psd, PSDMatrix):
+                size = constraint_or_psd.shape[0]
+                dual_values.append(self._svec_to_matrix(y[row:row + size * (size + 1) // 2], size))
+            else:
+                raise TypeError("The list of constraints that are sent to SCS should contain only"
+                                "\'Constraint\' objects of \'PSDMatrix\' objects."
+                                "Got {}".format(type(constraint_or_psd)))
+
+        return dual_values, residual
+
+    def solve(self, **kwargs):
+        """
+        Solve the PEP.
+
+        If only the objective changed since the last call (e.g. within the `logdet` dimension-reduction heuristic),
+        the factorization of the problem is reused and SCS is warm-started from the previous solution.
+
+        Args:
+            kwargs (keywords, optional): solver specific arguments (SCS settings, such as eps_abs or max_iters).
+                                         The tolerances eps_abs and eps_rel default to 1e-6.
+
+        Returns:
+            status (string): status of the solution / problem.
+            name (string): name of the solver.
+            value (float): value of the performance metric after solving.
+
+        """
+        import scs
+
+        if "solver" in kwargs.keys():
+            del kwargs["solver"]
+        kwargs.setdefault("verbose", self.verbose > 1)
+        kwargs.setdefault("eps_abs", 1e-6)
+        kwargs.setdefault("eps_rel", 1e-6)
+
+        if self._solver is None:
+            data = {key: self.prob[key] for key in ["A", "b", "c"]}
+            self._solver = scs.SCS(data, self.prob["cone"], **kwargs)
+            warm_start = self._solution is not None
+        else:
+            self._solver.update(c=self.prob["c"])
+            warm_start = True
+
+        if warm_start:
+            self._solution = self._solver.solve(warm_start=True, x=self._solution["x"],
+                                                y=self._solution["y"], s=self._solution["s"])
+        else:
+            self._solution = self._solver.solve(warm_start=False)
+
+        # Store main information.
+        self.solver_name = "SCS"
+        info = self._solution["info"]
+        x = self._solution["x"]
+        nb_G_variables = Point.counter * (Point.counter + 1) // 2
+        self.optimal_G = self._svec_to_matrix(x[:nb_G_variables], Point.counter)
+        self.optimal_F = x[nb_G_variables:]
+
+        # The problem is unbounded or infeasible
+        if info["status_val"] not in {1, 2}:
+            return info["status"], self.solver_name, None
+
+        tau = self._objective_row.dot(x)[0] + self._objective_constant
+        return info["status"], self.solver_name, tau
+
+    def prepare_heuristic(self, wc_value, tol_dimension_reduction):
+        """
+        Add the constraint that the objective stay close to its actual value before using
+        dimension-reduction heuristics. That is, we constrain
+
+        .. math:: \\tau \\geqslant \\text{wc value} - \\text{tol dimension reduction}
+
+        The new inequality is appended to the nonnegative cone, and the previous solution is extended
+        to warm-start the next call to SCS.
+
+        Args:
+            wc_value (float): the optimal value of the original PEP.
+            tol_dimension_reduction (float): tolerance on the objective for finding
+                                             low-dimensional examples.
+
+        """
+        # Insert the row -tau + s = -(wc_value - tol_dimension_reduction) + constant, s >= 0,
+        # at the end of the nonnegative cone
+        row = self.prob["cone"]["z"] + self.prob["cone"]["l"]
+        A = self.prob["A"].tocsr()
+        b_row = self._objective_constant - wc_value + tol_dimension_reduction
+        self.prob["A"] = vstack([A[:row], - self._objective_row, A[row:]], format="csc")
+        self.prob["b"] = np.concatenate([self.prob["b"][:row], [b_row], self.prob["b"][row:]])
+        self.prob["cone"]["l"] += 1
+        self._constraint_rows = [constraint_row + (constraint_row >= row) for constraint_row in self._constraint_rows]
+
+        # The conic data changed: a new solver is needed, warm-started from the extended previous solution
+        slack = b_row + self._objective_row.dot(self._solution["x"])[0]
+        self._solution = {"x": self._solution["x"],
+                          "y": np.insert(self._solution["y"], row, 0.),
+                          "s": np.insert(self._solution["s"], row, max(slack, 0.))}
+        self._solver = None
+
+    def heuristic(self, weight):
+        """
+        Change the objective of the PEP, specifically for finding low-dimensional examples.
+        We specify a matrix :math:`W` (weight), which will allow minimizing :math:`\\mathrm{Tr}(G\\,W)`.
+
+        Only the vector :math:`c` of the conic data changes, so that the next call to the method `solve`
+        reuses the factorization of the problem.
+
+        Args:
+            weight (np.array): weights that will be used in the heuristic.
+
+        """
+        vec_weight = np.concatenate([weight.flatten(order="F"), np.zeros(Expression.counter)])
+        self.prob["c"] = self._get_variables_map().T @ vec_weight
+        return self.prob
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from PEPit.tools.benchmark import wc_stress_gradient_descent, wc_stress_proximal_gradient, measure_pep_builder, \
+    run_benchmarks, save_benchmark_results, load_benchmark_results, compare_to_baseline
+from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.benchmarks = {"gradient_descent": (wc_gradient_descent, {"L": 1, "gamma": 1}, [1, 2, 3]),
+                           "stress_gradient_descent": (wc_stress_gradient_descent, {}, [2, 4])}
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stress_peps(self):
+
+        for pep_builder in [wc_stress_gradient_descent, wc_stress_proximal_gradient]:
+            pepit_tau, theoretical_tau = pep_builder(n=3)
+            self.assertAlmostEqual(pepit_tau, theoretical_tau, delta=theoretical_tau * 10 ** -3)
+
+    def test_measure_pep_builder(self):
+
+        row = measure_pep_builder(wc_stress_gradient_descent, nb_repeats=2, n=3)
+
+        # The times of the phases sum up to the total time
+        self.assertAlmostEqual(row["construction_time"] + row["compile_time"] + row["solve_time"]
+                               + row["postprocessing_time"], row["total_time"], delta=row["total_time"] / 2)
+        for name in ["construction_time", "compile_time", "solve_time", "postprocessing_time"]:
+            self.assertGreaterEqual(row[name], 0.)
+        self.assertGreater(row["peak_memory"], 0.)
+        self.assertEqual(row["gram_size"], 5)
+        self.assertEqual(row["nb_constraints"], 4 * 3 + 2)
+        self.assertEqual(row["nb_lmis"], 0)
+        self.assertEqual(row["nb_solves"], 1)
+        self.assertEqual(row["solver_status"], "optimal")
+        self.assertRaises(ValueError, measure_pep_builder, wc_stress_gradient_descent, nb_repeats=0, n=3)
+
+    def test_peak_memory_without_reset_peak(self):
+
+        # Before Python 3.9, tracemalloc cannot reset its peak
+        reset_peak = getattr(tracemalloc, "reset_peak", None)
+        if reset_peak is not None:
+            del tracemalloc.reset_peak
+        try:
+            # The peak memory is still measured by starting tracemalloc ...
+            self.assertGreater(measure_pep_builder(wc_stress_gradient_descent, n=2)["peak_memory"], 0.)
+            self.assertFalse(tracemalloc.is_tracing())
+
+            # ... but not if it is already tracing
+            tracemalloc.start()
+            try:
+                self.assertTrue(np.isnan(measure_pep_builder(wc_stress_gradient_descent, n=2)["peak_memory"]))
+                self.assertTrue(tracemalloc.is_tracing())
+            finally:
+                tracemalloc.stop()
+        finally:
+            if reset_peak is not None:
+                tracemalloc.reset_peak = reset_peak
+
+    def test_history_and_regressions(self):
+
+        streamed_rows = list()
+        results = run_benchmarks(self.benchmarks, max_n=3, measure_memory=False, label="baseline",
+                                 callback=streamed_rows.append)
+        self.assertEqual(len(streamed_rows), 4)
+        self.assertEqual(list(results["benchmark"]), ["gradient_descent"] * 3 + ["stress_gradient_descent"])
+        self.assertEqual(list(results["n"]), [1, 2, 3, 2])
+        self.assertRaises(ValueError, run_benchmarks, self.benchmarks, names=["unknown"])
+
+        # The history is appended run after run
+        path = os.path.join(self.directory, "history.jsonl")
+        save_benchmark_results(results, path)
+        save_benchmark_results(results, path)
+        history = load_benchmark_results(path)
+        self.assertEqual(len(history), 8)
+        self.assertEqual(list(history["label"].unique()), ["baseline"])
+
+        # The same results do not regress, while a larger Gram matrix or a slower solve does
+        comparison = compare_to_baseline(results, path)
+        self.assertFalse(comparison["regression"].any())
+        slower_results = results.copy()
+        slower_results.loc[0, "solve_time"] = 10 * slower_results.loc[0, "solve_time"] + 1
+        slower_results.loc[1, "gram_size"] += 1
+        comparison = compare_to_baseline(slower_results, path)
+        regressions = comparison[comparison["regression"]]
+        self.assertEqual(list(regressions["metric"]), ["solve_time", "gram_size"])
+        self.assertEqual(list(regressions["n"]), [1, 2])
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from PEPit.tools.chordal_decomposition import get_aggregate_sparsity_pattern, get_chordal_extension, \
+    complete_psd_matrix
+
+
+class TestChordalDecomposition(unittest.TestCase):
+
+    def setUp(self):
+        # A cycle of 5 vertices, which is not chordal
+        self.size = 5
+        self.pattern = np.eye(self.size, dtype=bool)
+        for i in range(self.size):
+            self.pattern[i, (i + 1) % self.size] = self.pattern[(i + 1) % self.size, i] = True
+
+    def test_get_aggregate_sparsity_pattern(self):
+        # Entries (1, 0) and (2, 3) of G, and 1 entry of F
+        A = csr_matrix((np.ones(3), ([0, 0, 1], [1, 3 * self.size + 2, self.size ** 2 + 1])),
+                       shape=(2, self.size ** 2 + 2))
+        pattern = get_aggregate_sparsity_pattern(A, self.size)
+
+        # The last point is not used at all
+        expected_pattern = np.zeros((self.size, self.size), dtype=bool)
+        expected_pattern[[1, 0, 2, 3, 0, 1, 2, 3], [0, 1, 3, 2, 0, 1, 2, 3]] = True
+        np.testing.assert_array_equal(pattern, expected_pattern)
+
+    def test_get_chordal_extension(self):
+        chordal_pattern, elimination_order, cliques = get_chordal_extension(self.pattern)
+
+        # The extension contains the pattern, and the order is a perfect elimination order
+        self.assertTrue(np.all(chordal_pattern[self.pattern]))
+        self.assertEqual(sorted(elimination_order), list(range(self.size)))
+        for position, vertex in enumerate(elimination_order):
+            later_neighbors = [i for i in elimination_order[position + 1:] if chordal_pattern[vertex, i]]
+            self.assertTrue(np.all(chordal_pattern[np.ix_(later_neighbors, later_neighbors)]))
+
+        # The cycle is triangulated into 3 triangles covering the extension
+        self.assertEqual(len(cliques), 3)
+        covered = np.zeros((self.size, self.size), dtype=bool)
+        for clique in cliques:
+            self.assertEqual(len(clique), 3)
+            covered[np.ix_(clique, clique)] = True
+        np.testing.assert_array_equal(covered, chordal_pattern)
+
+    def test_get_chordal_extension_with_unused_vertex(self):
+        # Remove the last vertex of the cycle, which becomes a path
+        self.pattern[-1] = self.pattern[:, -1] = False
+        chordal_pattern, elimination_order, cliques = get_chordal_extension(self.pattern)
+
+        np.testing.assert_array_equal(chordal_pattern, self.pattern)
+        self.assertEqual(len(elimination_order), self.size)
+        self.assertEqual([list(clique) for clique in cliques], [[0, 1], [1, 2], [2, 3]])
+
+    def test_complete_psd_matrix(self):
+        chordal_pattern, elimination_order, cliques = get_chordal_extension(self.pattern)
+
+        # Only the entries in the extension are given, the others are arbitrary
+        vectors = np.random.RandomState(0).randn(self.size, self.size)
+        matrix = vectors @ vectors.T
+        partial_matrix = np.where(chordal_pattern, matrix, 100.)
+        completed_matrix = complete_psd_matrix(partial_matrix, chordal_pattern, elimination_order)
+
+        np.testing.assert_array_almost_equal(completed_matrix[chordal_pattern], matrix[chordal_pattern])
+        np.testing.assert_array_almost_equal(completed_matrix, completed_matrix.T)
+        self.assertGreater(np.linalg.eigvalsh(completed_matrix).min(), -10 ** -10)
+
+        # The inverse of the maximum determinant completion is supported on the extension
+        np.testing.assert_array_almost_equal(np.linalg.inv(completed_matrix)[~chordal_pattern], 0)
@@ -0,0 +1,43 @@
+import unittest
+import numpy as np
+
+from PEPit.tools.coefficient_operations import coalesce_coefficients, add_coefficients, \
+    coalesce_symmetric_coefficients, multiply_coefficients
+
+
+class TestCoefficientOperations(unittest.TestCase):
+
+    def setUp(self):
+        self.indices1 = np.array([0, 2, 3])
+        self.values1 = np.array([1., -2., 4.])
+        self.indices2 = np.array([1, 2])
+        self.values2 = np.array([3., 2.])
+
+    def test_coalesce_coefficients(self):
+        indices, values = coalesce_coefficients(np.array([3, 1, 3, 2, 2]), np.array([1., 2., 3., 1., -1.]))
+        np.testing.assert_array_equal(indices, [1, 3])
+        np.testing.assert_array_equal(values, [2., 4.])
+
+    def test_add_coefficients(self):
+        indices, values = add_coefficients(self.indices1, self.values1, self.indices2, self.values2)
+        np.testing.assert_array_equal(indices, [0, 1, 3])
+        np.testing.assert_array_equal(values, [1., 3., 4.])
+
+    def test_coalesce_symmetric_coefficients(self):
+        indi, indj, values = coalesce_symmetric_coefficients(np.array([2, 1, 2]), np.array([0, 1, 0]),
+                                                             np.array([1., 5., 2.]))
+        np.testing.assert_array_equal(indi, [1, 2])
+        np.testing.assert_array_equal(indj, [1, 0])
+        np.testing.assert_array_equal(values, [5., 3.])
+
+    def test_multiply_coefficients(self):
+        indi, indj, values = multiply_coefficients(self.indices1, self.values1, self.indices2, self.values2)
+
+        # Compare the symmetric matrix of weights with the symmetrized outer product
+        vector1, vector2 = np.zeros(4), np.zeros(4)
+        vector1[self.indices1], vector2[self.indices2] = self.values1, self.values2
+        weights = np.zeros((4, 4))
+        weights[indi, indj] = values
+        weights[indj, indi] = values
+        outer_product = np.outer(vector1, vector2)
+        np.testing.assert_array_almost_equal(weights, (outer_product + outer_product.T) / 2)
@@ -1,6 +1,6 @@
 import unittest
 
-from PEPit.tools.dict_operations import merge_dict, prune_dict, multiply_dicts, symmetrize_dict
+from PEPit.tools.dict_operations import merge_dict, add_dict_in_place, prune_dict, multiply_dicts, symmetrize_dict
 
 
 class TestDictOperations(unittest.TestCase):
@@ -13,6 +13,13 @@ class TestDictOperations(unittest.TestCase):
         summed_dict = {'a': 7, 'b': 14, 'q': 11, 'w': 0}
         self.assertEqual(merge_dict(dict1=self.dict1, dict2=self.dict2), summed_dict)
 
+    def test_add_dict_in_place(self):
+        dict1 = self.dict1.copy()
+        summed_dict = add_dict_in_place(dict1=dict1, dict2={'a': -5, 'b': 8, 'w': 0})
+        self.assertIs(summed_dict, dict1)
+        self.assertEqual(summed_dict, {'b': 14, 'q': 11})
+        self.assertEqual(add_dict_in_place(dict1=dict1, dict2=dict1), {'b': 28, 'q': 22})
+
     def test_multiply_dicts(self):
 
         product_dict = {('a', 'a'): 10, ('a', 'b'): 40, ('a', 'w'): 0,
@@ -694,3 +694,10 @@ class TestExamplesMosek(TestExamplesCVXPY):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.wrapper = "mosek"
+
+
+class TestExamplesSCS(TestExamplesCVXPY):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wrapper = "scs"
@@ -1,9 +1,11 @@
 import unittest
+import numpy as np
 
 from PEPit import PEP
 from PEPit.point import Point
-from PEPit.expression import Expression
+from PEPit.expression import Expression, null_expression
 from PEPit.constraint import Constraint
+from PEPit.tools.expressions_to_matrices import expression_to_matrices, expression_to_sparse_matrices
 
 
 class TestExpression(unittest.TestCase):
@@ -53,6 +55,74 @@ class TestExpression(unittest.TestCase):
                                                              (self.point1, self.point2): 6,
                                                              self.function_value: 18 / 5})
 
+    def test_hash_consing(self):
+
+        self.assertIsNot(self.inner_product + self.function_value, self.function_value + self.inner_product)
+
+        pep = PEP(hash_consing=True)
+        point1 = pep.set_initial_point()
+        point2 = Point()
+        function_value = Expression()
+
+        expression = point1 * point2 + function_value - 1
+        self.assertIs(expression, - 1 + function_value + point2 * point1)
+        self.assertIs(expression - point1 * point2 + 1, function_value)
+        self.assertIs((point1 - point2) ** 2, point1 ** 2 - 2 * point1 * point2 + point2 ** 2)
+        self.assertIsNot(expression, point1 * point2 + function_value)
+
+    def test_sum(self):
+
+        expression = Expression.sum([self.inner_product, 2 * self.function_value, 1, - self.inner_product])
+
+        self.assertIsInstance(expression, Expression)
+        self.assertEqual(expression.decomposition_dict, {self.function_value: 2, 1: 1})
+        self.assertEqual(Expression.sum([]).decomposition_dict, dict())
+        self.assertRaises(TypeError, Expression.sum, [self.function_value, self.point1])
+
+    def test_iadd(self):
+
+        # += never modifies the Expressions still referenced elsewhere
+        accumulation = null_expression
+        accumulation += self.function_value
+        self.assertIsNot(accumulation, null_expression)
+        self.assertEqual(null_expression.decomposition_dict, dict())
+
+        # Expressions appended to a list are left unchanged by the next +=
+        history = list()
+        for term in [self.inner_product, 1]:
+            accumulation += term
+            history.append(accumulation)
+        self.assertEqual([len(expression.decomposition_dict) for expression in history], [2, 3])
+
+        # So are aliases, as well as their cached sparse representations
+        alias = accumulation
+        expression_to_sparse_matrices(alias)
+        accumulation -= 1
+        self.assertIsNot(accumulation, alias)
+        self.assertIsNotNone(alias._sparse_matrices)
+        self.assertEqual(alias.decomposition_dict, {self.function_value: 1, (self.point1, self.point2): 1, 1: 1})
+        self.assertEqual(accumulation.decomposition_dict, {self.function_value: 1, (self.point1, self.point2): 1})
+
+    def test_compact(self):
+
+        def build_expressions(compact):
+            PEP(compact=compact)
+            point1, point2 = Point(), Point()
+            function_value = Expression()
+            expression = (point1 - point2) ** 2 / 2 + 3 * function_value - 1
+            return [expression, Expression.sum([expression, point1 * point2, 2]), - expression + function_value]
+
+        list_of_weights = [expression_to_matrices(expression) for expression in build_expressions(compact=False)]
+        compact_expressions = build_expressions(compact=True)
+
+        # The compact representation encodes the same linear combinations
+        for weights, compact_expression in zip(list_of_weights, compact_expressions):
+            self.assertIsNone(compact_expression._decomposition_dict)
+            compact_expression.label = "expression"
+            self.assertEqual(vars(compact_expression), {"label": "expression"})
+            for weight, compact_weight in zip(weights, expression_to_matrices(compact_expression)):
+                np.testing.assert_array_almost_equal(weight, compact_weight)
+
     def test_constraint(self):
 
         constraint = self.inner_product <= self.function_value
@@ -4,7 +4,8 @@ import numpy as np
 from PEPit.point import Point
 from PEPit.expression import Expression
 
-from PEPit.tools.expressions_to_matrices import expression_to_matrices, expression_to_sparse_matrices
+from PEPit.tools.expressions_to_matrices import expression_to_matrices, expression_to_sparse_matrices,\
+    expressions_to_stacked_sparse_matrix
 
 
 class TestExpressionToMatrices(unittest.TestCase):
@@ -69,6 +70,52 @@ class TestExpressionToMatrices(unittest.TestCase):
         self.assertEqual(Fweights_val_error, 0)
         self.assertEqual(cons_val_error, 0)
 
+    def test_sparse_matrices_are_cached(self):
+
+        # The sparse representation is computed once and stored in the expression.
+        self.assertIsNone(self.combined_expression._sparse_matrices)
+        sparse_matrices = expression_to_sparse_matrices(self.combined_expression)
+        self.assertIs(self.combined_expression._sparse_matrices, sparse_matrices)
+        self.assertIs(expression_to_sparse_matrices(self.combined_expression), sparse_matrices)
+
+    def test_symmetrical_entries_are_merged(self):
+
+        # Both (point1, point2) and (point2, point1) appear in this expression.
+        expression = self.point1 * self.point2 + 3 * self.point2 * self.point1 + self.point2 ** 2
+
+        # Run expression_to_sparse_matrices.
+        Gweights_indi, Gweights_indj, Gweights_val, _, _, _ = expression_to_sparse_matrices(expression)
+
+        # Compare with the dense representation.
+        Gweights, _, _ = expression_to_matrices(expression)
+        Gweights_expected = np.array([[0., 0., 2.], [0., 0., 0.], [2., 0., 1.]])
+        self.assertEqual(np.sum((Gweights - Gweights_expected) ** 2), 0)
+        self.assertEqual(list(Gweights_indi), [2, 2])
+        self.assertEqual(list(Gweights_indj), [0, 2])
+        self.assertEqual(list(Gweights_val), [2., 1.])
+
+    def test_expressions_to_stacked_sparse_matrix(self):
+
+        # Run expressions_to_stacked_sparse_matrix on two expressions.
+        A, b = expressions_to_stacked_sparse_matrix([self.combined_expression, self.expr])
+
+        # Compute expected outputs.
+        A_expected = np.zeros((2, 3 ** 2 + 2))
+        A_expected[0, :9] = np.array([[0., 0., 0.5], [0., 0., 0.], [0.5, 0., 0.]]).reshape(-1, order="F")
+        A_expected[0, 9:] = np.array([0., 1.])
+        A_expected[1, 9:] = np.array([0., 1.])
+        b_expected = np.array([-1., 0.])
+
+        # Compare the obtained outputs with the desired ones.
+        self.assertEqual(A.shape, (2, 11))
+        self.assertEqual(np.sum((A.toarray() - A_expected) ** 2), 0)
+        self.assertEqual(np.sum((b - b_expected) ** 2), 0)
+
+        # Each row must match the dense representation of the corresponding expression.
+        Gweights, Fweights, cons = expression_to_matrices(self.combined_expression)
+        self.assertEqual(np.sum((A.toarray()[0] - np.concatenate([Gweights.reshape(-1, order="F"), Fweights])) ** 2), 0)
+        self.assertEqual(b[0], cons)
+
     def tearDown(self):
 
         Expression.counter = 0
@@ -261,6 +261,45 @@ class TestFunction(unittest.TestCase):
         self.assertEqual(self.func1._is_already_evaluated_on_point(self.point), self.func1.list_of_points[0][1:])
         self.assertEqual(self.func2._is_already_evaluated_on_point(self.point), self.func2.list_of_points[0][1:])
 
+    def test_is_already_evaluated_on_equivalent_points(self):
+        new_function = Function(is_leaf=True, decomposition_dict=None, reuse_gradient=True)
+        other_point = Point(is_leaf=True, decomposition_dict=None)
+
+        # Two different Point objects with the same decomposition
+        point1 = self.point - other_point / 2
+        point2 = self.point - other_point / 2
+        self.assertIsNot(point1, point2)
+
+        # The gradient and function value computed on point1 are reused on point2
+        grad1, val1 = new_function.oracle(point=point1)
+        self.assertEqual(new_function._is_already_evaluated_on_point(point2), (grad1, val1))
+        grad2, val2 = new_function.oracle(point=point2)
+        self.assertIs(grad1, grad2)
+        self.assertIs(val1, val2)
+
+        # The index remains consistent with the list of points when the latter is updated by hand
+        new_function.list_of_points = list()
+        self.assertIsNone(new_function._is_already_evaluated_on_point(point2))
+
+    def test_is_already_evaluated_on_large_combinations(self):
+
+        for compact in [False, True]:
+            PEP(compact=compact)
+            new_function = Function(is_leaf=True, decomposition_dict=None, reuse_gradient=True)
+            points = [Point(is_leaf=True, decomposition_dict=None) for _ in range(20)]
+
+            # Combinations of the same size, with the same decomposition or not
+            point1 = Point.sum([(i + 1) * point for i, point in enumerate(points)])
+            point2 = Point.sum([(i + 1) * point for i, point in reversed(list(enumerate(points)))])
+            point3 = point1 + points[0]
+            point3 = point3 - points[1]
+            self.assertEqual(Function._get_point_key(point1), Function._get_point_key(point2))
+            self.assertNotEqual(Function._get_point_key(point1), Function._get_point_key(point3))
+
+            grad1, val1 = new_function.oracle(point=point1)
+            self.assertEqual(new_function._is_already_evaluated_on_point(point2), (grad1, val1))
+            self.assertIsNone(new_function._is_already_evaluated_on_point(point3))
+
     def test_separate_leaf_functions_regarding_their_needs_on_points_non_differentiable(self):
         # Non differentiable case
         new_function = self.compute_linear_combination()
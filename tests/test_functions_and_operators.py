@@ -264,3 +264,27 @@ class TestFunctionsAndOperators(unittest.TestCase):
         self.assertEqual(table_of_duals.columns[0], self.point1.get_name())
         self.assertEqual(table_of_duals.columns[1], self.point2.get_name())
         self.assertLessEqual(np.sum(np.array(table_of_duals) - np.array([[0, 2], [2, 0]]))**2, 10**-4)
+
+    def test_class_constraint_names(self):
+
+        self.func7.gradient(self.point1)
+        self.func7.gradient(self.point2)
+        self.func7.set_class_constraints()
+        constraint = self.func7.list_of_class_constraints[0]
+
+        # The names are derived from the tables of constraints when requested
+        self.assertEqual(constraint.get_name(), "IC_f7_smoothness_convexity(pt1, pt2)")
+        self.assertEqual(self.func7.tables_of_constraints["smoothness_convexity"].iloc[0, 1], constraint)
+        self.func7.set_name("g7")
+        self.assertEqual(constraint.get_name(), "IC_g7_smoothness_convexity(pt1, pt2)")
+
+        # A name set explicitly overwrites the derived one
+        constraint.set_name("my_constraint")
+        self.assertEqual(constraint.get_name(), "my_constraint")
+        self.assertEqual(self.func7.list_of_class_constraints[1].name, "IC_g7_smoothness_convexity(pt2, pt1)")
+
+        # One-point constraints are described by a single row
+        self.func3.gradient(self.point1)
+        self.func3.set_class_constraints()
+        self.assertEqual(self.func3.list_of_class_constraints[0].get_name(), "IC_f3_lipschitz_continuity(pt1)")
+        self.assertEqual(self.func3.tables_of_constraints["lipschitz_continuity"].shape, (1, 1))
@@ -0,0 +1,175 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from PEPit import PEP, PEPCache, Expression
+from PEPit.functions import SmoothConvexFunction
+from PEPit.tools.homogeneity import get_homogeneity_scalings, rescale_solution
+
+
+class TestHomogeneity(unittest.TestCase):
+
+    def setUp(self):
+        self.n = 3
+        self.verbose = 0
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_problem(self, L, R):
+
+        # Gradient descent on a L-smooth convex function, from an initial point at distance R of the minimizer
+        problem = PEP()
+        func = problem.declare_function(SmoothConvexFunction, L=L)
+        xs = func.stationary_point()
+        fs = func(xs)
+        x0 = problem.set_initial_point()
+        initial_condition = (x0 - xs) ** 2 <= R ** 2
+        problem.set_initial_condition(initial_condition)
+        x = x0
+        for _ in range(self.n):
+            x = x - 1 / L * func.gradient(x)
+        problem.set_performance_metric(func(x) - fs)
+
+        return problem, func, x0, xs, initial_condition
+
+    def theoretical_tau(self, L, R):
+
+        return L * R ** 2 / (4 * self.n + 2)
+
+    def get_scalings(self, problem):
+
+        with problem:
+            list_of_leaf_functions, list_of_functions_with_constraints = problem._set_up_problem()
+            list_of_constraints, list_of_psd = problem._get_list_of_constraints_and_psd(
+                list_of_leaf_functions, list_of_functions_with_constraints)
+            return get_homogeneity_scalings(list_of_constraints, list_of_psd, problem.objective)
+
+    def test_normalized_problem(self):
+
+        scalings1 = self.get_scalings(self.build_problem(L=1., R=1.)[0])
+        scalings2 = self.get_scalings(self.build_problem(L=3., R=.2)[0])
+
+        # Both PEPs are normalized to the same one, and their values differ by a factor L R^2
+        self.assertEqual(scalings1.normalized_A.shape, scalings2.normalized_A.shape)
+        self.assertAlmostEqual(abs(scalings1.normalized_A - scalings2.normalized_A).max(), 0, places=10)
+        self.assertTrue(np.allclose(scalings1.normalized_b, scalings2.normalized_b))
+        self.assertAlmostEqual(scalings2.objective / scalings1.objective, 3 * .2 ** 2, places=10)
+
+    def test_same_worst_case(self):
+
+        for L, R in [(1., 1.), (50., .1)]:
+            problem, _, _, _, initial_condition = self.build_problem(L=L, R=R)
+            pepit_tau = problem.solve(verbose=self.verbose, homogeneity=True)
+            self.assertAlmostEqual(pepit_tau, self.theoretical_tau(L, R), delta=10 ** -5 * self.theoretical_tau(L, R))
+
+            # The dual values are the ones of the PEP, and not of the normalized one
+            self.assertAlmostEqual(initial_condition.eval_dual(), L / (4 * self.n + 2), delta=10 ** -4 * L)
+
+    def test_lmi_and_dimension_reduction(self):
+
+        pepit_taus = list()
+        for homogeneity in [False, True]:
+            problem = PEP()
+            func = problem.declare_function(SmoothConvexFunction, L=2.)
+            xs = func.stationary_point()
+            x0 = problem.set_initial_point()
+            problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+            x1 = x0 - 1 / 2 * func.gradient(x0)
+
+            # t^2 <= f(x1) - f(xs)
+            t = Expression()
+            psd_matrix = problem.add_psd_matrix([[func(x1) - func(xs), t], [t, 1]])
+            problem.set_performance_metric(t)
+            pepit_taus.append(problem.solve(verbose=self.verbose, homogeneity=homogeneity,
+                                            dimension_reduction_heuristic="trace"))
+            self.assertGreaterEqual(np.min(np.linalg.eigh(psd_matrix.eval_dual())[0]), -10 ** -6)
+
+        self.assertAlmostEqual(pepit_taus[1], pepit_taus[0], delta=10 ** -4)
+        self.assertAlmostEqual(pepit_taus[1], np.sqrt(1 / 3), delta=10 ** -4)
+
+    def test_rescaled_cached_solution(self):
+
+        cache = PEPCache(self.directory)
+        problem1, _, x1, xs1, initial_condition1 = self.build_problem(L=1., R=1.)
+        pepit_tau1 = problem1.solve(verbose=self.verbose, cache=cache, homogeneity=True)
+        problem2, _, x0, xs, initial_condition2 = self.build_problem(L=4., R=.5)
+        pepit_tau2 = problem2.solve(verbose=self.verbose, cache=cache, homogeneity=True)
+
+        # The second PEP is not solved, but its solution is the rescaled solution of the first one
+        self.assertEqual(cache.nb_misses, 1)
+        self.assertEqual(cache.nb_hits, 1)
+        self.assertEqual(problem2.solve_time, 0.)
+        self.assertAlmostEqual(pepit_tau2, pepit_tau1 * 4 * .5 ** 2, delta=10 ** -10)
+        self.assertAlmostEqual(pepit_tau2, self.theoretical_tau(4., .5), delta=10 ** -6)
+        self.assertAlmostEqual(problem2.G_value[x0.counter, xs.counter],
+                               problem1.G_value[x1.counter, xs1.counter] * .5 ** 2, delta=10 ** -10)
+        self.assertAlmostEqual(((x0 - xs) ** 2).eval(), .5 ** 2, delta=10 ** -4)
+        self.assertAlmostEqual(initial_condition2.eval_dual(), initial_condition1.eval_dual() * 4, delta=10 ** -10)
+
+        # Without homogeneity, both PEPs have different keys
+        self.build_problem(L=4., R=.5)[0].solve(verbose=self.verbose, cache=cache)
+        self.assertEqual(cache.nb_misses, 2)
+
+    def test_declared_scalings(self):
+
+        L, R = 3., 2.
+        problem, func, x0, xs, _ = self.build_problem(L=L, R=R)
+
+        # Points scale as R, gradients as L R and function values as L R^2
+        declared_scalings = {x0: R, xs: R}
+        for point, gradient, value in func.list_of_points:
+            if gradient.get_is_leaf():
+                declared_scalings[gradient] = L * R
+            if value.get_is_leaf():
+                declared_scalings[value] = L * R ** 2
+        pepit_tau = problem.solve(verbose=self.verbose, homogeneity=declared_scalings)
+        self.assertAlmostEqual(pepit_tau, self.theoretical_tau(L, R), delta=10 ** -5 * self.theoretical_tau(L, R))
+
+        # Scalings can only be declared positive, and for leaves
+        problem, func, x0, xs, _ = self.build_problem(L=L, R=R)
+        self.assertRaises(ValueError, problem.solve, verbose=self.verbose, homogeneity={x0: -1.})
+        problem, func, x0, xs, _ = self.build_problem(L=L, R=R)
+        self.assertRaises(ValueError, problem.solve, verbose=self.verbose, homogeneity={x0 - xs: 1.})
+
+    def test_rescale_solution(self):
+
+        scalings = self.get_scalings(self.build_problem(L=2., R=3.)[0])
+        nb_points, nb_expressions = scalings.points.size, scalings.expressions.size
+        G_value = np.random.randn(nb_points, nb_points)
+        solution = {"wc_value": 1., "dual_objective": 1., "solver_status": "optimal", "solver_name": "SCS",
+                    "G_value": G_value @ G_value.T, "F_value": np.random.randn(nb_expressions),
+                    "residual": np.random.randn(nb_points, nb_points),
+                    "constraint_duals": np.random.rand(scalings.constraints.size), "psd_duals": list()}
+
+        # Rescaling back and forth gives back the solution
+        rescaled_solution = rescale_solution(rescale_solution(solution, scalings, inverse=True), scalings)
+        for name in ["wc_value", "dual_objective", "G_value", "F_value", "residual", "constraint_duals"]:
+            self.assertTrue(np.allclose(rescaled_solution[name], solution[name]))
+
+    def test_cache_tolerance(self):
+
+        cache = PEPCache(self.directory)
+        problem = self.build_problem(L=1., R=1.)[0]
+        problem.solve(verbose=self.verbose, cache=cache, homogeneity=True)
+        key = [file_name for file_name in os.listdir(self.directory) if file_name.endswith(".npz")][0][:-4]
+        scalings = self.get_scalings(self.build_problem(L=1., R=1.)[0])
+
+        for relative_error, is_reused in [(PEPCache.homogeneity_rtol / 10, True),
+                                          (PEPCache.homogeneity_rtol * 10, False)]:
+            # Perturb one normalized coefficient, which is still hashed the same way
+            normalized_A = scalings.normalized_A.copy()
+            normalized_A.data[0] *= 1 + relative_error
+            perturbed_scalings = scalings._replace(normalized_A=normalized_A)
+            self.assertEqual(PEPCache.get_key(list(), list(), dict(), perturbed_scalings),
+                             PEPCache.get_key(list(), list(), dict(), scalings))
+
+            # The solution is reused only within the tolerance
+            nb_hits = cache.nb_hits
+            solution = cache.get_solution(key, perturbed_scalings)
+            self.assertEqual(solution is not None, is_reused)
+            self.assertEqual(cache.nb_hits, nb_hits + is_reused)
@@ -0,0 +1,121 @@
+import unittest
+
+import numpy as np
+
+from PEPit import PEP
+from PEPit.functions import ConvexFunction, SmoothConvexFunction, SmoothStronglyConvexFunction, \
+    StronglyConvexFunction, ConvexLipschitzFunction
+from PEPit.operators import LipschitzOperator, MonotoneOperator, StronglyMonotoneOperator, CocoerciveOperator
+from PEPit.tools.expressions_to_matrices import expressions_to_stacked_sparse_matrix
+from PEPit.tools.interpolation_kernels import InterpolationKernel, KERNEL_POINTS_BASIS, KERNEL_VALUES_BASIS, \
+    get_stacked_coefficients, get_batched_constraint_rows
+
+
+class TestInterpolationKernels(unittest.TestCase):
+
+    def setUp(self):
+        self.classes = [(ConvexFunction, dict()),
+                        (SmoothConvexFunction, dict(L=2.)),
+                        (SmoothStronglyConvexFunction, dict(mu=.1, L=2.)),
+                        (StronglyConvexFunction, dict(mu=.3)),
+                        (ConvexLipschitzFunction, dict(M=1.5)),
+                        (LipschitzOperator, dict(L=.7)),
+                        (MonotoneOperator, dict()),
+                        (StronglyMonotoneOperator, dict(mu=.2)),
+                        (CocoerciveOperator, dict(beta=.5)),
+                        ]
+        self.verbose = 0
+
+    @staticmethod
+    def build_problem(function_class, function_parameters, batched_class_constraints, extra_point=True, **kwargs):
+
+        problem = PEP(batched_class_constraints=batched_class_constraints, **kwargs)
+        func = problem.declare_function(function_class, **function_parameters)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+
+        # A few iterations, and possibly a point whose function value involves an inner product
+        x = x0
+        for _ in range(3):
+            x = x - .5 * func.gradient(x) + .1 * xs
+        if extra_point:
+            x1 = x + .5 * x0
+            func.add_point((x1, 2 * func.gradient(x), func(x) + x1 ** 2))
+        problem.set_performance_metric(func.gradient(x) ** 2)
+
+        return problem, func
+
+    def test_same_constraints(self):
+
+        for hash_consing in [False, True]:
+            for compact in [False, True]:
+                for function_class, function_parameters in self.classes:
+                    functions = list()
+                    for batched_class_constraints in [False, True]:
+                        problem, func = self.build_problem(function_class, function_parameters,
+                                                           batched_class_constraints,
+                                                           hash_consing=hash_consing, compact=compact)
+                        with problem:
+                            func.set_class_constraints()
+                            A, b = expressions_to_stacked_sparse_matrix(
+                                [constraint.expression for constraint in func.list_of_class_constraints])
+                        functions.append((func, A, b))
+
+                    # The batched constraints encode the same expressions, names and working set
+                    (func1, A1, b1), (func2, A2, b2) = functions
+                    self.assertEqual(A1.shape, A2.shape)
+                    self.assertAlmostEqual(abs(A1 - A2).max(), 0, places=12)
+                    self.assertTrue(np.allclose(b1, b2))
+                    self.assertEqual([constraint.name for constraint in func1.list_of_class_constraints],
+                                     [constraint.name for constraint in func2.list_of_class_constraints])
+                    self.assertEqual([constraint.equality_or_inequality
+                                      for constraint in func1.list_of_class_constraints],
+                                     [constraint.equality_or_inequality
+                                      for constraint in func2.list_of_class_constraints])
+                    self.assertEqual(sorted(func1.list_of_class_constraints.index(constraint)
+                                            for constraint in func1._set_of_deferrable_class_constraints),
+                                     sorted(func2.list_of_class_constraints.index(constraint)
+                                            for constraint in func2._set_of_deferrable_class_constraints))
+
+    def test_same_worst_case(self):
+
+        for function_class, function_parameters in [(SmoothStronglyConvexFunction, dict(mu=.1, L=1.)),
+                                                    (CocoerciveOperator, dict(beta=1.))]:
+            problem1, func1 = self.build_problem(function_class, function_parameters, False, extra_point=False)
+            pepit_tau1 = problem1.solve(verbose=self.verbose)
+            problem2, func2 = self.build_problem(function_class, function_parameters, True, extra_point=False)
+            pepit_tau2 = problem2.solve(verbose=self.verbose)
+            self.assertAlmostEqual(pepit_tau2, pepit_tau1, delta=10 ** -4)
+            self.assertEqual(len(func2.list_of_class_constraints), len(func1.list_of_class_constraints))
+
+    def test_batched_constraint_rows(self):
+
+        problem = PEP(batched_class_constraints=True)
+        func = problem.declare_function(ConvexFunction)
+        x0, x1 = problem.set_initial_point(), problem.set_initial_point()
+        g0, f0 = func.oracle(x0)
+        g1, f1 = func.oracle(x1)
+
+        # fi - fj >= gj * (xi - xj), i.e. gj * (xi - xj) - fi + fj <= 0
+        xi, gi, xj, gj = KERNEL_POINTS_BASIS
+        fi, fj = KERNEL_VALUES_BASIS
+        kernel = InterpolationKernel(quadratic_terms=[(1, gj, xi - xj)], linear_weights=fj - fi, constant=1.,
+                                     equality_or_inequality="inequality")
+        with problem:
+            stacked_coefficients = get_stacked_coefficients(func.list_of_points)
+            Gweights, Fweights, cons_val = get_batched_constraint_rows(kernel, stacked_coefficients,
+                                                                       stacked_coefficients,
+                                                                       np.array([0, 1]), np.array([1, 0]))
+            nb_points = stacked_coefficients[0].shape[1]
+
+        # The constraint of the couple (x0, x1) is <g1, x0 - x1> - f0 + f1 + 1 <= 0
+        G = np.zeros((nb_points, nb_points))
+        indi, indj = np.divmod(Gweights[0].indices, nb_points)
+        G[indi, indj] = Gweights[0].data
+        self.assertEqual(G[g1.counter, x0.counter], .5)
+        self.assertEqual(G[g1.counter, x1.counter], -.5)
+        self.assertEqual(np.count_nonzero(G), 2)
+        self.assertEqual(dict(zip(Fweights[0].indices.tolist(), Fweights[0].data.tolist())),
+                         {f0.counter: -1., f1.counter: 1.})
+        self.assertEqual(cons_val.tolist(), [1., 1.])
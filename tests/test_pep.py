@@ -5,6 +5,7 @@ from PEPit.pep import PEP
 from PEPit.point import Point
 from PEPit.expression import Expression
 from PEPit.function import Function
+from PEPit.psd_matrix import PSDMatrix
 from PEPit.functions.smooth_strongly_convex_function import SmoothStronglyConvexFunction
 from PEPit.primitive_steps import inexact_gradient_step
 
@@ -157,6 +158,150 @@ class TestPEP(unittest.TestCase):
                 self.assertAlmostEqual(self.problem.list_of_psd[0].eval_dual()[i, j], -1/2 * (-pepit_tau) ** (i+j-1),
                                        places=3)
 
+    def test_check_feasibility(self):
+
+        # Add an LMI constraint so that all the terms of the proof are involved
+        expr = Expression()
+        self.problem.add_psd_matrix(matrix_of_expressions=[[(self.x1 - self.xs) ** 2, expr], [expr, 1]])
+        pepit_tau = self.problem.solve(verbose=self.verbose)
+
+        # Reconstruct the proof symbolically
+        with self.problem:
+            proof = self.problem.objective - np.dot(self.problem.residual.dot(Point.list_of_leaf_points),
+                                                    Point.list_of_leaf_points)
+            for psd_matrix in self.problem._list_of_psd_sent_to_wrapper:
+                proof -= np.sum(psd_matrix.eval_dual() * psd_matrix.matrix_of_expressions)
+            for constraint in self.problem._list_of_constraints_sent_to_wrapper:
+                proof -= constraint.eval_dual() * constraint.expression
+            dual_objective = proof.decomposition_dict.get(1, 0.)
+
+        # The dual objective computed by sparse linear algebra is the constant term of the proof
+        wc_value = self.problem.objective.eval()
+        self.assertAlmostEqual(self.problem.check_feasibility(wc_value, verbose=self.verbose), dual_objective,
+                               places=10)
+        self.assertAlmostEqual(dual_objective, pepit_tau, delta=pepit_tau * 10 ** -3)
+
+    def test_compact(self):
+
+        pepit_tau = self.problem.solve(verbose=self.verbose)
+        x1_value = self.x1.eval()
+
+        # Build and solve the same problem in compact mode
+        problem = PEP(compact=True)
+        func = problem.declare_function(SmoothStronglyConvexFunction, mu=self.mu, L=self.L)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x1 = x0 - self.gamma * func.gradient(x0)
+        problem.set_performance_metric((x1 - xs) ** 2)
+        compact_pepit_tau = problem.solve(verbose=self.verbose)
+
+        self.assertAlmostEqual(compact_pepit_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        self.assertEqual(x1.eval().shape, x1_value.shape)
+        self.assertAlmostEqual(((x1 - xs) ** 2).eval(), compact_pepit_tau, delta=compact_pepit_tau * 10 ** -3)
+
+    def test_eval_many(self):
+
+        self.problem.solve(verbose=self.verbose)
+
+        # Define new objects after solving, so that none of them is evaluated yet, with a copy of each of them
+        def build_objects():
+            x2 = self.x1 - self.gamma * self.x0 + self.xs
+            expression = (x2 - self.xs) ** 2 + self.x1 * self.x0 - 1
+            return [x2, expression, expression <= 0, PSDMatrix([[expression, self.x1 ** 2], [self.x1 ** 2, 1]]),
+                    self.x0]
+
+        values = self.problem.eval_many(build_objects())
+        expected_values = [element.eval() for element in build_objects()]
+
+        self.assertEqual(len(values), len(expected_values))
+        for value, expected_value in zip(values, expected_values):
+            np.testing.assert_array_almost_equal(value, expected_value)
+
+        self.assertRaises(TypeError, self.problem.eval_many, [1.])
+
+    def test_chordal_decomposition(self):
+
+        # The constraints only couple consecutive points: the aggregate sparsity pattern is a cycle
+        problem = PEP()
+        points = [problem.set_initial_point() for _ in range(6)]
+        for point, next_point in zip(points[:-1], points[1:]):
+            problem.add_constraint((next_point - point) ** 2 <= 1)
+        problem.set_performance_metric((points[-1] - points[0]) ** 2)
+
+        pepit_tau = problem.solve(verbose=self.verbose)
+        chordal_pepit_tau = problem.solve(verbose=self.verbose, chordal_decomposition=True)
+        self.assertAlmostEqual(chordal_pepit_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        self.assertAlmostEqual(chordal_pepit_tau, 25, delta=10 ** -2)
+
+        # The main constraint is decomposed into cliques of size 3, and G is completed into a PSD matrix
+        _, _, cliques = problem.wrapper.chordal_extension
+        self.assertEqual(len(cliques), 4)
+        self.assertEqual(max(len(clique) for clique in cliques), 3)
+        self.assertEqual(problem.G_value.shape, (6, 6))
+        self.assertGreater(np.linalg.eigvalsh(problem.G_value).min(), -10 ** -2)
+        self.assertGreater(np.linalg.eigvalsh(problem.residual).min(), -10 ** -4)
+        self.assertAlmostEqual(((points[-1] - points[0]) ** 2).eval(), chordal_pepit_tau, delta=10 ** -1)
+
+        # The dimension reduction heuristics only act on the entries of G in the chordal extension
+        pepit_tau2 = problem.solve(verbose=self.verbose, chordal_decomposition=True,
+                                   dimension_reduction_heuristic="logdet2")
+        self.assertAlmostEqual(pepit_tau2, pepit_tau, delta=10 ** -2)
+
+        # A dense pattern is not decomposed
+        self.problem.solve(verbose=self.verbose, chordal_decomposition=True)
+        self.assertIsNone(self.problem.wrapper.chordal_extension)
+
+    def test_presolve(self):
+
+        pepit_tau = self.problem.solve(verbose=self.verbose)
+
+        # Add a duplicated constraint, a constraint without variable, and a point that is not used
+        duplicated_constraint = (self.x0 - self.xs) ** 2 <= 1
+        trivial_constraint = (self.x0 - self.x0) ** 2 <= 0
+        self.problem.add_constraint(duplicated_constraint)
+        self.problem.add_constraint(trivial_constraint)
+        unused_point = Point()
+
+        presolved_pepit_tau = self.problem.solve(verbose=self.verbose, presolve=True)
+        self.assertAlmostEqual(presolved_pepit_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        self.assertEqual(self.problem._set_of_constraints_removed_by_presolve,
+                         {duplicated_constraint, trivial_constraint})
+
+        # The removed constraints have a null dual variable, but still belong to the proof
+        self.assertEqual(duplicated_constraint.eval_dual(), 0)
+        self.assertEqual(trivial_constraint.eval_dual(), 0)
+        self.assertIn(duplicated_constraint, self.problem._list_of_constraints_sent_to_wrapper)
+
+        # The unused point is removed from the PSD constraint on G, and evaluated to 0
+        _, _, cliques = self.problem.wrapper.chordal_extension
+        self.assertEqual(len(cliques), 1)
+        self.assertNotIn(unused_point.counter, cliques[0])
+        self.assertEqual(self.problem.G_value.shape, (Point.counter, Point.counter))
+        self.assertAlmostEqual(np.linalg.norm(unused_point.eval()), 0)
+
+    def test_constraint_generation(self):
+
+        # Run more steps of the GD method, with a performance metric involving non-consecutive points
+        x = self.x1
+        for _ in range(4):
+            x = x - 1.8 / self.L * self.func.gradient(x)
+        self.problem.set_performance_metric((self.func.gradient(x) - self.func.gradient(self.x1)) ** 2)
+        pepit_tau = self.problem.solve(verbose=self.verbose)
+
+        # Only the constraints between consecutive points or involving xs are sent first
+        generated_pepit_tau = self.problem.solve(verbose=self.verbose, constraint_generation=True)
+        self.assertAlmostEqual(generated_pepit_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        self.assertEqual(len(self.func._set_of_deferrable_class_constraints), 20)
+        inactive_constraints = self.problem._set_of_inactive_class_constraints
+        self.assertLess(len(inactive_constraints), 20)
+
+        # The constraints left out are satisfied and have a null dual variable
+        for constraint in inactive_constraints:
+            self.assertLessEqual(constraint.eval(), 10 ** -4)
+            self.assertEqual(constraint.eval_dual(), 0)
+            self.assertIn(constraint, self.problem._list_of_constraints_sent_to_wrapper)
+
     def test_consistency(self):
 
         # Solve twice the same problem in a row and verify the two lists of constraints have same length.
@@ -186,6 +331,24 @@ class TestPEP(unittest.TestCase):
         pepit_tau4 = self.problem.solve(verbose=self.verbose, dimension_reduction_heuristic="logdet2")
         self.assertAlmostEqual(pepit_tau4, pepit_tau, delta=10 ** -2)
 
+    def test_solver_information_and_solve_hooks(self):
+
+        self.assertIsNone(self.problem.solver_status)
+        self.assertIsNone(self.problem.solve_time)
+
+        # Register a hook recording the solved PEPs
+        list_of_solved_peps = list()
+        PEP.list_of_solve_hooks.append(list_of_solved_peps.append)
+        try:
+            self.problem.solve(verbose=self.verbose)
+        finally:
+            PEP.list_of_solve_hooks.remove(list_of_solved_peps.append)
+
+        self.assertEqual(list_of_solved_peps, [self.problem])
+        self.assertEqual(self.problem.solver_status, "optimal")
+        self.assertEqual(self.problem.solver_name, self.problem.wrapper.solver_name)
+        self.assertGreater(self.problem.solve_time, 0)
+
     def test_unbounded_result(self):
 
         # The problem has 1 initial constraint.
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from PEPit import PEP
+from PEPit.pep_cache import PEPCache
+from PEPit.functions import SmoothStronglyConvexFunction
+
+
+class TestPEPCache(unittest.TestCase):
+
+    def setUp(self):
+        self.L = 1.
+        self.mu = 0.1
+        self.verbose = 0
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_problem(self, gamma, n=2):
+
+        # Gradient descent on a smooth strongly convex function
+        problem = PEP()
+        func = problem.declare_function(SmoothStronglyConvexFunction, mu=self.mu, L=self.L)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        initial_condition = (x0 - xs) ** 2 <= 1
+        problem.set_initial_condition(initial_condition)
+        x = x0
+        for _ in range(n):
+            x = x - gamma * func.gradient(x)
+        problem.set_performance_metric((x - xs) ** 2)
+
+        return problem, func, x, initial_condition
+
+    def test_active_cache(self):
+
+        self.assertIsNone(PEPCache.get_active_cache())
+        cache = PEPCache(self.directory)
+        with cache:
+            self.assertIs(PEPCache.get_active_cache(), cache)
+        self.assertIsNone(PEPCache.get_active_cache())
+
+    def test_hits_and_misses(self):
+
+        cache = PEPCache(self.directory)
+        with cache:
+            for gamma in [1.2 / self.L, 1.5 / self.L, 1.2 / self.L]:
+                self.build_problem(gamma=gamma)[0].solve(verbose=self.verbose)
+        self.assertEqual(cache.nb_misses, 2)
+        self.assertEqual(cache.nb_hits, 1)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+        # Different settings lead to a different key
+        self.build_problem(gamma=1.2 / self.L)[0].solve(verbose=self.verbose, cache=cache, presolve=True)
+        self.assertEqual(cache.nb_misses, 3)
+
+        cache.clear()
+        self.assertEqual(os.listdir(self.directory), list())
+
+    def test_loaded_solution(self):
+
+        cache = PEPCache(self.directory)
+        problem1, func1, x1, initial_condition1 = self.build_problem(gamma=1.5 / self.L)
+        pepit_tau1 = problem1.solve(verbose=self.verbose, cache=cache)
+        problem2, func2, x2, initial_condition2 = self.build_problem(gamma=1.5 / self.L)
+        pepit_tau2 = problem2.solve(verbose=self.verbose, cache=cache)
+        self.assertEqual(cache.nb_hits, 1)
+
+        # The worst-case values and all the primal and dual values are the same as after solving
+        self.assertEqual(pepit_tau2, pepit_tau1)
+        self.assertEqual(problem2.solve_time, 0.)
+        self.assertEqual(problem2.solver_status, problem1.solver_status)
+        self.assertEqual(x2.eval().tolist(), x1.eval().tolist())
+        self.assertEqual(func2.list_of_points[-1][2].eval(), func1.list_of_points[-1][2].eval())
+        self.assertEqual(initial_condition2.eval_dual(), initial_condition1.eval_dual())
+        for constraint1, constraint2 in zip(func1.list_of_class_constraints, func2.list_of_class_constraints):
+            self.assertEqual(constraint2.eval_dual(), constraint1.eval_dual())
+        self.assertTrue(np.array_equal(problem2.residual, problem1.residual))
+        self.assertEqual(len(problem2._list_of_constraints_sent_to_wrapper),
+                         len(problem1._list_of_constraints_sent_to_wrapper))
+
+        # The primal value can also be loaded
+        problem3 = self.build_problem(gamma=1.5 / self.L)[0]
+        self.assertEqual(problem3.solve(verbose=self.verbose, cache=cache, return_primal_or_dual="primal"),
+                         problem1.wrapper.prob.value)
+        self.assertEqual(cache.nb_hits, 2)
@@ -0,0 +1,123 @@
+import shutil
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from PEPit import PEP, PEPProfile, PEPCache
+from PEPit.functions import SmoothStronglyConvexFunction, ConvexFunction
+from PEPit.primitive_steps import proximal_step
+
+
+class TestPEPProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.L = 1.
+        self.mu = 0.1
+        self.gamma = 1 / self.L
+        self.verbose = 0
+        self.phases = ["set_class_constraints", "send_constraint_to_solver", "generate_problem", "solver",
+                       "eval_points_and_function_values", "check_feasibility"]
+
+    def build_problem(self, n=3):
+
+        # Proximal gradient on the sum of a smooth strongly convex function and of a convex function
+        problem = PEP()
+        f1 = problem.declare_function(SmoothStronglyConvexFunction, mu=self.mu, L=self.L)
+        f2 = problem.declare_function(ConvexFunction)
+        func = f1 + f2
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x = x0
+        for _ in range(n):
+            x, _, _ = proximal_step(x - self.gamma * f1.gradient(x), f2, self.gamma)
+        problem.set_performance_metric((x - xs) ** 2)
+
+        return problem
+
+    def test_phases(self):
+
+        problem = self.build_problem()
+        problem.solve(verbose=self.verbose)
+        profile = problem.profile
+
+        # All the phases are measured once, without memory as tracemalloc is not tracing
+        table = profile.get_phases_table()
+        self.assertEqual(list(table.index), self.phases)
+        self.assertEqual(list(table["nb_calls"]), [1] * 6)
+        self.assertTrue((table["wall_time"] >= 0).all())
+        self.assertTrue(table["peak_memory"].isna().all())
+        self.assertAlmostEqual(profile.phases["solver"]["wall_time"], problem.solve_time, delta=10 ** -2)
+        self.assertLessEqual(profile.get_total_time(),
+                             problem.compile_time + problem.solve_time + problem.postprocessing_time)
+
+        # The first two phases are broken down per function class
+        table = profile.get_function_classes_table()
+        self.assertEqual(list(table.index), [(phase, function_class)
+                                             for phase in self.phases[:2]
+                                             for function_class in ["SmoothStronglyConvexFunction",
+                                                                    "ConvexFunction"]])
+        self.assertLessEqual(table.loc["set_class_constraints"]["wall_time"].sum(),
+                             profile.phases["set_class_constraints"]["wall_time"])
+
+        # The solver is called again for the dimension reduction
+        problem = self.build_problem()
+        problem.solve(verbose=self.verbose, dimension_reduction_heuristic="logdet2")
+        self.assertEqual(problem.profile.phases["solver"]["nb_calls"], 3)
+
+    def test_memory(self):
+
+        tracemalloc.start()
+        try:
+            problem = self.build_problem(n=5)
+            problem.solve(verbose=self.verbose)
+        finally:
+            tracemalloc.stop()
+
+        # The phases enclosing the per function class measurements have larger peaks
+        profile = problem.profile
+        for phase in self.phases:
+            self.assertGreater(profile.phases[phase]["peak_memory"], 0.)
+        for phase in self.phases[:2]:
+            for function_class in ["SmoothStronglyConvexFunction", "ConvexFunction"]:
+                self.assertLessEqual(profile.function_classes[(phase, function_class)]["peak_memory"],
+                                     profile.phases[phase]["peak_memory"])
+
+    def test_hooks(self):
+
+        records = list()
+
+        def hook(profile, record):
+            records.append((profile, record))
+
+        PEPProfile.list_of_hooks.append(hook)
+        try:
+            problem = self.build_problem()
+            problem.solve(verbose=self.verbose)
+        finally:
+            PEPProfile.list_of_hooks.remove(hook)
+
+        # The hooks receive each measurement as soon as it ends
+        self.assertEqual(len(records), 6 + 4)
+        self.assertTrue(all(profile is problem.profile for profile, _ in records))
+        self.assertEqual([record["phase"] for _, record in records if record["function_class"] is None],
+                         self.phases)
+        self.assertEqual(records[0][1]["function_class"], "SmoothStronglyConvexFunction")
+        self.assertTrue(np.isnan(records[0][1]["peak_memory"]))
+
+    def test_cache(self):
+
+        directory = tempfile.mkdtemp()
+        try:
+            cache = PEPCache(directory)
+            self.build_problem().solve(verbose=self.verbose, cache=cache)
+            problem = self.build_problem()
+            problem.solve(verbose=self.verbose, cache=cache)
+        finally:
+            shutil.rmtree(directory)
+
+        # The solution loaded from the cache is evaluated, but the solver is not called
+        self.assertEqual(list(problem.profile.phases.keys()),
+                         ["set_class_constraints", "eval_points_and_function_values"])
@@ -0,0 +1,148 @@
+import importlib.util
+import unittest
+
+import numpy as np
+
+from PEPit import PEP, PEPProfile, Point
+from PEPit.pep_template import PEPTemplate
+from PEPit.functions import SmoothStronglyConvexFunction
+from PEPit.wrappers import MosekWrapper
+
+
+class TestPEPTemplate(unittest.TestCase):
+
+    def setUp(self):
+        self.L = 1.
+        self.mu = 0.1
+        self.verbose = 0
+
+    def build_problem(self, gamma, n=2):
+
+        # Gradient descent on a smooth strongly convex function
+        problem = PEP()
+        func = problem.declare_function(SmoothStronglyConvexFunction, mu=self.mu, L=self.L)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x = x0
+        for _ in range(n):
+            x = x - gamma * func.gradient(x)
+        problem.set_performance_metric((x - xs) ** 2)
+
+        return problem
+
+    def test_active_template(self):
+
+        self.assertIsNone(PEPTemplate.get_active_template())
+        template1 = PEPTemplate()
+        template2 = PEPTemplate()
+        with template1:
+            self.assertIs(PEPTemplate.get_active_template(), template1)
+            with template2:
+                self.assertIs(PEPTemplate.get_active_template(), template2)
+            self.assertIs(PEPTemplate.get_active_template(), template1)
+        self.assertIsNone(PEPTemplate.get_active_template())
+
+    def test_signature(self):
+
+        problem = self.build_problem(gamma=1.2 / self.L)
+        problem.solve(verbose=self.verbose)
+        signature1, A1, b1 = PEPTemplate.get_signature("cvxpy", problem.wrapper._list_of_constraints_sent_to_solver,
+                                                       problem.objective)
+
+        problem = self.build_problem(gamma=1.5 / self.L)
+        problem.solve(verbose=self.verbose)
+        signature2, A2, b2 = PEPTemplate.get_signature("cvxpy", problem.wrapper._list_of_constraints_sent_to_solver,
+                                                       problem.objective)
+
+        # Same structure, different coefficients
+        self.assertEqual(signature1, signature2)
+        self.assertEqual(A1.shape, A2.shape)
+        self.assertNotEqual(list(A1.data), list(A2.data))
+
+    def test_coefficients_update(self):
+
+        template = PEPTemplate()
+        for gamma in [1.2 / self.L, 1.5 / self.L, 1.8 / self.L]:
+
+            # Solve the problem with and without template
+            pepit_tau = self.build_problem(gamma=gamma).solve(verbose=self.verbose)
+            problem = self.build_problem(gamma=gamma)
+            pepit_tau_with_template = problem.solve(verbose=self.verbose, template=template)
+            self.assertAlmostEqual(pepit_tau_with_template, pepit_tau, delta=10 ** -3)
+
+            # Compare with the theoretical rate
+            theoretical_tau = max((1 - self.mu * gamma) ** 4, (1 - self.L * gamma) ** 4)
+            self.assertAlmostEqual(pepit_tau_with_template, theoretical_tau, delta=10 ** -3)
+
+        # The problem has been compiled once, then updated twice
+        self.assertEqual(template.nb_compilations, 1)
+        self.assertEqual(template.nb_updates, 2)
+
+        # A PEP with a different structure must be compiled
+        problem = self.build_problem(gamma=1.5 / self.L, n=3)
+        problem.solve(verbose=self.verbose, template=template)
+        self.assertEqual(template.nb_compilations, 2)
+
+    @staticmethod
+    def get_quadratic_part(task, row, size):
+
+        # Sum the symmetric matrices of the store weighted in the constraint `row`
+        G = np.zeros((size, size))
+        for idx in task.getbarasparsity()[1]:
+            i, _, _, sub, weights = task.getbaraidx(idx)
+            if i == row:
+                for matrix_index, weight in zip(sub, weights):
+                    subi, subj, valij = task.getsparsesymmat(matrix_index)
+                    G[subi, subj] += weight * np.array(valij)
+        return G
+
+    def test_mosek_task_reuse(self):
+
+        if importlib.util.find_spec("mosek") is None:
+            self.skipTest("MOSEK is not installed.")
+
+        # Build the tasks without solving them, which does not require a license
+        template = PEPTemplate()
+        list_of_task_sizes = list()
+        for gamma in [1.2 / self.L, 1.5 / self.L, 1.8 / self.L]:
+            problem = self.build_problem(gamma=gamma)
+            problem.profile = PEPProfile()
+            wrapper = MosekWrapper(verbose=self.verbose)
+            wrapper.template = template
+            with problem:
+                list_of_leaf_functions, list_of_functions_with_constraints = problem._set_up_problem()
+                problem._send_problem_to_wrapper(wrapper, list_of_leaf_functions, list_of_functions_with_constraints,
+                                                 verbose=self.verbose)
+                task = wrapper.generate_problem(problem.objective)
+                nb_points = Point.counter
+                _, A, _ = PEPTemplate.get_signature("mosek", wrapper._list_of_constraints_sent_to_solver,
+                                                    problem.objective)
+            list_of_task_sizes.append((task.getnumcon(), task.getnumbarvar(), task.getnumsymmat()))
+
+            # The quadratic part of each scalar constraint is the lower triangular part of its weights on G
+            for row in wrapper._constraint_index_in_mosek:
+                G = A[row, :nb_points ** 2].toarray().reshape((nb_points, nb_points), order="F")
+                self.assertTrue(np.allclose(self.get_quadratic_part(task, row, nb_points), np.tril(G)))
+
+        # The task is updated without growing
+        self.assertEqual(template.nb_compilations, 1)
+        self.assertEqual(template.nb_updates, 2)
+        self.assertEqual(list_of_task_sizes[1], list_of_task_sizes[0])
+        self.assertEqual(list_of_task_sizes[2], list_of_task_sizes[0])
+
+        # Solve the tasks, with the dimension reduction heuristic modifying them, if a license is available
+        if not MosekWrapper(verbose=self.verbose).check_license():
+            self.skipTest("No MOSEK license available.")
+        template = PEPTemplate()
+        list_of_task_sizes = list()
+        for gamma in [1.2 / self.L, 1.5 / self.L, 1.8 / self.L]:
+            pepit_tau = self.build_problem(gamma=gamma).solve(wrapper="mosek", verbose=self.verbose)
+            problem = self.build_problem(gamma=gamma)
+            pepit_tau_with_template = problem.solve(wrapper="mosek", verbose=self.verbose, template=template,
+                                                    dimension_reduction_heuristic="trace")
+            self.assertAlmostEqual(pepit_tau_with_template, pepit_tau, delta=10 ** -3)
+            task = problem.wrapper.task
+            list_of_task_sizes.append(task.getnumsymmat())
+        self.assertEqual(list_of_task_sizes[1], list_of_task_sizes[0])
+        self.assertEqual(list_of_task_sizes[2], list_of_task_sizes[0])
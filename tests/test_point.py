@@ -1,7 +1,7 @@
 import unittest
 
 from PEPit import PEP
-from PEPit.point import Point
+from PEPit.point import Point, null_point
 from PEPit.expression import Expression
 
 
@@ -18,6 +18,16 @@ class TestPoint(unittest.TestCase):
         self.assertIsInstance(self.A, Point)
         self.assertIsInstance(self.B, Point)
 
+    def test_attributes(self):
+
+        # Any attribute can be attached to a Point, as well as to the Expressions it leads to
+        C = self.A + self.B
+        C.label = "sum"
+        self.assertEqual(C.label, "sum")
+        expression = C ** 2
+        expression.label = "squared norm"
+        self.assertEqual(vars(expression), {"label": "squared norm"})
+
     def test_name(self):
 
         self.assertEqual(self.A.get_name(), "pointA")
@@ -50,6 +60,101 @@ class TestPoint(unittest.TestCase):
         self.assertIsInstance(new_point, Point)
         self.assertEqual(new_point.decomposition_dict, {self.A: -1, self.B: 9 / 5})
 
+    def test_sum(self):
+
+        new_point = Point.sum([self.A, 2 * self.B, - self.A])
+
+        self.assertIsInstance(new_point, Point)
+        self.assertEqual(new_point.decomposition_dict, {self.B: 2})
+        self.assertEqual(Point.sum([]).decomposition_dict, dict())
+
+    def test_iadd(self):
+
+        # += never modifies the Points still referenced elsewhere
+        accumulation = null_point
+        accumulation += self.A
+        self.assertIsNot(accumulation, null_point)
+        self.assertEqual(null_point.decomposition_dict, dict())
+        self.assertEqual(self.A.decomposition_dict, {self.A: 1})
+
+        # Iterates appended to a list are left unchanged by the next +=
+        x = self.A
+        history = list()
+        for step in [self.B, Point(), Point()]:
+            x += step
+            history.append(x)
+        self.assertEqual([len(point.decomposition_dict) for point in history], [2, 3, 4])
+        self.assertIsNot(history[0], history[2])
+
+        # So are aliases of an iterate (e.g. the previous iterate in a heavy-ball method)
+        x_prev = x
+        x += 2 * self.B
+        x -= self.A
+        self.assertIsNot(x, x_prev)
+        self.assertEqual(len(x_prev.decomposition_dict), 4)
+        self.assertEqual(x_prev.decomposition_dict[self.B], 1)
+        self.assertEqual(x.decomposition_dict[self.B], 3)
+        self.assertNotIn(self.A, x.decomposition_dict)
+
+    def test_iadd_with_hash_consing(self):
+
+        pep = PEP(hash_consing=True)
+        A = pep.set_initial_point()
+        B = Point()
+
+        accumulation = A
+        accumulation += B
+        self.assertIs(accumulation, A + B)
+        accumulation -= B
+        self.assertIs(accumulation, A)
+        self.assertEqual((A + B).decomposition_dict, {A: 1, B: 1})
+
+    def test_compact(self):
+
+        pep = PEP(compact=True)
+        A = pep.set_initial_point()
+        B = Point()
+        C = Point()
+
+        # Points only store their coefficients, and their decomposition dict is computed on demand
+        new_point = (A - 2 * B) / 4 + C
+        self.assertIsNone(new_point._decomposition_dict)
+        self.assertEqual(new_point.decomposition_dict, {A: 1 / 4, B: -1 / 2, C: 1})
+        self.assertEqual(Point.sum([A, B, - A]).decomposition_dict, {B: 1})
+        self.assertEqual((0 * A).decomposition_dict, dict())
+
+        # Other attributes can still be attached to the Points
+        new_point.label = "iterate"
+        self.assertEqual(new_point.label, "iterate")
+        self.assertEqual(vars(new_point), {"label": "iterate"})
+
+        # += leaves the Points it starts from unchanged
+        accumulation = A
+        accumulation += B
+        previous_point = accumulation
+        accumulation -= A
+        self.assertIsNot(accumulation, previous_point)
+        self.assertEqual(previous_point.decomposition_dict, {A: 1, B: 1})
+        self.assertEqual(accumulation.decomposition_dict, {B: 1})
+
+        # Inner products are computed from the outer product of the coefficients
+        inner_product = new_point * (A + B)
+        self.assertIsInstance(inner_product, Expression)
+        self.assertEqual(inner_product.decomposition_dict, {(A, A): 1 / 4, (B, A): -1 / 8, (A, B): -1 / 8,
+                                                            (B, B): -1 / 2, (C, A): 1 / 2, (A, C): 1 / 2,
+                                                            (C, B): 1 / 2, (B, C): 1 / 2})
+
+    def test_compact_with_hash_consing(self):
+
+        pep = PEP(hash_consing=True, compact=True)
+        A = pep.set_initial_point()
+        B = Point()
+
+        C = A - 0.1 * B - 0.2 * B
+        self.assertIs(C, A - 0.3 * B)
+        self.assertIs(C + 0.3 * B, A)
+        self.assertIs(C * B, B * C)
+
     def test_rmul_between_two_points(self):
 
         inner_product = self.A * self.B
@@ -69,3 +174,25 @@ class TestPoint(unittest.TestCase):
                                                           (self.B, self.A): -1,
                                                           (self.B, self.B): 1
                                                           })
+
+    def test_hash_consing(self):
+
+        self.assertFalse(Point.hash_consing)
+        self.assertIsNot(self.A - 0.1 * self.B - 0.2 * self.B, self.A - 0.3 * self.B)
+
+        pep = PEP(hash_consing=True)
+        A = pep.set_initial_point()
+        B = Point()
+
+        C = A - 0.1 * B - 0.2 * B
+        self.assertIs(C, A - 0.3 * B)
+        self.assertIs(C, - 0.3 * B + A)
+        self.assertIs(C + 0.3 * B, A)
+        self.assertIsNot(C, A - 0.4 * B)
+        self.assertEqual(C.decomposition_dict[A], 1)
+        self.assertAlmostEqual(C.decomposition_dict[B], -0.3)
+
+        # A new PEP does not share the registry, nor the mode, of the previous one
+        PEP()
+        self.assertFalse(Point.hash_consing)
+        self.assertEqual(Point._dict_of_hash_consed_points, dict())
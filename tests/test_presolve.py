@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from PEPit.tools.presolve import get_redundant_rows
+
+
+class TestPresolve(unittest.TestCase):
+
+    def test_get_redundant_rows(self):
+        A = csr_matrix(np.array([[1., 2., 0.],
+                                 [0., 0., 0.],
+                                 [1., 2., 0.],
+                                 [0., 0., 0.],
+                                 [-1., -2., 0.],
+                                 [1., 2., 0.],
+                                 [0., 0., 1.],
+                                 [0., 0., -1.],
+                                 [0., 0., 0.],
+                                 [0., 0., 0.]]))
+        b = np.array([1., -1., 1., 1., -1., 1., 0., 0., 0., 1.])
+        is_equality = np.array([False, False, False, False, False, True, True, True, True, True])
+
+        redundant = get_redundant_rows(A, b, is_equality)
+
+        # Duplicated inequalities (but not opposite ones), duplicated equalities up to the sign,
+        # and constraints without variable that are satisfied are redundant
+        np.testing.assert_array_equal(redundant, [False, True, True, False, False, False, False, True, True, False])
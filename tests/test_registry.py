@@ -0,0 +1,108 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from PEPit import PEP, Point, Expression, Function, Constraint
+from PEPit.registry import Registry, RegisteredClass, RegisteredAttribute
+from PEPit.functions import SmoothStronglyConvexFunction
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.L = 1.
+        self.mu = 0.1
+        self.verbose = -1
+
+    def build_problem(self, gamma, n=2):
+
+        # Gradient descent on a smooth strongly convex function
+        problem = PEP()
+        func = problem.declare_function(SmoothStronglyConvexFunction, mu=self.mu, L=self.L)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x = x0
+        for _ in range(n):
+            x = x - gamma * func.gradient(x)
+        problem.set_performance_metric((x - xs) ** 2)
+
+        return problem
+
+    def build_and_solve(self, gamma):
+
+        problem = self.build_problem(gamma)
+        return problem.solve(verbose=self.verbose)
+
+    def test_new_pep_activates_its_registry(self):
+
+        problem = PEP()
+        self.assertIs(Registry.get_active_registry(), problem.registry)
+        self.assertEqual(Point.counter, 0)
+        self.assertEqual(Expression.counter, 0)
+        self.assertEqual(Function.list_of_functions, list())
+
+    def test_registered_attributes(self):
+
+        problem = PEP()
+        problem.set_initial_point()
+        Constraint.counter += 3
+
+        # Only the shared attributes are descriptors of the metaclass, each class having its own values
+        self.assertIsInstance(RegisteredClass.__dict__["counter"], RegisteredAttribute)
+        self.assertNotIn("get_is_leaf", RegisteredClass.__dict__)
+        self.assertEqual(Point.counter, 1)
+        self.assertEqual(Constraint.counter, 3)
+        self.assertEqual(SmoothStronglyConvexFunction.counter, Function.counter)
+        self.assertEqual(problem.registry.get(Constraint, "counter"), 3)
+
+        # The other class attributes are read as usual
+        self.assertIs(Point.get_is_leaf, Point.__dict__["get_is_leaf"])
+        self.assertEqual(Point._registered_attributes["counter"], int)
+        self.assertRaises(AttributeError, getattr, Expression, "list_of_leaf_points")
+        self.assertRaises(AttributeError, setattr, Expression, "list_of_leaf_points", list())
+
+    def test_coexisting_peps(self):
+
+        problem1 = PEP()
+        x = problem1.set_initial_point()
+        problem2 = PEP()
+        y = problem2.set_initial_point()
+        z = problem2.set_initial_point()
+
+        self.assertEqual(x.counter, 0)
+        self.assertEqual(y.counter, 0)
+        self.assertEqual(z.counter, 1)
+        self.assertEqual(Point.counter, 2)
+
+        # A method of problem1 uses its registry, then the active registry is restored
+        w = problem1.set_initial_point()
+        self.assertEqual(w.counter, 1)
+        self.assertIs(Registry.get_active_registry(), problem2.registry)
+
+        with problem1:
+            self.assertEqual(Point.counter, 2)
+            self.assertEqual(Point.list_of_leaf_points, [x, w])
+            with problem2:
+                self.assertEqual(Point.list_of_leaf_points, [y, z])
+            self.assertIs(Registry.get_active_registry(), problem1.registry)
+        self.assertIs(Registry.get_active_registry(), problem2.registry)
+
+    def test_interleaved_solves(self):
+
+        problem1 = self.build_problem(gamma=1)
+        problem2 = self.build_problem(gamma=1.5, n=3)
+        value2 = problem2.solve(verbose=self.verbose)
+        value1 = problem1.solve(verbose=self.verbose)
+
+        self.assertAlmostEqual(value1, self.build_and_solve(gamma=1), delta=1e-4)
+        self.assertAlmostEqual(value2, self.build_problem(gamma=1.5, n=3).solve(verbose=self.verbose), delta=1e-4)
+
+    def test_concurrent_threads(self):
+
+        gammas = [.5, 1., 1.5, 1.8]
+        sequential_values = [self.build_and_solve(gamma) for gamma in gammas]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent_values = list(executor.map(self.build_and_solve, gammas))
+
+        for sequential_value, concurrent_value in zip(sequential_values, concurrent_values):
+            self.assertAlmostEqual(sequential_value, concurrent_value, delta=1e-4)
@@ -0,0 +1,172 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import cvxpy as cp
+from scipy.sparse import coo_matrix
+
+from PEPit import PEP
+from PEPit.functions import SmoothStronglyConvexFunction
+from PEPit.tools.sdp_formats import get_symmetric_vectorization_matrix, get_sdpa_block_structure
+
+
+def solve_sdpa_problem(problem_path, solution_path):
+    """
+    Solve an SDP written in the SDPA sparse format with CVXPY, and write its solution as CSDP does.
+
+    """
+    with open(problem_path, "r") as file:
+        lines = [line for line in file if not line.startswith(('"', "*"))]
+    nb_variables = int(lines[0])
+    block_structure = [int(block_size) for block_size in lines[2].split()]
+    c = np.array([float(value) for value in lines[3].split()])
+    entries = np.array([[float(value) for value in line.split()] for line in lines[4:]]).reshape((-1, 5))
+
+    # Build sum_i y_i F_i - F_0 block by block
+    y = cp.Variable(nb_variables)
+    constraints = list()
+    for block, block_size in enumerate(block_structure, start=1):
+        block_entries = entries[entries[:, 1] == block]
+        size = abs(block_size)
+        matno = block_entries[:, 0].astype(int)
+        i = block_entries[:, 2].astype(int) - 1
+        j = block_entries[:, 3].astype(int) - 1
+        values = np.where(matno == 0, -1, 1) * block_entries[:, 4]
+        rows = np.concatenate([i + size * j, (j + size * i)[i != j]])
+        columns = np.concatenate([matno, matno[i != j]])
+        weights = coo_matrix((np.concatenate([values, values[i != j]]), (rows, columns)),
+                             shape=(size ** 2, nb_variables + 1)).tocsr()
+        matrix = cp.reshape(weights[:, 1:] @ y + weights[:, 0].toarray().reshape(-1), (size, size), order="F")
+        if block_size > 0:
+            constraints.append((matrix + matrix.T) / 2 >> 0)
+        else:
+            constraints.append(cp.diag(matrix) >= 0)
+    prob = cp.Problem(cp.Minimize(c @ y), constraints)
+    prob.solve(solver="CLARABEL")
+
+    with open(solution_path, "w") as file:
+        file.write(" ".join(repr(float(value)) for value in y.value) + "\n")
+        for block, (block_size, constraint) in enumerate(zip(block_structure, constraints), start=1):
+            dual_value = np.asarray(constraint.dual_value)
+            if block_size > 0:
+                for i, j in zip(*np.triu_indices(block_size)):
+                    file.write("2 {} {} {} {}\n".format(block, i + 1, j + 1, repr(float(dual_value[i, j]))))
+            else:
+                for i in range(-block_size):
+                    file.write("2 {} {} {} {}\n".format(block, i + 1, i + 1, repr(float(dual_value[i]))))
+
+    return -prob.value
+
+
+class TestSDPFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.verbose = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build_problem(self):
+
+        # Gradient descent on a smooth strongly convex function, with an equality constraint and an LMI
+        problem = PEP()
+        func = problem.declare_function(SmoothStronglyConvexFunction, mu=.1, L=1)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x1 = x0 - func.gradient(x0)
+        x2 = x1 - func.gradient(x1)
+        problem.add_constraint(func(x1) == func(x0) - .1)
+        problem.add_psd_matrix([[1, x0 * xs], [x0 * xs, 1]])
+        problem.set_performance_metric((x2 - xs) ** 2)
+
+        return problem, func
+
+    def test_symmetric_vectorization_matrix(self):
+
+        G = np.random.randn(4, 4)
+        G = G + G.T
+        P = get_symmetric_vectorization_matrix(4)
+        self.assertEqual(P.shape, (16, 10))
+
+        # The upper triangular entries are stacked column by column
+        rows_i, columns_j = np.triu_indices(4)
+        order = np.lexsort((rows_i, columns_j))
+        u = G[rows_i[order], columns_j[order]]
+        self.assertTrue(np.allclose(P @ u, G.flatten(order="F")))
+        self.assertEqual(get_sdpa_block_structure(np.array([False, True]), [2], 4), [4, -3, 2])
+
+    def test_sdpa_export_and_import(self):
+
+        problem, func = self.build_problem()
+        pepit_tau = problem.solve(verbose=self.verbose)
+
+        # Solve the exported SDP outside of PEPit
+        problem_path = os.path.join(self.directory, "pep.dat-s")
+        solution_path = os.path.join(self.directory, "pep.sol")
+        problem.export(problem_path, format="sdpa")
+        sdpa_tau = solve_sdpa_problem(problem_path, solution_path)
+        self.assertAlmostEqual(sdpa_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+
+        # The solution is loaded as if the PEP was solved
+        imported_tau = problem.import_solution(solution_path, format="sdpa", verbose=self.verbose)
+        self.assertAlmostEqual(imported_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        self.assertAlmostEqual(problem.objective.eval(), pepit_tau, delta=pepit_tau * 10 ** -3)
+        for constraint in func.list_of_class_constraints + problem.list_of_constraints:
+            self.assertGreaterEqual(constraint.eval_dual(), -10 ** -5)
+        self.assertEqual(problem.solver_status, "imported")
+
+    def test_cbf_export(self):
+
+        problem, _ = self.build_problem()
+        path = os.path.join(self.directory, "pep.cbf")
+        problem.export(path, format="cbf")
+        with open(path, "r") as file:
+            content = file.read().split("\n\n")
+        sections = {section.strip().split("\n")[0]: section.strip().split("\n")[1:] for section in content
+                    if section.strip() and not section.startswith("#")}
+
+        # The Gram matrix and the LMI are affine PSD constraints, the scalar constraints are L- or L= cones
+        nb_constraints = len(problem._list_of_constraints_sent_to_wrapper)
+        self.assertEqual(sections["OBJSENSE"], ["MAX"])
+        self.assertEqual(sections["PSDCON"][0], "2")
+        self.assertEqual(sections["PSDCON"][2], "2")
+        self.assertEqual(sections["CON"][0], "{} {}".format(nb_constraints, len(sections["CON"]) - 1))
+        self.assertEqual(sum(int(line.split()[1]) for line in sections["CON"][1:]), nb_constraints)
+        self.assertIn("L= 1", sections["CON"][1:])
+
+    def test_npz_export_and_import(self):
+
+        problem, func = self.build_problem()
+        pepit_tau = problem.solve(verbose=self.verbose)
+        solution = {"G": problem.G_value, "F": problem.F_value, "residual": problem.residual,
+                    "constraint_duals": [constraint.eval_dual()
+                                         for constraint in problem._list_of_constraints_sent_to_wrapper],
+                    "psd_dual_0": problem.list_of_psd[0].eval_dual()}
+        class_duals = [constraint.eval_dual() for constraint in func.list_of_class_constraints]
+
+        # The exported arrays describe the same problem as the one sent to the wrapper
+        problem_path = os.path.join(self.directory, "pep.npz")
+        problem.export(problem_path, format="npz")
+        with np.load(problem_path) as data:
+            self.assertEqual(data["A_shape"][0], len(problem._list_of_constraints_sent_to_wrapper) + 4 + 1)
+            self.assertEqual(list(data["psd_sizes"]), [2])
+            self.assertEqual(int(np.sum(data["is_equality"])), 1)
+
+        # Importing the solution of the wrapper gives back the same values
+        solution_path = os.path.join(self.directory, "pep.sol.npz")
+        solution["F"] = np.concatenate([solution["F"], [pepit_tau]])
+        np.savez(solution_path, **solution)
+        imported_tau = problem.import_solution(solution_path, format="npz", verbose=self.verbose)
+        self.assertAlmostEqual(imported_tau, pepit_tau, delta=pepit_tau * 10 ** -3)
+        for constraint, dual_value in zip(func.list_of_class_constraints, class_duals):
+            self.assertAlmostEqual(constraint.eval_dual(), dual_value)
+
+    def test_wrong_format(self):
+
+        problem, _ = self.build_problem()
+        self.assertRaises(ValueError, problem.import_solution, "pep.sol")
+        self.assertRaises(ValueError, problem.export, "pep.txt", format="txt")
@@ -0,0 +1,70 @@
+import os
+import unittest
+
+import numpy as np
+
+from PEPit.tools.sweep import parameter_grid_to_list, run_sweep, iterate_sweep
+from PEPit.examples.unconstrained_convex_minimization import wc_gradient_descent
+
+
+def failing_pep_builder(L):
+    raise ValueError("L must be positive. Got {}".format(L))
+
+
+def thread_limit_pep_builder(name):
+    return float(os.environ.get(name, "nan"))
+
+
+class TestSweep(unittest.TestCase):
+
+    def test_parameter_grid_to_list(self):
+
+        self.assertEqual(parameter_grid_to_list({"gamma": [.5, 1], "n": [1, 2]}),
+                         [{"gamma": .5, "n": 1}, {"gamma": .5, "n": 2}, {"gamma": 1, "n": 1}, {"gamma": 1, "n": 2}])
+        self.assertEqual(parameter_grid_to_list([{"gamma": .5}, {"gamma": 1, "n": 2}]),
+                         [{"gamma": .5}, {"gamma": 1, "n": 2}])
+        self.assertRaises(TypeError, parameter_grid_to_list, [.5, 1])
+
+    def test_run_sweep(self):
+
+        parameter_grid = {"gamma": [.5, 1], "n": [1, 2]}
+        streamed_rows = list()
+        results = run_sweep(wc_gradient_descent, parameter_grid, max_workers=2,
+                            callback=streamed_rows.append, L=1, verbose=-1)
+
+        # One row per set of parameters, in the order of the grid
+        self.assertEqual(len(streamed_rows), 4)
+        self.assertEqual(list(results["gamma"]), [.5, .5, 1, 1])
+        self.assertEqual(list(results["n"]), [1, 2, 1, 2])
+
+        # Compare with sequential solves
+        for _, row in results.iterrows():
+            pepit_tau, theoretical_tau = wc_gradient_descent(L=1, gamma=row["gamma"], n=row["n"], verbose=-1)
+            self.assertAlmostEqual(row["worst_case_value"], pepit_tau, delta=10 ** -4)
+            self.assertAlmostEqual(row["theoretical_value"], theoretical_tau)
+            self.assertEqual(row["solver_status"], "optimal")
+            self.assertEqual(row["nb_solves"], 1)
+            self.assertGreater(row["total_time"], row["solve_time"])
+            self.assertIsNone(row["error"])
+
+    def test_errors_are_reported(self):
+
+        rows = list(iterate_sweep(failing_pep_builder, {"L": [-1]}, max_workers=1))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["error"], "ValueError: L must be positive. Got -1")
+        self.assertTrue(np.isnan(rows[0]["worst_case_value"]))
+        self.assertEqual(rows[0]["nb_solves"], 0)
+
+    def test_thread_limits(self):
+
+        names = ["OMP_NUM_THREADS", "MSK_IPAR_NUM_THREADS"]
+        old_environment = {name: os.environ.get(name) for name in names}
+        rows = list()
+        for row in iterate_sweep(thread_limit_pep_builder, {"name": names}, max_workers=1, nb_threads_per_worker=3):
+            # The environment of the parent process is left unchanged while the workers run
+            self.assertEqual({name: os.environ.get(name) for name in names}, old_environment)
+            rows.append(row)
+
+        # The limits are set in the workers
+        self.assertEqual([row["worst_case_value"] for row in rows], [3., 3.])
@@ -4,6 +4,11 @@ import numpy as np
 from PEPit.point import Point
 from PEPit.expression import Expression
 from PEPit.pep import PEP
+from PEPit.pep_template import PEPTemplate
+from PEPit.wrappers.cvxpy_wrapper import CvxpyWrapper
+from PEPit.wrappers.scs_wrapper import ScsWrapper
+from PEPit.wrappers.burer_monteiro_wrapper import BurerMonteiroWrapper
+from PEPit.functions.smooth_convex_function import SmoothConvexFunction
 from PEPit.functions.smooth_strongly_convex_function import SmoothStronglyConvexFunction
 
 from PEPit.tools.dict_operations import symmetrize_dict, prune_dict
@@ -72,6 +77,36 @@ class TestWrapperCVXPY(unittest.TestCase):
         pepit_tau4 = self.problem.solve(verbose=self.verbose, dimension_reduction_heuristic="logdet2", wrapper=self.wrapper)
         self.assertAlmostEqual(pepit_tau4, pepit_tau, delta=10 ** -2)
 
+    def test_lmi_constraints_are_vectorized(self):
+
+        self.problem.solve(verbose=self.verbose, dimension_reduction_heuristic=None, wrapper=self.wrapper)
+        wrapper = self.problem.wrapper
+        if not isinstance(wrapper, CvxpyWrapper):
+            self.skipTest("Only relevant for the cvxpy wrapper.")
+
+        # G >> 0, the scalar inequalities, and the 2x2 LMI as one PSD constraint and one vectorized equality
+        self.assertEqual(len(wrapper.prob.constraints), 4)
+        self.assertEqual(wrapper.prob.constraints[-1].shape, (4,))
+
+    def test_heuristic_reuses_problem(self):
+
+        pepit_tau = self.problem.solve(verbose=self.verbose, dimension_reduction_heuristic="logdet3",
+                                       wrapper=self.wrapper)
+        wrapper = self.problem.wrapper
+        if not isinstance(wrapper, CvxpyWrapper):
+            self.skipTest("Only relevant for the cvxpy wrapper.")
+
+        # All the heuristic steps solve the same parametrized problem, with new weights
+        heuristic_problem = wrapper.prob
+        weight = np.identity(Point.counter)
+        self.assertIs(wrapper.heuristic(weight), heuristic_problem)
+        np.testing.assert_array_equal(wrapper._heuristic_weight.value, weight)
+
+        # The solver is warm-started from the previous solution
+        wrapper.solve()
+        self.assertEqual(heuristic_problem.status, "optimal")
+        self.assertAlmostEqual(wrapper.objective.value, pepit_tau, delta=10 ** -2)
+
     def test_track_constraints_sent_to_solver(self):
 
         # Run problem to send constraints to wrapper who sends it to solver
@@ -167,3 +202,89 @@ class TestWrapperMOSEK(TestWrapperCVXPY):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.wrapper = "mosek"
+
+
+class TestWrapperCVXPYWithTemplate(TestWrapperCVXPY):
+
+    def setUp(self):
+        super().setUp()
+
+        # Solve all the problems with a template
+        self.template = PEPTemplate()
+        self.template.__enter__()
+
+    def tearDown(self):
+        self.template.__exit__(None, None, None)
+
+
+class TestWrapperMOSEKWithTemplate(TestWrapperCVXPYWithTemplate):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wrapper = "mosek"
+
+
+class TestWrapperSCS(TestWrapperCVXPY):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wrapper = "scs"
+
+    def test_heuristic_reuses_problem(self):
+
+        pepit_tau = self.problem.solve(verbose=self.verbose, dimension_reduction_heuristic="logdet3",
+                                       wrapper=self.wrapper)
+        wrapper = self.problem.wrapper
+        self.assertIsInstance(wrapper, ScsWrapper)
+
+        # The heuristic steps only update the objective of the SCS problem, which keeps its factorization
+        solver = wrapper._solver
+        weight = np.identity(Point.counter)
+        wrapper.heuristic(weight)
+        wrapper.solve()
+        self.assertIs(wrapper._solver, solver)
+        self.assertAlmostEqual(wrapper.prob["c"] @ wrapper._solution["x"], np.trace(wrapper.optimal_G), delta=10 ** -5)
+        self.assertAlmostEqual(wrapper.objective.eval(), pepit_tau, delta=10 ** -2)
+
+
+class TestWrapperBurerMonteiro(TestWrapperCVXPY):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wrapper = "burer_monteiro"
+
+    def test_rank(self):
+
+        pepit_tau = self.problem.solve(verbose=self.verbose, wrapper="cvxpy")
+
+        # A rank 1 factorization provides a 1-dimensional worst-case instance, whose value is certified
+        # when the duality gap is below the tolerance
+        low_rank_pepit_tau = self.problem.solve(verbose=self.verbose, wrapper=self.wrapper,
+                                                return_primal_or_dual="primal", rank=1, tol=10 ** -8)
+        self.assertIsInstance(self.problem.wrapper, BurerMonteiroWrapper)
+        self.assertEqual(self.problem.solver_status, "optimal")
+        self.assertAlmostEqual(low_rank_pepit_tau, pepit_tau, delta=10 ** -3)
+        self.assertEqual(np.linalg.matrix_rank(self.problem.G_value, tol=10 ** -8), 1)
+
+    def test_certification(self):
+
+        # Gradient descent on a smooth convex function, whose worst-case guarantee is L / (4n + 2)
+        L, n = 1., 5
+        problem = PEP()
+        func = problem.declare_function(SmoothConvexFunction, L=L)
+        xs = func.stationary_point()
+        x0 = problem.set_initial_point()
+        problem.set_initial_condition((x0 - xs) ** 2 <= 1)
+        x = x0
+        for _ in range(n):
+            x = x - 1 / L * func.gradient(x)
+        problem.set_performance_metric(func(x) - func(xs))
+        pepit_tau = problem.solve(verbose=self.verbose, wrapper=self.wrapper, return_primal_or_dual="primal")
+
+        # The constraints are satisfied up to the tolerance, but the duality gap is not: the value is not certified
+        wrapper = problem.wrapper
+        with problem:
+            dual_value = wrapper._objective_constant - wrapper._multipliers @ wrapper.prob["b"]
+        self.assertAlmostEqual(pepit_tau, L / (4 * n + 2), delta=10 ** -6)
+        self.assertGreater(abs(dual_value - pepit_tau), 10 ** -6)
+        self.assertEqual(problem.solver_status, "feasible")